@@ -6,6 +6,10 @@ from desktop_app.config.constants import (
     AppMeta,
     ServerDefaults,
     Network,
+    Recording,
+    Transfer,
+    Headless,
+    LocalApi,
     Ui,
     AndroidKeyCodes,
 )
@@ -14,6 +18,10 @@ __all__ = [
     "AppMeta",
     "ServerDefaults",
     "Network",
+    "Recording",
+    "Transfer",
+    "Headless",
+    "LocalApi",
     "Ui",
     "AndroidKeyCodes",
 ]
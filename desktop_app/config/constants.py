@@ -3,6 +3,7 @@ Desktop App — Tüm sabitler ve yapılandırma değerleri.
 Tek bir yerden yönetim; magic number ve stringler burada toplanır.
 """
 
+import os
 from dataclasses import dataclass
 from typing import Dict, Tuple
 
@@ -31,14 +32,96 @@ class ServerDefaults:
 @dataclass(frozen=True)
 class Network:
     """Ağ ve WebSocket sabitleri."""
-    PING_INTERVAL_SEC: int = 20
-    PING_TIMEOUT_SEC: int = 10
-    HEARTBEAT_INTERVAL_MS: int = 30_000
     MJPEG_REQUEST_TIMEOUT_SEC: int = 10
     MJPEG_CHUNK_SIZE: int = 4096
     JPEG_MARKER_START: bytes = b"\xff\xd8"
     JPEG_MARKER_END: bytes = b"\xff\xd9"
     MJPEG_JOIN_TIMEOUT_SEC: float = 2.0
+    FRAME_DEDUP_WINDOW: int = 64      # Hakemin hatırladığı son frame özetleri
+    REDUNDANT_PATH_STREAK: int = 30   # Art arda bu kadar geç kopya → yol gereksiz
+    STATIC_FRAME_STREAK: int = 10     # Art arda bu kadar aynı frame → ekran durağan
+    CHANNEL_SCREEN: int = 1           # Frame mesajının "ch" alanı (yoksa ekran)
+    CHANNEL_CAMERA: int = 2
+    LATENCY_WINDOW: int = 256         # Yüzdelikler için tutulan son RTT sayısı
+    ACK_TIMEOUT_MS: int = 3000        # Bu sürede ack gelmeyen komut kayıp sayılır
+    LATENCY_REPORT_MS: int = 500      # UI'a gecikme özeti gönderme aralığı
+
+    # Canlılık probe'ları (tek keep-alive; trafik varken gönderilmez)
+    PROBE_TICK_MS: int = 1000
+    PROBE_MIN_INTERVAL_MS: int = 2000     # Bağlanınca / kayıp sonrası
+    PROBE_MAX_INTERVAL_MS: int = 15_000   # Sakin bağlantıda (Render 100 sn idle sınırının altında)
+    PROBE_TIMEOUT_MS: int = 5000
+    PROBE_MAX_MISSES: int = 3             # Art arda kayıp → bağlantı kopmuş
+
+    # Açılışta ön ısıtma: GET / sağlık kontrolü + join'siz WebSocket (bkz. WsClient.prewarm)
+    PREWARM: bool = os.environ.get("REMOTE_PHONE_PREWARM", "1") != "0"
+    PREWARM_DELAY_MS: int = 300               # Pencerenin ilk çizimiyle yarışmasın
+    PREWARM_HEALTH_TIMEOUT_SEC: float = 60.0  # Uyuyan Render örneği ~30-50 sn'de kalkar
+
+    # Yayın kalitesi (telefonda seviye → ölçek + JPEG kalitesi)
+    QUALITY_LEVELS: int = 4
+    QUALITY_DEFAULT_LEVEL: int = 2
+    QUALITY_DEGRADE_RTT_MS: float = 250.0
+    QUALITY_UPGRADE_RTT_MS: float = 100.0
+    QUALITY_HOLD_MS: int = 5000
+
+    # Çözme tamponu havuzu: biri ekranda, biri kuyrukta, biri çözülüyor
+    IMAGE_POOL_SLOTS: int = 3
+
+
+@dataclass(frozen=True)
+class Recording:
+    """Oturum kaydı (MJPEG AVI) sabitleri."""
+    DIRECTORY: str = os.path.join(os.path.expanduser("~"), "RemotePhoneControl", "recordings")
+    QUEUE_FRAMES: int = 90                    # ~3 sn; dolarsa frame düşürülür
+    WRITER_POLL_SEC: float = 0.02
+    SEGMENT_SEC: int = 300
+    SEGMENT_MAX_BYTES: int = 512 * 1024 * 1024  # RIFF 1 GB sınırının altında
+    TRANSCODE_H264: bool = False              # Segment kapanınca ffmpeg ile MP4 (varsa)
+    TRANSCODE_CRF: int = 23
+
+
+@dataclass(frozen=True)
+class Transfer:
+    """Parçalı dosya / pano aktarımı sabitleri."""
+    DIRECTORY: str = os.path.join(os.path.expanduser("~"), "RemotePhoneControl", "received")
+    CHUNK_BYTES: int = 32 * 1024              # Frame en fazla bir parçanın arkasında bekler
+    WINDOW_CHUNKS: int = 32                   # Ack beklenmeden yoldaki en fazla parça
+    ACK_TIMEOUT_SEC: float = 3.0              # İlerleme yoksa son ack'ten yeniden gönder
+    DUP_ACK_REWIND: int = 3                   # Art arda aynı ack → parça kayıp, geri sar
+    CLIPBOARD_MAX_BYTES: int = 32 * 1024 * 1024
+    PROGRESS_INTERVAL_SEC: float = 0.25
+
+    # Hız denetimi: aktarımın frame'lere eklediği gecikme bütçesi. Parça ack
+    # RTT'sinin taban RTT'yi aşan kısmı QUEUE_DELAY_TARGET_MS'te tutulur;
+    # bütçenin kalanı yoldaki parçanın ve ölçüm gürültüsünün payı.
+    LATENCY_BUDGET_MS: float = 50.0
+    QUEUE_DELAY_TARGET_MS: float = 25.0
+    START_RATE: float = 256 * 1024            # byte/sn
+    MIN_RATE: float = 32 * 1024
+    MAX_RATE: float = 64 * 1024 * 1024
+    RATE_RAMP_SEC: float = 0.5                # Hedeften uzaklığa göre 2× / ½× süresi
+    BASE_RTT_WINDOW_SEC: float = 60.0
+
+
+@dataclass(frozen=True)
+class Headless:
+    """Arayüzsüz istemci (otomasyon / dayanıklılık testi) sabitleri."""
+    STATS_INTERVAL_SEC: float = 5.0
+    FRAME_FILE_PATTERN: str = "{channel}_{n:08d}.jpg"
+    CAPS_WAIT_SEC: float = 1.0                 # Eşleşmeden sonra telefonun yetenek bildirimi
+    RECONNECT_DELAY_SEC: float = 2.0
+    CONNECT_SPREAD_SEC: float = 5.0            # Çok cihazda bağlantılar bu süreye yayılır
+    DRAG_STEP_MS: int = 16
+
+
+@dataclass(frozen=True)
+class LocalApi:
+    """Otomasyon için yerel frame / girdi API'si (bkz. network.frame_api)."""
+    HOST: str = "127.0.0.1"                    # Yalnızca bu makine
+    PORT: int = int(os.environ.get("REMOTE_PHONE_API_PORT", "0"))  # 0: kapalı
+    LONG_POLL_SEC: float = 10.0
+    INPUT_MAX_BYTES: int = 64 * 1024
 
 
 @dataclass(frozen=True)
@@ -51,6 +134,18 @@ class Ui:
     HEADER_HEIGHT: int = 56
     TOUCH_THRESHOLD_PX: int = 8  # Tıklama vs kaydırma ayrımı
     COORD_PRECISION: int = 4
+    DRAG_MOVE_INTERVAL_MS: int = 16          # Canlı sürüklemede adımlar arası en az süre
+
+    # Frame önbelleği (ScreenWidget)
+    FRAME_CACHE_MAX_BYTES: int = 48 * 1024 * 1024
+    FRAME_CACHE_MAX_VARIANTS: int = 4        # Boyut başına ölçeklenmiş kopya
+    FRAME_CACHE_MAX_SESSIONS: int = 8        # Küçük resmi tutulan oturum sayısı
+    FRAME_CACHE_THUMB_WIDTH: int = 240
+    RESIZE_SMOOTH_DELAY_MS: int = 120        # Boyutlandırma bitince kaliteli ölçekleme
+    CAMERA_VIEW_WIDTH: int = 240             # Ekranın yanındaki kamera görüntüsü
+    ZOOM_STEP: float = 1.25                  # Tekerlek adımı başına yakınlaştırma
+    ZOOM_MAX: float = 4.0
+    ROI_SEND_DELAY_MS: int = 150             # Yakınlaştırma durunca bölge telefona bildirilir
 
     # Renkler (theme)
     BG_MAIN: str = "#0f0f1a"
@@ -91,6 +186,8 @@ class Ui:
     MSG_WAITING: str = "Bağlantı bekleniyor..."
     MSG_CONNECTING: str = "Bağlanıyor..."
     MSG_SERVER_CONNECTED: str = "Sunucuya bağlandı. Telefon bekleniyor..."
+    MSG_SERVER_READY: str = "Sunucu hazır ({ms:.0f} ms) — kodu girip bağlanın"
+    MSG_FIRST_FRAME: str = "İlk frame {ms:.0f} ms{warm}"
     MSG_PAIRED_WS: str = "🟢 Bağlandı (WebSocket modu) | Ekran görüntüsü WebSocket üzerinden geliyor"
     MSG_DISCONNECT_TIMEOUT: str = (
         "Bağlantı kesildi — Sunucu yanıt vermiyor. "
@@ -98,6 +195,21 @@ class Ui:
     )
     MSG_PEER_DISCONNECTED: str = "Telefon bağlantısı kesildi."
     MSG_STREAM_STOPPED: str = "Stream durdu."
+    MSG_WS_FRAMES_PAUSED: str = "🟢 Bağlandı | Stream: MJPEG (WebSocket frame'leri durduruldu)"
+    MSG_MJPEG_REDUNDANT: str = "🟢 Bağlandı (WebSocket modu) | MJPEG daha yavaş, kapatıldı"
+    MSG_RTT: str = "RTT sunucu {server} · telefon {peer}"
+    MSG_VIEW_ONLY: str = "👁 Yalnızca izleniyor — kontrol başka bir PC'de"
+    MSG_PEER_UNRESPONSIVE: str = "⚠️ Telefon yanıt vermiyor..."
+    MSG_SERVER_DRAINING: str = "Sunucu yeniden başlatılıyor, oturum taşınıyor..."
+    MSG_QUALITY: str = "Yayın kalitesi: seviye {level}"
+    MSG_LATENCY: str = "Girdi RTT p50 {p50:.0f} ms · p95 {p95:.0f} ms · kayıp {lost} · sıra dışı {reordered}"
+    MSG_RECORDING_ON: str = "⏺ Kayıt: {path}"
+    MSG_RECORDING_OFF: str = "Kayıt durdu: {frames} frame, {segments} dosya, {dropped} düşürüldü"
+    MSG_TRANSFER_PROGRESS: str = "📤 Aktarım: {sent_mb:.1f} / {total_mb:.1f} MB (%{percent:.0f})"
+    MSG_TRANSFER_DONE: str = "✅ Aktarım tamamlandı"
+    MSG_TRANSFER_FAILED: str = "Aktarım başarısız: {reason}"
+    MSG_CLIPBOARD_RECEIVED: str = "📋 Telefonun panosu kopyalandı ({chars} karakter)"
+    MSG_FILE_RECEIVED: str = "📥 Dosya alındı: {path}"
     MSG_CAMERA_ON: str = "Kamera açıldı"
     MSG_CAMERA_OFF: str = "Kamera kapatıldı"
     MSG_SERVER_AND_CODE_REQUIRED: str = "Sunucu adresi ve kod gerekli!"
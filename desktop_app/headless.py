@@ -0,0 +1,153 @@
+"""
+Remote Phone Control — Arayüzsüz Giriş Noktası
+===============================================
+Qt penceresi olmadan bir veya daha fazla koda PC olarak bağlanır
+(bkz. desktop_app.network.headless). Frame'ler diske veya stdout'a ham
+JPEG olarak yazılabilir, girdi betiği çalıştırılabilir; istatistikler
+düzenli aralıkla basılır. Çok sayıda cihaz tek süreçten sürülebilir.
+
+Kullanım (proje kökünden):
+    python desktop_app/headless.py --code 123456 --out frames/
+    python desktop_app/headless.py --code 123456 --stdout | ffmpeg -f mjpeg -i - out.mp4
+    python desktop_app/headless.py --codes-file codes.txt --script tap.txt --repeat 100 --duration 3600
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+# desktop_app/ içinden çalıştırıldığında parent dizini path'e ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from desktop_app.config import Headless, ServerDefaults
+from desktop_app.network.headless import (
+    DirectorySink, HeadlessClient, PipeSink, parse_script, summary,
+)
+
+
+def _format(s: dict) -> str:
+    lat = s["latency"]
+    rtt = (f"rtt p50={lat['p50']:.0f} p95={lat['p95']:.0f} kayıp={lat['lost']}"
+           if lat["samples"] else "rtt —")
+    return (f"{s['code']} {'eşli' if s['paired'] else 'bekliyor'} fps={s['fps']:.1f} "
+            f"{s['kbps']:.0f} KB/sn boşluk={s['max_gap_ms']:.0f} ms frame={s['frames']} "
+            f"kamera={s['camera_frames']} girdi={s['inputs']} {rtt} yeniden={s['reconnects']}"
+            + (f" çözme_hatası={s['decode_errors']}" if s["decode_errors"] else ""))
+
+
+def _report(clients: list[HeadlessClient], out, as_json: bool, per_client: bool) -> list[dict]:
+    rows = [summary(c) for c in clients]
+    if as_json:
+        for row in rows:
+            print(json.dumps(row, ensure_ascii=False), file=out, flush=True)
+        return rows
+    if per_client:
+        for row in rows:
+            print(_format(row), file=out)
+    paired = sum(r["paired"] for r in rows)
+    print(f"[{time.strftime('%H:%M:%S')}] eşli {paired}/{len(rows)} "
+          f"toplam fps={sum(r['fps'] for r in rows):.1f} "
+          f"{sum(r['kbps'] for r in rows) / 1024:.1f} MB/sn "
+          f"girdi={sum(r['inputs'] for r in rows)}", file=out, flush=True)
+    return rows
+
+
+async def _main(args, codes: list[str], script: list[tuple]) -> int:
+    if args.stdout:
+        sinks = [PipeSink(sys.stdout.buffer)]
+    elif args.out:
+        # Tek kodda doğrudan dizine, çok kodda kod başına alt dizine
+        sinks = [DirectorySink(args.out if len(codes) == 1 else os.path.join(args.out, code),
+                               args.keep) for code in codes]
+    else:
+        sinks = [None] * len(codes)
+    clients = [HeadlessClient(args.server, code, sink, role=args.role, script=script,
+                              repeat=args.repeat, decode=args.decode)
+               for code, sink in zip(codes, sinks)]
+
+    stop = asyncio.Event()
+    spread = Headless.CONNECT_SPREAD_SEC if len(clients) > 1 else 0.0
+
+    async def start(client: HeadlessClient):
+        await asyncio.sleep(random.uniform(0, spread))  # Yüzlerce bağlantı aynı anda açılmasın
+        await client.run(stop)
+
+    tasks = [asyncio.create_task(start(c)) for c in clients]
+    out = sys.stderr if args.stdout else sys.stdout
+    deadline = time.monotonic() + args.duration if args.duration else None
+    until_scripts = script and args.exit_after_script
+    while True:
+        timeout = args.stats_interval
+        if deadline is not None:
+            timeout = min(timeout, max(0.0, deadline - time.monotonic()))
+        await asyncio.sleep(timeout)
+        _report(clients, out, args.json, len(clients) <= args.per_client_max)
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        if until_scripts and all(c.script_done.is_set() for c in clients):
+            break
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return 0 if all(c.pairings for c in clients) else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--server", default=ServerDefaults.DEFAULT_URL)
+    parser.add_argument("--code", action="append", default=[], help="Bağlanılacak kod (tekrarlanabilir)")
+    parser.add_argument("--codes-file", help="Satır başına bir kod")
+    parser.add_argument("--role", choices=("pc", "viewer"), default="pc")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--out", help="Frame'lerin yazılacağı dizin")
+    target.add_argument("--stdout", action="store_true",
+                        help="Ekran frame'lerini stdout'a ham JPEG akışı olarak yaz (tek kod)")
+    parser.add_argument("--keep", type=int, default=0, help="Dizinde tutulacak son frame sayısı (0: hepsi)")
+    parser.add_argument("--decode", action="store_true", help="JPEG'leri çöz (bozuk frame sayımı)")
+    parser.add_argument("--script", help="Girdi betiği dosyası")
+    parser.add_argument("--repeat", type=int, default=1, help="Betik kaç kez çalıştırılsın")
+    parser.add_argument("--exit-after-script", action="store_true",
+                        help="Tüm istemcilerde betik bitince çık")
+    parser.add_argument("--duration", type=float, default=0, help="Saniye (0: Ctrl+C'ye kadar)")
+    parser.add_argument("--stats-interval", type=float, default=Headless.STATS_INTERVAL_SEC)
+    parser.add_argument("--per-client-max", type=int, default=20,
+                        help="Bu kadar istemciye kadar satır satır istatistik basılır")
+    parser.add_argument("--json", action="store_true", help="İstatistikleri JSON satırları olarak bas")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    codes = list(args.code)
+    if args.codes_file:
+        with open(args.codes_file, encoding="utf-8") as f:
+            codes += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if not codes:
+        parser.error("en az bir --code veya --codes-file gerekli")
+    if args.stdout and len(codes) > 1:
+        parser.error("--stdout yalnızca tek kodla kullanılabilir")
+    script = []
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            try:
+                script = parse_script(f.read())
+            except ValueError as e:
+                parser.error(f"{args.script}: {e}")
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        stream=sys.stderr,
+    )
+    try:
+        return asyncio.run(_main(args, codes, script))
+    except KeyboardInterrupt:
+        return 0
+    except BrokenPipeError:
+        return 0  # stdout'u okuyan süreç kapandı
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,7 +11,6 @@ import logging
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from PyQt6.QtWidgets import QApplication
-from desktop_app.ui.main_window import MainWindow
 from desktop_app.config import AppMeta
 
 # Logging yapılandırması
@@ -26,6 +25,9 @@ def main():
     app.setApplicationName(AppMeta.NAME)
     app.setApplicationVersion(AppMeta.VERSION)
 
+    # Pencere modülü (ve ağ katmanı) QApplication hazır olduktan sonra yüklenir
+    from desktop_app.ui.main_window import MainWindow
+
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,39 @@
+"""
+JSON Codec
+===========
+WsClient'ın mesaj encode/decode katmanı. Sunucuyla aynı sırayla kurulu
+olan seçilir: msgspec > orjson > stdlib json. `dumps` her zaman bytes döndürür;
+websocket-client bytes'ı metin frame'i olarak olduğu gibi gönderir.
+"""
+
+import json
+
+try:
+    import msgspec
+except ImportError:  # opsiyonel bağımlılık
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # opsiyonel bağımlılık
+    orjson = None
+
+
+if msgspec is not None:
+    BACKEND = "msgspec"
+    dumps = msgspec.json.Encoder().encode
+    loads = msgspec.json.decode
+    DecodeError: tuple = (msgspec.DecodeError,)
+elif orjson is not None:
+    BACKEND = "orjson"
+    dumps = orjson.dumps
+    loads = orjson.loads
+    DecodeError = (orjson.JSONDecodeError,)
+else:
+    BACKEND = "json"
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    loads = json.loads
+    DecodeError = (json.JSONDecodeError,)
@@ -0,0 +1,222 @@
+"""
+Yerel Frame API
+===============
+Otomasyon araçlarının (OCR, görsel test doğrulamaları) telefon ekranını Qt
+penceresinden kazımadan alabilmesi için yalnızca 127.0.0.1'de dinleyen küçük
+bir HTTP sunucusu.
+
+    GET  /frame              Son ekran frame'i (image/jpeg), X-Frame-Seq başlığıyla
+    GET  /frame?after=N      Sırası N'den büyük frame gelene kadar bekler (long-poll);
+                             LONG_POLL_SEC içinde gelmezse 204
+    GET  /stream             multipart/x-mixed-replace MJPEG; her parçada X-Frame-Seq
+    POST /input              JSON komut gövdesi → WsClient.send_command
+                             ({"action": "touch", "x": 0.5, "y": 0.5} gibi)
+
+Alıcılar (WsClient, MjpegReceiver) hakemden geçen her yeni frame'in JPEG
+byte'larını `LatestFrame.publish()` ile bırakır: yalnızca referans saklanır,
+kopya veya decode yoktur. İstemciler sunucunun kendi thread'lerinde beklenir
+ve yazılır; GUI thread'ine iş düşmez. Yavaş akış istemcisi kuyruk biriktirmez,
+bir sonraki yazımda en son frame'i alır (aradaki frame'ler atlanır).
+
+Tarayıcıdaki sayfaların isteği taklit etmesine karşı: Host yalnızca yerel ad
+olabilir (DNS rebinding), Origin başlığı taşıyan istekler reddedilir ve
+/input yalnızca application/json kabul eder (CORS ön kontrolü yanıtlanmaz).
+"""
+
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+from urllib.parse import parse_qs, urlsplit
+
+from desktop_app.config import LocalApi
+
+logger = logging.getLogger(__name__)
+
+_BOUNDARY = "frame"
+_LOCAL_HOSTS = frozenset({"127.0.0.1", "localhost", "[::1]"})
+
+
+class LatestFrame:
+    """Son ekran frame'i ve sıra numarası; alıcı thread'lerinden beslenir."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._jpeg: bytes = b""
+        self._seq = 0
+        self._closed = False
+
+    def publish(self, jpeg: bytes):
+        """Yeni frame (alıcı thread'i). Byte'lar kopyalanmaz, değiştirilmemeli."""
+        with self._cond:
+            self._jpeg = jpeg
+            self._seq += 1
+            self._cond.notify_all()
+
+    def latest(self) -> tuple[int, bytes]:
+        with self._cond:
+            return self._seq, self._jpeg
+
+    def wait(self, after: int, timeout: float) -> tuple[int, bytes] | None:
+        """Sırası `after`'dan büyük frame; süre dolarsa veya kapanırsa None."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > after or self._closed, timeout):
+                return None
+            return None if self._closed else (self._seq, self._jpeg)
+
+    def close(self):
+        """Bekleyen long-poll ve akış istemcilerini bırak."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class FrameApi:
+    """
+    LatestFrame'i ve girdi enjeksiyonunu yerel HTTP üzerinden sunar.
+
+    :param frames:       Alıcıların beslediği son frame
+    :param send_command: /input gövdesi bununla gönderilir (WsClient.send_command)
+    """
+
+    def __init__(self, frames: LatestFrame, send_command: Callable[[dict], None],
+                 port: int = LocalApi.PORT):
+        self._frames = frames
+        self._send_command = send_command
+        self._port = port
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def port(self) -> int:
+        """Dinlenen port (0 ile başlatıldıysa işletim sisteminin verdiği)."""
+        return self._server.server_address[1] if self._server else self._port
+
+    def start(self) -> bool:
+        if self._server:
+            return True
+        try:
+            self._server = ThreadingHTTPServer((LocalApi.HOST, self._port), _handler(self))
+        except OSError as e:
+            logger.warning(f"Yerel frame API başlatılamadı ({LocalApi.HOST}:{self._port}): {e}")
+            return False
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="frame-api", daemon=True).start()
+        logger.info(f"Yerel frame API: http://{LocalApi.HOST}:{self.port}/frame")
+        return True
+
+    def stop(self):
+        server, self._server = self._server, None
+        if server:
+            self._frames.close()
+            server.shutdown()
+            server.server_close()
+
+
+def _handler(api: FrameApi) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):
+            logger.debug("%s " + fmt, self.address_string(), *args)
+
+        def _allowed(self) -> bool:
+            host = (self.headers.get("Host") or "").rsplit(":", 1)[0]
+            if host not in _LOCAL_HOSTS or self.headers.get("Origin"):
+                self._reply(403, b"forbidden\n")
+                return False
+            return True
+
+        def _reply(self, status: int, body: bytes = b"", content_type: str = "text/plain",
+                   seq: int | None = None):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            if seq is not None:
+                self.send_header("X-Frame-Seq", str(seq))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def do_GET(self):
+            if not self._allowed():
+                return
+            url = urlsplit(self.path)
+            if url.path == "/frame":
+                self._frame(parse_qs(url.query))
+            elif url.path == "/stream":
+                self._stream()
+            else:
+                self._reply(404, b"not found\n")
+
+        def do_POST(self):
+            if not self._allowed():
+                return
+            if urlsplit(self.path).path != "/input":
+                self._reply(404, b"not found\n")
+                return
+            if self.headers.get_content_type() != "application/json":
+                self._reply(415, b"application/json required\n")
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            if not 0 < length <= LocalApi.INPUT_MAX_BYTES:
+                self._reply(413 if length else 411, b"bad length\n")
+                return
+            try:
+                cmd = json.loads(self.rfile.read(length))
+            except ValueError:
+                cmd = None
+            if not isinstance(cmd, dict) or not isinstance(cmd.get("action"), str):
+                self._reply(400, b'body must be {"action": ...}\n')
+                return
+            cmd.pop("type", None)
+            api._send_command(cmd)
+            self._reply(202, b'{"ok":true}', "application/json")
+
+        def _frame(self, query: dict):
+            after = query.get("after")
+            if after is None:
+                seq, jpeg = api._frames.latest()
+                if seq:
+                    self._reply(200, jpeg, "image/jpeg", seq)
+                else:
+                    self._reply(204)
+                return
+            try:
+                after_seq = int(after[0])
+            except ValueError:
+                self._reply(400, b"after must be an integer\n")
+                return
+            frame = api._frames.wait(after_seq, LocalApi.LONG_POLL_SEC)
+            if frame:
+                self._reply(200, frame[1], "image/jpeg", frame[0])
+            else:
+                self._reply(204)
+
+        def _stream(self):
+            self.send_response(200)
+            self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={_BOUNDARY}")
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            seq = 0
+            try:
+                while True:
+                    frame = api._frames.wait(seq, LocalApi.LONG_POLL_SEC)
+                    if frame is None:
+                        if api._server is None:
+                            return
+                        continue
+                    seq, jpeg = frame
+                    self.wfile.write(
+                        f"--{_BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                        f"Content-Length: {len(jpeg)}\r\nX-Frame-Seq: {seq}\r\n\r\n".encode())
+                    self.wfile.write(jpeg)
+                    self.wfile.write(b"\r\n")
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # İstemci akışı kapattı
+
+    return Handler
@@ -0,0 +1,110 @@
+"""
+Çift Yollu Frame Hakemi
+========================
+Telefon aynı JPEG'i hem MJPEG (HTTP) hem WebSocket relay üzerinden gönderir.
+Hakem iki kaynaktan gelen sıkıştırılmış byte'ların CRC32 özetini tutar,
+her frame'in ilk gelen kopyasını geçirir ve geç kalan kopyayı decode
+edilmeden düşürür. Bir yol art arda hep geç kalıyorsa `redundant_path`
+sinyaliyle bildirilir; MainWindow o yolu kapatır.
+
+Ekran durağanken telefon aynı JPEG'i saniyede onlarca kez gönderir. Son
+gösterilen frame ile byte byte aynı olan frame de (aynı CRC32) decode
+edilmeden atlanır (`STATIC`). STATIC_FRAME_STREAK kadar art arda tekrar
+`static_changed(True)`, ardından gelen ilk farklı frame `static_changed(False)`
+yayar; QualityController bu bilgiyi kullanır.
+
+Kullanım (alıcı thread'lerinde):
+    verdict = arbiter.classify(FrameArbiter.SOURCE_WS, jpeg_bytes)
+    if verdict == FrameArbiter.PRESENT:
+        ...decode + emit...
+"""
+
+import threading
+import zlib
+from collections import OrderedDict
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from desktop_app.config import Network
+
+
+class FrameArbiter(QObject):
+    """MJPEG ve WebSocket frame'lerini içerik özetine göre tekilleştirir."""
+
+    SOURCE_WS = "ws"
+    SOURCE_MJPEG = "mjpeg"
+
+    PRESENT = 0      # Yeni frame: decode + göster
+    DUPLICATE = 1    # Diğer yoldan zaten gösterildi
+    STATIC = 2       # Son gösterilen frame'in aynısı (ekran değişmedi)
+
+    redundant_path = pyqtSignal(str)    # Sürekli geç kalan (gereksiz) kaynak
+    static_changed = pyqtSignal(bool)   # Ekran durağan hale geldi / değişmeye başladı
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        # crc32 -> frame'i ilk gösteren kaynak (en eski başta)
+        self._recent: OrderedDict[int, str] = OrderedDict()
+        self._late_streak = {self.SOURCE_WS: 0, self.SOURCE_MJPEG: 0}
+        self._reported: str | None = None
+        self._last: int | None = None       # Son gösterilen frame'in özeti
+        self._static_streak = 0
+        self._static = False
+        self.presented = {self.SOURCE_WS: 0, self.SOURCE_MJPEG: 0}
+        self.duplicates = {self.SOURCE_WS: 0, self.SOURCE_MJPEG: 0}
+        self.skipped = {self.SOURCE_WS: 0, self.SOURCE_MJPEG: 0}
+
+    def classify(self, source: str, data: bytes) -> int:
+        """
+        Frame için PRESENT / DUPLICATE / STATIC kararı.
+        Her iki alıcı thread'inden de çağrılabilir.
+        """
+        digest = zlib.crc32(data)
+        redundant = static = None
+        with self._lock:
+            first = self._recent.get(digest)
+            if first is not None and first != source:
+                verdict = self.DUPLICATE
+                self.duplicates[source] += 1
+                self._late_streak[source] += 1
+                if (self._reported is None
+                        and self._late_streak[source] >= Network.REDUNDANT_PATH_STREAK):
+                    self._reported = redundant = source
+            elif digest == self._last:
+                verdict = self.STATIC
+                self.skipped[source] += 1
+                self._late_streak[source] = 0
+                self._static_streak += 1
+                if not self._static and self._static_streak >= Network.STATIC_FRAME_STREAK:
+                    self._static = static = True
+            else:
+                verdict = self.PRESENT
+                self._recent[digest] = source
+                self._recent.move_to_end(digest)
+                if len(self._recent) > Network.FRAME_DEDUP_WINDOW:
+                    self._recent.popitem(last=False)
+                self._late_streak[source] = 0
+                self.presented[source] += 1
+                self._last = digest
+                self._static_streak = 0
+                if self._static:
+                    self._static, static = False, False
+
+        if redundant:
+            self.redundant_path.emit(redundant)
+        if static is not None:
+            self.static_changed.emit(static)
+        return verdict
+
+    def reset(self):
+        """Yol durumu değiştiğinde (stream durdu, yeni eşleşme) geçmişi sıfırla."""
+        with self._lock:
+            self._recent.clear()
+            self._late_streak = {self.SOURCE_WS: 0, self.SOURCE_MJPEG: 0}
+            self._reported = None
+            self._last = None
+            self._static_streak = 0
+            was_static, self._static = self._static, False
+        if was_static:
+            self.static_changed.emit(False)
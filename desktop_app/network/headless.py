@@ -0,0 +1,366 @@
+"""
+Arayüzsüz İstemci
+==================
+Qt olmadan (QObject / sinyal / event loop yok) relay'e PC olarak bağlanır:
+frame'leri diske veya bir pipe'a ham JPEG olarak yazar, girdi betiklerini
+çalıştırır, frame ve girdi gecikmesi istatistiklerini toplar. Tek bir
+asyncio döngüsü yüzlerce bağlantıyı taşır; otomasyon ve dayanıklılık
+(soak) testleri için (bkz. desktop_app/headless.py).
+
+Frame mesajları JSON olarak parse edilmez: kanal başlıktan, JPEG "data"
+alanından dilimlenip base64 çözülür. Görüntü çözme yalnızca `decode=True`
+ile yapılır (QImage; yine event loop'suz). MJPEG (HTTP) yolu kullanılmaz,
+frame'ler yalnızca WebSocket'ten gelir.
+
+Girdi betiği (satır başına bir adım, # yorum):
+    touch X Y                  normalize koordinat (0–1)
+    swipe X1 Y1 X2 Y2
+    drag X1 Y1 X2 Y2 MS        basılı sürükleme (ikili girdi gerekir)
+    key back|home|recents|vol_up|vol_down|power|<kod>
+    wait MS
+    quality SEVİYE
+"""
+
+import asyncio
+import base64
+import logging
+import os
+import random
+import re
+import time
+
+import websockets
+
+from desktop_app.config import AndroidKeyCodes, Headless, Network
+from desktop_app.network import codec, input_protocol
+from desktop_app.network.latency import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+SCREEN = "screen"
+CAMERA = "camera"
+
+_FRAME_PREFIX = '{"type":"frame"'
+_CH_RE = re.compile(r'"ch"\s*:\s*(\d)')
+_DATA_KEY = '"data":"'
+
+_KEYS = {name[len("key_"):]: code for name, code in AndroidKeyCodes.as_mapping().items()}
+_ARITY = {"touch": 2, "swipe": 4, "drag": 5, "key": 1, "wait": 1, "quality": 1}
+
+
+# ─── GİRDİ BETİĞİ ────────────────────────────────────────────────────────────
+
+def parse_script(text: str) -> list[tuple]:
+    """Betiği (komut, argümanlar...) adımlarına çevir; hatalı satırda ValueError."""
+    steps = []
+    for lineno, line in enumerate(text.splitlines(), 1):
+        parts = line.split("#", 1)[0].split()
+        if not parts:
+            continue
+        cmd, args = parts[0].lower(), parts[1:]
+        if cmd not in _ARITY or len(args) != _ARITY[cmd]:
+            raise ValueError(f"satır {lineno}: anlaşılmadı: {line.strip()!r}")
+        try:
+            if cmd == "key":
+                steps.append((cmd, _KEYS[args[0]] if args[0] in _KEYS else int(args[0])))
+            elif cmd in ("wait", "quality"):
+                steps.append((cmd, int(args[0])))
+            else:
+                steps.append((cmd, *map(float, args)))
+        except ValueError:
+            raise ValueError(f"satır {lineno}: geçersiz değer: {line.strip()!r}") from None
+    return steps
+
+
+# ─── FRAME HEDEFLERİ ─────────────────────────────────────────────────────────
+
+class DirectorySink:
+    """Frame'leri dizine ayrı JPEG dosyaları olarak yazar; `keep` > 0 ise son N tutulur."""
+
+    def __init__(self, directory: str, keep: int = 0):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.keep = keep
+        self._counts: dict[str, int] = {}
+
+    def write(self, channel: str, jpeg: bytes):
+        n = self._counts.get(channel, 0) + 1
+        self._counts[channel] = n
+        with open(os.path.join(self.directory, Headless.FRAME_FILE_PATTERN.format(
+                channel=channel, n=n)), "wb") as f:
+            f.write(jpeg)
+        if self.keep and n > self.keep:
+            try:
+                os.remove(os.path.join(self.directory, Headless.FRAME_FILE_PATTERN.format(
+                    channel=channel, n=n - self.keep)))
+            except OSError:
+                pass
+
+
+class PipeSink:
+    """Ekran frame'lerini ardışık ham JPEG olarak akışa yazar (ör. ffmpeg -f mjpeg -i -)."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, channel: str, jpeg: bytes):
+        if channel == SCREEN:
+            # Okuyan yetişemezse yazma bekler; relay bu bağlantıda eski frame'leri düşürür
+            self.stream.write(jpeg)
+            self.stream.flush()
+
+
+# ─── İSTATİSTİK ──────────────────────────────────────────────────────────────
+
+class FrameStats:
+    """Kanal başına frame / byte sayaçları ve frame'ler arası en uzun boşluk."""
+
+    def __init__(self):
+        self.frames = {SCREEN: 0, CAMERA: 0}
+        self.bytes = 0
+        self.decode_errors = 0
+        self.max_gap_ms = 0.0
+        self._last: float | None = None
+        self._mark = (time.monotonic(), 0, 0)
+
+    def add(self, channel: str, size: int):
+        now = time.monotonic()
+        self.frames[channel] += 1
+        self.bytes += size
+        if channel == SCREEN:
+            if self._last is not None:
+                self.max_gap_ms = max(self.max_gap_ms, (now - self._last) * 1000)
+            self._last = now
+
+    def interval(self) -> dict:
+        """Son çağrıdan bu yana ekran fps ve KB/sn; boşluk ölçümü sıfırlanır."""
+        now = time.monotonic()
+        t0, frames0, bytes0 = self._mark
+        dt = max(now - t0, 1e-6)
+        out = {
+            "fps": (self.frames[SCREEN] - frames0) / dt,
+            "kbps": (self.bytes - bytes0) / dt / 1024,
+            "max_gap_ms": self.max_gap_ms,
+        }
+        self._mark = (now, self.frames[SCREEN], self.bytes)
+        self.max_gap_ms = 0.0
+        return out
+
+
+# ─── İSTEMCİ ─────────────────────────────────────────────────────────────────
+
+class HeadlessClient:
+    """Bir koda bağlanan arayüzsüz PC; kopunca yeniden bağlanır."""
+
+    def __init__(self, url: str, code: str, sink=None, role: str = "pc",
+                 script: list[tuple] | None = None, repeat: int = 1, decode: bool = False):
+        self.url = url
+        self.code = code
+        self.sink = sink
+        self.role = role
+        self.script = script or []
+        self.repeat = repeat
+        self.decode = decode
+        self.stats = FrameStats()
+        self.latency = LatencyTracker()
+        self.binary_input = False
+        self.pairings = 0
+        self.reconnects = 0
+        self.steps_sent = 0
+        self.script_done = asyncio.Event()
+        self.last_error = ""
+        self._ws = None
+        self._paired = asyncio.Event()
+        self._caps = asyncio.Event()
+        self._reconnect_after: float | None = None
+        self._qimage = None
+
+    @property
+    def paired(self) -> bool:
+        return self._paired.is_set()
+
+    async def run(self, stop: asyncio.Event):
+        """`stop` kurulana kadar bağlı kal; betik varsa ilk eşleşmede çalıştırılır."""
+        runner = asyncio.create_task(self._run_script()) if self.script else None
+        try:
+            while not stop.is_set():
+                delay = Headless.RECONNECT_DELAY_SEC
+                try:
+                    async with websockets.connect(self.url, max_size=None, compression=None) as ws:
+                        self._ws = ws
+                        self._reconnect_after = None
+                        await ws.send(codec.dumps({"type": "join", "code": self.code, "role": self.role}),
+                                      text=True)
+                        receiver = asyncio.create_task(self._receive(ws))
+                        stopper = asyncio.create_task(stop.wait())
+                        await asyncio.wait((receiver, stopper), return_when=asyncio.FIRST_COMPLETED)
+                        stopper.cancel()
+                        receiver.cancel()
+                        if receiver.done() and not receiver.cancelled() and receiver.exception():
+                            raise receiver.exception()
+                    if self._reconnect_after is not None:
+                        delay = self._reconnect_after
+                except (OSError, websockets.exceptions.WebSocketException) as e:
+                    self.last_error = str(e)
+                    logger.warning(f"code={self.code} bağlantı hatası: {e}")
+                finally:
+                    self._ws = None
+                    self._paired.clear()
+                    self._caps.clear()
+                if stop.is_set():
+                    break
+                self.reconnects += 1
+                try:
+                    await asyncio.wait_for(stop.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if runner:
+                runner.cancel()
+
+    # ─── ALMA ──────────────────────────────────────────────────────────────
+
+    async def _receive(self, ws):
+        async for raw in ws:
+            if isinstance(raw, bytes):
+                if input_protocol.is_binary(raw):
+                    try:
+                        msg = input_protocol.decode(raw)
+                    except ValueError:
+                        continue
+                    if msg["action"] == "ack":
+                        self.latency.on_ack(msg["seq"], msg["ts"])
+                continue
+            if raw.startswith(_FRAME_PREFIX):
+                self._on_frame(raw)
+                continue
+            try:
+                msg = codec.loads(raw)
+            except codec.DecodeError:
+                continue
+            msg_type = msg.get("type")
+            if msg_type == "paired":
+                self.pairings += 1
+                self.binary_input = False
+                self.latency.reset()
+                self._paired.set()
+            elif msg_type == "relay":
+                self.binary_input = input_protocol.CAPABILITY in (msg.get("caps") or [])
+                self._caps.set()
+            elif msg_type == "ack":
+                seq, ts = msg.get("seq"), msg.get("ts")
+                if isinstance(seq, int) and isinstance(ts, int):
+                    self.latency.on_ack(seq, ts)
+            elif msg_type == "peer_probe":
+                await ws.send(codec.dumps({"type": "peer_probe_ack", "ts": msg.get("ts")}), text=True)
+            elif msg_type == "role_changed":
+                self.role = msg.get("role", "viewer")
+            elif msg_type == "peer_disconnected":
+                self._paired.clear()
+                self._caps.clear()
+            elif msg_type == "server_draining":
+                # Sunucunun verdiği pencerede rastgele bir anda yeniden bağlan
+                window_ms = msg.get("reconnect_within_ms") or 0
+                self._reconnect_after = random.uniform(0, window_ms) / 1000
+                return
+            elif msg_type == "error":
+                self.last_error = msg.get("message", "")
+                logger.warning(f"code={self.code} sunucu hatası: {self.last_error}")
+
+    def _on_frame(self, raw: str):
+        m = _CH_RE.search(raw, 0, 64)
+        channel = CAMERA if m and int(m.group(1)) == Network.CHANNEL_CAMERA else SCREEN
+        start = raw.find(_DATA_KEY)
+        if start < 0:
+            return  # Yalnızca ROI karosu
+        start += len(_DATA_KEY)
+        try:
+            jpeg = base64.b64decode(raw[start:raw.index('"', start)])
+        except ValueError:
+            self.stats.decode_errors += 1
+            return
+        self.stats.add(channel, len(jpeg))
+        if self.decode and not self._decodes(jpeg):
+            self.stats.decode_errors += 1
+        if self.sink is not None:
+            self.sink.write(channel, jpeg)
+
+    def _decodes(self, jpeg: bytes) -> bool:
+        if self._qimage is None:
+            from PyQt6.QtGui import QImage  # Yalnızca istenirse; event loop gerekmez
+            self._qimage = QImage
+        return self._qimage().loadFromData(jpeg, "JPEG")
+
+    # ─── GİRDİ ─────────────────────────────────────────────────────────────
+
+    async def _run_script(self):
+        await self._paired.wait()
+        try:
+            await asyncio.wait_for(self._caps.wait(), Headless.CAPS_WAIT_SEC)
+        except asyncio.TimeoutError:
+            pass  # Yetenek bildirmeyen eski telefon: JSON komutlar
+        for _ in range(self.repeat):
+            for step in self.script:
+                await self._paired.wait()
+                await self._step(*step)
+        self.script_done.set()
+
+    async def _step(self, cmd: str, *args):
+        if cmd == "wait":
+            await asyncio.sleep(args[0] / 1000)
+            return
+        if cmd == "drag":
+            x1, y1, x2, y2, duration_ms = args
+            steps = max(1, int(duration_ms / Headless.DRAG_STEP_MS))
+            await self._send_input("pointer", "down", x1, y1)
+            for i in range(1, steps + 1):
+                await asyncio.sleep(Headless.DRAG_STEP_MS / 1000)
+                t = i / steps
+                await self._send_input("pointer", "move", x1 + (x2 - x1) * t, y1 + (y2 - y1) * t)
+            await self._send_input("pointer", "up", x2, y2)
+            return
+        await self._send_input(cmd, *args)
+
+    async def _send_input(self, cmd: str, *args):
+        ws = self._ws
+        if ws is None or self.role != "pc":
+            return
+        seq, ts = self.latency.next()
+        if self.binary_input and cmd != "quality":
+            encode = {
+                "touch": input_protocol.encode_touch, "swipe": input_protocol.encode_swipe,
+                "key": input_protocol.encode_key, "pointer": input_protocol.encode_pointer,
+            }[cmd]
+            payload, text = encode(*args, seq, ts), False
+        else:
+            if cmd == "pointer":
+                return  # Sürükleme yalnızca ikili protokolde
+            fields = {
+                "touch": lambda x, y: {"action": "touch", "x": x, "y": y},
+                "swipe": lambda x1, y1, x2, y2: {"action": "swipe", "x1": x1, "y1": y1,
+                                                 "x2": x2, "y2": y2},
+                "key": lambda k: {"action": "key_event", "key_code": k},
+                "quality": lambda level: {"action": "set_quality", "level": level},
+            }[cmd](*args)
+            payload, text = codec.dumps({"type": "command", **fields, "seq": seq, "ts": ts}), True
+        try:
+            await ws.send(payload, text=text)
+            self.steps_sent += 1
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+
+def summary(client: HeadlessClient) -> dict:
+    """İstemcinin anlık istatistikleri (aralık sayaçlarını sıfırlar)."""
+    stats = client.stats
+    return {
+        "code": client.code,
+        "paired": client.paired,
+        **stats.interval(),
+        "frames": stats.frames[SCREEN],
+        "camera_frames": stats.frames[CAMERA],
+        "decode_errors": stats.decode_errors,
+        "inputs": client.steps_sent,
+        "reconnects": client.reconnects,
+        "latency": client.latency.snapshot(),
+    }
@@ -0,0 +1,60 @@
+"""
+Çözme Tamponu Havuzu
+=====================
+Her frame için yeni QImage (1080×2400'de ~10 MB) ayırmak yerine JPEG'ler
+sabit sayıdaki QImage yuvasına sırayla çözülür. QImageReader.read(QImage)
+boyut ve biçim aynıysa yuvanın piksel tamponunu yeniden kullanır; sıkıştırılmış
+byte'lar da her frame'de büyüyüp küçülmeyen tek bir QBuffer'a yazılır.
+
+Yuvalar kopyalanmadan (implicit sharing) GUI'ye gönderilir. GUI bir yuvayı
+hâlâ tutarken sıra o yuvaya gelirse Qt yazmadan önce kopyayı ayırır (detach):
+gösterilen frame asla bozulmaz, yalnızca o frame için yeni tampon ayrılır.
+Kararlı durumda GUI'de bir frame gösterilir, biri kuyrukta bekler, üçüncüsü
+çözülür; IMAGE_POOL_SLOTS buna göre seçilmiştir.
+
+Her alıcı thread'inin kendi havuzu olmalıdır (decode() thread-safe değildir).
+"""
+
+from PyQt6.QtCore import QBuffer, QIODevice
+from PyQt6.QtGui import QImage, QImageReader
+
+from desktop_app.config import Network
+
+_REWRITE = QIODevice.OpenModeFlag.ReadWrite | QIODevice.OpenModeFlag.Truncate
+
+
+class ImagePool:
+    """JPEG'leri yeniden kullanılan QImage yuvalarına çözer."""
+
+    def __init__(self, slots: int = Network.IMAGE_POOL_SLOTS):
+        self._slots = [QImage() for _ in range(slots)]
+        self._next = 0
+        self._buffer = QBuffer()
+        self.reused = 0      # Tamponu yeniden kullanılan frame
+        self.allocated = 0   # Yeni tampon ayrılan frame (ilk frame, boyut değişimi, detach)
+
+    def decode(self, data) -> QImage | None:
+        """JPEG byte'larını sıradaki yuvaya çöz; başarısızsa None."""
+        if not self._slots:
+            img = QImage()
+            if not img.loadFromData(data, "JPEG"):
+                return None
+            self.allocated += 1
+            return img
+        slot = self._slots[self._next]
+        self._next = (self._next + 1) % len(self._slots)
+        before = slot.constBits()
+        buf = self._buffer
+        buf.open(_REWRITE)  # Kapasite korunur, yalnızca boy sıfırlanır
+        buf.write(data)
+        buf.seek(0)
+        ok = QImageReader(buf, b"JPEG").read(slot)
+        buf.close()
+        if not ok:
+            return None
+        if before is not None and int(before) == int(slot.constBits()):
+            self.reused += 1
+        else:
+            self.allocated += 1
+        # Ayrı bir QImage nesnesi (aynı tampon): alıcı tutarsa sonraki yazım detach eder
+        return QImage(slot)
@@ -0,0 +1,139 @@
+"""
+İkili Girdi Protokolü
+======================
+Yüksek frekanslı girdi olayları (dokunma, kaydırma, sürükleme, tuş) için
+kompakt ikili kodlama. JSON `{"type":"command","action":"touch",...}`
+yerine WebSocket binary frame'i olarak gönderilir; relay içeriğe bakmadan
+iletir, telefon `InputProtocol.kt` ile çözer.
+
+Biçim (big-endian):
+    opcode:u8 seq:u16 ts:u32 + alanlar
+    seq/ts: komut sıra numarası ve gönderim zamanı (ms), ack'te aynen döner
+    Koordinatlar 16-bit sabit noktalıdır: 0 → 0.0, 65535 → 1.0
+
+    TOUCH          0x01  x:u16 y:u16                     11 byte
+    SWIPE          0x02  x1:u16 y1:u16 x2:u16 y2:u16     15 byte
+    KEY            0x03  key_code:u16                     9 byte
+    POINTER_DOWN   0x04  x:u16 y:u16                     11 byte
+    POINTER_MOVE   0x05  x:u16 y:u16                     11 byte
+    POINTER_UP     0x06  x:u16 y:u16                     11 byte
+    ACK            0x07  (telefon → PC, alan yok)          7 byte
+
+Opcode'lar 0x20'nin altındadır ve JSON'un başlayabileceği hiçbir byte'la
+(`{`, `[`, boşluk, \\t \\n \\r) çakışmaz; sunucu mesajın ikili olduğunu ilk
+byte'tan anlar.
+
+`decode` referans çözücüdür: sonucu JSON komutlarıyla aynı biçimde döner
+(ör. {"action": "touch", "x": 0.5, "y": 0.25, "seq": 7, "ts": 123456}).
+"""
+
+import struct
+
+TOUCH = 0x01
+SWIPE = 0x02
+KEY = 0x03
+POINTER_DOWN = 0x04
+POINTER_MOVE = 0x05
+POINTER_UP = 0x06
+ACK = 0x07
+
+# Telefonun eşleşince bildirdiği yetenek adı
+CAPABILITY = "binary_input"
+
+FIXED_MAX = 0xFFFF
+
+_HEADER = struct.Struct(">BHI")
+_POINT = struct.Struct(">BHIHH")
+_SWIPE = struct.Struct(">BHIHHHH")
+_KEY = struct.Struct(">BHIH")
+
+# opcode -> mesaj uzunluğu
+_SIZES = {
+    TOUCH: _POINT.size,
+    SWIPE: _SWIPE.size,
+    KEY: _KEY.size,
+    POINTER_DOWN: _POINT.size,
+    POINTER_MOVE: _POINT.size,
+    POINTER_UP: _POINT.size,
+    ACK: _HEADER.size,
+}
+
+_POINTER_PHASES = {POINTER_DOWN: "down", POINTER_MOVE: "move", POINTER_UP: "up"}
+_POINTER_OPCODES = {phase: op for op, phase in _POINTER_PHASES.items()}
+
+
+def to_fixed(v: float) -> int:
+    """[0,1] aralığındaki koordinatı 16-bit sabit noktaya çevir (sınırlar kırpılır)."""
+    return int(round(min(max(v, 0.0), 1.0) * FIXED_MAX))
+
+
+def from_fixed(v: int) -> float:
+    return v / FIXED_MAX
+
+
+# ─── ENCODE ───────────────────────────────────────────────────────────────────
+
+def encode_touch(x: float, y: float, seq: int = 0, ts: int = 0) -> bytes:
+    return _POINT.pack(TOUCH, seq, ts, to_fixed(x), to_fixed(y))
+
+
+def encode_swipe(x1: float, y1: float, x2: float, y2: float,
+                 seq: int = 0, ts: int = 0) -> bytes:
+    return _SWIPE.pack(SWIPE, seq, ts, to_fixed(x1), to_fixed(y1), to_fixed(x2), to_fixed(y2))
+
+
+def encode_key(key_code: int, seq: int = 0, ts: int = 0) -> bytes:
+    return _KEY.pack(KEY, seq, ts, key_code & 0xFFFF)
+
+
+def encode_pointer(phase: str, x: float, y: float, seq: int = 0, ts: int = 0) -> bytes:
+    """Sürükleme adımı; phase: "down" / "move" / "up"."""
+    return _POINT.pack(_POINTER_OPCODES[phase], seq, ts, to_fixed(x), to_fixed(y))
+
+
+def encode_ack(seq: int, ts: int) -> bytes:
+    """Komutun uygulandığını bildiren ack (telefon tarafı; stub ve testler için)."""
+    return _HEADER.pack(ACK, seq, ts)
+
+
+# ─── DECODE (referans) ────────────────────────────────────────────────────────
+
+def is_binary(raw: bytes) -> bool:
+    """Mesaj ikili girdi protokolüne mi ait (ilk byte bir opcode mu)?"""
+    return bool(raw) and raw[0] in _SIZES
+
+
+def decode(raw: bytes) -> dict:
+    """
+    İkili mesajı JSON komut biçimine çevir.
+    Bilinmeyen opcode veya hatalı uzunlukta ValueError fırlatır.
+    """
+    if not raw:
+        raise ValueError("empty message")
+    op = raw[0]
+    size = _SIZES.get(op)
+    if size is None:
+        raise ValueError(f"unknown opcode 0x{op:02x}")
+    if len(raw) != size:
+        raise ValueError(f"opcode 0x{op:02x}: expected {size} bytes, got {len(raw)}")
+
+    if op == TOUCH:
+        _, seq, ts, x, y = _POINT.unpack(raw)
+        msg = {"action": "touch", "x": from_fixed(x), "y": from_fixed(y)}
+    elif op == SWIPE:
+        _, seq, ts, x1, y1, x2, y2 = _SWIPE.unpack(raw)
+        msg = {"action": "swipe", "x1": from_fixed(x1), "y1": from_fixed(y1),
+               "x2": from_fixed(x2), "y2": from_fixed(y2)}
+    elif op == KEY:
+        _, seq, ts, key_code = _KEY.unpack(raw)
+        msg = {"action": "key_event", "key_code": key_code}
+    elif op == ACK:
+        _, seq, ts = _HEADER.unpack(raw)
+        msg = {"action": "ack"}
+    else:
+        _, seq, ts, x, y = _POINT.unpack(raw)
+        msg = {"action": "pointer", "phase": _POINTER_PHASES[op],
+               "x": from_fixed(x), "y": from_fixed(y)}
+    msg["seq"] = seq
+    msg["ts"] = ts
+    return msg
@@ -0,0 +1,125 @@
+"""
+Girdi Gecikmesi Ölçümü
+=======================
+Telefona giden her komut bir sıra numarası (seq, 16-bit) ve gönderim
+zamanı (ts, 32-bit ms) taşır. Telefon komutu uyguladığında aynı seq/ts ile
+ack döner; gidiş-dönüş süresi (RTT) = şimdi - ts.
+
+Takip edilenler:
+  - son N RTT üzerinden p50 / p95 / p99
+  - kayıp: ACK_TIMEOUT_MS içinde ack gelmeyen komutlar
+  - sıra dışı: daha yeni bir komutun ack'inden sonra gelen eski ack
+
+Telefon hiç ack göndermiyorsa (eski sürüm) kayıp sayılmaz; `acks_seen`
+False kalır.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+
+from desktop_app.config import Network
+
+SEQ_MOD = 1 << 16
+TS_MOD = 1 << 32
+
+
+def now_ms() -> int:
+    """Komutlara yazılan 32-bit milisaniye saati (monotonik, taşar)."""
+    return int(time.monotonic() * 1000) % TS_MOD
+
+
+def seq_newer(a: int, b: int) -> bool:
+    """16-bit seri aritmetiği: a, b'den daha yeni mi (taşmaya dayanıklı)?"""
+    return a != b and (a - b) % SEQ_MOD < SEQ_MOD // 2
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    """En yakın sıra yöntemiyle yüzdelik (liste sıralı olmalı)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LatencyTracker:
+    """Komut seq/ts üretir, ack'lerden RTT yüzdeliklerini hesaplar. Thread-safe."""
+
+    def __init__(self, window: int = Network.LATENCY_WINDOW,
+                 ack_timeout_ms: int = Network.ACK_TIMEOUT_MS):
+        self._lock = threading.Lock()
+        self._ack_timeout_ms = ack_timeout_ms
+        self._seq = 0
+        # seq -> ts (gönderim sırasıyla, en eski başta)
+        self._pending: OrderedDict[int, int] = OrderedDict()
+        self._rtts: deque[float] = deque(maxlen=window)
+        self._last_acked: int | None = None
+        self.acks_seen = False
+        self.acked = 0
+        self.lost = 0
+        self.reordered = 0
+        self.duplicates = 0
+
+    def reset(self):
+        """Yeni oturum: bekleyen komutları ve istatistikleri sıfırla."""
+        with self._lock:
+            self._pending.clear()
+            self._rtts.clear()
+            self._last_acked = None
+            self.acks_seen = False
+            self.acked = self.lost = self.reordered = self.duplicates = 0
+
+    def next(self) -> tuple[int, int]:
+        """Gönderilecek komut için (seq, ts)."""
+        with self._lock:
+            self._seq = (self._seq + 1) % SEQ_MOD
+            ts = now_ms()
+            self._pending[self._seq] = ts
+            self._expire(ts)
+            return self._seq, ts
+
+    def on_ack(self, seq: int, ts: int) -> float | None:
+        """Ack işle; RTT'yi (ms) döndürür, bilinmeyen/tekrar ack ise None."""
+        now = now_ms()
+        with self._lock:
+            self.acks_seen = True
+            if self._pending.pop(seq, None) is None:
+                self.duplicates += 1
+                return None
+            if self._last_acked is not None and seq_newer(self._last_acked, seq):
+                self.reordered += 1
+            else:
+                self._last_acked = seq
+            rtt = float((now - ts) % TS_MOD)
+            self._rtts.append(rtt)
+            self.acked += 1
+            self._expire(now)
+            return rtt
+
+    def _expire(self, now: int):
+        """Zaman aşımına uğrayan komutları düşür (ack destekleniyorsa kayıp say)."""
+        while self._pending:
+            seq, ts = next(iter(self._pending.items()))
+            if (now - ts) % TS_MOD < self._ack_timeout_ms:
+                break
+            self._pending.popitem(last=False)
+            if self.acks_seen:
+                self.lost += 1
+
+    def snapshot(self) -> dict:
+        """Anlık istatistikler (UI ve loglar için)."""
+        with self._lock:
+            self._expire(now_ms())
+            values = sorted(self._rtts)
+            return {
+                "acks_seen": self.acks_seen,
+                "samples": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "acked": self.acked,
+                "pending": len(self._pending),
+                "lost": self.lost,
+                "reordered": self.reordered,
+            }
@@ -0,0 +1,146 @@
+"""
+Bağlantı Canlılığı ve RTT
+==========================
+Desktop tarafındaki tek keep-alive mekanizması (websocket-client ping'leri
+ve JSON heartbeat'in yerine). İki hedef ayrı ölçülür:
+
+    server  — {"type":"probe","ts":t}      → sunucu "probe_ack" ile yanıtlar
+    peer    — {"type":"peer_probe","ts":t} → relay → telefon "peer_probe_ack"
+
+Aralık trafiğe uyar: bir hedeften (veya onun üzerinden) son aralık içinde
+mesaj geldiyse probe gönderilmez — frame akarken hiç probe gitmez. Başarılı
+her probe'da aralık ikiye katlanır (en fazla PROBE_MAX_INTERVAL_MS), kayıp
+probe'da en kısaya döner. Art arda PROBE_MAX_MISSES kayıpta `link_lost`
+(hedef en az bir probe'a yanıt verdiyse; probe bilmeyen eski sunucu veya
+telefon kopmuş sayılmaz).
+
+Telefonun girdi ack'lerinden gelen RTT'ler de (bkz. latency) peer RTT
+örneği olarak kullanılır; böylece akış sırasında da ölçüm sürer.
+"""
+
+import logging
+import time
+from typing import Callable
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from desktop_app.config import Network
+from desktop_app.network import codec
+from desktop_app.network.latency import now_ms, TS_MOD
+
+logger = logging.getLogger(__name__)
+
+SERVER = "server"
+PEER = "peer"
+
+_PROBE_TYPES = {SERVER: "probe", PEER: "peer_probe"}
+
+
+class _Target:
+    """Bir hedefin probe durumu."""
+
+    __slots__ = ("interval_ms", "last_traffic", "last_probe", "outstanding", "misses",
+                 "answered", "rtt_ms")
+
+    def __init__(self):
+        self.interval_ms = Network.PROBE_MIN_INTERVAL_MS
+        self.last_traffic = 0.0
+        self.last_probe = 0.0
+        self.outstanding: int | None = None   # Yanıt beklenen probe'un ts'i
+        self.misses = 0
+        self.answered = False                 # Hedef probe'ları destekliyor mu
+        self.rtt_ms: float | None = None
+
+
+class LivenessMonitor(QObject):
+    """Sunucu ve telefon için uyarlanır aralıklı probe'lar; RTT ve kopma tespiti."""
+
+    rtt_updated = pyqtSignal(str, float)    # hedef ("server" / "peer"), RTT (ms)
+    link_lost = pyqtSignal(str)             # hedef art arda yanıt vermedi
+
+    def __init__(self, send: Callable[[bytes], None], parent=None):
+        super().__init__(parent)
+        self._send = send
+        self._targets = {SERVER: _Target(), PEER: _Target()}
+        self._active = {SERVER: False, PEER: False}
+        self._timer = QTimer(self)
+        self._timer.setInterval(Network.PROBE_TICK_MS)
+        self._timer.timeout.connect(self._tick)
+
+    # ─── DURUM (herhangi bir thread'den) ──────────────────────────────────────
+
+    def start(self):
+        """Zamanlayıcıyı başlat (ana thread'den çağrılmalı)."""
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+        self.set_active(SERVER, False)
+        self.set_active(PEER, False)
+
+    def set_active(self, target: str, active: bool):
+        """Hedef probe'lanmalı mı (sunucuya bağlı / telefonla eşleşmiş)."""
+        self._active[target] = active
+        self._targets[target] = _Target()
+        if active:
+            self._targets[target].last_traffic = time.monotonic()
+
+    def rtt(self, target: str) -> float | None:
+        return self._targets[target].rtt_ms
+
+    def on_traffic(self, from_peer: bool):
+        """Gelen her mesajda çağrılır; telefondan gelen trafik sunucu yolunu da canlı kılar."""
+        now = time.monotonic()
+        self._targets[SERVER].last_traffic = now
+        if from_peer:
+            self._targets[PEER].last_traffic = now
+
+    def on_probe_ack(self, target: str, ts: int):
+        state = self._targets[target]
+        if state.outstanding != ts:
+            return  # Zaman aşımına uğramış eski probe
+        state.outstanding = None
+        state.misses = 0
+        state.answered = True
+        state.interval_ms = min(state.interval_ms * 2, Network.PROBE_MAX_INTERVAL_MS)
+        self._record(target, float((now_ms() - ts) % TS_MOD))
+
+    def add_peer_sample(self, rtt_ms: float):
+        """Girdi ack'inden gelen RTT'yi peer örneği olarak kaydet."""
+        self._record(PEER, rtt_ms)
+
+    def _record(self, target: str, rtt_ms: float):
+        state = self._targets[target]
+        state.rtt_ms = rtt_ms
+        self.rtt_updated.emit(target, rtt_ms)
+
+    # ─── ZAMANLAYICI ──────────────────────────────────────────────────────────
+
+    def _tick(self):
+        now = time.monotonic()
+        for target, state in self._targets.items():
+            if not self._active[target]:
+                continue
+            if state.outstanding is not None:
+                if (now - state.last_probe) * 1000 < Network.PROBE_TIMEOUT_MS:
+                    continue
+                # Yanıt gelmedi: arada trafik de yoksa kayıp say, aralığı sıfırla
+                state.outstanding = None
+                state.interval_ms = Network.PROBE_MIN_INTERVAL_MS
+                if state.answered and state.last_traffic < state.last_probe:
+                    state.misses += 1
+                if state.misses >= Network.PROBE_MAX_MISSES:
+                    state.misses = 0
+                    self.link_lost.emit(target)
+                    continue
+            idle_ms = (now - max(state.last_traffic, state.last_probe)) * 1000
+            if idle_ms < state.interval_ms:
+                continue  # Trafik var veya aralık dolmadı
+            ts = now_ms()
+            state.outstanding = ts
+            state.last_probe = now
+            try:
+                self._send(codec.dumps({"type": _PROBE_TYPES[target], "ts": ts}))
+            except Exception as e:
+                # Bağlantı kapanırken gönderim hatası; yanıt gelmeyince kayıp sayılır
+                logger.debug(f"Probe gönderilemedi ({target}): {e}")
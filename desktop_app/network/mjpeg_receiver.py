@@ -6,22 +6,35 @@ ve her frame'i sinyal olarak ana thread'e iletir.
 """
 
 import threading
+from typing import TYPE_CHECKING
+
 import requests
 from PyQt6.QtCore import QObject, pyqtSignal
-from PyQt6.QtGui import QPixmap, QImage
+from PyQt6.QtGui import QImage
 
 from desktop_app.config import Network
+from desktop_app.network.frame_arbiter import FrameArbiter
+from desktop_app.network.image_pool import ImagePool
+from desktop_app.network.recorder import Recorder
+
+if TYPE_CHECKING:
+    from desktop_app.network.frame_api import LatestFrame
 
 
 class MjpegReceiver(QObject):
     """MJPEG stream'inden frame'leri alır ve PyQt6 sinyali ile iletir."""
 
-    frame_ready = pyqtSignal(QPixmap)    # Yeni frame geldiğinde
+    frame_ready = pyqtSignal(QImage)     # Yeni frame geldiğinde
     error_occurred = pyqtSignal(str)     # Hata durumunda
     stream_stopped = pyqtSignal()        # Stream durunca
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, arbiter: FrameArbiter | None = None,
+                 recorder: Recorder | None = None, latest: "LatestFrame | None" = None):
         super().__init__(parent)
+        self._arbiter = arbiter
+        self._recorder = recorder
+        self._latest = latest
+        self._pool = ImagePool()
         self._thread: threading.Thread | None = None
         self._running = False
         self._url: str = ""
@@ -68,10 +81,21 @@ class MjpegReceiver(QObject):
 
                         if not self._running:
                             break
+                        verdict = (self._arbiter.classify(FrameArbiter.SOURCE_MJPEG, jpeg_data)
+                                   if self._arbiter else FrameArbiter.PRESENT)
+                        if verdict == FrameArbiter.DUPLICATE:
+                            continue
+                        if self._recorder:
+                            self._recorder.offer(jpeg_data,
+                                                 repeat=verdict == FrameArbiter.STATIC)
+                        if verdict == FrameArbiter.STATIC:
+                            continue
+                        if self._latest:
+                            self._latest.publish(jpeg_data)
 
-                        pixmap = self._bytes_to_pixmap(jpeg_data)
-                        if pixmap and not pixmap.isNull():
-                            self.frame_ready.emit(pixmap)
+                        img = self._pool.decode(jpeg_data)
+                        if img is not None:
+                            self.frame_ready.emit(img)
 
         except requests.exceptions.RequestException as e:
             if self._running:
@@ -79,11 +103,3 @@ class MjpegReceiver(QObject):
         finally:
             self._running = False
             self.stream_stopped.emit()
-
-    @staticmethod
-    def _bytes_to_pixmap(data: bytes) -> QPixmap | None:
-        """JPEG byte dizisini QPixmap'e çevir."""
-        img = QImage()
-        if img.loadFromData(data, "JPEG"):
-            return QPixmap.fromImage(img)
-        return None
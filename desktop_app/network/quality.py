@@ -0,0 +1,80 @@
+"""
+Yayın Kalitesi Denetimi
+========================
+Telefon RTT'sine göre ekran yayınının kalite seviyesini ayarlar ve
+telefona `set_quality` komutu olarak bildirir. Seviyeler telefonda
+(ölçek, JPEG kalitesi) çiftlerine karşılık gelir; 0 en düşük.
+
+RTT üstel ortalaması QUALITY_DEGRADE_RTT_MS'yi aşarsa seviye hemen bir
+düşer; QUALITY_UPGRADE_RTT_MS'nin altında QUALITY_HOLD_MS boyunca kalırsa
+bir artar. Değişiklikler arasında en az QUALITY_HOLD_MS beklenir
+(histerezis), böylece seviye salınmaz.
+
+Ekran durağanken (FrameArbiter.static_changed) ayrıntı önem kazanır ve
+tekrar eden frame'ler decode edilmez: bu sürede QUALITY_DEGRADE_RTT_MS'nin
+altındaki her RTT yükseltme için yeterli sayılır.
+"""
+
+import time
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from desktop_app.config import Network
+
+_EWMA_ALPHA = 0.3
+
+
+class QualityController(QObject):
+    """Peer RTT örneklerinden kalite seviyesi üretir."""
+
+    level_changed = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.reset()
+
+    @property
+    def level(self) -> int:
+        return self._level
+
+    def reset(self):
+        """Yeni oturum: varsayılan seviye, ölçüm geçmişi yok."""
+        self._level = Network.QUALITY_DEFAULT_LEVEL
+        self._rtt: float | None = None
+        self._good_since: float | None = None
+        self._last_change = 0.0
+        self._static = False
+
+    def on_static(self, static: bool):
+        """FrameArbiter.static_changed'e bağlanır."""
+        self._static = static
+        if not static and (self._rtt is None or self._rtt >= Network.QUALITY_UPGRADE_RTT_MS):
+            self._good_since = None  # Durağanlıkla başlayan bekleme sayılmaz
+
+    def on_rtt(self, target: str, rtt_ms: float):
+        """LivenessMonitor.rtt_updated'a bağlanır; sadece telefon RTT'si dikkate alınır."""
+        if target != "peer":
+            return
+        self._rtt = rtt_ms if self._rtt is None else (
+            _EWMA_ALPHA * rtt_ms + (1 - _EWMA_ALPHA) * self._rtt)
+        now = time.monotonic()
+        settled = (now - self._last_change) * 1000 >= Network.QUALITY_HOLD_MS
+
+        if self._rtt > Network.QUALITY_DEGRADE_RTT_MS:
+            self._good_since = None
+            if settled and self._level > 0:
+                self._set_level(self._level - 1, now)
+        elif self._rtt < Network.QUALITY_UPGRADE_RTT_MS or self._static:
+            if self._good_since is None:
+                self._good_since = now
+            held = (now - self._good_since) * 1000 >= Network.QUALITY_HOLD_MS
+            if settled and held and self._level < Network.QUALITY_LEVELS - 1:
+                self._set_level(self._level + 1, now)
+                self._good_since = now
+        else:
+            self._good_since = None
+
+    def _set_level(self, level: int, now: float):
+        self._level = level
+        self._last_change = now
+        self.level_changed.emit(level)
@@ -0,0 +1,260 @@
+"""
+Oturum Kaydı
+=============
+Alıcıların (WsClient, MjpegReceiver) hakemden geçirdiği sıkıştırılmış JPEG
+byte'larını yeniden encode etmeden diske yazar. Kap biçimi MJPEG AVI'dir
+(RIFF, `idx1` indeksli); her oynatıcı ve ffmpeg açabilir.
+
+Alıcı thread'i yalnızca `offer()` çağırır: frame zaman damgasıyla sınırlı
+bir deque'ye eklenir, doluysa düşürülür (canlı görüntü asla beklemez).
+Yazıcı thread'i deque'yi WRITER_POLL_SEC aralıklarla boşaltır; kuyruk
+koşul değişkeniyle uyandırılmadığından offer() thread geçişi tetiklemez.
+Yazma, segment değişimi ve başlık düzeltmeleri arka plan thread'indedir.
+
+Segmentler RECORD_SEGMENT_SEC / RECORD_SEGMENT_MAX_BYTES dolunca veya
+frame boyutu değişince (kalite seviyesi değişti) yeni dosyaya geçer. AVI
+sabit kare hızı varsayar; segment kapanırken hız, segmentin gerçek frame
+sayısı / süresinden yazılır.
+
+Ekran durağanken atlanan tekrar frame'leri (FrameArbiter.STATIC) veri
+yazılmadan, boş `00dc` parçası olarak eklenir: oynatıcılar bunu "önceki
+kareyi tekrarla" olarak okur, kayıt süresi doğru kalır. Segment süresi
+veya boyutu tekrar parçası sırasında dolarsa da bölünür; yeni segment son
+gerçek frame'le başlar.
+
+`transcode=True` ise kapanan her segment, sistemde ffmpeg varsa arka planda
+H.264 MP4'e dönüştürülür (AVI korunur).
+"""
+
+import logging
+import os
+import shutil
+import struct
+import subprocess
+import threading
+import time
+from collections import deque
+
+from desktop_app.config import Recording
+
+logger = logging.getLogger(__name__)
+
+_AVIF_HASINDEX = 0x10
+_AVIIF_KEYFRAME = 0x10
+_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def jpeg_size(data: bytes) -> tuple[int, int] | None:
+    """JPEG başlığındaki SOF segmentinden (genişlik, yükseklik); decode etmeden."""
+    i = 2
+    n = len(data)
+    while i + 9 <= n:
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:
+            i += 1  # Dolgu byte'ı
+            continue
+        if marker in _SOF_MARKERS:
+            height, width = struct.unpack_from(">HH", data, i + 5)
+            return width, height
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            i += 2
+            continue
+        (length,) = struct.unpack_from(">H", data, i + 2)
+        i += 2 + length
+    return None
+
+
+class AviWriter:
+    """Tek video akışlı MJPEG AVI; başlıklar kapanışta düzeltilir."""
+
+    def __init__(self, path: str, width: int, height: int):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.frames = 0
+        self.bytes = 0
+        self._index: list[tuple[int, int]] = []   # (movi'ye göre offset, boyut)
+        self._max_frame = 0
+        self._f = open(path, "wb")
+        self._write_headers(fps_num=1_000_000, fps_den=1_000_000 // 30)
+        self._movi_start = self._f.tell()
+        self._f.write(b"LIST\0\0\0\0movi")
+
+    def _write_headers(self, fps_num: int, fps_den: int):
+        w, h = self.width, self.height
+        avih = struct.pack(
+            "<10I4I",
+            fps_den * 1_000_000 // max(fps_num, 1),   # dwMicroSecPerFrame
+            0, 0, _AVIF_HASINDEX, self.frames, 0, 1, self._max_frame, w, h,
+            0, 0, 0, 0,
+        )
+        strh = struct.pack(
+            "<4s4sIHHIIIIIIII4h",
+            b"vids", b"MJPG", 0, 0, 0, 0, fps_den, fps_num, 0, self.frames,
+            self._max_frame, 0xFFFFFFFF, 0, 0, 0, w, h,
+        )
+        strf = struct.pack("<IiiHH4sIiiII", 40, w, h, 1, 24, b"MJPG", w * h * 3, 0, 0, 0, 0)
+        strl = (b"strh" + struct.pack("<I", len(strh)) + strh
+                + b"strf" + struct.pack("<I", len(strf)) + strf)
+        hdrl = (b"avih" + struct.pack("<I", len(avih)) + avih
+                + b"LIST" + struct.pack("<I", len(strl) + 4) + b"strl" + strl)
+        self._f.seek(0)
+        self._f.write(b"RIFF\0\0\0\0AVI ")
+        self._f.write(b"LIST" + struct.pack("<I", len(hdrl) + 4) + b"hdrl" + hdrl)
+
+    def write(self, data: bytes):
+        pad = len(data) & 1
+        self._index.append((self._f.tell() - self._movi_start - 8, len(data)))
+        self._f.write(b"00dc" + struct.pack("<I", len(data)))
+        self._f.write(data)
+        if pad:
+            self._f.write(b"\0")
+        self.frames += 1
+        self.bytes += len(data)
+        self._max_frame = max(self._max_frame, len(data))
+
+    def close(self, duration_sec: float):
+        """İndeksi ekle, gerçek kare hızı ve boyutlarla başlıkları düzelt."""
+        movi_end = self._f.tell()
+        idx = b"".join(struct.pack("<4sIII", b"00dc", _AVIIF_KEYFRAME if size else 0, off, size)
+                       for off, size in self._index)
+        self._f.write(b"idx1" + struct.pack("<I", len(idx)) + idx)
+        riff_end = self._f.tell()
+
+        # Kare hızı: ms çözünürlüğünde kesir (frame / süre)
+        fps_num = max(self.frames, 1) * 1000
+        fps_den = max(int(duration_sec * 1000), 1)
+        self._write_headers(fps_num, fps_den)
+        self._f.seek(self._movi_start + 4)
+        self._f.write(struct.pack("<I", movi_end - self._movi_start - 8))
+        self._f.seek(4)
+        self._f.write(struct.pack("<I", riff_end - 8))
+        self._f.close()
+
+
+def transcode(path: str) -> subprocess.Popen | None:
+    """Sistemde ffmpeg varsa segmenti arka planda H.264 MP4'e dönüştür."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return None
+    out = os.path.splitext(path)[0] + ".mp4"
+    return subprocess.Popen(
+        [ffmpeg, "-loglevel", "error", "-y", "-i", path,
+         "-c:v", "libx264", "-preset", "veryfast", "-crf", str(Recording.TRANSCODE_CRF),
+         "-pix_fmt", "yuv420p", out],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+class Recorder:
+    """Sınırlı kuyruk + arka plan yazıcı; doluysa frame düşürür."""
+
+    def __init__(self, directory: str = Recording.DIRECTORY, prefix: str = "session",
+                 transcode: bool = False):
+        self._directory = directory
+        self._prefix = prefix
+        self._transcode = transcode
+        self._pending: deque[tuple[float, bytes]] = deque()
+        self._running = False
+        self._thread: threading.Thread | None = None
+        self._writer: AviWriter | None = None
+        self._segment_started = 0.0
+        self._last_ts = 0.0
+        self._last_frame = b""      # Son gerçek frame (tekrarla bölünen segmentin ilk karesi)
+        self.segments: list[str] = []
+        self.recorded = 0
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        os.makedirs(self._directory, exist_ok=True)
+        self.segments, self.recorded, self.dropped = [], 0, 0
+        self._last_frame = b""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Kuyruktaki frame'leri yaz, segmenti kapat (çağıranı bekletir)."""
+        if self._thread is None:
+            return
+        self._running = False
+        self._thread.join()
+        self._thread = None
+
+    def offer(self, data: bytes, repeat: bool = False):
+        """
+        Alıcı thread'inden: frame'i kuyruğa koy, yer yoksa düşür (beklemez).
+        `repeat`: son frame'in aynısı; diske yalnızca boş parça yazılır.
+        """
+        if not self._running:
+            return
+        if len(self._pending) >= Recording.QUEUE_FRAMES:
+            self.dropped += 1
+            return
+        self._pending.append((time.monotonic(), b"" if repeat else data))
+
+    def _run(self):
+        pending = self._pending
+        while self._running or pending:
+            if not pending:
+                time.sleep(Recording.WRITER_POLL_SEC)
+                continue
+            ts, data = pending.popleft()
+            try:
+                self._write(ts, data)
+            except OSError as e:
+                logger.error(f"Kayıt yazılamadı: {e}")
+                self.dropped += 1
+        self._close_segment()
+
+    def _segment_full(self, writer: AviWriter, ts: float) -> bool:
+        return (ts - self._segment_started >= Recording.SEGMENT_SEC
+                or writer.bytes >= Recording.SEGMENT_MAX_BYTES)
+
+    def _write(self, ts: float, data: bytes):
+        if not data:
+            writer = self._writer
+            if writer is None:
+                return
+            if not self._segment_full(writer, ts):
+                writer.write(data)
+                self._last_ts = ts
+                self.recorded += 1
+                return
+            # Uzun durağan ekran: segment yine bölünür, yenisi boş parçayla başlayamaz
+            data = self._last_frame
+        size = jpeg_size(data)
+        if size is None:
+            self.dropped += 1
+            return
+        writer = self._writer
+        if (writer is None or size != (writer.width, writer.height)
+                or self._segment_full(writer, ts)):
+            self._close_segment()
+            name = f"{self._prefix}-{time.strftime('%Y%m%d-%H%M%S')}-{len(self.segments):03d}.avi"
+            path = os.path.join(self._directory, name)
+            self._writer = writer = AviWriter(path, *size)
+            self._segment_started = ts
+            self.segments.append(path)
+            logger.info(f"Kayıt segmenti: {path} ({size[0]}x{size[1]})")
+        writer.write(data)
+        self._last_frame = data
+        self._last_ts = ts
+        self.recorded += 1
+
+    def _close_segment(self):
+        writer, self._writer = self._writer, None
+        if writer is None:
+            return
+        writer.close(self._last_ts - self._segment_started)
+        if self._transcode and transcode(writer.path) is None:
+            logger.warning("ffmpeg bulunamadı; H.264 dönüşümü atlandı")
+            self._transcode = False
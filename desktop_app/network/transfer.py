@@ -0,0 +1,596 @@
+"""
+Parçalı Dosya ve Pano Aktarımı
+===============================
+PC ile telefon arasında dosya veya büyük pano içeriği, frame yolunu
+tıkamadan aktarılır. Denetim mesajları JSON'dur (`"type": "transfer"`),
+veri sabit boyutlu ikili parçalarla gider; relay içeriklerine bakmaz,
+parçaları kendi (düşük ağırlıklı) kanalından iletir.
+
+Denetim (JSON, "op" alanı):
+    offer   gönderen → alan   id, kind ("file" / "clipboard"), name, size, sha256
+    accept  alan → gönderen   id, offset   (alanda zaten olan byte; devam noktası)
+    done    alan → gönderen   id, ok       (SHA-256 doğrulandı mı)
+    cancel  iki yön            id, reason
+
+İkili (big-endian; opcode'lar input_protocol'ünkilerle çakışmaz):
+    CHUNK      0x10  id:u32 offset:u64 crc32:u32 + veri (≤ CHUNK_BYTES)
+    CHUNK_ACK  0x11  id:u32 next:u64     alanın beklediği sıradaki offset
+
+Gönderen kayan pencereyle çalışır: ack'lenmemiş en fazla WINDOW_CHUNKS
+parça yoldadır. Alan yalnızca beklediği offset'i kabul eder; boşlukta, CRC
+hatasında veya tekrar gelen parçada beklediği offset'i yeniden ack'ler.
+Gönderen art arda DUP_ACK_REWIND aynı ack'te ya da ACK_TIMEOUT_SEC boyunca
+ilerleme olmazsa son ack'lenen offset'e geri sarar (go-back-N).
+
+Bağlantı koparsa aktarım bekler; yeniden eşleşmede aynı id ile offer
+tekrarlanır. Alan, diskteki `.part` dosyasının boyunu offset olarak döner
+ve aktarım kaldığı yerden sürer. Dosya tamamlanınca SHA-256 arka planda
+doğrulanır, sonra `.part` asıl adına taşınır.
+
+Hız: parça ack'lerinin RTT'si, yol üstündeki kuyruklarda bekleyen veriyle
+birlikte artar. `Pacer` pencere içindeki en düşük RTT'yi taban sayar ve
+aradaki farkı (kuyruk gecikmesi) QUEUE_DELAY_TARGET_MS'te tutacak şekilde
+hızı artırır ya da düşürür (LEDBAT benzeri). Frame'ler ve komutlar
+aynı kuyruklardan geçtiği için büyük bir aktarım onlara bütçeden fazla
+gecikme eklemez; yol boşsa hız hızla tavana çıkar.
+"""
+
+import hashlib
+import logging
+import os
+import random
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Callable
+
+from desktop_app.config import Transfer
+from desktop_app.network import codec
+
+logger = logging.getLogger(__name__)
+
+CHUNK = 0x10
+CHUNK_ACK = 0x11
+
+FILE = "file"
+CLIPBOARD = "clipboard"
+
+_CHUNK = struct.Struct(">BIQI")
+_ACK = struct.Struct(">BIQ")
+
+
+# ─── KODLAMA ─────────────────────────────────────────────────────────────────
+
+def is_transfer(raw: bytes) -> bool:
+    """İkili mesaj aktarım protokolüne mi ait?"""
+    return bool(raw) and raw[0] in (CHUNK, CHUNK_ACK)
+
+
+def encode_chunk(tid: int, offset: int, data: bytes) -> bytes:
+    return _CHUNK.pack(CHUNK, tid, offset, zlib.crc32(data)) + data
+
+
+def decode_chunk(raw: bytes) -> tuple[int, int, bytes]:
+    """(id, offset, veri); bozuk veya CRC'si tutmayan parçada ValueError."""
+    if len(raw) < _CHUNK.size or raw[0] != CHUNK:
+        raise ValueError("not a chunk")
+    _, tid, offset, crc = _CHUNK.unpack_from(raw)
+    data = raw[_CHUNK.size:]
+    if zlib.crc32(data) != crc:
+        raise ValueError(f"crc mismatch id={tid} offset={offset}")
+    return tid, offset, data
+
+
+def encode_ack(tid: int, next_offset: int) -> bytes:
+    return _ACK.pack(CHUNK_ACK, tid, next_offset)
+
+
+def decode_ack(raw: bytes) -> tuple[int, int]:
+    if len(raw) != _ACK.size or raw[0] != CHUNK_ACK:
+        raise ValueError("not a chunk ack")
+    _, tid, next_offset = _ACK.unpack(raw)
+    return tid, next_offset
+
+
+def _control(op: str, tid: int, **fields) -> bytes:
+    return codec.dumps({"type": "transfer", "op": op, "id": tid, **fields})
+
+
+# ─── HIZ DENETİMİ ────────────────────────────────────────────────────────────
+
+class Pacer:
+    """Token bucket; hızı kuyruk gecikmesi hedefine göre ayarlanır."""
+
+    def __init__(self):
+        self.rate = Transfer.START_RATE
+        self.queue_delay = 0.0
+        self._tokens = float(Transfer.CHUNK_BYTES)
+        self._stamp = time.monotonic()
+        self._updated = self._stamp
+        # Kayan pencere minimumu: (zaman, rtt), rtt'ye göre artan
+        self._base: deque[tuple[float, float]] = deque()
+
+    def delay(self, size: int, now: float) -> float:
+        """`size` byte gönderilebilmesi için beklenecek süre (sn)."""
+        burst = 2 * Transfer.CHUNK_BYTES
+        self._tokens = min(burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+        return 0.0 if self._tokens >= size else (size - self._tokens) / self.rate
+
+    def consume(self, size: int):
+        self._tokens -= size
+
+    def on_rtt(self, rtt: float, now: float):
+        base = self._base
+        while base and base[-1][1] >= rtt:
+            base.pop()
+        base.append((now, rtt))
+        while base[0][0] < now - Transfer.BASE_RTT_WINDOW_SEC:
+            base.popleft()
+        self.queue_delay = rtt - base[0][1]
+        target = Transfer.QUEUE_DELAY_TARGET_MS / 1000
+        off_target = max(-1.0, min(1.0, (target - self.queue_delay) / target))
+        dt = min(now - self._updated, Transfer.RATE_RAMP_SEC)
+        self._updated = now
+        rate = self.rate * 2 ** (off_target * dt / Transfer.RATE_RAMP_SEC)
+        self.rate = min(Transfer.MAX_RATE, max(Transfer.MIN_RATE, rate))
+
+    def on_loss(self):
+        self.rate = max(Transfer.MIN_RATE, self.rate / 2)
+
+
+# ─── AKTARIM DURUMLARI ───────────────────────────────────────────────────────
+
+class _Outgoing:
+    """Gönderilen dosya / pano içeriği."""
+
+    def __init__(self, tid: int, kind: str, name: str, size: int,
+                 path: str | None = None, data: bytes | None = None):
+        self.id = tid
+        self.kind = kind
+        self.name = name
+        self.size = size
+        self.path = path
+        self.data = data
+        self.sha256: str | None = None   # Gönderim thread'i hesaplar
+        self.accepted = False
+        self.acked = 0
+        self.sent = 0
+        self.sent_at: deque[tuple[int, float]] = deque()   # (parça sonu, gönderim zamanı)
+        self.dup_acks = 0
+        self.last_progress = 0.0
+        self.reported = 0.0
+        self._file = None
+
+    def read(self, offset: int, n: int) -> bytes:
+        if self.data is not None:
+            return self.data[offset:offset + n]
+        if self._file is None:
+            self._file = open(self.path, "rb")
+        self._file.seek(offset)
+        return self._file.read(n)
+
+    def hash(self) -> str:
+        if self.data is not None:
+            return hashlib.sha256(self.data).hexdigest()
+        h = hashlib.sha256()
+        with open(self.path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(block)
+        return h.hexdigest()
+
+    def offer(self) -> bytes:
+        return _control("offer", self.id, kind=self.kind, name=self.name,
+                        size=self.size, sha256=self.sha256)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _Incoming:
+    """Alınan dosya (diskte `.part`) veya pano içeriği (bellekte)."""
+
+    def __init__(self, tid: int, kind: str, name: str, size: int, sha256: str, directory: str):
+        self.id = tid
+        self.kind = kind
+        self.name = name
+        self.size = size
+        self.sha256 = sha256
+        self.expected = 0
+        self.directory = directory
+        self.part = os.path.join(directory, f"{name}.{sha256[:12]}.part")
+        self._file = None
+        self._buf: bytearray | None = None
+
+    def open(self) -> int:
+        """Yazmaya hazırlan; devam edilecek offset'i döndür."""
+        if self.kind == CLIPBOARD:
+            self._buf = bytearray()
+            return 0
+        os.makedirs(self.directory, exist_ok=True)
+        have = os.path.getsize(self.part) if os.path.exists(self.part) else 0
+        self.expected = min(have, self.size)
+        self._file = open(self.part, "r+b" if have else "wb")
+        self._file.truncate(self.expected)
+        self._file.seek(self.expected)
+        return self.expected
+
+    def write(self, data: bytes):
+        if self._buf is not None:
+            self._buf += data
+        else:
+            self._file.write(data)
+        self.expected += len(data)
+
+    def content(self) -> bytes:
+        return bytes(self._buf or b"")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _safe_name(name) -> str:
+    name = os.path.basename(str(name or "")).strip().lstrip(".")
+    return name[:200] or "received"
+
+
+def _unique_path(directory: str, name: str) -> str:
+    path = os.path.join(directory, name)
+    stem, ext = os.path.splitext(name)
+    n = 1
+    while os.path.exists(path):
+        path = os.path.join(directory, f"{stem} ({n}){ext}")
+        n += 1
+    return path
+
+
+# ─── YÖNETİCİ ────────────────────────────────────────────────────────────────
+
+class TransferManager:
+    """
+    Bir bağlantının giden ve gelen aktarımları. Giden parçaları kendi
+    thread'i gönderir; ack'ler, gelen parçalar ve denetim mesajları
+    WebSocket thread'inden gelir.
+
+    Geri çağrılar (herhangi bir thread'den çağrılır):
+        on_progress(id, bytes, total)
+        on_finished(id, ok, detay)     detay: hata veya "" (gönderen tarafı)
+        on_received(kind, değer)       dosya yolu veya pano metni
+
+    Alınan dosyalar `directory`'ye yazılır.
+    """
+
+    def __init__(self, send_text: Callable[[bytes], None], send_binary: Callable[[bytes], None],
+                 on_progress: Callable[[int, int, int], None],
+                 on_finished: Callable[[int, bool, str], None],
+                 on_received: Callable[[str, str], None], directory: str = Transfer.DIRECTORY):
+        self._send_text = send_text
+        self._send_binary = send_binary
+        self._on_progress = on_progress
+        self._on_finished = on_finished
+        self._on_received = on_received
+        self._directory = directory
+        self._cond = threading.Condition()
+        self._out: dict[int, _Outgoing] = {}
+        self._in: dict[int, _Incoming] = {}
+        self._pacer = Pacer()
+        self._window = Transfer.WINDOW_CHUNKS * Transfer.CHUNK_BYTES
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    # ─── PUBLIC API ────────────────────────────────────────────────────────
+
+    def send_file(self, path: str) -> int:
+        """Dosyayı gönder (hash gönderim thread'inde hesaplanır); aktarım id'si."""
+        return self._add(_Outgoing(self._new_id(), FILE, _safe_name(path), os.path.getsize(path),
+                                   path=path))
+
+    def send_clipboard(self, text: str) -> int:
+        data = text.encode("utf-8")
+        return self._add(_Outgoing(self._new_id(), CLIPBOARD, "clipboard.txt", len(data), data=data))
+
+    def cancel(self, tid: int):
+        with self._cond:
+            t = self._out.pop(tid, None) or self._in.pop(tid, None)
+        if t is not None:
+            t.close()
+            self._send_control(_control("cancel", tid, reason="cancelled"))
+            self._on_finished(tid, False, "cancelled")
+
+    def resume(self):
+        """Eş yeniden bağlandı: yarım kalan giden aktarımları yeniden teklif et."""
+        with self._cond:
+            offers = [t.offer() for t in self._out.values() if t.sha256 is not None]
+        for payload in offers:
+            self._send_text(payload)
+
+    def pause(self):
+        """Eş gitti: gönderimi durdur, gelenleri diske bırak (devam edilebilir)."""
+        with self._cond:
+            for t in self._out.values():
+                t.accepted = False
+            for inc in self._in.values():
+                inc.close()
+            self._in.clear()
+
+    @property
+    def rate(self) -> float:
+        return self._pacer.rate
+
+    @property
+    def queue_delay(self) -> float:
+        return self._pacer.queue_delay
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            for t in self._out.values():
+                t.close()
+            self._cond.notify_all()
+        self.pause()
+
+    # ─── GELEN MESAJLAR (WebSocket thread'i) ───────────────────────────────
+
+    def on_binary(self, raw: bytes):
+        if raw[0] == CHUNK_ACK:
+            try:
+                self._on_ack(*decode_ack(raw))
+            except ValueError as e:
+                logger.warning(f"Aktarım ack'i çözülemedi: {e}")
+            return
+        try:
+            tid, offset, data = decode_chunk(raw)
+        except ValueError as e:
+            # Parça atılır; sonraki parçalardaki tekrar ack gönderene geri sardırır
+            logger.warning(f"Aktarım parçası atıldı: {e}")
+            return
+        with self._cond:
+            inc = self._in.get(tid)
+            if inc is None:
+                return
+            if offset == inc.expected and offset + len(data) <= inc.size:
+                inc.write(data)
+            expected = inc.expected
+            complete = expected == inc.size
+            if complete:
+                del self._in[tid]
+        self._send_binary(encode_ack(tid, expected))
+        if complete:
+            self._complete(inc)
+
+    def on_message(self, msg: dict):
+        op = msg.get("op")
+        tid = msg.get("id")
+        if not isinstance(tid, int):
+            return
+        if op == "offer":
+            self._on_offer(tid, msg)
+        elif op == "accept":
+            self._on_accept(tid, msg.get("offset"))
+        elif op == "done":
+            with self._cond:
+                t = self._out.pop(tid, None)
+            if t is not None:
+                t.close()
+                ok = bool(msg.get("ok"))
+                self._on_finished(tid, ok, "" if ok else "hash mismatch")
+        elif op == "cancel":
+            with self._cond:
+                t = self._out.pop(tid, None) or self._in.pop(tid, None)
+            if t is not None:
+                t.close()
+                self._on_finished(tid, False, str(msg.get("reason") or "cancelled"))
+
+    # ─── GÖNDEREN ──────────────────────────────────────────────────────────
+
+    def _new_id(self) -> int:
+        with self._cond:
+            while True:
+                tid = random.getrandbits(32)
+                if tid not in self._out:
+                    return tid
+
+    def _add(self, t: _Outgoing) -> int:
+        with self._cond:
+            self._out[t.id] = t
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="transfer-sender", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return t.id
+
+    def _on_accept(self, tid: int, offset):
+        with self._cond:
+            t = self._out.get(tid)
+            if t is None or not isinstance(offset, int):
+                return
+            t.acked = t.sent = min(max(offset, 0), t.size)
+            t.sent_at.clear()
+            t.dup_acks = 0
+            t.accepted = True
+            t.last_progress = time.monotonic()
+            self._cond.notify()
+        logger.info(f"Aktarım kabul edildi: id={tid} offset={offset}/{t.size}")
+
+    def _on_ack(self, tid: int, next_offset: int):
+        progress = None
+        with self._cond:
+            t = self._out.get(tid)
+            if t is None or not t.accepted:
+                return
+            now = time.monotonic()
+            if next_offset > t.acked:
+                sent_at = None
+                while t.sent_at and t.sent_at[0][0] <= next_offset:
+                    sent_at = t.sent_at.popleft()[1]
+                if sent_at is not None:
+                    self._pacer.on_rtt(now - sent_at, now)
+                t.acked = min(next_offset, t.size)
+                t.sent = max(t.sent, t.acked)
+                t.dup_acks = 0
+                t.last_progress = now
+                if now - t.reported >= Transfer.PROGRESS_INTERVAL_SEC or t.acked == t.size:
+                    t.reported = now
+                    progress = (tid, t.acked, t.size)
+            elif next_offset == t.acked and t.sent > t.acked:
+                t.dup_acks += 1
+                if t.dup_acks >= Transfer.DUP_ACK_REWIND:
+                    self._rewind(t, now)
+            self._cond.notify()
+        if progress:
+            self._on_progress(*progress)
+
+    def _rewind(self, t: _Outgoing, now: float):
+        """Son ack'lenen offset'ten yeniden gönder (go-back-N); kayıp hızı yarıya indirir."""
+        logger.info(f"Aktarım geri sarıldı: id={t.id} {t.sent} → {t.acked}")
+        t.sent = t.acked
+        t.sent_at.clear()
+        # Yoldaki eski parçaların tekrar ack'leri yeni bir geri sarma tetiklemesin
+        t.dup_acks = -Transfer.WINDOW_CHUNKS
+        t.last_progress = now
+        self._pacer.on_loss()
+
+    def _pick(self, now: float) -> tuple[_Outgoing | None, float | None]:
+        """Sıradaki parçası gönderilecek aktarım veya beklenecek süre (None: sonsuz)."""
+        wait = None
+        for t in self._out.values():
+            if not t.accepted or t.acked >= t.size:
+                continue
+            if t.sent > t.acked and now - t.last_progress > Transfer.ACK_TIMEOUT_SEC:
+                self._rewind(t, now)
+            if t.sent >= t.size or t.sent - t.acked >= self._window:
+                timeout = t.last_progress + Transfer.ACK_TIMEOUT_SEC - now
+                wait = timeout if wait is None else min(wait, timeout)
+                continue
+            delay = self._pacer.delay(min(Transfer.CHUNK_BYTES, t.size - t.sent), now)
+            if delay <= 0:
+                return t, None
+            return None, delay if wait is None else min(wait, delay)
+        return None, wait
+
+    def _run(self):
+        cond = self._cond
+        while True:
+            with cond:
+                if self._closed:
+                    return
+                unhashed = next((t for t in self._out.values() if t.sha256 is None), None)
+            if unhashed is not None:
+                self._prepare(unhashed)
+                continue
+
+            with cond:
+                if self._closed:
+                    return
+                now = time.monotonic()
+                t, wait = self._pick(now)
+                if t is None:
+                    cond.wait(wait)
+                    continue
+                offset = t.sent
+                n = min(Transfer.CHUNK_BYTES, t.size - offset)
+                t.sent = offset + n
+                t.sent_at.append((t.sent, now))
+                self._pacer.consume(n)
+            # Gönderim kilidin dışında: soket dolarsa ack işleme beklemez.
+            # Bu arada geri sarılırsa eski parçayı alan tekrar ack'le yanıtlar.
+            try:
+                self._send_binary(encode_chunk(t.id, offset, t.read(offset, n)))
+            except OSError as e:
+                self._fail(t, str(e))
+            except Exception as e:
+                logger.warning(f"Aktarım parçası gönderilemedi: {e}")
+
+    def _prepare(self, t: _Outgoing):
+        try:
+            t.sha256 = t.hash()
+        except OSError as e:
+            self._fail(t, str(e))
+            return
+        # Gönderilemezse teklif yeniden eşleşmede (resume) tekrarlanır
+        self._send_control(t.offer())
+
+    def _fail(self, t: _Outgoing, reason: str):
+        with self._cond:
+            self._out.pop(t.id, None)
+        t.close()
+        self._send_control(_control("cancel", t.id, reason=reason))
+        self._on_finished(t.id, False, reason)
+
+    def _send_control(self, payload: bytes) -> bool:
+        """Denetim mesajını gönder; bağlantı hatası çağıran thread'i sonlandırmasın."""
+        try:
+            self._send_text(payload)
+        except Exception as e:
+            logger.warning(f"Aktarım denetim mesajı gönderilemedi: {e}")
+            return False
+        return True
+
+    # ─── ALAN ──────────────────────────────────────────────────────────────
+
+    def _on_offer(self, tid: int, msg: dict):
+        kind, size, sha256 = msg.get("kind"), msg.get("size"), msg.get("sha256")
+        valid = (kind in (FILE, CLIPBOARD) and isinstance(size, int) and size >= 0
+                 and isinstance(sha256, str) and len(sha256) == 64)
+        if valid and kind == CLIPBOARD and size > Transfer.CLIPBOARD_MAX_BYTES:
+            valid = False
+        if not valid:
+            self._send_text(_control("cancel", tid, reason="invalid offer"))
+            return
+        inc = _Incoming(tid, kind, _safe_name(msg.get("name")), size, sha256.lower(), self._directory)
+        try:
+            offset = inc.open()
+        except OSError as e:
+            self._send_text(_control("cancel", tid, reason=str(e)))
+            return
+        with self._cond:
+            old = self._in.pop(tid, None)
+            if old is not None:
+                old.close()
+            complete = offset == size
+            if not complete:
+                self._in[tid] = inc
+        logger.info(f"Aktarım teklifi: id={tid} {kind} {inc.name} {size} byte, offset={offset}")
+        self._send_text(_control("accept", tid, offset=offset))
+        if complete:
+            self._complete(inc)
+
+    def _complete(self, inc: _Incoming):
+        if inc.kind == CLIPBOARD:
+            content = inc.content()
+            ok = hashlib.sha256(content).hexdigest() == inc.sha256
+            self._send_text(_control("done", inc.id, ok=ok))
+            if ok:
+                self._on_received(CLIPBOARD, content.decode("utf-8", "replace"))
+            return
+        inc.close()
+        # Büyük dosyanın hash'i WebSocket thread'ini bekletmesin
+        threading.Thread(target=self._verify, args=(inc,), name="transfer-verify", daemon=True).start()
+
+    def _verify(self, inc: _Incoming):
+        try:
+            h = hashlib.sha256()
+            with open(inc.part, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    h.update(block)
+            ok = h.hexdigest() == inc.sha256
+            if ok:
+                path = _unique_path(inc.directory, inc.name)
+                os.replace(inc.part, path)
+            else:
+                os.remove(inc.part)  # Bozuk parça devam noktası olmasın
+                logger.warning(f"Aktarım hash'i tutmadı: id={inc.id} {inc.name}")
+        except OSError as e:
+            # Gönderen tamamen ack'lenmiş aktarımda done beklerken takılı kalmasın
+            logger.warning(f"Aktarım doğrulanamadı: id={inc.id} {inc.name} ({e})")
+            self._send_control(_control("cancel", inc.id, reason=str(e)))
+            return
+        self._send_control(_control("done", inc.id, ok=ok))
+        if ok:
+            self._on_received(FILE, path)
@@ -4,6 +4,41 @@ WebSocket Signaling İstemcisi
 Signaling sunucusuna bağlanır, oturum eşleşmesini yönetir ve
 telefona komut (kamera aç/kapat, touch, swipe) gönderir.
 
+Telefon eşleşince `binary_input` yeteneğini bildirirse dokunma, kaydırma,
+sürükleme ve tuş olayları JSON yerine ikili protokolle gönderilir
+(bkz. input_protocol).
+
+Her komut bir sıra numarası (seq) ve gönderim zamanı (ts) taşır; telefon
+ack döndürürse girdi gecikmesi yüzdelikleri `latency_updated` ile yayılır
+(bkz. latency).
+
+Bağlantı canlılığı ve sunucu/telefon RTT'si tek bir mekanizmayla, trafiğe
+uyarlanan probe'larla izlenir (bkz. liveness); websocket-client ping'i ve
+ayrı bir heartbeat kullanılmaz.
+
+Telefon ekran ve kamera frame'lerini aynı bağlantıda ayrı kanallardan
+gönderir (frame mesajının "ch" alanı); ekran `frame_received`, kamera
+`camera_frame_received` ile yayılır. Kamera frame'leri hakem ve kayıttan
+geçmez.
+
+Dosya ve pano içeriği parçalı aktarımla gönderilir/alınır (bkz. transfer);
+parçalar frame'lerle aynı bağlantıyı paylaşır, hızı kuyruk gecikmesine göre
+ayarlanır. Telefon koparsa aktarım bekler, yeniden eşleşince kaldığı yerden
+sürer.
+
+Pencere açılınca `prewarm()` kod beklemeden sunucuyu uyandırır: önce
+`GET /` sağlık kontrolü (uykudaki örnek burada kalkar), ardından join
+göndermeden WebSocket'i açar (TLS el sıkışması dahil). Kullanıcı aynı
+sunucuya bağlanınca join bu sokette gider; soğuk başlangıç ve el sıkışma
+Connect'e basıldıktan sonraki süreye yansımaz. Isıtılmış soketin kopması
+UI'a hata olarak yansımaz; bağlanırken yeni soket açılır.
+
+Sunucu kapanırken (`server_draining`) istemci sunucunun verdiği pencere
+içinde rastgele bir anda aynı adrese yeniden bağlanıp aynı kodla tekrar
+katılır; eski bağlantı ancak yenisi açıldıktan sonra kapatılır ve UI'a
+kopma olarak yansımaz. Yeni bağlantı açılamazsa eskisi de kapatılır ve
+`disconnected` yayılır.
+
 Kullanım:
     client = WsClient()
     client.paired.connect(on_paired)
@@ -11,18 +46,41 @@ Kullanım:
     client.connect_to_server("wss://your-server.onrender.com", "123456")
 """
 
-import json
 import threading
 import base64
 import logging
-import websocket
+import random
+import time
+from typing import TYPE_CHECKING
+
 from PyQt6.QtCore import QObject, pyqtSignal
 from PyQt6.QtGui import QPixmap, QImage
 
 from desktop_app.config import Network
+from desktop_app.network import codec, input_protocol, transfer
+from desktop_app.network.latency import LatencyTracker, now_ms
+from desktop_app.network.liveness import LivenessMonitor, SERVER, PEER
+from desktop_app.network.frame_arbiter import FrameArbiter
+from desktop_app.network.image_pool import ImagePool
+from desktop_app.network.recorder import Recorder
+
+if TYPE_CHECKING:
+    import websocket
+
+    from desktop_app.network.frame_api import LatestFrame
 
 logger = logging.getLogger(__name__)
 
+# Dokunma/kaydırma şablonla doldurulur
+_TPL_TOUCH = b'{"type":"command","action":"touch","x":%.4f,"y":%.4f,"seq":%d,"ts":%d}'
+_TPL_SWIPE = (b'{"type":"command","action":"swipe","x1":%.4f,"y1":%.4f,"x2":%.4f,"y2":%.4f,'
+              b'"seq":%d,"ts":%d}')
+
+# Telefondan relay edilen mesaj tipleri (telefonun canlı olduğunu gösterir)
+_PEER_TYPES = frozenset({
+    "frame", "command", "ack", "relay", "stream_info", "peer_probe", "peer_probe_ack", "transfer",
+})
+
 
 class WsClient(QObject):
     """Signaling sunucusuyla ve (relay üzerinden) telefonla WebSocket haberleşmesi."""
@@ -33,61 +91,245 @@ class WsClient(QObject):
     peer_disconnected = pyqtSignal()            # Telefon bağlantısı kesildi
     command_received = pyqtSignal(dict)         # Telefondan komut geldi
     error_occurred = pyqtSignal(str)            # Hata mesajı
-    frame_received = pyqtSignal(QPixmap)        # WebSocket üzerinden JPEG frame
+    frame_received = pyqtSignal(QImage)         # WebSocket üzerinden JPEG frame (ekran kanalı)
+    camera_frame_received = pyqtSignal(QImage)  # Kamera kanalından JPEG frame
+    binary_input_changed = pyqtSignal(bool)     # Telefon ikili girdi protokolünü destekliyor mu
+    latency_updated = pyqtSignal(dict)          # Girdi RTT yüzdelikleri (LatencyTracker.snapshot)
+    rtt_updated = pyqtSignal(str, float)        # "server" / "peer" RTT (ms)
+    link_lost = pyqtSignal(str)                 # "server" / "peer" probe'lara yanıt vermiyor
+    server_draining = pyqtSignal()              # Sunucu kapanıyor; oturum taşınıyor
+    tile_received = pyqtSignal(QPixmap, float, float, float, float)  # ROI karosu + bölgesi
+    role_changed = pyqtSignal(str)              # "viewer": başka PC kontrolü devraldı
+    transfer_progress = pyqtSignal(int, int, int)   # Giden aktarım: id, gönderilen, toplam byte
+    transfer_finished = pyqtSignal(int, bool, str)  # Giden aktarım: id, başarılı mı, hata
+    clipboard_received = pyqtSignal(str)        # Telefonun gönderdiği pano metni
+    file_received = pyqtSignal(str)             # Telefondan alınan dosyanın yolu
+    server_ready = pyqtSignal(float)            # Ön ısıtma: sunucu yanıt verdi, soket açılıyor (ms)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, arbiter: FrameArbiter | None = None,
+                 recorder: Recorder | None = None, latest: "LatestFrame | None" = None):
         super().__init__(parent)
-        self._ws: websocket.WebSocketApp | None = None
+        self._arbiter = arbiter
+        self._recorder = recorder
+        self._latest = latest
+        # Frame'ler WebSocket thread'inde yeniden kullanılan tamponlara çözülür
+        self._screen_pool = ImagePool()
+        self._camera_pool = ImagePool()
+        self._ws: "websocket.WebSocketApp | None" = None
         self._thread: threading.Thread | None = None
+        # _ws / _socket_open / _warm_url / _session_code GUI, ön ısıtma ve WS thread'lerinden erişilir
+        self._lock = threading.Lock()
+        self._socket_open = False
+        self._warm_url = ""             # Join'siz bekleyen (ön ısıtılmış) bağlantının adresi
+        # Ön ısıtma ile açılıp henüz oturuma bağlanmamış soket; kopması UI'a yansımaz
+        self._warm: "websocket.WebSocketApp | None" = None
+        # Drain: taşınma zamanlayıcısı ve yeni soket açılınca kapatılacak eski soket
+        self._drain_timer: threading.Timer | None = None
+        self._migrating_from: "websocket.WebSocketApp | None" = None
+        self.prewarmed = False          # Son connect_to_server ısıtılmış soketi kullandı mı
+        self._url: str = ""
         self._session_code: str = ""
+        self._role = "pc"
+        self._binary_input = False
+        self._latency = LatencyTracker()
+        self._last_latency_report = 0
+        self._liveness = LivenessMonitor(self._send, self)
+        self._liveness.rtt_updated.connect(self.rtt_updated)
+        self._liveness.link_lost.connect(self._on_link_lost)
+        self._transfers = transfer.TransferManager(
+            self._send, self._send_binary, self.transfer_progress.emit,
+            self.transfer_finished.emit, self._on_transfer_received)
 
     # ─── PUBLIC API ────────────────────────────────────────────────────────────
 
-    def connect_to_server(self, url: str, code: str):
+    def connect_to_server(self, url: str, code: str, role: str = "pc"):
         """
         Signaling sunucusuna bağlan ve verilen kod ile join isteği gönder.
 
         :param url:  wss://... veya ws://...
         :param code: Telefon uygulamasının gösterdiği 6 haneli kod
+        :param role: "pc" (kontrol eden) veya "viewer" (yalnızca izler)
+        """
+        with self._lock:
+            self._session_code = code
+            self._role = role
+            self.prewarmed = self._ws is not None and self._warm_url == url
+            self._warm_url = ""
+            self._warm = None
+            if self.prewarmed:
+                # Isıtılmış soket: açıksa join şimdi, açılıyorsa _on_open'da gider
+                joined = self._socket_open
+                if joined:
+                    self._ws.send(self._join_message())
+            else:
+                if self._ws is not None:
+                    self._ws.close()  # Başka adrese ısıtılmış soket
+                self._url = url
+                self._open()
+        if self.prewarmed and joined:
+            self._liveness.set_active(SERVER, True)
+            self.connected.emit()
+        self._liveness.start()
+
+    def prewarm(self, url: str):
+        """
+        Kod girilmeden sunucuyu uyandır ve soketi aç (arka plan thread'inde);
+        sonraki connect_to_server aynı adrese ise bu soketi kullanır.
         """
-        self._session_code = code
+        with self._lock:
+            if (self._ws is not None and self._ws is not self._warm
+                    and (self._socket_open or self._migrating_from is not None)):
+                return  # Oturum açık veya taşınıyor
+            if self._warm_url == url:
+                return  # Zaten ısıtılıyor / ısıtıldı
+            old, self._ws = self._ws, None  # Kopmuş oturum veya başka adrese ısıtılmış soket
+            self._warm = None
+            self._session_code = ""
+            self._warm_url = url
+        if old is not None:
+            old.close()
+        self._liveness.stop()
+        threading.Thread(target=self._prewarm, args=(url,), name="ws-prewarm", daemon=True).start()
+
+    def _prewarm(self, url: str):
+        t0 = time.perf_counter()
+        try:
+            status = _health_check(url)
+        except OSError as e:
+            logger.info(f"Ön ısıtma: sunucuya ulaşılamadı ({e})")
+            with self._lock:
+                if self._warm_url == url and self._ws is None:
+                    self._warm_url = ""  # Bağlanırken yeniden denenir
+            return
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        logger.info(f"Ön ısıtma: GET / → {status} ({elapsed_ms:.0f} ms)")
+        with self._lock:
+            if self._warm_url != url or self._ws is not None:
+                return  # Bu arada bağlanıldı veya adres değişti
+            self._url = url
+            self._open()
+            self._warm = self._ws
+        self.server_ready.emit(elapsed_ms)
+
+    def _join_message(self) -> bytes:
+        return codec.dumps({"type": "join", "code": self._session_code, "role": self._role})
+
+    def _open(self):
+        import websocket  # websocket-client ilk bağlantıda yüklenir
+
+        self._socket_open = False
         self._ws = websocket.WebSocketApp(
-            url,
+            self._url,
             on_open=self._on_open,
             on_message=self._on_message,
             on_error=self._on_error,
             on_close=self._on_close,
         )
+        # Keep-alive ve RTT LivenessMonitor probe'larıyla; websocket-client ping'i kapalı
         self._thread = threading.Thread(
             target=self._ws.run_forever,
-            kwargs={
-                "ping_interval": Network.PING_INTERVAL_SEC,
-                "ping_timeout": Network.PING_TIMEOUT_SEC,
-                "skip_utf8_validation": True,
-            },
+            kwargs={"skip_utf8_validation": True},
             daemon=True,
         )
         self._thread.start()
 
+    def _migrate(self, old):
+        """Sunucu drain ediyor: yeni bağlantıyı aç; eskisi yenisi açılınca (_on_open) kapanır."""
+        with self._lock:
+            self._drain_timer = None
+            if self._ws is not old:
+                return  # Bu arada kullanıcı bağlantıyı kesti veya zaten taşındı
+            logger.info("Sunucu drain ediyor; yeniden bağlanılıyor")
+            self._migrating_from = old
+            self._open()
+
+    def _end_migration(self):
+        """Bekleyen taşınmayı bırak: zamanlayıcıyı durdur, eski soketi kapat (kilit tutulurken)."""
+        if self._drain_timer is not None:
+            self._drain_timer.cancel()
+            self._drain_timer = None
+        old, self._migrating_from = self._migrating_from, None
+        return old
+
     def disconnect(self):
         """Bağlantıyı kapat."""
-        if self._ws:
-            self._ws.close()
-        self._ws = None
+        self._liveness.stop()
+        with self._lock:
+            ws, self._ws = self._ws, None
+            self._socket_open = False
+            self._warm_url = ""
+            self._warm = None
+            old = self._end_migration()
+        if old:
+            old.close()
+        if ws:
+            ws.close()
+        self._set_binary_input(False)
 
     def send_command(self, cmd: dict):
-        """Telefona komut gönder (relay üzerinden)."""
-        if self._ws:
-            payload = {"type": "command", **cmd}
-            self._ws.send(json.dumps(payload))
+        """Telefona komut gönder (relay üzerinden); seq/ts eklenir."""
+        if self._role != "pc":
+            return  # İzleyicinin komutlarını sunucu zaten reddeder
+        seq, ts = self._latency.next()
+        self._send(codec.dumps({"type": "command", **cmd, "seq": seq, "ts": ts}))
+
+    def send_file(self, path: str) -> int | None:
+        """Dosyayı telefona gönder; aktarım id'si (izleyiciyken None)."""
+        if self._role != "pc":
+            return None
+        return self._transfers.send_file(path)
+
+    def send_clipboard(self, text: str) -> int | None:
+        """Pano metnini telefona gönder; aktarım id'si (izleyiciyken None)."""
+        if self._role != "pc":
+            return None
+        return self._transfers.send_clipboard(text)
+
+    def request_clipboard(self):
+        """Telefonun panosunu iste (telefon pano aktarımıyla yanıtlar)."""
+        if self._role == "pc":
+            self._send(codec.dumps({"type": "transfer", "op": "request", "kind": transfer.CLIPBOARD}))
+
+    def cancel_transfer(self, tid: int):
+        self._transfers.cancel(tid)
+
+    @property
+    def view_only(self) -> bool:
+        """Oturumu yalnızca izliyor muyuz (komut gönderemeyiz)?"""
+        return self._role != "pc"
+
+    @property
+    def latency(self) -> LatencyTracker:
+        return self._latency
+
+    @property
+    def binary_input(self) -> bool:
+        """Girdi olayları ikili protokolle mi gönderiliyor?"""
+        return self._binary_input
 
     def send_touch(self, x: float, y: float):
         """Dokunma koordinatını gönder (0.0–1.0 arası normalize)."""
-        self.send_command({"action": "touch", "x": x, "y": y})
+        seq, ts = self._latency.next()
+        if self._binary_input:
+            self._send_binary(input_protocol.encode_touch(x, y, seq, ts))
+        else:
+            self._send(_TPL_TOUCH % (x, y, seq, ts))
 
     def send_swipe(self, x1: float, y1: float, x2: float, y2: float):
         """Kaydırma olayı gönder."""
-        self.send_command({"action": "swipe", "x1": x1, "y1": y1, "x2": x2, "y2": y2})
+        seq, ts = self._latency.next()
+        if self._binary_input:
+            self._send_binary(input_protocol.encode_swipe(x1, y1, x2, y2, seq, ts))
+        else:
+            self._send(_TPL_SWIPE % (x1, y1, x2, y2, seq, ts))
+
+    def send_pointer(self, phase: str, x: float, y: float):
+        """
+        Sürekli sürükleme adımı ("down" / "move" / "up").
+        Sadece ikili protokolde vardır; telefon desteklemiyorsa gönderilmez.
+        """
+        if self._binary_input:
+            self._send_binary(input_protocol.encode_pointer(phase, x, y, *self._latency.next()))
 
     def send_camera_on(self):
         """Kamerayı aç komutu."""
@@ -99,41 +341,179 @@ class WsClient(QObject):
 
     def send_key_event(self, key_code: int):
         """Android KeyEvent gönder."""
-        self.send_command({"action": "key_event", "key_code": key_code})
+        if self._binary_input:
+            self._send_binary(input_protocol.encode_key(key_code, *self._latency.next()))
+        else:
+            self.send_command({"action": "key_event", "key_code": key_code})
+
+    def set_ws_frames(self, enabled: bool):
+        """Telefondan WebSocket üzerinden ekran frame'i gönderimini aç/kapat."""
+        self.send_command({"action": "set_ws_frames", "enabled": enabled})
 
-    def send_heartbeat(self):
-        """Keep-alive ping."""
+    def set_quality(self, level: int):
+        """Telefonun ekran yayını kalite seviyesini ayarla (bkz. QualityController)."""
+        self.send_command({"action": "set_quality", "level": level})
+
+    def set_roi(self, x: float, y: float, w: float, h: float):
+        """
+        Yakınlaştırılan bölgeyi telefona bildir; telefon bu bölgeyi ayrı, yüksek
+        çözünürlüklü karo olarak gönderir. Tam ekran (w, h >= 1) karoyu kapatır.
+        """
+        if w >= 1.0 and h >= 1.0:
+            self.send_command({"action": "set_roi"})
+        else:
+            self.send_command({"action": "set_roi", "x": x, "y": y, "w": w, "h": h})
+
+    def rtt(self, target: str) -> float | None:
+        """Son ölçülen RTT (ms); "server" veya "peer"."""
+        return self._liveness.rtt(target)
+
+    def _send(self, payload: bytes):
+        """Encode edilmiş JSON'u metin frame'i olarak gönder."""
         if self._ws:
-            self._ws.send(json.dumps({"type": "heartbeat"}))
+            self._ws.send(payload)
+
+    def _send_binary(self, payload: bytes):
+        """İkili girdi mesajını binary frame olarak gönder."""
+        if self._ws:
+            self._ws.send_bytes(payload)
+
+    def _set_binary_input(self, enabled: bool):
+        if enabled != self._binary_input:
+            self._binary_input = enabled
+            self.binary_input_changed.emit(enabled)
+
+    def _on_tile(self, msg: dict):
+        """ROI karosu: hakem ve kayıttan geçmez, yalnızca ScreenWidget'a gider."""
+        roi = msg.get("roi")
+        if not (isinstance(roi, list) and len(roi) == 4):
+            return
+        try:
+            img = QImage()
+            if img.loadFromData(base64.b64decode(msg["tile"]), "JPEG"):
+                self.tile_received.emit(QPixmap.fromImage(img), *map(float, roi))
+        except (ValueError, TypeError) as e:
+            logger.warning(f"ROI karosu çözülemedi: {e}")
+
+    def _on_transfer_received(self, kind: str, value: str):
+        if kind == transfer.CLIPBOARD:
+            self.clipboard_received.emit(value)
+        else:
+            self.file_received.emit(value)
+
+    def _on_camera_frame(self, msg: dict):
+        """Kamera kanalı: ekran frame'lerinden bağımsız, ayrı görünüme gider."""
+        try:
+            img = self._camera_pool.decode(base64.b64decode(msg.get("data", "")))
+            if img is not None:
+                self.camera_frame_received.emit(img)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Kamera frame'i çözülemedi: {e}")
+
+    def _on_ack(self, seq: int, ts: int):
+        """Telefonun ack'i: RTT'yi kaydet, UI'a aralıklı özet gönder."""
+        rtt = self._latency.on_ack(seq, ts)
+        if rtt is not None:
+            self._liveness.add_peer_sample(rtt)
+        now = now_ms()
+        if (now - self._last_latency_report) % (1 << 32) >= Network.LATENCY_REPORT_MS:
+            self._last_latency_report = now
+            self.latency_updated.emit(self._latency.snapshot())
+
+    def _on_link_lost(self, target: str):
+        """Probe'lar yanıtsız: sunucu ise bağlantıyı kapat (disconnected yayılır)."""
+        logger.warning(f"Bağlantı yanıt vermiyor: {target}")
+        if target == SERVER and self._ws:
+            self._ws.close()
+        self.link_lost.emit(target)
 
     # ─── WEBSOCKET CALLBACKS ───────────────────────────────────────────────────
 
     def _on_open(self, ws):
+        with self._lock:
+            if ws is not self._ws:
+                return
+            self._socket_open = True
+            joining = bool(self._session_code)
+            if joining:
+                # PC (veya izleyici) olarak join isteği gönder
+                ws.send(self._join_message())
+            # Taşınma: yeni soket açıldı, eskisi artık kapatılabilir
+            old, self._migrating_from = self._migrating_from, None
+        if old is not None:
+            old.close()
+        if not joining:
+            return  # Ön ısıtma: join kullanıcı bağlanınca gider
+        self._liveness.set_active(SERVER, True)
         self.connected.emit()
-        # PC olarak join isteği gönder
-        ws.send(json.dumps({
-            "type": "join",
-            "code": self._session_code,
-            "role": "pc"
-        }))
-
-    def _on_message(self, ws, raw: str):
+
+    def _on_message(self, ws, raw: str | bytes):
+        if isinstance(raw, bytes) and transfer.is_transfer(raw):
+            # Aktarım parçası veya parça ack'i
+            self._liveness.on_traffic(from_peer=True)
+            self._transfers.on_binary(raw)
+            return
+        if isinstance(raw, bytes) and input_protocol.is_binary(raw):
+            # İkili mesaj: telefonun girdi ack'i
+            try:
+                msg = input_protocol.decode(raw)
+            except ValueError as e:
+                logger.warning(f"İkili mesaj çözülemedi: {e}")
+                return
+            self._liveness.on_traffic(from_peer=True)
+            if msg["action"] == "ack":
+                self._on_ack(msg["seq"], msg["ts"])
+            return
+
         try:
-            msg = json.loads(raw)
-        except json.JSONDecodeError:
+            msg = codec.loads(raw)
+        except codec.DecodeError:
             print(f"⚠️ JSON decode hatası: {raw[:100]}...")
             return
 
         msg_type = msg.get("type")
+        self._liveness.on_traffic(from_peer=msg_type in _PEER_TYPES)
+        if msg_type in ("probe_ack", "peer_probe_ack"):
+            ts = msg.get("ts")
+            if isinstance(ts, int):
+                self._liveness.on_probe_ack(SERVER if msg_type == "probe_ack" else PEER, ts)
+            return
+        if msg_type == "peer_probe":
+            # Telefonun probe'u: aynı ts ile yanıtla
+            self._send(codec.dumps({"type": "peer_probe_ack", "ts": msg.get("ts")}))
+            return
+
         if msg_type == "frame":
             print(f"📨 WebSocket mesajı alındı: type={msg_type}")
         elif msg_type:
             print(f"📨 WebSocket mesajı: type={msg_type}")
 
         if msg_type == "paired":
-            # Telefon bağlantısı gerçekleşti; stream URL'sini relay'den alacağız
+            # Telefon bağlantısı gerçekleşti; stream URL'sini relay'den alacağız.
+            # Yetenekler telefonun "relay" mesajıyla yeniden bildirilir.
+            self._set_binary_input(False)
+            self._latency.reset()
+            # İzleyicinin peer probe'ları telefona iletilmez
+            self._liveness.set_active(PEER, self._role == "pc")
+            if self._role == "pc":
+                self._transfers.resume()  # Yarım kalan aktarımlar kaldığı yerden
             self.paired.emit(msg.get("stream_url", ""))
 
+        elif msg_type == "role_changed":
+            self._role = msg.get("role", "viewer")
+            self._liveness.set_active(PEER, self._role == "pc")
+            self._transfers.pause()
+            self.role_changed.emit(self._role)
+
+        elif msg_type == "ack":
+            seq, ts = msg.get("seq"), msg.get("ts")
+            if isinstance(seq, int) and isinstance(ts, int):
+                self._on_ack(seq, ts)
+
+        elif msg_type == "relay":
+            caps = msg.get("caps") or []
+            self._set_binary_input(input_protocol.CAPABILITY in caps)
+
         elif msg_type == "stream_info":
             # Telefon stream başlayınca URL'sini iletir
             self.paired.emit(msg.get("url", ""))
@@ -141,25 +521,40 @@ class WsClient(QObject):
         elif msg_type == "frame":
             # Telefon WebSocket üzerinden JPEG frame gönderdi
             print(f"📥 Frame mesajı alındı!")
+            if msg.get("ch", Network.CHANNEL_SCREEN) == Network.CHANNEL_CAMERA:
+                self._on_camera_frame(msg)
+                return
+            if msg.get("tile"):
+                self._on_tile(msg)
             try:
                 data_str = msg.get("data", "")
                 if not data_str:
+                    if msg.get("tile"):
+                        return  # MJPEG yolu açıkken yalnızca karo gelir
                     print("⚠️ Frame mesajı boş data içeriyor")
                     logger.warning("Frame mesajı boş data içeriyor")
                     return
                 print(f"📥 Base64 data uzunluğu: {len(data_str)} karakter")
                 jpeg_bytes = base64.b64decode(data_str)
                 print(f"📥 Decode edildi: {len(jpeg_bytes)} bytes JPEG")
-                img = QImage()
-                if img.loadFromData(jpeg_bytes, "JPEG"):
+                verdict = (self._arbiter.classify(FrameArbiter.SOURCE_WS, jpeg_bytes)
+                           if self._arbiter else FrameArbiter.PRESENT)
+                if verdict == FrameArbiter.DUPLICATE:
+                    # Aynı frame MJPEG üzerinden zaten gösterildi
+                    return
+                if self._recorder:
+                    self._recorder.offer(jpeg_bytes, repeat=verdict == FrameArbiter.STATIC)
+                if verdict == FrameArbiter.STATIC:
+                    # Ekran değişmedi: decode ve yeniden çizim gereksiz
+                    return
+                if self._latest:
+                    self._latest.publish(jpeg_bytes)
+                img = self._screen_pool.decode(jpeg_bytes)
+                if img is not None:
+                    # QPixmap'e GUI thread'inde, ölçeklenmiş haliyle çevrilir
                     print(f"✅ JPEG decode başarılı: {img.width()}x{img.height()}")
-                    pixmap = QPixmap.fromImage(img)
-                    if pixmap.isNull():
-                        print("⚠️ Pixmap null!")
-                    else:
-                        print(f"✅ Pixmap oluşturuldu, emit ediliyor...")
-                        self.frame_received.emit(pixmap)
-                        logger.debug(f"Frame alındı ve gönderildi: {len(jpeg_bytes)} bytes")
+                    self.frame_received.emit(img)
+                    logger.debug(f"Frame alındı ve gönderildi: {len(jpeg_bytes)} bytes")
                 else:
                     print("❌ JPEG decode başarısız - loadFromData False döndü")
                     logger.warning("JPEG decode başarısız")
@@ -168,16 +563,75 @@ class WsClient(QObject):
                 logger.error(f"Frame decode hatası: {e}", exc_info=True)
 
         elif msg_type == "peer_disconnected":
+            self._set_binary_input(False)
+            self._liveness.set_active(PEER, False)
+            self._transfers.pause()
             self.peer_disconnected.emit()
 
         elif msg_type == "command":
             self.command_received.emit(msg)
 
+        elif msg_type == "transfer":
+            self._transfers.on_message(msg)
+
+        elif msg_type == "server_draining":
+            # Herkes aynı anda bağlanmasın: sunucunun verdiği pencerede rastgele bekle
+            window_ms = msg.get("reconnect_within_ms") or 0
+            with self._lock:
+                if ws is not self._ws or self._drain_timer is not None:
+                    return  # Eski soket veya taşınma zaten planlandı
+                timer = self._drain_timer = threading.Timer(
+                    random.uniform(0, window_ms) / 1000, self._migrate, (ws,))
+            timer.daemon = True
+            timer.start()
+            self.server_draining.emit()
+
         elif msg_type == "error":
             self.error_occurred.emit(msg.get("message", "Bilinmeyen hata"))
 
     def _on_error(self, ws, error):
+        if ws is not self._ws:
+            return  # Taşınma sonrası kapatılan eski bağlantı
+        if ws is self._warm:
+            logger.info(f"Ön ısıtılmış bağlantı hatası: {error}")
+            return
         self.error_occurred.emit(str(error))
 
     def _on_close(self, ws, code, msg):
+        if ws is not self._ws and self._ws is not None:
+            return  # Taşınma sonrası kapatılan eski bağlantı
+        with self._lock:
+            if ws is self._ws:
+                self._socket_open = False
+            if ws is self._warm:
+                # Isıtılmış soket koptu: UI'a yansımaz, bağlanırken yenisi açılır
+                self._warm = None
+                if ws is self._ws:
+                    self._ws = None
+                    self._warm_url = ""
+                logger.info(f"Ön ısıtılmış bağlantı kapandı (code={code})")
+                return
+            # Oturum koptu (taşınma soketi açılamadıysa eskisi de kapanır)
+            old = self._end_migration()
+        if old is not None:
+            old.close()
+        self._liveness.set_active(SERVER, False)
+        self._liveness.set_active(PEER, False)
+        self._transfers.pause()
         self.disconnected.emit(f"code={code}, msg={msg}")
+
+
+def _health_check(url: str) -> int:
+    """Sunucunun `GET /` sağlık ucu (ws→http, wss→https); HTTP durum kodu."""
+    import urllib.error
+    import urllib.parse
+    import urllib.request
+
+    parts = urllib.parse.urlsplit(url)
+    scheme = "https" if parts.scheme == "wss" else "http"
+    try:
+        with urllib.request.urlopen(urllib.parse.urlunsplit((scheme, parts.netloc, "/", "", "")),
+                                    timeout=Network.PREWARM_HEALTH_TIMEOUT_SEC) as r:
+            return r.status
+    except urllib.error.HTTPError as e:
+        return e.code  # Sunucu ayakta (ör. drain'de 503); WebSocket yine açılır
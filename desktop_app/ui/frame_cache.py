@@ -0,0 +1,104 @@
+"""
+Frame Önbelleği
+================
+ScreenWidget için boyut sınırlı (byte) LRU önbellek:
+  - Son decode edilmiş frame (QImage; alıcının tampon havuzundan, kopyasız)
+  - Son frame'in widget boyutuna göre ölçeklenmiş birkaç varyantı
+  - Oturum (bağlantı kodu) başına son frame ve küçük resim
+
+Varyantlar yalnızca son frame'e aittir; her yeni frame'de silinir. Bu yüzden
+yalnızca görüntü değişmezken (pencere boyutlandırma, duran ekran, duraklatılmış
+yayın) aynı boyuta dönüldüğünde ölçeklemeyi tekrarlamamayı sağlar; akan
+yayında her frame zaten bir kez ölçeklenir.
+
+Yeniden bağlanmada son bilinen frame anında gösterilebilir; başka bir
+oturuma dönülüyorsa elde yalnızca küçük resmi vardır ve o yalnızca yer
+tutucu olarak gösterilir (bkz. session_frame).
+"""
+
+from collections import OrderedDict
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QPixmap
+
+from desktop_app.config import Ui
+
+
+def _pixmap_bytes(pixmap: QPixmap | QImage) -> int:
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+class FrameCache:
+    """Son frame + ölçeklenmiş varyantlar + oturum küçük resimleri."""
+
+    def __init__(self, max_bytes: int = Ui.FRAME_CACHE_MAX_BYTES):
+        self._max_bytes = max_bytes
+        self._last: QImage | None = None
+        self._last_session: str = ""
+        # (genişlik, yükseklik) -> son frame'in ölçeklenmiş hali
+        self._scaled: OrderedDict[tuple[int, int], QPixmap] = OrderedDict()
+        self._scaled_bytes = 0
+        # oturum kodu -> küçük resim
+        self._thumbs: OrderedDict[str, QImage] = OrderedDict()
+
+    # ─── SON FRAME ─────────────────────────────────────────────────────────────
+
+    def set_frame(self, image: QImage, session: str = ""):
+        """Yeni frame geldi; eski frame'in ölçeklenmiş varyantları geçersiz."""
+        self._last = image
+        self._last_session = session
+        self._scaled.clear()
+        self._scaled_bytes = 0
+
+    @property
+    def last_frame(self) -> QImage | None:
+        return self._last
+
+    # ─── ÖLÇEKLENMİŞ VARYANTLAR ───────────────────────────────────────────────
+
+    def scaled(self, width: int, height: int) -> QPixmap | None:
+        """Son frame'in bu boyuttaki varyantı önbellekteyse döndür."""
+        key = (width, height)
+        pixmap = self._scaled.get(key)
+        if pixmap is not None:
+            self._scaled.move_to_end(key)
+        return pixmap
+
+    def put_scaled(self, width: int, height: int, pixmap: QPixmap):
+        key = (width, height)
+        old = self._scaled.pop(key, None)
+        if old is not None:
+            self._scaled_bytes -= _pixmap_bytes(old)
+        self._scaled[key] = pixmap
+        self._scaled_bytes += _pixmap_bytes(pixmap)
+        while (len(self._scaled) > Ui.FRAME_CACHE_MAX_VARIANTS
+               or self._scaled_bytes > self._max_bytes) and len(self._scaled) > 1:
+            _, evicted = self._scaled.popitem(last=False)
+            self._scaled_bytes -= _pixmap_bytes(evicted)
+
+    # ─── OTURUMLAR ─────────────────────────────────────────────────────────────
+
+    def remember_session(self):
+        """Son frame'in küçük resmini oturumuna kaydet (bağlantı kesilirken çağrılır)."""
+        session = self._last_session
+        if not session or self._last is None:
+            return
+        self._thumbs[session] = self._last.scaledToWidth(
+            Ui.FRAME_CACHE_THUMB_WIDTH, Qt.TransformationMode.SmoothTransformation
+        )
+        self._thumbs.move_to_end(session)
+        while len(self._thumbs) > Ui.FRAME_CACHE_MAX_SESSIONS:
+            self._thumbs.popitem(last=False)
+
+    def session_frame(self, session: str) -> tuple[QImage, bool] | None:
+        """
+        Oturumun son bilinen frame'i ve küçük resim olup olmadığı: aynı oturumsa
+        tam boy (False), değilse küçük resim (True; son frame yerine konmamalı).
+        """
+        if session and session == self._last_session and self._last is not None:
+            return self._last, False
+        thumb = self._thumbs.get(session)
+        return None if thumb is None else (thumb, True)
+
+    def thumbnail(self, session: str) -> QImage | None:
+        return self._thumbs.get(session)
@@ -5,18 +5,29 @@ PyQt6 ile hazırlanmış, AnyDesk benzeri telefon kontrol arayüzü.
 """
 
 import logging
+import time
+from typing import TYPE_CHECKING
+
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLineEdit, QLabel, QFrame, QStatusBar,
-    QSplitter, QGroupBox, QGridLayout,
+    QSplitter, QGroupBox, QGridLayout, QCheckBox, QFileDialog, QApplication,
 )
 from PyQt6.QtCore import Qt, QTimer, pyqtSlot
-from PyQt6.QtGui import QPixmap
+from PyQt6.QtGui import QImage, QPixmap
 
-from desktop_app.config import AppMeta, ServerDefaults, Network, Ui, AndroidKeyCodes
+from desktop_app.config import AppMeta, ServerDefaults, LocalApi, Network, Recording, Ui, AndroidKeyCodes
 from desktop_app.ui.screen_widget import ScreenWidget
 from desktop_app.network.ws_client import WsClient
-from desktop_app.network.mjpeg_receiver import MjpegReceiver
+from desktop_app.network.frame_arbiter import FrameArbiter
+from desktop_app.network.quality import QualityController
+from desktop_app.network.recorder import Recorder
+from desktop_app.ui import styles
+
+if TYPE_CHECKING:
+    # requests + MJPEG alıcısı ilk stream_url gelene kadar yüklenmez
+    from desktop_app.network.frame_api import FrameApi, LatestFrame
+    from desktop_app.network.mjpeg_receiver import MjpegReceiver
 
 logger = logging.getLogger(__name__)
 
@@ -30,120 +41,36 @@ class MainWindow(QMainWindow):
         self.setMinimumSize(AppMeta.MIN_WIDTH, AppMeta.MIN_HEIGHT)
         self.resize(AppMeta.DEFAULT_WIDTH, AppMeta.DEFAULT_HEIGHT)
 
-        self._ws_client = WsClient()
-        self._mjpeg = MjpegReceiver()
+        self._arbiter = FrameArbiter(self)
+        self._recorder = Recorder(transcode=Recording.TRANSCODE_H264)
+        self._latest: "LatestFrame | None" = None
+        self._api: "FrameApi | None" = None
+        if LocalApi.PORT:
+            # Otomasyon için yerel frame / girdi API'si (REMOTE_PHONE_API_PORT)
+            from desktop_app.network import frame_api
+
+            self._latest = frame_api.LatestFrame()
+        self._ws_client = WsClient(arbiter=self._arbiter, recorder=self._recorder,
+                                   latest=self._latest)
+        if self._latest is not None:
+            self._api = frame_api.FrameApi(self._latest, self._ws_client.send_command)
+            self._api.start()
+        self._quality = QualityController(self)
+        self._mjpeg: "MjpegReceiver | None" = None
+        self._ws_frames_paused = False
         self._connected = False
         self._camera_active = False
+        self._connect_started: float | None = None  # İlk frame süresi ölçülüyorsa Connect anı
 
         self._setup_style()
         self._build_ui()
         self._connect_signals()
-
-        self._heartbeat = QTimer(self)
-        self._heartbeat.setInterval(Network.HEARTBEAT_INTERVAL_MS)
-        self._heartbeat.timeout.connect(self._ws_client.send_heartbeat)
+        self._schedule_prewarm()
 
     # ─── STYLE ────────────────────────────────────────────────────────────────
 
     def _setup_style(self):
-        u = Ui
-        self.setStyleSheet(f"""
-            QMainWindow, QWidget {{
-                background-color: {u.BG_MAIN};
-                color: {u.TEXT_PRIMARY};
-                font-family: 'Segoe UI', sans-serif;
-                font-size: 13px;
-            }}
-            QGroupBox {{
-                border: 1px solid {u.BORDER};
-                border-radius: 8px;
-                margin-top: 8px;
-                padding-top: 16px;
-                font-weight: bold;
-                color: {u.ACCENT_GROUP};
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 12px;
-                padding: 0 4px;
-            }}
-            QLineEdit {{
-                background-color: {u.BG_INPUT};
-                border: 1px solid {u.BORDER_INPUT};
-                border-radius: 6px;
-                padding: 6px 10px;
-                color: {u.TEXT_INPUT};
-                selection-background-color: #4a4aaa;
-            }}
-            QLineEdit:focus {{
-                border: 1px solid {u.BORDER_FOCUS};
-            }}
-            QPushButton {{
-                border-radius: 6px;
-                padding: 8px 16px;
-                font-weight: bold;
-                font-size: 12px;
-            }}
-            QPushButton#btn_connect {{
-                background-color: {u.BTN_CONNECT_BG};
-                color: white;
-                border: none;
-            }}
-            QPushButton#btn_connect:hover {{ background-color: {u.BTN_CONNECT_HOVER}; }}
-            QPushButton#btn_connect:pressed {{ background-color: {u.BTN_CONNECT_PRESSED}; }}
-
-            QPushButton#btn_disconnect {{
-                background-color: {u.BTN_DISCONNECT_BG};
-                color: white;
-                border: none;
-            }}
-            QPushButton#btn_disconnect:hover {{ background-color: {u.BTN_DISCONNECT_HOVER}; }}
-
-            QPushButton.control_btn {{
-                background-color: {u.BTN_CONTROL_BG};
-                color: #b0b0e0;
-                border: 1px solid {u.BTN_CONTROL_BORDER};
-                padding: 10px;
-            }}
-            QPushButton.control_btn:hover {{
-                background-color: {u.BTN_CONTROL_HOVER_BG};
-                border-color: {u.BTN_CONTROL_HOVER_BORDER};
-                color: white;
-            }}
-            QPushButton.control_btn:pressed {{ background-color: #111130; }}
-
-            QPushButton#btn_camera_on {{
-                background-color: {u.BTN_CAM_ON_BG};
-                color: #80dd80;
-                border: 1px solid {u.BTN_CAM_ON_BORDER};
-                padding: 10px;
-                border-radius: 6px;
-            }}
-            QPushButton#btn_camera_on:hover {{ background-color: {u.BTN_CAM_ON_BORDER}; }}
-            QPushButton#btn_camera_on:checked {{
-                background-color: {u.BTN_CAM_ON_BORDER};
-                border-color: #50cc50;
-            }}
-
-            QPushButton#btn_camera_off {{
-                background-color: {u.BTN_CAM_OFF_BG};
-                color: #dd8080;
-                border: 1px solid {u.BTN_CAM_OFF_BORDER};
-                padding: 10px;
-                border-radius: 6px;
-            }}
-            QPushButton#btn_camera_off:hover {{ background-color: {u.BTN_CAM_OFF_BORDER}; }}
-
-            QStatusBar {{
-                background-color: {u.STATUS_BAR_BG};
-                color: {u.TEXT_MUTED};
-                border-top: 1px solid {u.BORDER};
-            }}
-            QSplitter::handle {{
-                background-color: {u.SPLITTER_HANDLE_BG};
-                width: 2px;
-            }}
-        """)
+        self.setStyleSheet(styles.main_window_qss())
 
     # ─── UI BUILD ─────────────────────────────────────────────────────────────
 
@@ -169,16 +96,21 @@ class MainWindow(QMainWindow):
         self._status_bar.showMessage(Ui.MSG_WAITING)
         self.setStatusBar(self._status_bar)
 
+        # Sunucu/telefon RTT'si ve girdi gecikmesi (telefon ack gönderiyorsa dolar)
+        self._lbl_rtt = QLabel("")
+        self._lbl_rtt.setStyleSheet(styles.color_qss(Ui.TEXT_MUTED))
+        self._status_bar.addPermanentWidget(self._lbl_rtt)
+        self._lbl_latency = QLabel("")
+        self._lbl_latency.setStyleSheet(styles.color_qss(Ui.TEXT_MUTED))
+        self._status_bar.addPermanentWidget(self._lbl_latency)
+        self._lbl_first_frame = QLabel("")
+        self._lbl_first_frame.setStyleSheet(styles.color_qss(Ui.TEXT_MUTED))
+        self._status_bar.addPermanentWidget(self._lbl_first_frame)
+
     def _build_header(self) -> QWidget:
         header = QFrame()
         header.setFixedHeight(Ui.HEADER_HEIGHT)
-        header.setStyleSheet(f"""
-            QFrame {{
-                background: qlineargradient(x1:0,y1:0,x2:1,y2:0,
-                    stop:0 {Ui.BG_HEADER_START}, stop:1 {Ui.BG_HEADER_END});
-                border-bottom: 1px solid {Ui.BORDER};
-            }}
-        """)
+        header.setStyleSheet(styles.header_qss())
         lay = QHBoxLayout(header)
         lay.setContentsMargins(20, 0, 20, 0)
 
@@ -188,9 +120,9 @@ class MainWindow(QMainWindow):
         lay.addStretch()
 
         self._lbl_status_dot = QLabel("⬤")
-        self._lbl_status_dot.setStyleSheet(f"font-size: 14px; color: {Ui.TEXT_DISCONNECTED};")
+        self._lbl_status_dot.setStyleSheet(styles.color_qss(Ui.TEXT_DISCONNECTED, 14))
         self._lbl_status_text = QLabel("Bağlı değil")
-        self._lbl_status_text.setStyleSheet(f"color: {Ui.TEXT_DISCONNECTED};")
+        self._lbl_status_text.setStyleSheet(styles.color_qss(Ui.TEXT_DISCONNECTED))
         lay.addWidget(self._lbl_status_dot)
         lay.addWidget(self._lbl_status_text)
         return header
@@ -220,6 +152,10 @@ class MainWindow(QMainWindow):
         self._inp_code.setMaxLength(ServerDefaults.CODE_LENGTH)
         conn_lay.addWidget(self._inp_code)
 
+        self._chk_view_only = QCheckBox("👁 Yalnızca izle")
+        self._chk_view_only.setToolTip("Oturuma kontrol etmeden izleyici olarak katıl")
+        conn_lay.addWidget(self._chk_view_only)
+
         btn_row = QHBoxLayout()
         self._btn_connect = QPushButton("🔌 Bağlan")
         self._btn_connect.setObjectName("btn_connect")
@@ -244,28 +180,39 @@ class MainWindow(QMainWindow):
         cam_lay.addWidget(self._btn_cam_off)
         lay.addWidget(grp_cam)
 
+        # Kayıt grubu
+        grp_rec = QGroupBox("Kayıt")
+        rec_lay = QVBoxLayout(grp_rec)
+        self._btn_record = QPushButton("⏺ Kaydı Başlat")
+        self._btn_record.setProperty("class", "control_btn")
+        self._btn_record.setCheckable(True)
+        self._btn_record.setEnabled(False)
+        rec_lay.addWidget(self._btn_record)
+        lay.addWidget(grp_rec)
+
+        # Aktarım grubu
+        grp_xfer = QGroupBox("Aktarım")
+        xfer_lay = QVBoxLayout(grp_xfer)
+        self._btn_send_file = QPushButton("📁 Dosya Gönder")
+        self._btn_send_clipboard = QPushButton("📋 Panoyu Gönder")
+        self._btn_get_clipboard = QPushButton("📥 Telefonun Panosunu Al")
+        self._transfer_buttons = [self._btn_send_file, self._btn_send_clipboard,
+                                  self._btn_get_clipboard]
+        for btn in self._transfer_buttons:
+            btn.setProperty("class", "control_btn")
+            btn.setEnabled(False)
+            xfer_lay.addWidget(btn)
+        lay.addWidget(grp_xfer)
+
         grp_keys = QGroupBox("Tuş Kontrolleri")
         keys_lay = QGridLayout(grp_keys)
         keys_lay.setSpacing(6)
+        grp_keys.setStyleSheet(styles.key_buttons_qss())
         key_codes = AndroidKeyCodes.as_mapping()
         self._key_buttons = []
         for text, row, col, key_id in AndroidKeyCodes.button_specs():
             btn = QPushButton(text)
             btn.setProperty("class", "control_btn")
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {Ui.BTN_CONTROL_BG};
-                    color: #b0b0e0;
-                    border: 1px solid {Ui.BTN_CONTROL_BORDER};
-                    padding: 8px;
-                    border-radius: 6px;
-                }}
-                QPushButton:hover {{
-                    background-color: {Ui.BTN_CONTROL_HOVER_BG};
-                    color: white;
-                }}
-                QPushButton:disabled {{ color: #444466; border-color: #222244; }}
-            """)
             btn.clicked.connect(lambda _, k=key_codes[key_id]: self._ws_client.send_key_event(k))
             btn.setEnabled(False)
             self._key_buttons.append(btn)
@@ -301,8 +248,16 @@ class MainWindow(QMainWindow):
         label.setStyleSheet("color: #6060aa; font-size: 11px; margin-bottom: 4px;")
         lay.addWidget(label)
 
+        # Ekran ve (açıksa) kamera yan yana; kamera ayrı kanaldan gelir
+        views = QHBoxLayout()
         self._screen = ScreenWidget()
-        lay.addWidget(self._screen, stretch=1)
+        views.addWidget(self._screen, stretch=1)
+        self._camera_view = QLabel()
+        self._camera_view.setFixedWidth(Ui.CAMERA_VIEW_WIDTH)
+        self._camera_view.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignHCenter)
+        self._camera_view.hide()
+        views.addWidget(self._camera_view)
+        lay.addLayout(views, stretch=1)
 
         # Koordinat göstergesi
         self._lbl_coords = QLabel("—")
@@ -320,6 +275,10 @@ class MainWindow(QMainWindow):
         self._btn_disconnect.clicked.connect(self._on_disconnect)
         self._btn_cam_on.clicked.connect(self._on_camera_on)
         self._btn_cam_off.clicked.connect(self._on_camera_off)
+        self._btn_record.toggled.connect(self._on_record_toggled)
+        self._btn_send_file.clicked.connect(self._on_send_file)
+        self._btn_send_clipboard.clicked.connect(self._on_send_clipboard)
+        self._btn_get_clipboard.clicked.connect(self._ws_client.request_clipboard)
 
         # WsClient sinyalleri
         self._ws_client.connected.connect(self._on_ws_connected)
@@ -329,15 +288,32 @@ class MainWindow(QMainWindow):
         self._ws_client.error_occurred.connect(self._on_error)
         # WebSocket üzerinden gelen kamera/ekran frame'leri
         self._ws_client.frame_received.connect(self._on_frame_received)
-
-        # MJPEG sinyalleri
-        self._mjpeg.frame_ready.connect(self._screen.set_frame)
-        self._mjpeg.error_occurred.connect(self._on_mjpeg_error)
-        self._mjpeg.stream_stopped.connect(self._on_stream_stopped)
+        self._ws_client.camera_frame_received.connect(self._on_camera_frame)
+        self._ws_client.binary_input_changed.connect(self._screen.set_live_drag)
+        self._ws_client.latency_updated.connect(self._on_latency_updated)
+        self._ws_client.rtt_updated.connect(self._on_rtt_updated)
+        self._ws_client.rtt_updated.connect(self._quality.on_rtt)
+        self._ws_client.link_lost.connect(self._on_link_lost)
+        self._ws_client.server_draining.connect(self._on_server_draining)
+        self._ws_client.role_changed.connect(self._on_role_changed)
+        self._ws_client.transfer_progress.connect(self._on_transfer_progress)
+        self._ws_client.transfer_finished.connect(self._on_transfer_finished)
+        self._ws_client.clipboard_received.connect(self._on_clipboard_received)
+        self._ws_client.file_received.connect(self._on_file_received)
+        self._ws_client.server_ready.connect(self._on_server_ready)
+        self._ws_client.frame_received.connect(self._note_first_frame)
+        self._quality.level_changed.connect(self._on_quality_changed)
+
+        # Çift yol tekilleştirme
+        self._arbiter.redundant_path.connect(self._on_redundant_path)
+        self._arbiter.static_changed.connect(self._quality.on_static)
 
         # Ekran dokunma olayları
         self._screen.touch_event.connect(self._on_touch)
         self._screen.swipe_event.connect(self._on_swipe)
+        self._screen.drag_event.connect(self._on_drag)
+        self._screen.roi_changed.connect(self._ws_client.set_roi)
+        self._ws_client.tile_received.connect(self._screen.set_tile)
 
     # ─── SLOTS ────────────────────────────────────────────────────────────────
 
@@ -351,21 +327,27 @@ class MainWindow(QMainWindow):
         if len(code) != ServerDefaults.CODE_LENGTH or not code.isdigit():
             self._set_status(Ui.MSG_CODE_MUST_BE_6_DIGITS, error=True)
             return
-        # URL'yi normalize et: ws:// veya wss:// yoksa ekle
-        if not (server.startswith("ws://") or server.startswith("wss://")):
-            server = "ws://" + server
+        server = self._server_url()
         self._inp_server.setText(server)
 
         self._btn_connect.setEnabled(False)
+        self._connect_started = time.monotonic()
+        self._lbl_first_frame.clear()
         self._set_status(Ui.MSG_CONNECTING)
-        self._ws_client.connect_to_server(server, code)
+        # Aynı oturuma yeniden bağlanılıyorsa son frame'i stream beklenirken göster
+        self._screen.set_session(code)
+        self._screen.show_last_frame(code)
+        role = "viewer" if self._chk_view_only.isChecked() else "pc"
+        self._ws_client.connect_to_server(server, code, role)
 
     @pyqtSlot()
     def _on_disconnect(self):
-        self._mjpeg.stop()
+        self._ws_frames_paused = False
+        self._stop_mjpeg()
         self._ws_client.disconnect()
         self._set_connected(False)
         self._screen.clear_frame()
+        self._schedule_prewarm()
 
     @pyqtSlot()
     def _on_ws_connected(self):
@@ -381,17 +363,19 @@ class MainWindow(QMainWindow):
             self._set_status(f"Bağlantı kesildi — {reason}", error=True)
         self._btn_connect.setEnabled(True)
         self._screen.clear_frame()
+        self._schedule_prewarm()
 
     @pyqtSlot(str)
     def _on_paired(self, stream_url: str):
         """Telefon ile eşleşildi; stream URL'si alındıysa MJPEG'i başlat."""
         self._set_connected(True)
+        self._resume_ws_frames()
         if stream_url and stream_url.startswith("http"):
             # Sadece geçerli HTTP URL'leri için MJPEG'i dene
             # Emülatör IP'leri (10.0.2.x) veya 0.0.0.0 erişilemez, bu yüzden atla
             if "0.0.0.0" not in stream_url and "10.0.2." not in stream_url:
                 try:
-                    self._mjpeg.start(stream_url)
+                    self._ensure_mjpeg().start(stream_url)
                     self._set_status(f"🟢 Bağlandı | Stream: {stream_url}")
                 except Exception as e:
                     # MJPEG başlatılamazsa WebSocket frame'lerine güven
@@ -401,10 +385,14 @@ class MainWindow(QMainWindow):
                 self._set_status(Ui.MSG_PAIRED_WS)
         else:
             self._set_status(Ui.MSG_PAIRED_WS)
+        if self._ws_client.view_only:
+            self._set_status(Ui.MSG_VIEW_ONLY)
 
     @pyqtSlot()
     def _on_peer_disconnected(self):
-        self._mjpeg.stop()
+        # Telefon gitti; WebSocket frame'lerini yeniden açma komutu gönderilmez
+        self._ws_frames_paused = False
+        self._stop_mjpeg()
         self._screen.clear_frame()
         self._set_connected(False)
         self._set_status(Ui.MSG_PEER_DISCONNECTED, error=True)
@@ -413,16 +401,71 @@ class MainWindow(QMainWindow):
     def _on_error(self, msg: str):
         self._set_status(f"Hata: {msg}", error=True)
 
-    @pyqtSlot(QPixmap)
-    def _on_frame_received(self, pixmap: QPixmap):
+    @pyqtSlot(QImage)
+    def _on_frame_received(self, image: QImage):
         """WebSocket üzerinden frame geldiğinde çağrılır."""
-        print(f"🎯 MainWindow._on_frame_received çağrıldı: {pixmap.width()}x{pixmap.height()}")
-        logger.debug(f"Frame alındı: {pixmap.width()}x{pixmap.height()}")
-        self._screen.set_frame(pixmap)
+        print(f"🎯 MainWindow._on_frame_received çağrıldı: {image.width()}x{image.height()}")
+        logger.debug(f"Frame alındı: {image.width()}x{image.height()}")
+        self._screen.set_frame(image)
+
+    @pyqtSlot(QImage)
+    def _note_first_frame(self, image: QImage):
+        """Connect'ten ilk görüntüye geçen süre (WebSocket veya MJPEG, hangisi önce)."""
+        if self._connect_started is None:
+            return
+        elapsed_ms = (time.monotonic() - self._connect_started) * 1000
+        self._connect_started = None
+        warm = self._ws_client.prewarmed
+        logger.info(f"İlk frame {elapsed_ms:.0f} ms (ısıtılmış bağlantı: {warm})")
+        self._lbl_first_frame.setText(Ui.MSG_FIRST_FRAME.format(
+            ms=elapsed_ms, warm=" · ısıtılmış bağlantı" if warm else "",
+        ))
+
+    @pyqtSlot(float)
+    def _on_server_ready(self, elapsed_ms: float):
+        if self._btn_connect.isEnabled():  # Bu arada Connect'e basılmadıysa
+            self._set_status(Ui.MSG_SERVER_READY.format(ms=elapsed_ms))
+
+    @pyqtSlot(QImage)
+    def _on_camera_frame(self, image: QImage):
+        """Kamera kanalından gelen frame; ekranın yanında gösterilir."""
+        if not (self._camera_active or self._ws_client.view_only):
+            return  # Kapatma komutundan sonra yoldaki son frame'ler
+        self._camera_view.setPixmap(QPixmap.fromImage(image.scaledToWidth(
+            Ui.CAMERA_VIEW_WIDTH, Qt.TransformationMode.SmoothTransformation,
+        )))
+        self._camera_view.show()
+
+    def _hide_camera(self):
+        self._camera_active = False
+        self._camera_view.clear()
+        self._camera_view.hide()
+
+    @pyqtSlot(str)
+    def _on_redundant_path(self, source: str):
+        """Bir yol sürekli geç kalıyor; o yoldan frame gönderimini durdur."""
+        if source == FrameArbiter.SOURCE_WS:
+            # MJPEG önde: telefon WebSocket'e frame basmayı bıraksın (relay bant genişliği)
+            self._ws_client.set_ws_frames(False)
+            self._ws_frames_paused = True
+            self._set_status(Ui.MSG_WS_FRAMES_PAUSED)
+        else:
+            # WebSocket önde: HTTP bağlantısını kapatmak telefonun MJPEG yayınını keser
+            self._stop_mjpeg()
+            self._set_status(Ui.MSG_MJPEG_REDUNDANT)
+        logger.info(f"Gereksiz frame yolu kapatıldı: {source}")
+
+    def _resume_ws_frames(self):
+        """MJPEG yolu kaybolduğunda WebSocket frame'lerini yeniden aç."""
+        self._arbiter.reset()
+        if self._ws_frames_paused:
+            self._ws_frames_paused = False
+            self._ws_client.set_ws_frames(True)
 
     @pyqtSlot(str)
     def _on_mjpeg_error(self, error_msg: str):
         """MJPEG stream hatası - WebSocket aktifse sadece bilgilendir."""
+        self._resume_ws_frames()
         if self._connected:
             # WebSocket bağlantısı aktifse, MJPEG hatası kritik değil
             # Sadece bilgilendirme mesajı göster, hata olarak gösterme
@@ -436,6 +479,7 @@ class MainWindow(QMainWindow):
         # MJPEG stream durdu ama WebSocket hala aktif olabilir
         # Ekranı temizleme - WebSocket frame'leri gelmeye devam edebilir
         # Sadece durumu güncelle, hata olarak gösterme
+        self._resume_ws_frames()
         if self._connected:
             self._set_status("🟢 Bağlandı (WebSocket modu) | HTTP stream durdu, WebSocket aktif")
         else:
@@ -451,45 +495,187 @@ class MainWindow(QMainWindow):
     @pyqtSlot()
     def _on_camera_off(self):
         self._ws_client.send_camera_off()
-        self._camera_active = False
+        self._hide_camera()
         self._set_status(Ui.MSG_CAMERA_OFF)
 
+    @pyqtSlot(bool)
+    def _on_record_toggled(self, on: bool):
+        if on:
+            self._recorder.start()
+            self._btn_record.setText("⏹ Kaydı Durdur")
+            self._set_status(Ui.MSG_RECORDING_ON.format(path=Recording.DIRECTORY))
+        else:
+            self._recorder.stop()
+            self._btn_record.setText("⏺ Kaydı Başlat")
+            self._set_status(Ui.MSG_RECORDING_OFF.format(
+                frames=self._recorder.recorded, segments=len(self._recorder.segments),
+                dropped=self._recorder.dropped,
+            ))
+
+    @pyqtSlot()
+    def _on_send_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Telefona gönderilecek dosya")
+        if path:
+            self._ws_client.send_file(path)
+
+    @pyqtSlot()
+    def _on_send_clipboard(self):
+        text = QApplication.clipboard().text()
+        if text:
+            self._ws_client.send_clipboard(text)
+
+    @pyqtSlot(int, int, int)
+    def _on_transfer_progress(self, tid: int, sent: int, total: int):
+        self._set_status(Ui.MSG_TRANSFER_PROGRESS.format(
+            sent_mb=sent / 1e6, total_mb=total / 1e6, percent=100 * sent / max(total, 1),
+        ))
+
+    @pyqtSlot(int, bool, str)
+    def _on_transfer_finished(self, tid: int, ok: bool, reason: str):
+        if ok:
+            self._set_status(Ui.MSG_TRANSFER_DONE)
+        else:
+            self._set_status(Ui.MSG_TRANSFER_FAILED.format(reason=reason), error=True)
+
+    @pyqtSlot(str)
+    def _on_clipboard_received(self, text: str):
+        QApplication.clipboard().setText(text)
+        self._set_status(Ui.MSG_CLIPBOARD_RECEIVED.format(chars=len(text)))
+
+    @pyqtSlot(str)
+    def _on_file_received(self, path: str):
+        self._set_status(Ui.MSG_FILE_RECEIVED.format(path=path))
+
     @pyqtSlot(float, float)
     def _on_touch(self, x: float, y: float):
+        if self._ws_client.view_only:
+            return
         self._ws_client.send_touch(x, y)
         self._lbl_coords.setText(f"Dokunma: ({x:.3f}, {y:.3f})")
 
     @pyqtSlot(float, float, float, float)
     def _on_swipe(self, x1, y1, x2, y2):
+        if self._ws_client.view_only:
+            return
         self._ws_client.send_swipe(x1, y1, x2, y2)
         self._lbl_coords.setText(f"Kaydırma: ({x1:.2f},{y1:.2f}) → ({x2:.2f},{y2:.2f})")
 
+    @pyqtSlot(str, float, float)
+    def _on_drag(self, phase: str, x: float, y: float):
+        if self._ws_client.view_only:
+            return
+        self._ws_client.send_pointer(phase, x, y)
+        self._lbl_coords.setText(f"Sürükleme ({phase}): ({x:.3f}, {y:.3f})")
+
+    @pyqtSlot(dict)
+    def _on_latency_updated(self, stats: dict):
+        if stats["acks_seen"] and stats["samples"]:
+            self._lbl_latency.setText(Ui.MSG_LATENCY.format(**stats))
+
+    @pyqtSlot(str, float)
+    def _on_rtt_updated(self, target: str, rtt_ms: float):
+        fmt = lambda v: "—" if v is None else f"{v:.0f} ms"
+        self._lbl_rtt.setText(Ui.MSG_RTT.format(
+            server=fmt(self._ws_client.rtt("server")), peer=fmt(self._ws_client.rtt("peer")),
+        ))
+
+    @pyqtSlot(str)
+    def _on_link_lost(self, target: str):
+        # Sunucu kopmasını WsClient bağlantıyı kapatarak bildirir (disconnected)
+        if target == "peer" and self._connected:
+            self._set_status(Ui.MSG_PEER_UNRESPONSIVE, error=True)
+
+    @pyqtSlot()
+    def _on_server_draining(self):
+        # WsClient kendisi yeniden bağlanır; eşleşince _on_paired durumu günceller
+        self._set_status(Ui.MSG_SERVER_DRAINING)
+
+    @pyqtSlot(str)
+    def _on_role_changed(self, role: str):
+        # Başka bir PC kontrolü devraldı; bu pencere izlemeye devam eder
+        self._set_connected(self._connected)
+        self._set_status(Ui.MSG_VIEW_ONLY)
+
+    @pyqtSlot(int)
+    def _on_quality_changed(self, level: int):
+        self._ws_client.set_quality(level)
+        self._set_status(Ui.MSG_QUALITY.format(level=level))
+
     # ─── HELPER ───────────────────────────────────────────────────────────────
 
+    def _ensure_mjpeg(self) -> "MjpegReceiver":
+        """MJPEG alıcısını (ve requests'i) ilk ihtiyaçta yükle."""
+        if self._mjpeg is None:
+            from desktop_app.network.mjpeg_receiver import MjpegReceiver
+
+            self._mjpeg = MjpegReceiver(arbiter=self._arbiter, recorder=self._recorder,
+                                        latest=self._latest)
+            self._mjpeg.frame_ready.connect(self._screen.set_frame)
+            self._mjpeg.frame_ready.connect(self._note_first_frame)
+            self._mjpeg.error_occurred.connect(self._on_mjpeg_error)
+            self._mjpeg.stream_stopped.connect(self._on_stream_stopped)
+        return self._mjpeg
+
+    def _server_url(self) -> str:
+        """Sunucu adresi; ws:// veya wss:// yoksa ws:// eklenir."""
+        server = self._inp_server.text().strip()
+        if server and not (server.startswith("ws://") or server.startswith("wss://")):
+            server = "ws://" + server
+        return server
+
+    def _schedule_prewarm(self):
+        if Network.PREWARM:
+            # websocket-client / urllib pencere çizildikten sonra, arka planda yüklenir
+            QTimer.singleShot(Network.PREWARM_DELAY_MS, self._prewarm)
+
+    @pyqtSlot()
+    def _prewarm(self):
+        """Kod beklenirken sunucuyu uyandır ve soketi aç (bkz. WsClient.prewarm)."""
+        server = self._server_url()
+        if server and not self._connected and self._btn_connect.isEnabled():
+            self._ws_client.prewarm(server)
+
+    def _stop_mjpeg(self):
+        if self._mjpeg is not None:
+            self._mjpeg.stop()
+
     def _set_connected(self, connected: bool):
         self._connected = connected
         color = Ui.TEXT_SUCCESS if connected else Ui.TEXT_DISCONNECTED
         text = "Bağlandı" if connected else "Bağlı değil"
-        self._lbl_status_dot.setStyleSheet(f"font-size: 14px; color: {color};")
-        self._lbl_status_text.setStyleSheet(f"color: {color};")
+        self._lbl_status_dot.setStyleSheet(styles.color_qss(color, 14))
+        self._lbl_status_text.setStyleSheet(styles.color_qss(color))
         self._lbl_status_text.setText(text)
 
-        for btn in [self._btn_cam_on, self._btn_cam_off, *self._key_buttons]:
-            btn.setEnabled(connected)
+        control = connected and not self._ws_client.view_only
+        for btn in [self._btn_cam_on, self._btn_cam_off, *self._key_buttons,
+                    *self._transfer_buttons]:
+            btn.setEnabled(control)
+        self._btn_record.setEnabled(connected)
+        self._chk_view_only.setEnabled(not connected)
         self._btn_connect.setEnabled(not connected)
         self._btn_disconnect.setEnabled(connected)
 
-        if connected:
-            self._heartbeat.start()
-        else:
-            self._heartbeat.stop()
+        if not connected:
+            self._btn_record.setChecked(False)  # Açıksa kaydı kapatır
+            self._hide_camera()
+            self._lbl_rtt.clear()
+            self._lbl_latency.clear()
+            self._quality.reset()
+            self._connect_started = None
 
     def _set_status(self, msg: str, error: bool = False):
         color = Ui.TEXT_ERROR if error else Ui.TEXT_MUTED
-        self._status_bar.setStyleSheet(f"color: {color};")
+        qss = styles.color_qss(color)
+        if self._status_bar.styleSheet() != qss:
+            # Her durum mesajında stil yeniden parse edilmesin
+            self._status_bar.setStyleSheet(qss)
         self._status_bar.showMessage(msg)
 
     def closeEvent(self, event):
-        self._mjpeg.stop()
+        self._stop_mjpeg()
+        self._recorder.stop()
+        if self._api is not None:
+            self._api.stop()
         self._ws_client.disconnect()
         super().closeEvent(event)
@@ -4,13 +4,24 @@ Ekran Görüntüsü Widget'ı
 MJPEG stream'inden gelen frame'leri gösterir.
 Tıklama ve sürükleme olaylarını normalize koordinatlar olarak
 sinyal ile yayar (touch/swipe simülasyonu için).
+
+Yakınlaştırma: fare tekerleği imlecin altındaki noktayı sabit tutarak
+görünür bölgeyi (ROI) daraltır, orta tık tam ekrana döner. Bölge
+`roi_changed` ile bildirilir; telefon o bölgeyi tam çözünürlükte ayrı bir
+karo (tile) olarak gönderir. Karo gelene kadar ve karonun kapsamadığı
+kısımlarda düşük çözünürlüklü tam ekran frame'in büyütülmüş hali görünür.
+
+Frame'ler alıcının tampon havuzundan QImage olarak gelir; tam boy QPixmap
+kopyası yapılmaz, yalnızca widget boyutuna ölçeklenmiş hali QPixmap'e çevrilir.
 """
 
 from PyQt6.QtWidgets import QLabel, QSizePolicy
-from PyQt6.QtCore import Qt, pyqtSignal, QPoint
-from PyQt6.QtGui import QPixmap, QPainter, QColor, QFont
+from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QRect, QRectF, QTimer, QElapsedTimer
+from PyQt6.QtGui import QImage, QPixmap, QPainter, QColor, QFont
 
 from desktop_app.config import Ui
+from desktop_app.ui import styles
+from desktop_app.ui.frame_cache import FrameCache
 
 
 class ScreenWidget(QLabel):
@@ -20,53 +31,167 @@ class ScreenWidget(QLabel):
     Sinyaller:
         touch_event(x, y)           - Normalize [0,1] koordinatlarda tıklama
         swipe_event(x1,y1,x2,y2)   - Normalize koordinatlarda kaydırma
+        drag_event(phase, x, y)     - Canlı sürükleme adımı ("down"/"move"/"up");
+                                      sadece set_live_drag(True) iken, swipe yerine
+        roi_changed(x, y, w, h)     - Görünen bölge; (0, 0, 1, 1) tam ekran
     """
 
     touch_event = pyqtSignal(float, float)
     swipe_event = pyqtSignal(float, float, float, float)
+    drag_event = pyqtSignal(str, float, float)
+    roi_changed = pyqtSignal(float, float, float, float)
+
+    FULL_ROI = (0.0, 0.0, 1.0, 1.0)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.setMinimumSize(280, 500)
-        self.setStyleSheet(f"""
-            QLabel {{
-                background-color: {Ui.BG_CARD};
-                border: 2px solid {Ui.SCREEN_BORDER};
-                border-radius: 12px;
-            }}
-        """)
-
-        self._current_pixmap: QPixmap | None = None
+        self.setStyleSheet(styles.screen_qss())
+
+        self._current_frame: QImage | None = None
         self._drag_start: QPoint | None = None
+        self._live_drag = False
+        self._dragging = False
+        self._drag_clock = QElapsedTimer()
         self._is_streaming = False
+        self._session: str = ""
+        self._cache = FrameCache()
+        self._zoom = 1.0
+        self._roi = self.FULL_ROI
+        self._tile: QPixmap | None = None
+        self._tile_roi = self.FULL_ROI
+
+        # Boyutlandırma sırasında hızlı ölçekle, durunca bir kez kaliteli ölçekle
+        self._smooth_timer = QTimer(self)
+        self._smooth_timer.setSingleShot(True)
+        self._smooth_timer.setInterval(Ui.RESIZE_SMOOTH_DELAY_MS)
+        self._smooth_timer.timeout.connect(self._render)
+
+        # Tekerlek çevrilirken her adımda komut gönderilmesin
+        self._roi_timer = QTimer(self)
+        self._roi_timer.setSingleShot(True)
+        self._roi_timer.setInterval(Ui.ROI_SEND_DELAY_MS)
+        self._roi_timer.timeout.connect(lambda: self.roi_changed.emit(*self._roi))
 
         self._show_placeholder()
 
     # ─── PUBLIC ────────────────────────────────────────────────────────────────
 
-    def set_frame(self, pixmap: QPixmap):
+    def set_frame(self, image: QImage):
         """Yeni bir frame göster."""
-        if pixmap is None or pixmap.isNull():
-            print("⚠️ ScreenWidget.set_frame: Null veya geçersiz pixmap!")
+        if image is None or image.isNull():
+            print("⚠️ ScreenWidget.set_frame: Null veya geçersiz frame!")
             return
-        self._current_pixmap = pixmap
+        self._current_frame = image
+        self._cache.set_frame(image, self._session)
         self._is_streaming = True
         self._render()
-        print(f"✅ Frame gösterildi: {pixmap.width()}x{pixmap.height()}")
+        print(f"✅ Frame gösterildi: {image.width()}x{image.height()}")
+
+    def set_tile(self, pixmap: QPixmap, x: float, y: float, w: float, h: float):
+        """Yakınlaştırılan bölgenin telefondan gelen yüksek çözünürlüklü karosu."""
+        if self._zoom == 1.0 or pixmap.isNull():
+            return
+        self._tile = pixmap
+        self._tile_roi = (x, y, w, h)
+        self._render()
+
+    def reset_zoom(self):
+        """Tam ekran görünümüne dön."""
+        if self._zoom == 1.0:
+            return
+        self._zoom = 1.0
+        self._set_roi(self.FULL_ROI)
+        self._render()
+
+    def set_session(self, code: str):
+        """Gelen frame'lerin ait olduğu oturum (bağlantı kodu)."""
+        self._session = code
+
+    def set_live_drag(self, enabled: bool):
+        """Sürüklemeyi bırakınca tek swipe yerine adım adım (drag_event) yay."""
+        self._live_drag = enabled
+
+    def show_last_frame(self, code: str) -> bool:
+        """
+        Yeniden bağlanırken oturumun son bilinen frame'ini hemen göster.
+        Stream devam edince gerçek frame'ler bunun üzerine yazılır.
+        """
+        found = self._cache.session_frame(code)
+        if found is None:
+            return False
+        image, thumbnail = found
+        if thumbnail:
+            # Küçük resim yalnızca yer tutucu: son frame olarak saklanmaz,
+            # ilk gerçek frame gelene kadar dokunma / yakınlaştırma kapalı kalır
+            self.setPixmap(QPixmap.fromImage(image.scaled(
+                self.size(), Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )))
+            return True
+        self._current_frame = image
+        self._cache.set_frame(image, code)
+        self._render()
+        return True
 
     def clear_frame(self):
-        """Stream durduğunda placeholder göster."""
-        self._current_pixmap = None
+        """Stream durduğunda placeholder göster (son frame önbellekte kalır)."""
+        if self._is_streaming:
+            self._cache.remember_session()
+        self._smooth_timer.stop()
+        self.reset_zoom()
+        self._current_frame = None
         self._is_streaming = False
         self._show_placeholder()
 
     # ─── MOUSE EVENTS ──────────────────────────────────────────────────────────
 
+    def wheelEvent(self, event):
+        if not self._current_frame:
+            return
+        steps = event.angleDelta().y() / 120
+        zoom = min(self._zoom * Ui.ZOOM_STEP ** steps, Ui.ZOOM_MAX)
+        if zoom < 1.01:
+            zoom = 1.0  # Kayan nokta artığı tam ekranı engellemesin
+        if zoom == self._zoom:
+            return
+        pos = event.position()
+        # İmlecin altındaki ekran noktası yakınlaştırmadan sonra da aynı yerde kalsın
+        fx = pos.x() / max(self.width(), 1)
+        fy = pos.y() / max(self.height(), 1)
+        px, py = self._normalize(pos.x(), pos.y())
+        size = 1.0 / zoom
+        x = min(max(px - fx * size, 0.0), 1.0 - size)
+        y = min(max(py - fy * size, 0.0), 1.0 - size)
+        self._zoom = zoom
+        self._set_roi((x, y, size, size) if zoom > 1.0 else self.FULL_ROI)
+        self._render(fast=True)
+        self._smooth_timer.start()
+
     def mousePressEvent(self, event):
-        if event.button() == Qt.MouseButton.LeftButton:
+        if event.button() == Qt.MouseButton.MiddleButton:
+            self.reset_zoom()
+        elif event.button() == Qt.MouseButton.LeftButton:
             self._drag_start = event.pos()
+            self._dragging = False
+
+    def mouseMoveEvent(self, event):
+        if not self._live_drag or self._drag_start is None:
+            return
+        pos = event.pos()
+        if not self._dragging:
+            # Eşik aşılana kadar tıklama sayılır
+            if (abs(pos.x() - self._drag_start.x()) < Ui.TOUCH_THRESHOLD_PX
+                    and abs(pos.y() - self._drag_start.y()) < Ui.TOUCH_THRESHOLD_PX):
+                return
+            self._dragging = True
+            self.drag_event.emit("down", *self._normalize(self._drag_start.x(), self._drag_start.y()))
+        elif self._drag_clock.isValid() and self._drag_clock.elapsed() < Ui.DRAG_MOVE_INTERVAL_MS:
+            return
+        self._drag_clock.start()
+        self.drag_event.emit("move", *self._normalize(pos.x(), pos.y()))
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton and self._drag_start:
@@ -74,6 +199,12 @@ class ScreenWidget(QLabel):
             start = self._drag_start
             self._drag_start = None
 
+            if self._dragging:
+                # Canlı sürükleme: son konum "up" ile gönderilir
+                self._dragging = False
+                self.drag_event.emit("up", *self._normalize(end.x(), end.y()))
+                return
+
             dx = abs(end.x() - start.x())
             dy = abs(end.y() - start.y())
 
@@ -90,26 +221,68 @@ class ScreenWidget(QLabel):
     # ─── INTERNAL ──────────────────────────────────────────────────────────────
 
     def _normalize(self, x: int, y: int) -> tuple[float, float]:
-        """Widget koordinatlarını [0,1] aralığına normalize et."""
+        """Widget koordinatlarını (yakınlaştırılmış bölge dahil) [0,1] aralığına normalize et."""
         w = max(self.width(), 1)
         h = max(self.height(), 1)
+        rx, ry, rw, rh = self._roi
         p = Ui.COORD_PRECISION
-        return round(x / w, p), round(y / h, p)
-
-    def _render(self):
-        """Mevcut pixmap'i widget boyutuna uyarla."""
-        if self._current_pixmap:
-            scaled = self._current_pixmap.scaled(
-                self.size(),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation,
-            )
-            self.setPixmap(scaled)
+        return round(rx + x / w * rw, p), round(ry + y / h * rh, p)
+
+    def _set_roi(self, roi: tuple[float, float, float, float]):
+        self._roi = roi
+        self._tile = None  # Eski bölgenin karosu yeni bölgeye uymaz
+        self._roi_timer.start()
+
+    def _render(self, fast: bool = False):
+        """
+        Mevcut pixmap'i widget boyutuna uyarla.
+        Bu boyut önbellekteyse tekrar ölçeklenmez; `fast` ise (boyutlandırma
+        sırasında) düşük kaliteli ölçeklenir ve önbelleğe yazılmaz.
+        """
+        if not self._current_frame:
+            return
+        if self._zoom != 1.0:
+            self._render_zoomed(fast)
+            return
+        w, h = self.width(), self.height()
+        scaled = self._cache.scaled(w, h)
+        if scaled is None:
+            mode = (Qt.TransformationMode.FastTransformation if fast
+                    else Qt.TransformationMode.SmoothTransformation)
+            scaled = QPixmap.fromImage(self._current_frame.scaled(
+                self.size(), Qt.AspectRatioMode.KeepAspectRatio, mode,
+            ))
+            if not fast:
+                self._cache.put_scaled(w, h, scaled)
+        self.setPixmap(scaled)
+
+    def _render_zoomed(self, fast: bool):
+        """
+        Görünen bölgeyi tam ekran frame'den kırpıp büyüt, üstüne karoyu çiz.
+        Bölge her an değişebildiği için ölçeklenmiş kopyalar önbelleğe alınmaz.
+        """
+        base = self._current_frame
+        rx, ry, rw, rh = self._roi
+        src = QRect(int(rx * base.width()), int(ry * base.height()),
+                    max(int(rw * base.width()), 1), max(int(rh * base.height()), 1))
+        mode = (Qt.TransformationMode.FastTransformation if fast
+                else Qt.TransformationMode.SmoothTransformation)
+        canvas = base.copy(src).scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatio, mode)
+        if self._tile is not None:
+            tx, ty, tw, th = self._tile_roi
+            cw, ch = canvas.width(), canvas.height()
+            target = QRectF((tx - rx) / rw * cw, (ty - ry) / rh * ch, tw / rw * cw, th / rh * ch)
+            painter = QPainter(canvas)
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, not fast)
+            painter.drawPixmap(target, self._tile, QRectF(self._tile.rect()))
+            painter.end()
+        self.setPixmap(QPixmap.fromImage(canvas))
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        if self._current_pixmap:
-            self._render()
+        if self._current_frame:
+            self._render(fast=True)
+            self._smooth_timer.start()
 
     def _show_placeholder(self):
         """Bağlantı bekleme ekranı."""
@@ -0,0 +1,161 @@
+"""
+Arayüz Stil Sayfaları
+======================
+Qt stil sayfaları (QSS) her çağrıda f-string ile yeniden üretilmek yerine
+burada bir kez üretilir ve önbellekten döndürülür.
+"""
+
+from functools import lru_cache
+
+from desktop_app.config import Ui
+
+
+@lru_cache(maxsize=None)
+def main_window_qss() -> str:
+    """Ana pencerenin tamamına uygulanan tema."""
+    return f"""
+        QMainWindow, QWidget {{
+            background-color: {Ui.BG_MAIN};
+            color: {Ui.TEXT_PRIMARY};
+            font-family: 'Segoe UI', sans-serif;
+            font-size: 13px;
+        }}
+        QGroupBox {{
+            border: 1px solid {Ui.BORDER};
+            border-radius: 8px;
+            margin-top: 8px;
+            padding-top: 16px;
+            font-weight: bold;
+            color: {Ui.ACCENT_GROUP};
+        }}
+        QGroupBox::title {{
+            subcontrol-origin: margin;
+            left: 12px;
+            padding: 0 4px;
+        }}
+        QLineEdit {{
+            background-color: {Ui.BG_INPUT};
+            border: 1px solid {Ui.BORDER_INPUT};
+            border-radius: 6px;
+            padding: 6px 10px;
+            color: {Ui.TEXT_INPUT};
+            selection-background-color: #4a4aaa;
+        }}
+        QLineEdit:focus {{
+            border: 1px solid {Ui.BORDER_FOCUS};
+        }}
+        QPushButton {{
+            border-radius: 6px;
+            padding: 8px 16px;
+            font-weight: bold;
+            font-size: 12px;
+        }}
+        QPushButton#btn_connect {{
+            background-color: {Ui.BTN_CONNECT_BG};
+            color: white;
+            border: none;
+        }}
+        QPushButton#btn_connect:hover {{ background-color: {Ui.BTN_CONNECT_HOVER}; }}
+        QPushButton#btn_connect:pressed {{ background-color: {Ui.BTN_CONNECT_PRESSED}; }}
+
+        QPushButton#btn_disconnect {{
+            background-color: {Ui.BTN_DISCONNECT_BG};
+            color: white;
+            border: none;
+        }}
+        QPushButton#btn_disconnect:hover {{ background-color: {Ui.BTN_DISCONNECT_HOVER}; }}
+
+        QPushButton.control_btn {{
+            background-color: {Ui.BTN_CONTROL_BG};
+            color: #b0b0e0;
+            border: 1px solid {Ui.BTN_CONTROL_BORDER};
+            padding: 10px;
+        }}
+        QPushButton.control_btn:hover {{
+            background-color: {Ui.BTN_CONTROL_HOVER_BG};
+            border-color: {Ui.BTN_CONTROL_HOVER_BORDER};
+            color: white;
+        }}
+        QPushButton.control_btn:pressed {{ background-color: #111130; }}
+
+        QPushButton#btn_camera_on {{
+            background-color: {Ui.BTN_CAM_ON_BG};
+            color: #80dd80;
+            border: 1px solid {Ui.BTN_CAM_ON_BORDER};
+            padding: 10px;
+            border-radius: 6px;
+        }}
+        QPushButton#btn_camera_on:hover {{ background-color: {Ui.BTN_CAM_ON_BORDER}; }}
+        QPushButton#btn_camera_on:checked {{
+            background-color: {Ui.BTN_CAM_ON_BORDER};
+            border-color: #50cc50;
+        }}
+
+        QPushButton#btn_camera_off {{
+            background-color: {Ui.BTN_CAM_OFF_BG};
+            color: #dd8080;
+            border: 1px solid {Ui.BTN_CAM_OFF_BORDER};
+            padding: 10px;
+            border-radius: 6px;
+        }}
+        QPushButton#btn_camera_off:hover {{ background-color: {Ui.BTN_CAM_OFF_BORDER}; }}
+
+        QStatusBar {{
+            background-color: {Ui.STATUS_BAR_BG};
+            color: {Ui.TEXT_MUTED};
+            border-top: 1px solid {Ui.BORDER};
+        }}
+        QSplitter::handle {{
+            background-color: {Ui.SPLITTER_HANDLE_BG};
+            width: 2px;
+        }}
+    """
+
+
+@lru_cache(maxsize=None)
+def header_qss() -> str:
+    return f"""
+        QFrame {{
+            background: qlineargradient(x1:0,y1:0,x2:1,y2:0,
+                stop:0 {Ui.BG_HEADER_START}, stop:1 {Ui.BG_HEADER_END});
+            border-bottom: 1px solid {Ui.BORDER};
+        }}
+    """
+
+
+@lru_cache(maxsize=None)
+def key_buttons_qss() -> str:
+    """Tuş kontrolleri grubu — tek tek butonlara değil gruba bir kez uygulanır."""
+    return f"""
+        QPushButton {{
+            background-color: {Ui.BTN_CONTROL_BG};
+            color: #b0b0e0;
+            border: 1px solid {Ui.BTN_CONTROL_BORDER};
+            padding: 8px;
+            border-radius: 6px;
+        }}
+        QPushButton:hover {{
+            background-color: {Ui.BTN_CONTROL_HOVER_BG};
+            color: white;
+        }}
+        QPushButton:disabled {{ color: #444466; border-color: #222244; }}
+    """
+
+
+@lru_cache(maxsize=None)
+def screen_qss() -> str:
+    return f"""
+        QLabel {{
+            background-color: {Ui.BG_CARD};
+            border: 2px solid {Ui.SCREEN_BORDER};
+            border-radius: 12px;
+        }}
+    """
+
+
+@lru_cache(maxsize=None)
+def color_qss(color: str, font_size: int = 0) -> str:
+    """Durum etiketleri için tek satırlık renk (+ opsiyonel font boyutu) stili."""
+    if font_size:
+        return f"font-size: {font_size}px; color: {color};"
+    return f"color: {color};"
@@ -133,7 +133,9 @@ class CameraStreamService : LifecycleService() {
                 out
             )
             // WebSocket aracılığıyla PC'ye relay et
-            SignalingClient.instance?.sendFrame(out.toByteArray())
+            SignalingClient.instance?.sendFrame(
+                out.toByteArray(), channel = SignalingClient.CHANNEL_CAMERA
+            )
         } catch (e: Exception) {
             Log.e(TAG, "Frame process error: $e")
         } finally {
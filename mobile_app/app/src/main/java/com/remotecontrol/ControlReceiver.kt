@@ -104,6 +104,56 @@ class ControlReceiver : AccessibilityService() {
         Log.d(TAG, "Swipe ($nx1,$ny1)->($nx2,$ny2)")
     }
 
+    // Canlı sürüklemenin devam eden stroke'u ve son noktası (piksel)
+    private var dragStroke: GestureDescription.StrokeDescription? = null
+    private var lastX = 0f
+    private var lastY = 0f
+
+    /**
+     * Canlı sürükleme adımı (phase: down / move / up) — normalize koordinatlar.
+     * Her adım önceki stroke'un devamı olarak gönderilir (API 26+);
+     * daha eski sürümlerde sadece "up" anında tek bir swipe yapılır.
+     */
+    fun performPointer(phase: String, normX: Float, normY: Float) {
+        val display = getSystemService(Context.WINDOW_SERVICE) as android.view.WindowManager
+        val metrics = if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.R) {
+            display.currentWindowMetrics.bounds
+        } else {
+            @Suppress("DEPRECATION")
+            val dm = android.util.DisplayMetrics()
+            display.defaultDisplay.getRealMetrics(dm)
+            android.graphics.Rect(0, 0, dm.widthPixels, dm.heightPixels)
+        }
+        val x = normX * metrics.width()
+        val y = normY * metrics.height()
+
+        if (Build.VERSION.SDK_INT < Build.VERSION_CODES.O) {
+            when (phase) {
+                "down" -> { lastX = x; lastY = y }
+                "up" -> performSwipe(
+                    lastX / metrics.width(), lastY / metrics.height(), normX, normY,
+                )
+            }
+            return
+        }
+
+        val path = Path().apply {
+            moveTo(if (phase == "down") x else lastX, if (phase == "down") y else lastY)
+            lineTo(x, y)
+        }
+        val willContinue = phase != "up"
+        val previous = dragStroke
+        val stroke = if (phase == "down" || previous == null) {
+            GestureDescription.StrokeDescription(path, 0L, 1L, willContinue)
+        } else {
+            previous.continueStroke(path, 0L, 16L, willContinue)
+        }
+        dragStroke = if (willContinue) stroke else null
+        lastX = x
+        lastY = y
+        dispatchGesture(GestureDescription.Builder().addStroke(stroke).build(), null, null)
+    }
+
     /**
      * Sistem tuşu (Back, Home, Recents, Volume, Power)
      */
@@ -0,0 +1,85 @@
+package com.remotecontrol
+
+/**
+ * İkili Girdi Protokolü
+ * =====================
+ * PC'nin binary WebSocket frame'i olarak gönderdiği kompakt girdi olaylarını
+ * çözer (referans: desktop_app/network/input_protocol.py).
+ *
+ * Biçim (big-endian): opcode:u8 seq:u16 ts:u32 + alanlar.
+ * seq/ts komutun sıra numarası ve PC gönderim zamanıdır; ack'te aynen döner.
+ * Koordinatlar 16-bit sabit noktadır: 0 → 0.0, 65535 → 1.0
+ *
+ *   TOUCH          0x01  x y            11 byte
+ *   SWIPE          0x02  x1 y1 x2 y2    15 byte
+ *   KEY            0x03  key_code        9 byte
+ *   POINTER_DOWN   0x04  x y            11 byte
+ *   POINTER_MOVE   0x05  x y            11 byte
+ *   POINTER_UP     0x06  x y            11 byte
+ *   ACK            0x07  (telefon → PC)  7 byte
+ *
+ * Çözülen olay JSON komutlarıyla aynı (action, params) biçiminde döner
+ * (params "seq" ve "ts" içerir), böylece MainActivity.handleCommand iki
+ * yolu da aynı şekilde işler.
+ */
+object InputProtocol {
+    const val CAPABILITY = "binary_input"
+
+    private const val TOUCH = 0x01
+    private const val SWIPE = 0x02
+    private const val KEY = 0x03
+    private const val POINTER_DOWN = 0x04
+    private const val POINTER_MOVE = 0x05
+    private const val POINTER_UP = 0x06
+    private const val ACK = 0x07
+    private const val HEADER = 7
+
+    private const val FIXED_MAX = 65535.0
+
+    private fun u16(b: ByteArray, i: Int): Int =
+        ((b[i].toInt() and 0xFF) shl 8) or (b[i + 1].toInt() and 0xFF)
+
+    private fun u32(b: ByteArray, i: Int): Long =
+        ((u16(b, i).toLong() shl 16) or u16(b, i + 2).toLong())
+
+    private fun coord(b: ByteArray, i: Int): Double = u16(b, i) / FIXED_MAX
+
+    /** Bilinmeyen opcode veya hatalı uzunlukta null döner. */
+    fun decode(b: ByteArray): Pair<String, Map<String, Any>>? {
+        if (b.size < HEADER) return null
+        val seq = mapOf("seq" to u16(b, 1), "ts" to u32(b, 3))
+        val h = HEADER
+        return when (b[0].toInt()) {
+            TOUCH -> if (b.size != h + 4) null else
+                "touch" to mapOf("x" to coord(b, h), "y" to coord(b, h + 2)) + seq
+            SWIPE -> if (b.size != h + 8) null else
+                "swipe" to mapOf(
+                    "x1" to coord(b, h), "y1" to coord(b, h + 2),
+                    "x2" to coord(b, h + 4), "y2" to coord(b, h + 6),
+                ) + seq
+            KEY -> if (b.size != h + 2) null else
+                "key_event" to mapOf("key_code" to u16(b, h)) + seq
+            POINTER_DOWN, POINTER_MOVE, POINTER_UP -> if (b.size != h + 4) null else {
+                val phase = when (b[0].toInt()) {
+                    POINTER_DOWN -> "down"
+                    POINTER_MOVE -> "move"
+                    else -> "up"
+                }
+                "pointer" to mapOf(
+                    "phase" to phase, "x" to coord(b, h), "y" to coord(b, h + 2),
+                ) + seq
+            }
+            else -> null
+        }
+    }
+
+    /** Komutun uygulandığını bildiren ack: opcode + aynı seq/ts. */
+    fun encodeAck(seq: Int, ts: Long): ByteArray = byteArrayOf(
+        ACK.toByte(),
+        (seq shr 8).toByte(), seq.toByte(),
+        (ts shr 24).toByte(), (ts shr 16).toByte(), (ts shr 8).toByte(), ts.toByte(),
+    )
+
+    /** 16-bit seri aritmetiği: a, b'den daha yeni mi (taşmaya dayanıklı)? */
+    fun seqNewer(a: Int, b: Int): Boolean = a != b && ((a - b) and 0xFFFF) < 0x8000
+}
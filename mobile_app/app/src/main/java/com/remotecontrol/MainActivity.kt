@@ -153,15 +153,18 @@ class MainActivity : AppCompatActivity() {
                     btnStopStream.isEnabled = false
                     // tvCode — kodu silmiyoruz, kullanıcı tekrar deneyebilir
                 }
-            }
+            },
+            onRegistered = { code ->
+                // Kodu sunucu verir; kayıt olunca göster
+                runOnUiThread {
+                    tvCode.text = code
+                    updateStatus("⏳ PC bağlantısı bekleniyor...")
+                }
+                Log.i(TAG, "Session code: $code")
+            },
+            context = this,
         )
         signalingClient?.connect()
-
-        // Kodu göster
-        val code = signalingClient!!.sessionCode
-        tvCode.text = code
-        updateStatus("⏳ PC bağlantısı bekleniyor...")
-        Log.i(TAG, "Session code: $code")
     }
 
     private fun handleCommand(action: String, params: Map<String, Any>) {
@@ -183,12 +186,34 @@ class MainActivity : AppCompatActivity() {
                 val keyCode = (params["key_code"] as? Int) ?: return
                 ControlReceiver.instance?.performKeyEvent(keyCode)
             }
+            "pointer" -> {
+                val phase = params["phase"] as? String ?: return
+                val x = (params["x"] as? Double)?.toFloat() ?: return
+                val y = (params["y"] as? Double)?.toFloat() ?: return
+                ControlReceiver.instance?.performPointer(phase, x, y)
+            }
             "camera_on" -> {
                 runOnUiThread { requestCameraAccess(useFront = false) }
             }
             "camera_off" -> {
                 runOnUiThread { stopCameraStream() }
             }
+            "set_ws_frames" -> {
+                signalingClient?.wsFramesEnabled = (params["enabled"] as? Boolean) ?: true
+            }
+            "set_quality" -> {
+                val level = (params["level"] as? Int) ?: return
+                signalingClient?.qualityLevel = level
+            }
+            "set_roi" -> {
+                // Bölge yoksa (tam ekran) karo gönderimi durur
+                val x = (params["x"] as? Double)?.toFloat()
+                val y = (params["y"] as? Double)?.toFloat()
+                val w = (params["w"] as? Double)?.toFloat()
+                val h = (params["h"] as? Double)?.toFloat()
+                signalingClient?.roi = if (x != null && y != null && w != null && h != null &&
+                    w > 0f && h > 0f && (w < 1f || h < 1f)) floatArrayOf(x, y, w, h) else null
+            }
             else -> Log.w(TAG, "Unknown command: $action")
         }
     }
@@ -37,6 +37,16 @@ class ScreenStreamService : Service() {
         const val PORT = 8080
         const val EXTRA_RESULT_CODE = "result_code"
         const val EXTRA_RESULT_DATA = "result_data"
+
+        // Kalite seviyeleri (PC `set_quality` ile seçer): ölçek ve JPEG kalitesi
+        private val QUALITY_SCALE = floatArrayOf(0.35f, 0.5f, 0.6f, 0.75f)
+        private val QUALITY_JPEG = intArrayOf(45, 55, 65, 75)
+
+        // PC bir bölgeyi yakınlaştırınca (`set_roi`) o bölge tam çözünürlükte ayrı
+        // karo olarak gider; tam ekran frame en düşük seviyeye iner. Karo en fazla
+        // bu kadar piksel olacak şekilde küçültülür.
+        private const val ROI_MAX_PIXELS = 1_000_000
+        private const val ROI_JPEG = 80
     }
 
     private var mediaProjection: MediaProjection? = null
@@ -139,14 +149,22 @@ class ScreenStreamService : Service() {
                     )
                     bmp.copyPixelsFromBuffer(buffer)
 
-                    // Performans için yarı boyut
-                    val scaledW = (width * 0.6).toInt()
-                    val scaledH = (height * 0.6).toInt()
+                    // Yakınlaştırılan bölgenin karosu (küçültmeden önce, tam çözünürlükten)
+                    val roi = SignalingClient.instance?.roi
+                    val tileBytes = if (roi != null) encodeTile(bmp, width, height, roi) else null
+
+                    // Performans için küçült; oran PC'nin seçtiği kalite seviyesine bağlı.
+                    // Karo gönderilirken tam ekran yalnızca arka plandır: en düşük seviye.
+                    val level = if (tileBytes != null) 0 else
+                        (SignalingClient.instance?.qualityLevel ?: SignalingClient.DEFAULT_QUALITY)
+                            .coerceIn(0, QUALITY_SCALE.size - 1)
+                    val scaledW = (width * QUALITY_SCALE[level]).toInt()
+                    val scaledH = (height * QUALITY_SCALE[level]).toInt()
                     val scaled = Bitmap.createScaledBitmap(bmp, scaledW, scaledH, false)
                     bmp.recycle()
 
                     val out = ByteArrayOutputStream()
-                    scaled.compress(Bitmap.CompressFormat.JPEG, 65, out)
+                    scaled.compress(Bitmap.CompressFormat.JPEG, QUALITY_JPEG[level], out)
                     scaled.recycle()
 
                     // Ortak byte dizisi oluştur
@@ -158,10 +176,13 @@ class ScreenStreamService : Service() {
                     frameCount++
                     
                     // Aynı frame'i WebSocket üzerinden de PC'ye relay et
+                    // (PC MJPEG'i daha hızlı alıyorsa bu kopya kapatılmıştır)
                     val client = SignalingClient.instance
-                    if (client != null) {
+                    if (client != null && (client.wsFramesEnabled || tileBytes != null)) {
                         try {
-                            client.sendFrame(jpegBytes)
+                            client.sendFrame(
+                                if (client.wsFramesEnabled) jpegBytes else null, tileBytes, roi
+                            )
                             // Her 30 frame'de bir log (spam'i önlemek için)
                             if (frameCount % 30 == 0L) {
                                 Log.i(TAG, "✅ Frame sent via WebSocket: ${jpegBytes.size} bytes (frame #$frameCount)")
@@ -169,7 +190,7 @@ class ScreenStreamService : Service() {
                         } catch (e: Exception) {
                             Log.e(TAG, "❌ Frame gönderme hatası: $e", e)
                         }
-                    } else {
+                    } else if (client == null) {
                         // İlk 10 frame'de ve sonra her 100 frame'de bir log göster
                         if (frameCount <= 10 || frameCount % 100 == 0L) {
                             Log.w(TAG, "⚠️ SignalingClient.instance is null - frame #$frameCount gönderilemedi (${jpegBytes.size} bytes)")
@@ -198,6 +219,26 @@ class ScreenStreamService : Service() {
         }
     }
 
+    /** Normalize `roi` bölgesini kırp, ROI_MAX_PIXELS'e sığdır ve JPEG'e çevir. */
+    private fun encodeTile(bmp: Bitmap, width: Int, height: Int, roi: FloatArray): ByteArray? {
+        val left = (roi[0] * width).toInt().coerceIn(0, width - 1)
+        val top = (roi[1] * height).toInt().coerceIn(0, height - 1)
+        val w = (roi[2] * width).toInt().coerceIn(1, width - left)
+        val h = (roi[3] * height).toInt().coerceIn(1, height - top)
+        var tile = Bitmap.createBitmap(bmp, left, top, w, h)
+        val pixels = w.toLong() * h
+        if (pixels > ROI_MAX_PIXELS) {
+            val f = Math.sqrt(ROI_MAX_PIXELS.toDouble() / pixels)
+            val scaled = Bitmap.createScaledBitmap(tile, (w * f).toInt(), (h * f).toInt(), true)
+            tile.recycle()
+            tile = scaled
+        }
+        val out = ByteArrayOutputStream()
+        tile.compress(Bitmap.CompressFormat.JPEG, ROI_JPEG, out)
+        tile.recycle()
+        return out.toByteArray()
+    }
+
     override fun onDestroy() {
         mjpegServer?.stop()
         virtualDisplay?.release()
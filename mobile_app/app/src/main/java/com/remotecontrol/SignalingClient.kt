@@ -1,35 +1,65 @@
 package com.remotecontrol
 
+import android.content.Context
 import android.util.Log
 import kotlinx.coroutines.*
 import okhttp3.*
 import okio.ByteString
+import okio.ByteString.Companion.toByteString
+import org.json.JSONArray
 import org.json.JSONObject
 import java.util.concurrent.TimeUnit
 import kotlin.random.Random
 
 /**
  * Signaling sunucusuyla WebSocket üzerinden haberleşir.
- * - 6 haneli rastgele bir oturum kodu üretir
- * - Kodu sunucuya kaydeder
+ * - Sunucudan 6 haneli bir oturum kodu alır (kod + sahiplik token'ı)
+ * - Yeniden bağlanırken aynı kodu token ile geri alır
  * - PC eşleştiğinde callback tetikler
  * - Relay üzerinden gelen komutları iletir
+ * - Sunucu drain ederken (`server_draining`) aynı kodla yeni bağlantıya taşınır
+ * - Ekran ve kamera frame'lerini ayrı kanallardan (`ch`) gönderir; kontrol
+ *   mesajları video'nun arkasında en fazla VIDEO_WINDOW_BYTES bekler
+ * - PC'den gelen dosya ve pano aktarımlarını alır (bkz. Transfer)
  */
 class SignalingClient(
     private val serverUrl: String,
     private val onPaired: (streamPort: Int) -> Unit,
     private val onCommand: (action: String, params: Map<String, Any>) -> Unit,
     private val onDisconnected: () -> Unit,
+    private val onRegistered: (code: String) -> Unit = {},
+    context: Context? = null,
 ) {
     companion object {
         private const val TAG = "SignalingClient"
-        fun generateCode(): String = (100_000..999_999).random().toString()
+
+        /** Varsayılan yayın kalitesi seviyesi (ScreenStreamService tablosunda) */
+        const val DEFAULT_QUALITY = 2
+
+        /** Frame mesajının `ch` alanı; kontrol mesajları kanal taşımaz (0). */
+        const val CHANNEL_SCREEN = 1
+        const val CHANNEL_CAMERA = 2
+
+        /** Gönderim önceliği: ekran kameradan önce */
+        private val VIDEO_PRIORITY = intArrayOf(CHANNEL_SCREEN, CHANNEL_CAMERA)
+
+        /**
+         * OkHttp'nin gönderim kuyruğu FIFO'dur ve öncelik bilmez. Kuyrukta bu
+         * kadar byte video varken yeni frame kuyruğa verilmez, kanalının tek
+         * bekleme yerinde tutulur (yenisi gelirse eskisi düşer). Böylece ack ve
+         * komut yanıtları en fazla bu kadar videonun arkasında kalır.
+         */
+        private const val VIDEO_WINDOW_BYTES = 256 * 1024L
+        private const val VIDEO_FLUSH_POLL_MS = 10L
 
         /** Diğer servislerden frame göndermek için erişilebilir instance */
         var instance: SignalingClient? = null
     }
 
-    val sessionCode: String = generateCode()
+    /** Sunucunun verdiği kod; `registered` gelene kadar boş. */
+    @Volatile var sessionCode: String = ""
+        private set
+    private var codeToken: String = ""
 
     private val scope = CoroutineScope(Dispatchers.IO + SupervisorJob())
     private val client = OkHttpClient.Builder()
@@ -37,73 +67,218 @@ class SignalingClient(
         .readTimeout(0, TimeUnit.MILLISECONDS)  // WebSocket için timeout kapatılır
         .build()
 
-    private var ws: WebSocket? = null
+    private val request by lazy { Request.Builder().url(serverUrl).build() }
+    @Volatile private var ws: WebSocket? = null
+
+    /** Dosya / pano aktarımı; context verilmezse aktarım teklifleri yanıtsız kalır. */
+    private val transfer = context?.let {
+        Transfer(it.applicationContext, scope, { text -> ws?.send(text) },
+            { bytes -> ws?.send(bytes.toByteString()) })
+    }
+
+    /**
+     * `server_draining` sonrası yeni bağlantı kuruldu; yeniden eşleşme yayını
+     * baştan başlatmaz, sadece son stream_info'yu tekrar gönderir.
+     */
+    @Volatile private var migrating = false
+    private var lastStreamUrl: String? = null
+
+    /**
+     * PC, MJPEG yolu daha hızlıyken ekran frame'lerinin WebSocket kopyasını
+     * `set_ws_frames` komutuyla kapatır (relay bant genişliği tasarrufu).
+     */
+    @Volatile var wsFramesEnabled: Boolean = true
+
+    /**
+     * PC'nin RTT'ye göre seçtiği yayın kalitesi (`set_quality` komutu).
+     * Eşleşmede varsayılana döner.
+     */
+    @Volatile var qualityLevel: Int = DEFAULT_QUALITY
+
+    /**
+     * PC'nin yakınlaştırdığı bölge (`set_roi`): normalize [x, y, w, h].
+     * null değilse ekran servisi bu bölgeyi ayrı bir yüksek çözünürlüklü karo
+     * olarak da gönderir. Eşleşmede sıfırlanır.
+     */
+    @Volatile var roi: FloatArray? = null
+
+    /** Kanal başına kuyruğa verilmeyi bekleyen en güncel frame mesajı. */
+    private val pendingFrames = arrayOfNulls<String>(CHANNEL_CAMERA + 1)
+    private var flushScheduled = false
+    var framesDropped: Int = 0
+        private set
+
+    /** Son uygulanan komutun sırası; eskisi gelirse sıra dışı sayılır. */
+    private var lastSeq: Int? = null
+    var outOfOrder: Int = 0
+        private set
 
     fun connect() {
         instance = this
-        val request = Request.Builder().url(serverUrl).build()
-        ws = client.newWebSocket(request, object : WebSocketListener() {
-
-            override fun onOpen(webSocket: WebSocket, response: Response) {
-                Log.i(TAG, "Connected to signaling server, code=$sessionCode")
-                // Telefon olarak kayıt
-                val msg = JSONObject().apply {
-                    put("type", "register")
+        ws = client.newWebSocket(request, listener)
+    }
+
+    /** Sunucu drain ediyor: yeni bağlantıyı aç, eskisini sonra kapat. */
+    private fun migrate(old: WebSocket) {
+        if (ws !== old) return
+        Log.i(TAG, "Server draining, reconnecting with code=$sessionCode")
+        migrating = true
+        ws = client.newWebSocket(request, listener)
+        old.close(1000, "Server draining")
+    }
+
+    private val listener = object : WebSocketListener() {
+        override fun onOpen(webSocket: WebSocket, response: Response) {
+            Log.i(TAG, "Connected to signaling server, code=$sessionCode")
+            // Telefon olarak kayıt; ilk bağlantıda kodu sunucu verir
+            val msg = JSONObject().apply {
+                put("type", "register")
+                put("role", "phone")
+                if (sessionCode.isNotEmpty()) {
                     put("code", sessionCode)
-                    put("role", "phone")
+                    put("token", codeToken)
                 }
-                webSocket.send(msg.toString())
             }
+            webSocket.send(msg.toString())
+        }
 
-            override fun onMessage(webSocket: WebSocket, text: String) {
-                Log.d(TAG, "Message: $text")
-                try {
-                    val json = JSONObject(text)
-                    when (json.getString("type")) {
-                        "registered" -> Log.i(TAG, "Registered with code=$sessionCode")
+        override fun onMessage(webSocket: WebSocket, text: String) {
+            Log.d(TAG, "Message: $text")
+            try {
+                val json = JSONObject(text)
+                when (json.getString("type")) {
+                    "registered" -> {
+                        sessionCode = json.getString("code")
+                        codeToken = json.optString("token", "")
+                        Log.i(TAG, "Registered with code=$sessionCode")
+                        if (!migrating) onRegistered(sessionCode)
+                    }
 
-                        "paired" -> {
-                            Log.i(TAG, "Paired with PC!")
+                    "paired" -> {
+                        Log.i(TAG, "Paired with PC!")
+                        lastSeq = null
+                        // PC'ye ikili girdi protokolünü desteklediğimizi bildir
+                        val caps = JSONObject().apply {
+                            put("type", "relay")
+                            put("caps", org.json.JSONArray().put(InputProtocol.CAPABILITY))
+                        }
+                        webSocket.send(caps.toString())
+                        if (migrating) {
+                            // Yayın zaten açık; PC'ye stream URL'sini yeniden bildir
+                            migrating = false
+                            lastStreamUrl?.let { notifyStreamReady(it) }
+                        } else {
+                            wsFramesEnabled = true
+                            qualityLevel = DEFAULT_QUALITY
+                            roi = null
                             // Stream başladıktan sonra stream_info gönder
                             scope.launch {
                                 delay(500)
                                 onPaired(8080) // NanoHTTPD 8080 portunda dinler
                             }
                         }
+                    }
 
-                        "command" -> {
-                            val action = json.optString("action", "")
-                            val params = mutableMapOf<String, Any>()
-                            json.keys().forEach { key ->
-                                if (key != "type" && key != "action") {
-                                    params[key] = json.get(key)
-                                }
+                    "command" -> {
+                        val action = json.optString("action", "")
+                        val params = mutableMapOf<String, Any>()
+                        json.keys().forEach { key ->
+                            if (key != "type" && key != "action") {
+                                params[key] = json.get(key)
+                            }
+                        }
+                        if (json.has("seq")) {
+                            val seq = json.getInt("seq")
+                            val ts = json.optLong("ts", 0L)
+                            if (accept(action, params, seq)) onCommand(action, params)
+                            val ack = JSONObject().apply {
+                                put("type", "ack")
+                                put("seq", seq)
+                                put("ts", ts)
                             }
+                            webSocket.send(ack.toString())
+                        } else {
                             onCommand(action, params)
                         }
+                    }
+
+                    "peer_probe" -> {
+                        // PC'nin RTT probe'u: aynı ts ile hemen yanıtla
+                        val ack = JSONObject().apply {
+                            put("type", "peer_probe_ack")
+                            put("ts", json.opt("ts"))
+                        }
+                        webSocket.send(ack.toString())
+                    }
 
-                        "peer_disconnected" -> {
-                            Log.i(TAG, "PC disconnected")
-                            onDisconnected()
+                    "server_draining" -> {
+                        // Herkes aynı anda bağlanmasın: verilen pencerede rastgele bekle
+                        val window = json.optLong("reconnect_within_ms", 0L)
+                        scope.launch {
+                            delay(if (window > 0) Random.nextLong(window) else 0L)
+                            migrate(webSocket)
                         }
+                    }
+
+                    "transfer" -> transfer?.onControl(json)
 
-                        "error" -> Log.e(TAG, "Server error: ${json.optString("message")}")
+                    "peer_disconnected" -> {
+                        Log.i(TAG, "PC disconnected")
+                        transfer?.pause()
+                        onDisconnected()
                     }
-                } catch (e: Exception) {
-                    Log.e(TAG, "Parse error: $e")
+
+                    "error" -> Log.e(TAG, "Server error: ${json.optString("message")}")
                 }
+            } catch (e: Exception) {
+                Log.e(TAG, "Parse error: $e")
             }
+        }
 
-            override fun onFailure(webSocket: WebSocket, t: Throwable, response: Response?) {
-                Log.e(TAG, "WS failure: $t")
-                onDisconnected()
+        override fun onMessage(webSocket: WebSocket, bytes: ByteString) {
+            val data = bytes.toByteArray()
+            if (Transfer.isTransfer(data)) {
+                transfer?.onBinary(data)
+                return
             }
-
-            override fun onClosed(webSocket: WebSocket, code: Int, reason: String) {
-                Log.i(TAG, "WS closed: $code $reason")
-                onDisconnected()
+            // İkili girdi olayı (touch / swipe / key / pointer)
+            val decoded = InputProtocol.decode(data)
+            if (decoded == null) {
+                Log.w(TAG, "Unknown binary message: ${bytes.size} bytes")
+                return
             }
-        })
+            val (action, params) = decoded
+            val seq = params["seq"] as Int
+            if (accept(action, params, seq)) onCommand(action, params)
+            webSocket.send(InputProtocol.encodeAck(seq, params["ts"] as Long).toByteString())
+        }
+
+        override fun onFailure(webSocket: WebSocket, t: Throwable, response: Response?) {
+            Log.e(TAG, "WS failure: $t")
+            if (webSocket !== ws) return  // Taşınma sonrası kapatılan eski bağlantı
+            onDisconnected()
+        }
+
+        override fun onClosed(webSocket: WebSocket, code: Int, reason: String) {
+            Log.i(TAG, "WS closed: $code $reason")
+            if (webSocket !== ws) return  // Taşınma sonrası kapatılan eski bağlantı
+            onDisconnected()
+        }
+    }
+
+    /**
+     * Komut sırası denetimi. Eski bir seq geldiğinde sıra dışı sayılır;
+     * bayat sürükleme adımları (pointer move) uygulanmaz, diğerleri uygulanır.
+     */
+    private fun accept(action: String, params: Map<String, Any>, seq: Int): Boolean {
+        val last = lastSeq
+        if (last != null && !InputProtocol.seqNewer(seq, last)) {
+            outOfOrder++
+            Log.w(TAG, "Out-of-order command: seq=$seq last=$last ($action)")
+            return !(action == "pointer" && params["phase"] == "move")
+        }
+        lastSeq = seq
+        return true
     }
 
     /**
@@ -119,26 +294,73 @@ class SignalingClient(
      * Kamera/ekran JPEG frame'ini Base64 JSON olarak PC'ye relay eder.
      * Port forwarding gerektirmez — WebSocket üzerinden gider.
      */
-    fun sendFrame(jpeg: ByteArray) {
+    /**
+     * Frame'i relay'e gönder. `tile` verilirse aynı mesaja `roi` bölgesinin
+     * yüksek çözünürlüklü karosu eklenir (ayrı mesaj hız sınırını harcamaz);
+     * `jpeg` null ise (WebSocket frame'leri kapalı) yalnızca karo gider.
+     * `channel` ekran veya kamera kanalıdır; relay ve PC frame'leri buna göre ayırır.
+     */
+    fun sendFrame(
+        jpeg: ByteArray?,
+        tile: ByteArray? = null,
+        roi: FloatArray? = null,
+        channel: Int = CHANNEL_SCREEN,
+    ) {
         val currentWs = ws
         if (currentWs == null) {
             Log.w(TAG, "WebSocket null - frame gönderilemedi")
             return
         }
         try {
-            val b64 = android.util.Base64.encodeToString(jpeg, android.util.Base64.NO_WRAP)
             val msg = JSONObject().apply {
                 put("type", "frame")
-                put("data", b64)
+                put("ch", channel)  // Relay kanalı mesajın başından okur
+                if (jpeg != null) {
+                    put("data", android.util.Base64.encodeToString(jpeg, android.util.Base64.NO_WRAP))
+                }
+                if (tile != null && roi != null) {
+                    put("tile", android.util.Base64.encodeToString(tile, android.util.Base64.NO_WRAP))
+                    put("roi", JSONArray(roi.map { it.toDouble() }))
+                }
             }
-            currentWs.send(msg.toString())
-            Log.d(TAG, "Frame gönderildi: ${jpeg.size} bytes -> ${b64.length} chars base64")
+            offerFrame(channel, msg.toString())
+            Log.d(TAG, "Frame kuyrukta (ch=$channel): ${jpeg?.size ?: 0} bytes, karo ${tile?.size ?: 0} bytes")
         } catch (e: Exception) {
             Log.e(TAG, "Frame gönderme hatası: $e", e)
         }
     }
 
+    private fun offerFrame(channel: Int, text: String) {
+        synchronized(pendingFrames) {
+            if (pendingFrames[channel] != null) framesDropped++
+            pendingFrames[channel] = text
+        }
+        flushFrames()
+    }
+
+    /** Kuyrukta yer varsa bekleyen frame'leri öncelik sırasıyla OkHttp'ye ver. */
+    private fun flushFrames() {
+        val currentWs = ws ?: return
+        synchronized(pendingFrames) {
+            for (channel in VIDEO_PRIORITY) {
+                val text = pendingFrames[channel] ?: continue
+                if (currentWs.queueSize() >= VIDEO_WINDOW_BYTES) break
+                currentWs.send(text)
+                pendingFrames[channel] = null
+            }
+            if (flushScheduled || pendingFrames.all { it == null }) return
+            flushScheduled = true
+        }
+        // OkHttp kuyruk boşalınca haber vermez; kısa aralıkla tekrar dene
+        scope.launch {
+            delay(VIDEO_FLUSH_POLL_MS)
+            synchronized(pendingFrames) { flushScheduled = false }
+            flushFrames()
+        }
+    }
+
     fun notifyStreamReady(publicUrl: String) {
+        lastStreamUrl = publicUrl
         val msg = JSONObject().apply {
             put("type", "stream_info")
             put("url", publicUrl)
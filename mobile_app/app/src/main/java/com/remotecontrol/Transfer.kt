@@ -0,0 +1,314 @@
+package com.remotecontrol
+
+import android.content.ClipData
+import android.content.ClipboardManager
+import android.content.Context
+import android.os.Handler
+import android.os.Looper
+import android.util.Log
+import kotlinx.coroutines.CoroutineScope
+import kotlinx.coroutines.launch
+import org.json.JSONObject
+import java.io.File
+import java.io.RandomAccessFile
+import java.nio.ByteBuffer
+import java.security.MessageDigest
+import java.util.zip.CRC32
+
+/**
+ * Parçalı Dosya ve Pano Aktarımı
+ * ==============================
+ * PC'nin gönderdiği dosya ve pano içeriğini alır; PC isterse (`op: request`)
+ * telefonun panosunu gönderir (referans: desktop_app/network/transfer.py).
+ *
+ * Denetim JSON'dur (`"type": "transfer"`, `op`: offer / accept / done /
+ * cancel / request). Veri ikili parçalarla gelir (big-endian):
+ *
+ *   CHUNK      0x10  id:u32 offset:u64 crc32:u32 + veri
+ *   CHUNK_ACK  0x11  id:u32 next:u64   beklenen sıradaki offset
+ *
+ * Yalnızca beklenen offset kabul edilir, her parça ack'lenir; boşlukta veya
+ * CRC hatasında beklenen offset yeniden ack'lenir ve PC geri sarar. Dosya
+ * `.part` olarak yazılır; bağlantı koparsa PC yeniden eşleşmede aynı teklifi
+ * gönderir ve aktarım `.part` dosyasının boyundan devam eder. SHA-256
+ * tutarsa dosya asıl adına taşınır.
+ *
+ * Hız denetimini gönderen (PC) yapar. Telefondan giden pano içeriği küçüktür;
+ * pencere kadar parça gönderilir, ack geldikçe devam edilir.
+ */
+class Transfer(
+    private val context: Context,
+    private val scope: CoroutineScope,
+    private val send: (String) -> Unit,
+    private val sendBytes: (ByteArray) -> Unit,
+) {
+    companion object {
+        private const val TAG = "Transfer"
+
+        const val CHUNK = 0x10
+        const val CHUNK_ACK = 0x11
+        private const val CHUNK_HEADER = 17
+        private const val ACK_SIZE = 13
+
+        private const val CHUNK_BYTES = 32 * 1024
+        private const val WINDOW_CHUNKS = 16
+        private const val DUP_ACK_REWIND = 3
+        private const val CLIPBOARD_MAX_BYTES = 32 * 1024 * 1024L
+
+        fun isTransfer(bytes: ByteArray): Boolean =
+            bytes.isNotEmpty() && (bytes[0].toInt() == CHUNK || bytes[0].toInt() == CHUNK_ACK)
+    }
+
+    private class Incoming(
+        val id: Long,
+        val kind: String,
+        val name: String,
+        val size: Long,
+        val sha256: String,
+        val part: File?,
+    ) {
+        var expected = 0L
+        var file: RandomAccessFile? = null
+        var buffer: java.io.ByteArrayOutputStream? = null
+    }
+
+    private class Outgoing(val id: Long, val data: ByteArray, val sha256: String) {
+        var acked = 0L
+        var sent = 0L
+        var dupAcks = 0
+        var accepted = false
+    }
+
+    private val directory: File by lazy {
+        File(context.getExternalFilesDir(null) ?: context.filesDir, "received").apply { mkdirs() }
+    }
+    private val incoming = mutableMapOf<Long, Incoming>()
+    private val outgoing = mutableMapOf<Long, Outgoing>()
+    private val mainHandler = Handler(Looper.getMainLooper())
+
+    // ─── DENETİM ─────────────────────────────────────────────────────────────
+
+    @Synchronized
+    fun onControl(json: JSONObject) {
+        when (json.optString("op")) {
+            "offer" -> onOffer(json)
+            "accept" -> onAccept(json.getLong("id"), json.optLong("offset", 0L))
+            "done" -> {
+                outgoing.remove(json.getLong("id"))
+                Log.i(TAG, "Transfer done id=${json.getLong("id")} ok=${json.optBoolean("ok")}")
+            }
+            "cancel" -> {
+                val id = json.getLong("id")
+                outgoing.remove(id)
+                incoming.remove(id)?.file?.close()
+                Log.i(TAG, "Transfer cancelled id=$id: ${json.optString("reason")}")
+            }
+            "request" -> mainHandler.post { sendClipboard() }
+        }
+    }
+
+    /** PC koptu: alınan dosyalar `.part` olarak kalır (devam edilebilir). */
+    @Synchronized
+    fun pause() {
+        incoming.values.forEach { it.file?.close() }
+        incoming.clear()
+        outgoing.values.forEach { it.accepted = false }
+    }
+
+    private fun onOffer(json: JSONObject) {
+        val id = json.getLong("id")
+        val kind = json.optString("kind")
+        val size = json.optLong("size", -1L)
+        val sha256 = json.optString("sha256").lowercase()
+        val valid = (kind == "file" || kind == "clipboard") && size >= 0 && sha256.length == 64 &&
+            !(kind == "clipboard" && size > CLIPBOARD_MAX_BYTES)
+        if (!valid) {
+            control("cancel", id) { put("reason", "invalid offer") }
+            return
+        }
+        val name = File(json.optString("name")).name.trimStart('.').take(200).ifEmpty { "received" }
+        incoming.remove(id)?.file?.close()
+        val inc = Incoming(id, kind, name, size, sha256,
+            if (kind == "file") File(directory, "$name.${sha256.take(12)}.part") else null)
+        try {
+            if (inc.part != null) {
+                val file = RandomAccessFile(inc.part, "rw")
+                inc.expected = minOf(file.length(), size)
+                file.setLength(inc.expected)
+                file.seek(inc.expected)
+                inc.file = file
+            } else {
+                inc.buffer = java.io.ByteArrayOutputStream(size.toInt())
+            }
+        } catch (e: Exception) {
+            control("cancel", id) { put("reason", e.toString()) }
+            return
+        }
+        Log.i(TAG, "Transfer offer id=$id $kind $name $size bytes, offset=${inc.expected}")
+        control("accept", id) { put("offset", inc.expected) }
+        if (inc.expected == size) complete(inc) else incoming[id] = inc
+    }
+
+    // ─── İKİLİ ───────────────────────────────────────────────────────────────
+
+    @Synchronized
+    fun onBinary(bytes: ByteArray) {
+        val buf = ByteBuffer.wrap(bytes)
+        if (bytes[0].toInt() == CHUNK_ACK) {
+            if (bytes.size == ACK_SIZE) {
+                buf.get()
+                onAck(buf.int.toLong() and 0xFFFFFFFFL, buf.long)
+            }
+            return
+        }
+        if (bytes.size < CHUNK_HEADER) return
+        buf.get()
+        val id = buf.int.toLong() and 0xFFFFFFFFL
+        val offset = buf.long
+        val crc = buf.int.toLong() and 0xFFFFFFFFL
+        val inc = incoming[id] ?: return
+        val check = CRC32().apply { update(bytes, CHUNK_HEADER, bytes.size - CHUNK_HEADER) }
+        val length = bytes.size - CHUNK_HEADER
+        if (check.value == crc && offset == inc.expected && offset + length <= inc.size) {
+            inc.file?.write(bytes, CHUNK_HEADER, length)
+            inc.buffer?.write(bytes, CHUNK_HEADER, length)
+            inc.expected += length
+        }
+        sendBytes(encodeAck(id, inc.expected))
+        if (inc.expected == inc.size) {
+            incoming.remove(id)
+            complete(inc)
+        }
+    }
+
+    private fun complete(inc: Incoming) {
+        inc.file?.close()
+        val buffer = inc.buffer
+        if (buffer != null) {
+            val data = buffer.toByteArray()
+            val ok = sha256(data) == inc.sha256
+            control("done", inc.id) { put("ok", ok) }
+            if (ok) {
+                val text = String(data, Charsets.UTF_8)
+                mainHandler.post {
+                    val clipboard = context.getSystemService(Context.CLIPBOARD_SERVICE) as ClipboardManager
+                    clipboard.setPrimaryClip(ClipData.newPlainText("PC", text))
+                }
+            }
+            return
+        }
+        // Büyük dosyanın hash'i WebSocket thread'ini bekletmesin
+        scope.launch {
+            val part = inc.part!!
+            val digest = MessageDigest.getInstance("SHA-256")
+            part.inputStream().use { input ->
+                val block = ByteArray(1024 * 1024)
+                while (true) {
+                    val n = input.read(block)
+                    if (n < 0) break
+                    digest.update(block, 0, n)
+                }
+            }
+            val ok = digest.digest().toHex() == inc.sha256
+            if (ok) {
+                part.renameTo(uniqueFile(inc.name))
+            } else {
+                part.delete()  // Bozuk parça devam noktası olmasın
+                Log.w(TAG, "Transfer hash mismatch id=${inc.id} ${inc.name}")
+            }
+            control("done", inc.id) { put("ok", ok) }
+        }
+    }
+
+    private fun uniqueFile(name: String): File {
+        var file = File(directory, name)
+        var n = 1
+        while (file.exists()) {
+            file = File(directory, "${name.substringBeforeLast('.')} ($n)" +
+                (if ('.' in name) ".${name.substringAfterLast('.')}" else ""))
+            n++
+        }
+        return file
+    }
+
+    // ─── GÖNDEREN (pano) ─────────────────────────────────────────────────────
+
+    /** Telefonun panosunu PC'ye gönder (Android 10+: uygulama ön plandayken okunabilir). */
+    private fun sendClipboard() {
+        val clipboard = context.getSystemService(Context.CLIPBOARD_SERVICE) as ClipboardManager
+        val text = clipboard.primaryClip?.takeIf { it.itemCount > 0 }
+            ?.getItemAt(0)?.coerceToText(context)?.toString()
+        val id = kotlin.random.Random.nextLong(0, 0xFFFFFFFFL)
+        if (text == null) {
+            control("cancel", id) { put("reason", "clipboard unavailable") }
+            return
+        }
+        val data = text.toByteArray(Charsets.UTF_8)
+        val out = Outgoing(id, data, sha256(data))
+        synchronized(this) { outgoing[id] = out }
+        control("offer", id) {
+            put("kind", "clipboard")
+            put("name", "clipboard.txt")
+            put("size", data.size)
+            put("sha256", out.sha256)
+        }
+    }
+
+    private fun onAccept(id: Long, offset: Long) {
+        val out = outgoing[id] ?: return
+        out.acked = offset.coerceIn(0L, out.data.size.toLong())
+        out.sent = out.acked
+        out.accepted = true
+        pump(out)
+    }
+
+    private fun onAck(id: Long, next: Long) {
+        val out = outgoing[id] ?: return
+        if (!out.accepted) return
+        if (next > out.acked) {
+            out.acked = minOf(next, out.data.size.toLong())
+            out.sent = maxOf(out.sent, out.acked)
+            out.dupAcks = 0
+        } else if (next == out.acked && out.sent > out.acked && ++out.dupAcks >= DUP_ACK_REWIND) {
+            out.sent = out.acked  // Parça kayboldu: son ack'ten yeniden gönder
+            out.dupAcks = -WINDOW_CHUNKS
+        }
+        pump(out)
+    }
+
+    private fun pump(out: Outgoing) {
+        val size = out.data.size.toLong()
+        while (out.sent < size && out.sent - out.acked < WINDOW_CHUNKS * CHUNK_BYTES) {
+            val n = minOf(CHUNK_BYTES.toLong(), size - out.sent).toInt()
+            sendBytes(encodeChunk(out.id, out.sent, out.data, n))
+            out.sent += n
+        }
+    }
+
+    // ─── KODLAMA ─────────────────────────────────────────────────────────────
+
+    private fun encodeChunk(id: Long, offset: Long, data: ByteArray, n: Int): ByteArray {
+        val crc = CRC32().apply { update(data, offset.toInt(), n) }
+        return ByteBuffer.allocate(CHUNK_HEADER + n)
+            .put(CHUNK.toByte()).putInt(id.toInt()).putLong(offset).putInt(crc.value.toInt())
+            .put(data, offset.toInt(), n)
+            .array()
+    }
+
+    private fun encodeAck(id: Long, next: Long): ByteArray =
+        ByteBuffer.allocate(ACK_SIZE).put(CHUNK_ACK.toByte()).putInt(id.toInt()).putLong(next).array()
+
+    private fun control(op: String, id: Long, fields: JSONObject.() -> Unit = {}) {
+        send(JSONObject().apply {
+            put("type", "transfer")
+            put("op", op)
+            put("id", id)
+            fields()
+        }.toString())
+    }
+
+    private fun sha256(data: ByteArray): String =
+        MessageDigest.getInstance("SHA-256").digest(data).toHex()
+
+    private fun ByteArray.toHex(): String = joinToString("") { "%02x".format(it) }
+}
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Kanal Önceliği Ölçümü — video altında kontrol gecikmesi
+========================================================
+Relay'i alt süreç olarak başlatır. Telefon rolündeki istemci ekran (ch=1)
+ve kamera (ch=2) kanallarından büyük frame'ler ile birlikte düzenli aralıkla
+küçük "ack" mesajları gönderir. PC'nin bağlantısı `--link-kbps` ile
+sınırlıdır (darboğaz relay → PC yolunda). Ack'lerin telefondan PC'ye gecikme yüzdelikleri ve kanal başına
+ulaşan frame sayıları raporlanır: kontrol mesajı en fazla o an yazılan tek
+frame'in arkasında beklemeli, fazla frame relay'de düşmelidir.
+
+Kullanım (proje kökünden):
+    python scripts/bench_channels.py
+    python scripts/bench_channels.py --seconds 10 --frame-kb 200 --link-kbps 1024
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import websockets
+
+from websockets.client import ClientProtocol
+from websockets.frames import Frame, Opcode
+from websockets.protocol import State
+from websockets.uri import parse_uri
+
+from bench_cluster import _free_port, _spawn
+
+
+async def _recv_type(ws, msg_type: str) -> dict:
+    while True:
+        msg = json.loads(await asyncio.wait_for(ws.recv(), 5))
+        if msg.get("type") == msg_type:
+            return msg
+
+
+class _SlowLink:
+    """
+    Bant genişliği sınırlı bir bağlantının ucundaki PC: soketten saniyede en
+    fazla `rate` byte okur (sans-I/O websockets protokolüyle). Alma tamponu
+    küçük tutulur; darboğaz relay'in gönderim tarafında birikir, gerçek
+    ağdaki gibi.
+    """
+
+    _CHUNK = 16 * 1024
+
+    def __init__(self, url: str, rate: float):
+        self.url = url
+        self.rate = rate
+        self.proto = ClientProtocol(parse_uri(url), max_size=None)
+
+    async def open(self):
+        parts = urlsplit(self.url)
+        sock = socket.socket()
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 64 * 1024)
+        sock.connect((parts.hostname, parts.port))
+        self.reader, self.writer = await asyncio.open_connection(sock=sock, limit=self._CHUNK)
+        self.proto.send_request(self.proto.connect())
+        self._flush()
+        while self.proto.state is State.CONNECTING:
+            self.proto.receive_data(await self.reader.read(self._CHUNK))
+        self.proto.events_received()  # El sıkışma yanıtı
+
+    def send(self, text: str):
+        self.proto.send_text(text.encode())
+        self._flush()
+
+    def send_bytes(self, data: bytes):
+        self.proto.send_binary(data)
+        self._flush()
+
+    def _flush(self):
+        for data in self.proto.data_to_send():
+            self.writer.write(data)
+
+    async def messages(self):
+        """Gelen mesajlar (metin: str, ikili: bytes); her okumadan sonra bağlantı hızına göre bekler."""
+        while True:
+            chunk = await self.reader.read(self._CHUNK)
+            if not chunk:
+                return
+            self.proto.receive_data(chunk)
+            self._flush()  # Pong'lar
+            for event in self.proto.events_received():
+                if isinstance(event, Frame) and event.opcode == Opcode.TEXT:
+                    yield event.data.decode()
+                elif isinstance(event, Frame) and event.opcode == Opcode.BINARY:
+                    yield bytes(event.data)
+            await asyncio.sleep(len(chunk) / self.rate)
+
+    def close(self):
+        self.writer.close()
+
+
+async def _measure(url: str, seconds: float, frame_kb: int, link_kbps: float) -> dict:
+    phone = await websockets.connect(url, max_size=None)
+    await phone.send(json.dumps({"type": "register", "role": "phone"}))
+    code = (await _recv_type(phone, "registered"))["code"]
+    pc = _SlowLink(url, link_kbps * 1024)
+    await pc.open()
+    pc.send(json.dumps({"type": "join", "code": code, "role": "pc"}))
+
+    delays: list[float] = []
+    frames = {1: 0, 2: 0}
+    paired = asyncio.Event()
+
+    async def receive():
+        async for raw in pc.messages():
+            if raw.startswith('{"type":"ack"'):
+                delays.append(time.perf_counter() - json.loads(raw)["ts"])
+            elif raw.startswith('{"type":"frame"'):
+                frames[int(raw[len('{"type":"frame","ch":')])] += 1
+            elif '"paired"' in raw:
+                paired.set()
+
+    receiver = asyncio.create_task(receive())
+    await asyncio.wait_for(paired.wait(), 5)
+    blob = "x" * (frame_kb * 1024)
+    screen = ('{"type":"frame","ch":1,"data":"%s"}' % blob).encode()
+    camera = ('{"type":"frame","ch":2,"data":"%s"}' % blob[: len(blob) // 2]).encode()
+    sent = {1: 0, 2: 0}
+    deadline = time.perf_counter() + seconds
+    tick = 0
+    while time.perf_counter() < deadline:
+        if tick % 3 == 0:
+            await phone.send(screen, text=True)
+            sent[1] += 1
+        if tick % 6 == 0:
+            await phone.send(camera, text=True)
+            sent[2] += 1
+        await phone.send('{"type":"ack","seq":%d,"ts":%r}' % (tick, time.perf_counter()))
+        tick += 1
+        await asyncio.sleep(0.011)  # ~90 ack/sn, ~30 ekran + ~15 kamera frame/sn
+    await asyncio.sleep(1)
+    receiver.cancel()
+    await phone.close()
+    pc.close()
+    return {"delays": sorted(delays), "frames": frames, "sent": sent, "acks": tick}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--frame-kb", type=int, default=120)
+    parser.add_argument("--link-kbps", type=float, default=2048, help="PC bağlantısının hızı (KiB/sn)")
+    args = parser.parse_args()
+
+    port = _free_port()
+    # Ölçülen şey kuyruk davranışı: hız sınırları ölçümü kesmesin
+    proc = _spawn([os.path.join(ROOT, "signaling_server", "server.py")], port, {
+        "PORT": str(port), "FRAME_RATE_PER_SEC": "1000",
+        "FRAME_BYTES_PER_SEC": str(512 * 1024 * 1024), "CONTROL_RATE_PER_SEC": "1000",
+    })
+    try:
+        r = asyncio.run(_measure(f"ws://127.0.0.1:{port}", args.seconds, args.frame_kb, args.link_kbps))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    d = r["delays"]
+    if not d:
+        print("ack ulaşmadı")
+        return 1
+    pct = lambda p: d[min(len(d) - 1, int(p * len(d)))] * 1000
+    print(f"ack gecikmesi ms p50={pct(0.50):.1f} p95={pct(0.95):.1f} p99={pct(0.99):.1f} "
+          f"max={d[-1] * 1000:.1f} ({len(d)}/{r['acks']})")
+    for ch, name in ((1, "ekran"), (2, "kamera")):
+        print(f"{name}: gönderilen={r['sent'][ch]} ulaşan={r['frames'][ch]}")
+    return 0 if len(d) == r["acks"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Çok Düğümlü Relay Ölçümü — aynı düğüm / farklı düğüm
+=====================================================
+`resp_standin.py` ve paylaşılan depoya bağlı iki relay düğümünü alt süreç
+olarak başlatır. Telefon (stub) A düğümüne bağlanır; PC önce A'ya, sonra
+B'ye bağlanıp JSON komutları gönderir. Ack RTT yüzdelikleri karşılaştırılır;
+fark düğümler arası iletimin (pub/sub) ek maliyetidir.
+
+Kullanım (proje kökünden):
+    python scripts/bench_cluster.py
+    python scripts/bench_cluster.py --count 1000 --interval-ms 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import websockets
+
+from desktop_app.network.latency import LatencyTracker
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_port(port: int, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"port {port} açılmadı")
+
+
+def _spawn(args: list[str], port: int, env: dict | None = None) -> subprocess.Popen:
+    proc = subprocess.Popen([sys.executable, *args], env={**os.environ, **(env or {})},
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _wait_port(port)
+    return proc
+
+
+async def _measure(pc_url: str, phone_url: str, count: int, interval_ms: float) -> dict:
+    from phone_stub import PhoneStub
+
+    stub = PhoneStub(phone_url, binary=False)
+    stop = asyncio.Event()
+    stub_task = asyncio.create_task(stub.run(stop))
+    await asyncio.wait_for(stub.registered.wait(), 5)
+
+    tracker = LatencyTracker(window=count)
+    async with websockets.connect(pc_url) as ws:
+        await ws.send(json.dumps({"type": "join", "code": stub.code, "role": "pc"}))
+
+        async def receive():
+            async for raw in ws:
+                msg = json.loads(raw)
+                if msg.get("type") == "ack":
+                    tracker.on_ack(msg["seq"], msg["ts"])
+
+        receiver = asyncio.create_task(receive())
+        await asyncio.wait_for(stub.paired.wait(), 5)
+        for _ in range(count):
+            seq, ts = tracker.next()
+            await ws.send(json.dumps({"type": "command", "action": "touch",
+                                      "x": random.random(), "y": random.random(),
+                                      "seq": seq, "ts": ts}))
+            await asyncio.sleep(interval_ms / 1000)
+        deadline = time.monotonic() + 3
+        while tracker.snapshot()["pending"] and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        receiver.cancel()
+    stop.set()
+    await stub_task
+    return tracker.snapshot()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=300)
+    parser.add_argument("--interval-ms", type=float, default=8.0)
+    args = parser.parse_args()
+
+    store_port, port_a, port_b = _free_port(), _free_port(), _free_port()
+    store_url = f"redis://127.0.0.1:{store_port}"
+    server = os.path.join(ROOT, "signaling_server", "server.py")
+    procs = [_spawn([os.path.join(ROOT, "scripts", "resp_standin.py"), "--port", str(store_port)],
+                    store_port)]
+    try:
+        for node, port in (("a", port_a), ("b", port_b)):
+            procs.append(_spawn([server], port, {"PORT": str(port), "RELAY_NODE_ID": node,
+                                                 "RELAY_STORE_URL": store_url}))
+        url_a, url_b = f"ws://127.0.0.1:{port_a}", f"ws://127.0.0.1:{port_b}"
+        results = {
+            "aynı düğüm": asyncio.run(_measure(url_a, url_a, args.count, args.interval_ms)),
+            "farklı düğüm": asyncio.run(_measure(url_b, url_a, args.count, args.interval_ms)),
+        }
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.wait()
+
+    for name, s in results.items():
+        print(f"{name:<13} ack={s['acked']}/{args.count} kayıp={s['lost']}  "
+              f"RTT ms p50={s['p50']:.1f} p95={s['p95']:.1f} p99={s['p99']:.1f}")
+    same, cross = results["aynı düğüm"], results["farklı düğüm"]
+    print(f"ek maliyet    p50=+{cross['p50'] - same['p50']:.1f} ms  "
+          f"p95=+{cross['p95'] - same['p95']:.1f} ms")
+    return 0 if cross["acked"] == args.count else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Kod Havuzu Ölçümü — doluluk arttıkça tahsis/iade süresi
+=======================================================
+CodePool'u farklı eşzamanlı kod sayılarına kadar doldurur; her seviyede
+ayır + iade (bekletme süresi 0) döngüsünün işlem başına süresini ölçer.
+Süre doluluktan bağımsız kalmalıdır (O(1)).
+
+Kullanım (proje kökünden):
+    python scripts/bench_code_pool.py
+    python scripts/bench_code_pool.py --levels 1000 100000 900000 --ops 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signaling_server.code_pool import CodePool
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--levels", type=int, nargs="+",
+                        default=[1_000, 10_000, 50_000, 100_000, 500_000, 900_000])
+    parser.add_argument("--ops", type=int, default=20_000, help="Seviye başına ayır+iade döngüsü")
+    args = parser.parse_args()
+
+    pool = CodePool(hold_sec=0)
+    t0 = time.perf_counter()
+    pool.allocate(now=0)
+    print(f"ilk tahsis (diziler oluşturulur): {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    print(f"{'eşzamanlı':>10} {'ayır µs':>9} {'iade µs':>9} {'belirli kod µs':>15}")
+    clock = 1.0
+    for level in sorted(args.levels):
+        while len(pool) < level:
+            pool.allocate(now=clock)
+
+        t_alloc = t_release = t_claim = 0.0
+        for _ in range(args.ops):
+            t0 = time.perf_counter()
+            code, _ = pool.allocate(now=clock)
+            t1 = time.perf_counter()
+            pool.release(code, now=clock)
+            t2 = time.perf_counter()
+            clock += 1e-6
+            pool.expire(now=clock)  # Bekletme 0: kod hemen havuza döner
+            t3 = time.perf_counter()
+            token = pool.claim(code, now=clock)
+            t4 = time.perf_counter()
+            pool.release(code, now=clock)
+            clock += 1e-6
+            pool.expire(now=clock)
+            t_alloc += t1 - t0
+            t_release += (t2 - t1) + (t3 - t2)
+            t_claim += t4 - t3
+            assert token is not None
+
+        n = args.ops
+        print(f"{len(pool):>10} {t_alloc / n * 1e6:>9.2f} {t_release / n * 1e6:>9.2f} "
+              f"{t_claim / n * 1e6:>15.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Codec Ölçümü — arka uç başına saniyedeki mesaj sayısı
+======================================================
+Kurulu her JSON arka ucu (msgspec / orjson / json) için sunucunun sıcak
+yolundaki işlemleri ölçer:
+  - kontrol mesajı encode (dict -> bytes)
+  - Envelope decode (join mesajı)
+  - frame mesajı: tam decode ve parse'sız tip tespiti (sniff)
+  - desktop dokunma komutu: dict + dumps ve bytes şablonu (%-biçimleme)
+
+Kullanım (proje kökünden):
+    python scripts/bench_codec.py
+    python scripts/bench_codec.py --seconds 0.5 --frame-kb 200
+"""
+
+import argparse
+import base64
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signaling_server import codec as codec_mod
+from signaling_server.rate_limit import sniff_type
+
+
+def _rate(fn, seconds: float) -> float:
+    """fn'i `seconds` boyunca çağır; saniyedeki çağrı sayısı."""
+    n = 0
+    batch = 100
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for _ in range(batch):
+            fn()
+        n += batch
+    return n / (time.perf_counter() - start)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=0.3, help="Ölçüm başına süre")
+    parser.add_argument("--frame-kb", type=int, default=100, help="Frame JPEG boyutu (KB)")
+    args = parser.parse_args()
+
+    paired = {"type": "paired", "code": "123456", "your_role": "pc"}
+    join = b'{"type":"join","code":"123456","role":"pc"}'
+    frame = (b'{"type":"frame","data":"'
+             + base64.b64encode(os.urandom(args.frame_kb * 1024)) + b'"}')
+
+    rows = []
+    for name, cls in codec_mod.available().items():
+        c = cls()
+        rows.append((name, {
+            "encode paired": _rate(lambda: c.dumps(paired), args.seconds),
+            "decode join": _rate(lambda: c.decode_envelope(join), args.seconds),
+            "decode frame": _rate(lambda: c.decode_envelope(frame), args.seconds),
+            "touch dict": _rate(lambda: c.dumps(
+                {"type": "command", "action": "touch", "x": 0.1234, "y": 0.5678}), args.seconds),
+        }))
+
+    touch_tpl = b'{"type":"command","action":"touch","x":%.4f,"y":%.4f}'
+    rows.append(("şablon / sniff", {
+        "decode frame": _rate(lambda: sniff_type(frame), args.seconds),
+        "touch dict": _rate(lambda: touch_tpl % (0.1234, 0.5678), args.seconds),
+    }))
+
+    columns = ["encode paired", "decode join", "decode frame", "touch dict"]
+    print(f"{'arka uç':<18}" + "".join(f"{c:>16}" for c in columns) + "   (mesaj/sn)")
+    for name, results in rows:
+        cells = "".join(
+            f"{results[c]:>16,.0f}" if c in results else f"{'—':>16}" for c in columns
+        )
+        print(f"{name:<18}{cells}")
+    print(f"\nframe boyutu: {len(frame) / 1024:.0f} KB (base64 JSON); "
+          f"şablon satırındaki 'decode frame' = parse'sız tip tespiti")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Frame Havuzu Ölçümü — kararlı durumda bellek ve tahsis hızı
+============================================================
+Gerçek alıcı yolunu çalıştırır: bir thread WsClient'a frame mesajlarını
+verilen kare hızında verir (WebSocket thread'i gibi), frame'ler sinyalle GUI
+thread'indeki ScreenWidget'a gider ve widget boyutuna ölçeklenip gösterilir
+(QT_QPA_PLATFORM=offscreen). Her mod ayrı süreçte ölçülür:
+
+  havuz      ImagePool (Network.IMAGE_POOL_SLOTS yuva)
+  havuzsuz   Her frame için yeni QImage (havuz 0 yuva)
+
+Raporlanan: gösterilen fps, alıcı thread'inde frame başına süre, GUI'de
+set_frame süresi, frame başına minor page fault, ısınmadan sonraki RSS
+(ortanca ve artış), havuzun yeniden kullandığı / yeni ayırdığı tampon sayısı
+ve buna göre tam boy görüntü tamponu tahsis hızı (MB/sn).
+
+Kullanım (proje kökünden):
+    python scripts/bench_frame_pool.py
+    python scripts/bench_frame_pool.py --width 1440 --height 3200 --fps 30 --seconds 10
+"""
+
+import argparse
+import base64
+import contextlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from desktop_app.config import Network
+
+MODES = ("havuz", "havuzsuz")
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _faults() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_minflt
+
+
+def _frames(width: int, height: int, count: int) -> list[str]:
+    """Birbirinden farklı (hakemde STATIC sayılmayan) sentetik ekran frame'leri."""
+    from PyQt6.QtCore import QBuffer, QIODevice
+    from PyQt6.QtGui import QColor, QImage, QLinearGradient, QPainter
+
+    out = []
+    for n in range(count):
+        img = QImage(width, height, QImage.Format.Format_RGB32)
+        painter = QPainter(img)
+        gradient = QLinearGradient(0, 0, width, height)
+        gradient.setColorAt(0, QColor(20, 40 + n * 20, 200))
+        gradient.setColorAt(1, QColor(240, 120, n * 30 % 256))
+        painter.fillRect(img.rect(), gradient)
+        for y in range(0, height, 48):
+            painter.drawText(16, y, f"satır {y} frame {n} " * 4)
+        painter.end()
+        buf = QBuffer()
+        buf.open(QIODevice.OpenModeFlag.WriteOnly)
+        img.save(buf, "JPEG", 75)
+        data = base64.b64encode(bytes(buf.data())).decode()
+        out.append('{"type":"frame","ch":1,"data":"%s"}' % data)
+    return out
+
+
+def _run_mode(args) -> dict:
+    """Tek modu bu süreçte ölç (alt süreç olarak çağrılır)."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+
+    from desktop_app.network.image_pool import ImagePool
+    from desktop_app.network.ws_client import WsClient
+    from desktop_app.ui.screen_widget import ScreenWidget
+
+    app = QApplication(sys.argv[:1])
+    screen = ScreenWidget()
+    screen.resize(args.view_width, args.view_height)
+    screen.show()
+    client = WsClient()
+    client._screen_pool = pool = ImagePool(Network.IMAGE_POOL_SLOTS if args.mode == "havuz" else 0)
+
+    shown = []
+    gui_costs = []
+
+    def on_frame(image):
+        t0 = time.perf_counter()
+        screen.set_frame(image)
+        gui_costs.append(time.perf_counter() - t0)
+        shown.append(t0)
+
+    client.frame_received.connect(on_frame)
+    messages = _frames(args.width, args.height, 6)
+    recv_costs = []
+    samples = []
+    state = {}
+
+    def feed():
+        total = int(args.fps * (args.warmup + args.seconds))
+        warm = int(args.fps * args.warmup)
+        start = time.perf_counter()
+        for i in range(total):
+            if i == warm:
+                state.update(faults=_faults(), reused=pool.reused, allocated=pool.allocated,
+                             at=time.perf_counter(), shown=len(shown))
+            t0 = time.perf_counter()
+            client._on_message(None, messages[i % len(messages)])
+            if i >= warm:
+                recv_costs.append(time.perf_counter() - t0)
+                if i % max(int(args.fps / 4), 1) == 0:
+                    samples.append(_rss_mb())
+            time.sleep(max(0.0, start + (i + 1) / args.fps - time.perf_counter()))
+        state.update(end=time.perf_counter(), faults_end=_faults())
+        QTimer.singleShot(200, app.quit)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        threading.Thread(target=feed, daemon=True).start()
+        app.exec()
+
+    elapsed = state["end"] - state["at"]
+    frames = len(recv_costs)
+    allocated = pool.allocated - state["allocated"]
+    pct = lambda d, p: sorted(d)[min(len(d) - 1, int(p * len(d)))] * 1000
+    steady_gui = gui_costs[state["shown"]:] or gui_costs
+    return {
+        "mode": args.mode,
+        "fps": (len(shown) - state["shown"]) / elapsed,
+        "recv_ms_p50": pct(recv_costs, 0.5), "recv_ms_p95": pct(recv_costs, 0.95),
+        "gui_ms_p50": pct(steady_gui, 0.5), "gui_ms_p95": pct(steady_gui, 0.95),
+        "faults_per_frame": (state["faults_end"] - state["faults"]) / frames,
+        "rss_mb": sorted(samples)[len(samples) // 2], "rss_growth_mb": samples[-1] - samples[0],
+        "reused": pool.reused - state["reused"], "allocated": allocated,
+        "alloc_mb_s": allocated * args.width * args.height * 4 / (1024 * 1024) / elapsed,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--width", type=int, default=1080)
+    parser.add_argument("--height", type=int, default=2400)
+    parser.add_argument("--fps", type=float, default=20)
+    parser.add_argument("--seconds", type=float, default=6)
+    parser.add_argument("--warmup", type=float, default=2)
+    parser.add_argument("--view-width", type=int, default=720)
+    parser.add_argument("--view-height", type=int, default=1000)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(_run_mode(args)))
+        return 0
+
+    print(f"{args.width}x{args.height} @ {args.fps:.0f} fps, görünüm {args.view_width}x{args.view_height}")
+    results = []
+    for mode in MODES:
+        out = subprocess.run([sys.executable, __file__, "--mode", mode, *sys.argv[1:]],
+                             capture_output=True, text=True, check=True).stdout
+        r = json.loads(out.strip().splitlines()[-1])
+        results.append(r)
+        print(f"{mode:9s} fps={r['fps']:.1f} alıcı ms p50={r['recv_ms_p50']:.1f} "
+              f"p95={r['recv_ms_p95']:.1f} | GUI ms p50={r['gui_ms_p50']:.1f} p95={r['gui_ms_p95']:.1f} | "
+              f"fault/frame={r['faults_per_frame']:.0f} RSS={r['rss_mb']:.0f} MB "
+              f"(artış {r['rss_growth_mb']:+.0f}) | tampon yeniden={r['reused']} yeni={r['allocated']} "
+              f"→ {r['alloc_mb_s']:.0f} MB/sn")
+    # Kararlı durumda (ısınmadan sonra) havuz yeni tampon ayırmamalı
+    return 0 if results[0]["allocated"] <= Network.IMAGE_POOL_SLOTS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
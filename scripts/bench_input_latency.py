@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Girdi Gecikmesi Ölçümü — uçtan uca (PC → relay → telefon → ack)
+================================================================
+WsClient'ı `phone_stub.py` ile eşleştirir, aralıklı dokunma komutları
+gönderir ve ack'lerden RTT yüzdeliklerini, kayıp ve sıra dışı sayılarını
+yazdırır. `--server` verilmezse relay alt süreç olarak boş bir portta başlatılır.
+
+Kullanım (proje kökünden):
+    python scripts/bench_input_latency.py
+    python scripts/bench_input_latency.py --count 500 --interval-ms 8 --jitter-ms 20
+    python scripts/bench_input_latency.py --server ws://127.0.0.1:8765 --json
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_relay() -> tuple[subprocess.Popen, str]:
+    """Relay'i alt süreç olarak başlat; (süreç, ws URL'si) döndür."""
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "signaling_server", "server.py")],
+        env={**os.environ, "PORT": str(port)},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    return proc, f"ws://127.0.0.1:{port}"
+
+
+def _wait(cond, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while not cond():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--server", help="Çalışan relay (verilmezse alt süreç olarak başlatılır)")
+    parser.add_argument("--count", type=int, default=200, help="Gönderilecek dokunma sayısı")
+    parser.add_argument("--interval-ms", type=float, default=16.0)
+    parser.add_argument("--json", action="store_true", help="İkili protokol yerine JSON komutları")
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="Stub ack gecikmesi")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Stub ack titreşimi")
+    parser.add_argument("--drop", type=float, default=0.0, help="Stub ack kaybı olasılığı")
+    args = parser.parse_args()
+
+    import logging
+    logging.basicConfig(level=logging.WARNING)
+
+    relay = None
+    if args.server:
+        url = args.server
+    else:
+        relay, url = _start_relay()
+    try:
+        return _run(args, url)
+    finally:
+        if relay is not None:
+            relay.terminate()
+            relay.wait()
+
+
+def _run(args, url: str) -> int:
+    from phone_stub import PhoneStub
+    from desktop_app.config import Network
+    from desktop_app.network.ws_client import WsClient
+
+    stub = PhoneStub(url, binary=not args.json, delay_ms=args.delay_ms,
+                     jitter_ms=args.jitter_ms, drop=args.drop)
+    threading.Thread(target=lambda: asyncio.run(stub.run()), daemon=True).start()
+    if not _wait(stub.registered.is_set, 5):
+        print("❌ Telefon kayıt olamadı")
+        return 1
+
+    client = WsClient()
+    client.connect_to_server(url, stub.code)
+    if not _wait(stub.paired.is_set, 5):
+        print("❌ Eşleşme olmadı")
+        return 1
+    if not args.json and not _wait(lambda: client.binary_input, 2):
+        print("❌ Telefon ikili girdi yeteneğini bildirmedi")
+        return 1
+
+    for _ in range(args.count):
+        client.send_touch(random.random(), random.random())
+        time.sleep(args.interval_ms / 1000)
+    # Kaybolan ack'ler ACK_TIMEOUT_MS sonunda bekleyenlerden düşer
+    _wait(lambda: client.latency.snapshot()["pending"] == 0,
+          (Network.ACK_TIMEOUT_MS + args.delay_ms + args.jitter_ms) / 1000 + 1)
+    stats = client.latency.snapshot()
+    client.disconnect()
+
+    mode = "json" if args.json else "binary"
+    print(f"mod={mode} gönderilen={args.count} ack={stats['acked']} "
+          f"kayıp={stats['lost']} bekleyen={stats['pending']} sıra_dışı={stats['reordered']}")
+    print(f"RTT ms  p50={stats['p50']:.1f}  p95={stats['p95']:.1f}  p99={stats['p99']:.1f}")
+    print(f"stub: komut={stub.commands} ack={stub.acks} sıra_dışı={stub.out_of_order}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
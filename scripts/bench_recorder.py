@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Kayıt Ölçümü — alıcı thread'ine eklenen süre ve yazıcı verimi
+=============================================================
+Farklı boyutlarda sentetik JPEG'leri Recorder.offer() ile verilen kare
+hızında sunar. Alıcı tarafında offer() süresinin yüzdeliklerini (canlı
+görüntüye eklenen gecikme), yazılan / düşürülen frame sayısını ve
+oluşan AVI dosyasının indeks tutarlılığını raporlar.
+
+Kullanım (proje kökünden):
+    python scripts/bench_recorder.py
+    python scripts/bench_recorder.py --fps 60 --seconds 5 --out /tmp/rec
+"""
+
+import argparse
+import os
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QBuffer, QIODevice
+from PyQt6.QtGui import QColor, QImage
+
+from desktop_app.network.recorder import Recorder
+
+
+def _jpeg(width: int, height: int, shade: int) -> bytes:
+    img = QImage(width, height, QImage.Format.Format_RGB32)
+    img.fill(QColor(shade % 256, 80, 160))
+    buf = QBuffer()
+    buf.open(QIODevice.OpenModeFlag.WriteOnly)
+    img.save(buf, "JPEG", 80)
+    return bytes(buf.data())
+
+
+def _check_avi(path: str) -> int:
+    """idx1 girdilerinin movi içindeki '00dc' parçalarını gösterdiğini doğrula."""
+    with open(path, "rb") as f:
+        data = f.read()
+    assert struct.unpack_from("<I", data, 4)[0] == len(data) - 8, path
+    movi = data.find(b"movi")  # Offset'ler 'movi' fourcc'sine göredir
+    idx = movi + struct.unpack_from("<I", data, movi - 4)[0]
+    assert data[idx:idx + 4] == b"idx1", path
+    (size,) = struct.unpack_from("<I", data, idx + 4)
+    for i in range(size // 16):
+        _, _, off, length = struct.unpack_from("<4sIII", data, idx + 8 + i * 16)
+        assert data[movi + off:movi + off + 4] == b"00dc", path
+        assert length == 0 or data[movi + off + 8:movi + off + 10] == b"\xff\xd8", path
+    return size // 16
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--out", default=None, help="Kayıt dizini (varsayılan: geçici)")
+    args = parser.parse_args()
+
+    sizes = [(720, 1280), (540, 960), (360, 640)]  # Kalite seviyesi değişimi → yeni segment
+    frames = [[_jpeg(w, h, s) for s in range(8)] for w, h in sizes]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = Recorder(directory=args.out or tmp, prefix="bench")
+        recorder.start()
+        total = int(args.fps * args.seconds)
+        costs = []
+        for i in range(total):
+            data = frames[i * len(sizes) // total][i % 8]
+            t0 = time.perf_counter()
+            recorder.offer(data)
+            costs.append(time.perf_counter() - t0)
+            time.sleep(1 / args.fps)
+        recorder.stop()
+
+        costs.sort()
+        pct = lambda p: costs[min(len(costs) - 1, int(p * len(costs)))] * 1e6
+        print(f"offer() µs p50={pct(0.50):.1f} p99={pct(0.99):.1f} max={costs[-1] * 1e6:.1f}")
+        print(f"frame: sunulan={total} yazılan={recorder.recorded} düşürülen={recorder.dropped}")
+        indexed = 0
+        for path in recorder.segments:
+            n = _check_avi(path)
+            indexed += n
+            print(f"  {os.path.basename(path)}: {n} frame, {os.path.getsize(path) / 1024:.0f} KiB")
+    return 0 if indexed == recorder.recorded else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
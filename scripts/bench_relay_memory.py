@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Relay Bellek Ölçümü — oturum başına RSS ve bellek bütçesi
+==========================================================
+Relay'i alt süreç olarak başlatır ve `--sessions` kadar telefon+PC çifti
+açar. Üç aşamada relay sürecinin RSS'i (/proc/<pid>/status) ölçülür:
+
+  boşta      Eşleşmiş ama frame göndermeyen oturumlar
+  akış       Her telefon `--fps` hızında `--frame-kb`'lık ekran frame'i gönderir
+  yavaş      `--slow` PC okumayı bırakır (soketi okunmayan istemci); frame'ler
+             relay'de birikmeye çalışır
+
+Boşta ve akış için oturum başına RSS artışı raporlanır. Yavaş aşamada
+RELAY_MEMORY_BUDGET_MB (`--budget-mb`) küçük tutulur: /metrics'ten kuyruktaki
+byte, frame düşürme ve bağlantı kapatma sayaçları okunur. Sayılan byte'lar
+bütçeyi aşarsa çıkış kodu 1'dir; tepe RSS ayrıca gelen kuyrukları ve
+ayırıcının geri vermediği belleği de içerir.
+
+Kullanım (proje kökünden):
+    python scripts/bench_relay_memory.py
+    python scripts/bench_relay_memory.py --sessions 500 --fps 10 --frame-kb 150 --slow 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import websockets
+
+from bench_cluster import _free_port, _spawn
+
+
+def _rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _metrics(port: int) -> dict[str, float]:
+    """/metrics'i ad → değer olarak oku (etiketli seriler toplanır)."""
+    out: dict[str, float] = {}
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as r:
+        for line in r.read().decode().splitlines():
+            if line and not line.startswith("#"):
+                key, value = line.rsplit(" ", 1)
+                name = key.split("{", 1)[0]
+                out[name] = out.get(name, 0.0) + float(value)
+    return out
+
+
+async def _recv_type(ws, msg_type: str) -> dict:
+    while True:
+        msg = json.loads(await asyncio.wait_for(ws.recv(), 10))
+        if msg.get("type") == msg_type:
+            return msg
+
+
+async def _pair(url: str, port: int, slow: bool) -> tuple:
+    phone = await websockets.connect(url, max_size=None)
+    await phone.send(json.dumps({"type": "register", "role": "phone"}))
+    code = (await _recv_type(phone, "registered"))["code"]
+    sock = socket.socket()
+    if slow:
+        # Küçük alma penceresi: okuma durunca birikim çekirdekte değil relay'de olur
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 64 * 1024)
+    sock.connect(("127.0.0.1", port))
+    pc = await websockets.connect(url, sock=sock, max_size=None, max_queue=2)
+    await pc.send(json.dumps({"type": "join", "code": code, "role": "pc"}))
+    await _recv_type(pc, "paired")
+    return phone, pc
+
+
+async def _drain(pc, counts: list[int], i: int):
+    try:
+        async for _ in pc:
+            counts[i] += 1
+    except websockets.ConnectionClosed:
+        pass
+
+
+async def _stream(phones: list, frame: bytes, fps: float, seconds: float):
+    async def one(ws):
+        deadline = time.monotonic() + seconds
+        try:
+            while time.monotonic() < deadline:
+                await ws.send(frame, text=True)
+                await asyncio.sleep(1 / fps)
+        except websockets.ConnectionClosed:
+            pass
+
+    await asyncio.gather(*(one(ws) for ws in phones))
+
+
+async def _measure(args, port: int, pid: int) -> dict:
+    url = f"ws://127.0.0.1:{port}"
+    base = _rss_mb(pid)
+    pairs = []
+    for start in range(0, args.sessions, 50):  # Açılışı kümeler halinde yap
+        pairs += await asyncio.gather(*(_pair(url, port, i < args.slow)
+                                        for i in range(start, min(start + 50, args.sessions))))
+    phones = [p for p, _ in pairs]
+    pcs = [c for _, c in pairs]
+    await asyncio.sleep(1)
+    idle = _rss_mb(pid)
+
+    counts = [0] * len(pcs)
+    readers = [asyncio.create_task(_drain(pc, counts, i)) for i, pc in enumerate(pcs)]
+    frame = ('{"type":"frame","ch":1,"data":"%s"}' % ("x" * (args.frame_kb * 1024))).encode()
+    await _stream(phones, frame, args.fps, args.seconds)
+    streaming = _rss_mb(pid)
+    received = sum(counts)
+
+    # Yavaş PC'ler: okuma durur, relay'in gönderim tarafı dolar
+    for i, pc in enumerate(pcs[: args.slow]):
+        readers[i].cancel()  # Gelen kuyruk (max_queue) dolunca websockets okumayı durdurur
+    peak = streaming
+    task = asyncio.create_task(_stream(phones, frame, args.fps, args.seconds))
+    while not task.done():
+        await asyncio.sleep(0.25)
+        peak = max(peak, _rss_mb(pid))
+    m = _metrics(port)
+    closed = [pc.state is websockets.protocol.State.CLOSED for pc in pcs]
+
+    for r in readers:
+        r.cancel()
+    await asyncio.gather(*(ws.close() for ws in phones + pcs), return_exceptions=True)
+    return {
+        "base": base, "idle": idle, "streaming": streaming, "peak": peak,
+        "received": received, "closed": closed, "metrics": m,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--fps", type=float, default=10)
+    parser.add_argument("--frame-kb", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=8)
+    parser.add_argument("--slow", type=int, default=20, help="Okumayı bırakan PC sayısı")
+    parser.add_argument("--budget-mb", type=int, default=32, help="RELAY_MEMORY_BUDGET_MB")
+    args = parser.parse_args()
+
+    port = _free_port()
+    # Ölçülen şey bellek: hız sınırları ölçümü kesmesin
+    proc = _spawn([os.path.join(ROOT, "signaling_server", "server.py")], port, {
+        "PORT": str(port), "FRAME_RATE_PER_SEC": "1000",
+        "FRAME_BYTES_PER_SEC": str(512 * 1024 * 1024), "CONTROL_RATE_PER_SEC": "1000",
+        "RELAY_MEMORY_BUDGET_MB": str(args.budget_mb),
+    })
+    try:
+        r = asyncio.run(_measure(args, port, proc.pid))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    n = args.sessions
+    m = r["metrics"]
+    print(f"{n} oturum, {args.frame_kb} KB × {args.fps:.0f} fps, bütçe {args.budget_mb} MB")
+    print(f"boşta  RSS={r['idle']:.0f} MB  oturum başına {(r['idle'] - r['base']) * 1024 / n:.0f} KB")
+    print(f"akış   RSS={r['streaming']:.0f} MB  oturum başına {(r['streaming'] - r['base']) * 1024 / n:.0f} KB"
+          f"  ulaşan frame={r['received']}")
+    print(f"yavaş  {args.slow} PC  tepe RSS={r['peak']:.0f} MB  kuyruk={m.get('relay_memory_queued_bytes', 0) / 2**20:.1f} MB"
+          f"  düşen frame={m.get('relay_channel_messages_dropped_total', 0):.0f}"
+          f"  yük atma={m.get('relay_memory_shed_events_total', 0):.0f}"
+          f"  kapanan yavaş={sum(r['closed'][:args.slow])} diğer={sum(r['closed'][args.slow:])}")
+    # Relay'in tuttuğu (sayılan) byte'lar bütçenin içinde kalmalı
+    return 0 if m.get("relay_memory_queued_bytes", 0) <= args.budget_mb * 1024 * 1024 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
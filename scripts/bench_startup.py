@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Desktop App — Açılış Süresi Ölçümü
+===================================
+Masaüstü uygulamasını ayrı bir süreçte `-X importtime` ile başlatır,
+ilk pencere gösterilene kadar geçen süreyi ölçer ve en pahalı importları
+listeler. Süre bütçeyi aşarsa veya tembel yüklenmesi gereken modüller
+(requests, websocket-client, MJPEG alıcısı) açılışta yüklenmişse
+çıkış kodu 1 olur; CI'da açılış süresini takip etmek için kullanılır.
+
+Kullanım (proje kökünden):
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --runs 10 --budget-ms 800 --top 15
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Açılışta yüklenmemesi gereken modüller
+LAZY_MODULES = ("requests", "websocket", "desktop_app.network.mjpeg_receiver")
+
+PROBE = f"""
+import time
+t0 = time.perf_counter()
+import sys
+sys.path.insert(0, {ROOT!r})
+import desktop_app.main
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication(sys.argv)
+from desktop_app.ui.main_window import MainWindow
+window = MainWindow()
+window.show()
+
+def done():
+    print(f"FIRST_WINDOW_MS={{(time.perf_counter() - t0) * 1000:.1f}}")
+    print("LAZY_VIOLATIONS=" + ",".join(m for m in {LAZY_MODULES!r} if m in sys.modules))
+    app.quit()
+
+QTimer.singleShot(0, done)
+app.exec()
+"""
+
+
+def _run_once() -> tuple[float, float, list[str], dict[str, int]]:
+    """(süreç duvar süresi ms, ilk pencere ms, tembel ihlaller, modül -> kümülatif µs)."""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    first_window_ms = 0.0
+    violations: list[str] = []
+    for line in proc.stdout.splitlines():
+        if line.startswith("FIRST_WINDOW_MS="):
+            first_window_ms = float(line.split("=", 1)[1])
+        elif line.startswith("LAZY_VIOLATIONS="):
+            violations = [m for m in line.split("=", 1)[1].split(",") if m]
+
+    imports: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imports[name.strip()] = int(cumulative)
+    return wall_ms, first_window_ms, violations, imports
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500.0,
+                        help="İlk pencere için bütçe (medyan)")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Listelenecek en pahalı import sayısı")
+    args = parser.parse_args()
+
+    walls, firsts = [], []
+    violations: list[str] = []
+    imports: dict[str, int] = {}
+    for _ in range(args.runs):
+        wall_ms, first_ms, violations, imports = _run_once()
+        walls.append(wall_ms)
+        firsts.append(first_ms)
+
+    print(f"Süreç (interpreter dahil): medyan {statistics.median(walls):.1f} ms")
+    print(f"İlk pencere:               medyan {statistics.median(firsts):.1f} ms "
+          f"(min {min(firsts):.1f}, max {max(firsts):.1f}, bütçe {args.budget_ms:.0f})")
+
+    print(f"\nEn pahalı {args.top} import (son çalıştırma, kümülatif):")
+    for name, cumulative in sorted(imports.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if violations:
+        print(f"\n❌ Açılışta yüklenmemesi gereken modüller: {', '.join(violations)}")
+        failed = True
+    if statistics.median(firsts) > args.budget_ms:
+        print("\n❌ Açılış bütçesi aşıldı")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Yeniden Kodlama Ölçümü — yavaş izleyicilere küçültülmüş frame
+==============================================================
+Relay'i RELAY_TRANSCODE=1 ile alt süreç olarak başlatır (Pillow gerekir).
+Telefon rolündeki istemci Pillow ile üretilmiş gerçek JPEG ekran frame'leri
+gönderir. Kontrol eden PC ve bir izleyici hızlı bağlantıdadır; `--slow`
+izleyicinin bağlantısı `--link-kbps` ile sınırlıdır.
+
+Alıcı başına ulaşan frame, KB/sn ve son frame'in çözünürlüğü raporlanır;
+relay'in /metrics'inden sınıf başına kodlama işi, ortalama kodlama süresi ve
+önbellek isabeti okunur. Beklenen: yavaş izleyiciler küçültülmüş frame alır,
+hızlılar telefonun frame'ini alır ve bir sınıftaki iş sayısı gönderilen frame
+sayısını aşmaz (izleyici sayısından bağımsız).
+
+Kullanım (proje kökünden):
+    python scripts/bench_transcode.py
+    python scripts/bench_transcode.py --slow 5 --link-kbps 300 --seconds 20
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import os
+import random
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import websockets
+from PIL import Image, ImageDraw
+
+from bench_channels import _SlowLink, _recv_type
+from bench_cluster import _free_port, _spawn
+
+
+def _frames(width: int, height: int, count: int) -> list[bytes]:
+    """Birbirinden farklı ekran görüntüsü benzeri JPEG frame mesajları."""
+    out = []
+    rng = random.Random(1)
+    for n in range(count):
+        img = Image.new("RGB", (width, height), (20 + n * 10, 40, 90))
+        draw = ImageDraw.Draw(img)
+        for y in range(0, height, 40):
+            draw.rectangle((0, y, width, y + 18), fill=(rng.randrange(256), 120, 200))
+            draw.text((12, y + 20), f"satır {y} frame {n} " * 6, fill=(255, 255, 255))
+        buf = io.BytesIO()
+        img.save(buf, "JPEG", quality=80)
+        out.append(('{"type":"frame","ch":1,"data":"%s"}'
+                    % base64.b64encode(buf.getvalue()).decode()).encode())
+    return out
+
+
+def _metrics(port: int) -> dict[str, float]:
+    out: dict[str, float] = {}
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as r:
+        for line in r.read().decode().splitlines():
+            if line and not line.startswith("#"):
+                key, value = line.rsplit(" ", 1)
+                out[key] = float(value)
+    return out
+
+
+class _Stats:
+    def __init__(self, name: str):
+        self.name = name
+        self.frames = 0
+        self.bytes = 0
+        self.sizes: dict[tuple[int, int], int] = {}
+
+    def on_message(self, raw):
+        if not raw.startswith('{"type":"frame"'):
+            return
+        self.frames += 1
+        self.bytes += len(raw)
+        jpeg = base64.b64decode(json.loads(raw)["data"])
+        size = Image.open(io.BytesIO(jpeg)).size
+        self.sizes[size] = self.sizes.get(size, 0) + 1
+
+
+async def _measure(args, url: str) -> tuple[list[_Stats], int]:
+    phone = await websockets.connect(url, max_size=None)
+    await phone.send(json.dumps({"type": "register", "role": "phone"}))
+    code = (await _recv_type(phone, "registered"))["code"]
+
+    stats = [_Stats("pc"), _Stats("izleyici")]
+    fast = []
+    for role in ("pc", "viewer"):
+        ws = await websockets.connect(url, max_size=None)
+        await ws.send(json.dumps({"type": "join", "code": code, "role": role}))
+        fast.append(ws)
+    slow = []
+    for i in range(args.slow):
+        link = _SlowLink(url, args.link_kbps * 1024)
+        await link.open()
+        link.send(json.dumps({"type": "join", "code": code, "role": "viewer"}))
+        slow.append(link)
+        stats.append(_Stats(f"yavaş {i + 1}"))
+
+    async def read_fast(ws, s: _Stats):
+        async for raw in ws:
+            s.on_message(raw)
+
+    async def read_slow(link: _SlowLink, s: _Stats):
+        async for raw in link.messages():
+            if isinstance(raw, str):
+                s.on_message(raw)
+
+    readers = [asyncio.create_task(read_fast(ws, s)) for ws, s in zip(fast, stats)]
+    readers += [asyncio.create_task(read_slow(link, s)) for link, s in zip(slow, stats[2:])]
+    await asyncio.sleep(0.5)
+
+    frames = _frames(args.width, args.height, 8)
+    sent = 0
+    start = time.monotonic()
+    while time.monotonic() - start < args.seconds:
+        await phone.send(frames[sent % len(frames)], text=True)
+        sent += 1
+        await asyncio.sleep(max(0.0, start + sent / args.fps - time.monotonic()))
+    await asyncio.sleep(1)
+    for r in readers:
+        r.cancel()
+    for ws in fast + [phone]:
+        await ws.close()
+    for link in slow:
+        link.close()
+    return stats, sent
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=12)
+    parser.add_argument("--fps", type=float, default=10)
+    parser.add_argument("--width", type=int, default=1080)
+    parser.add_argument("--height", type=int, default=2400)
+    parser.add_argument("--slow", type=int, default=3, help="Yavaş izleyici sayısı")
+    parser.add_argument("--link-kbps", type=float, default=400, help="Yavaş bağlantının hızı (KiB/sn)")
+    args = parser.parse_args()
+
+    port = _free_port()
+    proc = _spawn([os.path.join(ROOT, "signaling_server", "server.py")], port, {
+        "PORT": str(port), "RELAY_TRANSCODE": "1", "FRAME_RATE_PER_SEC": "1000",
+        "FRAME_BYTES_PER_SEC": str(512 * 1024 * 1024),
+    })
+    try:
+        stats, sent = asyncio.run(_measure(args, f"ws://127.0.0.1:{port}"))
+        m = _metrics(port)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    full = (args.width, args.height)
+    print(f"gönderilen frame={sent} ({args.width}x{args.height} @ {args.fps:.0f} fps), "
+          f"yavaş bağlantı {args.link_kbps:.0f} KiB/sn")
+    for s in stats:
+        sizes = " ".join(f"{w}x{h}:{n}" for (w, h), n in sorted(s.sizes.items(), reverse=True))
+        print(f"{s.name:<9} frame={s.frames:<4} {s.bytes / 1024 / args.seconds:6.0f} KiB/sn  {sizes}")
+    jobs = {}
+    for key, value in m.items():
+        if key.startswith("relay_transcode_jobs_total"):
+            tier = int(key.split('tier="')[1].split('"')[0])
+            total = m.get(f'relay_transcode_seconds_sum{{tier="{tier}"}}', 0.0)
+            jobs[tier] = value
+            print(f"sınıf {tier}: iş={value:.0f} ortalama {total / value * 1000:.1f} ms")
+    print(f"önbellek isabeti={m.get('relay_transcode_cache_hits_total', 0):.0f} "
+          f"atlanan={m.get('relay_transcode_superseded_total', 0):.0f}")
+
+    slow_reduced = all(any(size != full for size in s.sizes) for s in stats[2:])
+    fast_full = all(set(s.sizes) <= {full} for s in stats[:2])
+    once_per_frame = all(n <= sent for n in jobs.values())
+    return 0 if slow_reduced and fast_full and once_per_frame else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
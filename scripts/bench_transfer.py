@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Aktarım Ölçümü — dosya aktarımı altında frame gecikmesi
+========================================================
+Relay'i alt süreç olarak başlatır. Telefon rolündeki istemci düzenli ekran
+frame'leri (gönderim zamanıyla) gönderir; PC'nin bağlantısı `--link-kbps`
+ile sınırlıdır (bkz. bench_channels._SlowLink). Önce yalnızca frame'lerle,
+sonra aynı anda telefondan PC'ye `--file-mb` boyutunda bir dosya aktarılırken
+frame gecikmesi ölçülür. Aktarım desktop'un `TransferManager`'ı ile yapılır
+(iki yönde aynı protokol): parça ack'lerinin gecikmesine göre hız ayarlanır.
+
+Raporlanan: iki evrede frame gecikmesi yüzdelikleri, aktarım süresi, ortalama
+hız ve hash doğrulaması. Aktarımlı evrede p95, frame'siz evredekini
+LATENCY_BUDGET_MS'ten fazla aşarsa veya aktarım tamamlanmazsa çıkış kodu 1.
+
+Kullanım (proje kökünden):
+    python scripts/bench_transfer.py
+    python scripts/bench_transfer.py --file-mb 32 --link-kbps 4096
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import websockets
+
+from bench_channels import _SlowLink, _recv_type
+from bench_cluster import _free_port, _spawn
+from desktop_app.config import Transfer
+from desktop_app.network import transfer
+
+
+async def _frames(phone, blob: str, fps: float, seconds: float) -> int:
+    sent = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        await phone.send('{"type":"frame","ch":1,"ts":%r,"data":"%s"}' % (time.perf_counter(), blob))
+        sent += 1
+        await asyncio.sleep(1 / fps)
+    return sent
+
+
+def _threadsafe(loop, send):
+    """TransferManager kendi thread'lerinden gönderir; gönderim event loop'ta yapılır."""
+    return lambda payload: loop.call_soon_threadsafe(send, payload)
+
+
+async def _measure(url: str, seconds: float, frame_kb: int, fps: float, link_kbps: float,
+                   path: str, directory: str) -> dict:
+    loop = asyncio.get_running_loop()
+    phone = await websockets.connect(url, max_size=None)
+    await phone.send(json.dumps({"type": "register", "role": "phone"}))
+    code = (await _recv_type(phone, "registered"))["code"]
+    pc = _SlowLink(url, link_kbps * 1024)
+    await pc.open()
+    pc.send(json.dumps({"type": "join", "code": code, "role": "pc"}))
+
+    phase = "idle"
+    delays: dict[str, list[float]] = {"idle": [], "transfer": []}
+    paired = asyncio.Event()
+    done = asyncio.Event()
+    result = {}
+
+    def finished(tid, ok, reason):
+        result.update(ok=ok, reason=reason, at=time.perf_counter())
+        loop.call_soon_threadsafe(done.set)
+
+    def phone_send(payload: bytes):
+        asyncio.ensure_future(phone.send(payload if transfer.is_transfer(payload) else payload.decode()))
+
+    sender = transfer.TransferManager(
+        _threadsafe(loop, phone_send), _threadsafe(loop, phone_send),
+        lambda *_: None, finished, lambda *_: None,
+    )
+    receiver = transfer.TransferManager(
+        _threadsafe(loop, lambda p: pc.send(p.decode())), _threadsafe(loop, pc.send_bytes),
+        lambda *_: None, lambda *_: None, lambda *_: None, directory=directory,
+    )
+
+    async def pc_receive():
+        async for raw in pc.messages():
+            if isinstance(raw, bytes):
+                if transfer.is_transfer(raw):
+                    receiver.on_binary(raw)
+            elif raw.startswith('{"type":"frame"'):
+                ts = float(raw[raw.index('"ts":') + 5: raw.index(',"data"')])
+                delays[phase].append(time.perf_counter() - ts)
+            elif raw.startswith('{"type":"transfer"'):
+                receiver.on_message(json.loads(raw))
+            elif '"paired"' in raw:
+                paired.set()
+
+    async def phone_receive():
+        async for raw in phone:
+            if isinstance(raw, bytes) and transfer.is_transfer(raw):
+                sender.on_binary(raw)
+            elif isinstance(raw, str) and raw.startswith('{"type":"transfer"'):
+                sender.on_message(json.loads(raw))
+
+    tasks = [asyncio.create_task(pc_receive()), asyncio.create_task(phone_receive())]
+    await asyncio.wait_for(paired.wait(), 5)
+    blob = "x" * (frame_kb * 1024)
+    await _frames(phone, blob, fps, seconds)
+
+    phase = "transfer"
+    started = time.perf_counter()
+    sender.send_file(path)
+    frames = asyncio.create_task(_frames(phone, blob, fps, 3600))
+    try:
+        await asyncio.wait_for(done.wait(), seconds * 20)
+    except asyncio.TimeoutError:
+        result.update(ok=False, reason="timeout", at=time.perf_counter())
+    frames.cancel()
+    sender.close()
+    receiver.close()
+    for task in tasks:
+        task.cancel()
+    await phone.close()
+    pc.close()
+    return {"delays": {k: sorted(v) for k, v in delays.items()}, "elapsed": result["at"] - started,
+            "ok": result["ok"], "reason": result["reason"]}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=4, help="Aktarımsız evrenin süresi")
+    parser.add_argument("--file-mb", type=float, default=8)
+    parser.add_argument("--frame-kb", type=int, default=30)
+    parser.add_argument("--fps", type=float, default=20)
+    parser.add_argument("--link-kbps", type=float, default=2048, help="PC bağlantısının hızı (KiB/sn)")
+    args = parser.parse_args()
+
+    port = _free_port()
+    proc = _spawn([os.path.join(ROOT, "signaling_server", "server.py")], port, {
+        "PORT": str(port), "FRAME_RATE_PER_SEC": "1000",
+        "FRAME_BYTES_PER_SEC": str(512 * 1024 * 1024),
+    })
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "upload.bin")
+        with open(path, "wb") as f:
+            for _ in range(int(args.file_mb * 1024 * 1024) // (1024 * 1024)):
+                f.write(os.urandom(1024 * 1024))
+        try:
+            r = asyncio.run(_measure(f"ws://127.0.0.1:{port}", args.seconds, args.frame_kb, args.fps,
+                                     args.link_kbps, path, os.path.join(tmp, "received")))
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    pct = lambda d, p: d[min(len(d) - 1, int(p * len(d)))] * 1000
+    for phase, name in (("idle", "aktarımsız"), ("transfer", "aktarım sırasında")):
+        d = r["delays"][phase]
+        if not d:
+            print(f"{name}: frame ulaşmadı")
+            return 1
+        print(f"{name}: frame gecikmesi ms p50={pct(d, 0.50):.1f} p95={pct(d, 0.95):.1f} "
+              f"max={d[-1] * 1000:.1f} ({len(d)} frame)")
+    mb = args.file_mb
+    print(f"aktarım: {mb:.0f} MB {r['elapsed']:.1f} sn ({mb / r['elapsed']:.2f} MB/sn) "
+          f"ok={r['ok']} {r['reason']}")
+    extra = pct(r["delays"]["transfer"], 0.95) - pct(r["delays"]["idle"], 0.95)
+    print(f"p95 artışı {extra:.1f} ms (bütçe {Transfer.LATENCY_BUDGET_MS:.0f} ms)")
+    return 0 if r["ok"] and extra <= Transfer.LATENCY_BUDGET_MS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Telefon Simülatörü (stub)
+==========================
+Android uygulaması yerine relay'e "phone" rolüyle bağlanır; PC'den gelen
+komutları (JSON ve ikili) çözer ve seq/ts ile ack döndürür; `peer_probe`
+mesajlarını yanıtlar ve `set_quality` seviyesini kaydeder. Sunucu drain
+ederken (`server_draining`) Android uygulaması gibi aynı kodla yeniden
+bağlanır. PC'nin gönderdiği dosya ve pano aktarımlarını alır (bkz.
+desktop_app.network.transfer), pano isteğine sabit bir metinle yanıt verir.
+Desktop uygulamasını veya `bench_input_latency.py`'yi gerçek telefon olmadan
+uçtan uca denemek için kullanılır.
+
+Gecikme, titreşim (jitter) ve ack kaybı eklenebilir (gecikme probe
+yanıtlarına da uygulanır); titreşim ack'lerin
+sırasını bozar, PC'nin sıra dışı tespitini denemek için kullanılır.
+
+Kullanım (proje kökünden):
+    python scripts/phone_stub.py --server ws://127.0.0.1:8765          # kodu sunucu verir
+    python scripts/phone_stub.py --code 123456                         # belirli kod (boşsa)
+    python scripts/phone_stub.py --delay-ms 40 --jitter-ms 30 --drop 0.05
+    python scripts/phone_stub.py --receive-dir /tmp/received
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import websockets
+
+from desktop_app.network import input_protocol, transfer
+from desktop_app.network.latency import seq_newer
+
+logger = logging.getLogger("phone_stub")
+
+
+class PhoneStub:
+    """Relay'e telefon olarak bağlanan, komutlara ack veren basit istemci."""
+
+    def __init__(self, url: str, code: str = "", binary: bool = True,
+                 delay_ms: float = 0.0, jitter_ms: float = 0.0, drop: float = 0.0,
+                 receive_dir: str = ""):
+        self.url = url
+        self.code = code
+        self.binary = binary
+        self.delay_ms = delay_ms
+        self.jitter_ms = jitter_ms
+        self.drop = drop
+        self.token = ""
+        self.registered = asyncio.Event()
+        self.paired = asyncio.Event()
+        self.commands = 0
+        self.acks = 0
+        self.out_of_order = 0
+        self.probes = 0
+        self.quality_level: int | None = None
+        self.migrations = 0
+        self._last_seq: int | None = None
+        self._ws = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._reconnect_after: float | None = None
+        self.received: list[str] = []
+        self.transfers = transfer.TransferManager(
+            self._threadsafe(text=True), self._threadsafe(text=False), lambda *_: None,
+            lambda tid, ok, reason: logger.info(f"transfer_finished id={tid} ok={ok} {reason}"),
+            self._on_received,
+            directory=receive_dir or os.path.join(tempfile.gettempdir(), "phone_stub_received"),
+        )
+
+    async def run(self, stop: asyncio.Event | None = None):
+        self._loop = asyncio.get_running_loop()
+        while True:
+            self._reconnect_after = None
+            async with websockets.connect(self.url) as ws:
+                self._ws = ws
+                register = {"type": "register", "role": "phone"}
+                if self.code:
+                    register.update(code=self.code, token=self.token)
+                await ws.send(json.dumps(register))
+                receiver = asyncio.create_task(self._receive(ws))
+                waiters = [receiver]
+                if stop is not None:
+                    waiters.append(asyncio.create_task(stop.wait()))
+                await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+                for task in waiters:
+                    task.cancel()
+            if self._reconnect_after is None or (stop is not None and stop.is_set()):
+                return
+            self.migrations += 1
+            await asyncio.sleep(self._reconnect_after)
+
+    async def _receive(self, ws):
+        async for raw in ws:
+            if isinstance(raw, bytes) and transfer.is_transfer(raw):
+                self.transfers.on_binary(raw)
+                continue
+            if isinstance(raw, bytes):
+                try:
+                    msg = input_protocol.decode(raw)
+                except ValueError as e:
+                    logger.warning(f"binary_decode_error {e}")
+                    continue
+                self._on_command(msg, binary=True)
+                continue
+
+            msg = json.loads(raw)
+            msg_type = msg.get("type")
+            if msg_type == "registered":
+                self.code, self.token = msg.get("code"), msg.get("token", "")
+                logger.info(f"📱 Kod: {self.code}  (desktop uygulamasında bu kodla bağlanın)")
+                self.registered.set()
+            elif msg_type == "paired":
+                logger.info(f"paired code={self.code}")
+                self._last_seq = None
+                if self.binary:
+                    await ws.send(json.dumps({"type": "relay", "caps": [input_protocol.CAPABILITY]}))
+                self.paired.set()
+            elif msg_type == "command":
+                self._on_command(msg, binary=False)
+            elif msg_type == "transfer":
+                if msg.get("op") == "request":
+                    self.transfers.send_clipboard(f"phone_stub {self.code}")
+                else:
+                    self.transfers.on_message(msg)
+            elif msg_type == "peer_probe":
+                self.probes += 1
+                self._send_later(json.dumps({"type": "peer_probe_ack", "ts": msg.get("ts")}))
+            elif msg_type == "server_draining":
+                # Yeniden bağlanmayı sunucunun verdiği pencereye yay
+                window_ms = msg.get("reconnect_within_ms") or 0
+                self._reconnect_after = random.uniform(0, window_ms) / 1000
+                logger.info(f"server_draining, reconnecting in {self._reconnect_after:.2f}s")
+                return
+            elif msg_type == "peer_disconnected":
+                logger.info("pc_disconnected")
+                self.transfers.pause()
+                self.paired.clear()
+            elif msg_type == "error":
+                logger.warning(f"server_error {msg.get('message')}")
+
+    def _on_command(self, msg: dict, binary: bool):
+        self.commands += 1
+        if msg.get("action") == "set_quality":
+            self.quality_level = msg.get("level")
+            logger.info(f"set_quality level={self.quality_level}")
+        seq, ts = msg.get("seq"), msg.get("ts")
+        logger.debug(f"command {msg}")
+        if seq is None:
+            return
+        if self._last_seq is not None and not seq_newer(seq, self._last_seq):
+            self.out_of_order += 1
+            logger.warning(f"out_of_order seq={seq} last={self._last_seq}")
+        else:
+            self._last_seq = seq
+        if random.random() < self.drop:
+            return
+        if binary:
+            payload = input_protocol.encode_ack(seq, ts)
+        else:
+            payload = json.dumps({"type": "ack", "seq": seq, "ts": ts})
+        self._send_later(payload, ack=True)
+
+    def _on_received(self, kind: str, value: str):
+        self.received.append(value)
+        logger.info(f"transfer_received {kind} {value if kind == transfer.FILE else len(value)}")
+
+    def _threadsafe(self, text: bool):
+        """Aktarım yöneticisi kendi thread'lerinden de gönderir; JSON metin frame'i olarak gider."""
+        def send(payload: bytes):
+            data = payload.decode() if text else payload
+            self._loop.call_soon_threadsafe(lambda: asyncio.ensure_future(self._send(data, False)))
+        return send
+
+    def _send_later(self, payload, ack: bool = False):
+        """Yanıtı yapay gecikme + titreşimle gönder (ağ koşulu taklidi)."""
+        delay = max(0.0, self.delay_ms + random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+        asyncio.get_running_loop().call_later(
+            delay, lambda: asyncio.ensure_future(self._send(payload, ack)),
+        )
+
+    async def _send(self, payload, ack: bool):
+        try:
+            await self._ws.send(payload)
+            if ack:
+                self.acks += 1
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--server", default="ws://127.0.0.1:8765")
+    parser.add_argument("--code", default="", help="İstenen kod (verilmezse sunucu ayırır)")
+    parser.add_argument("--json-only", action="store_true", help="İkili girdi yeteneğini bildirme")
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="Ack öncesi yapay gecikme")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Gecikmeye ± rastgele ekleme")
+    parser.add_argument("--drop", type=float, default=0.0, help="Ack gönderilmeme olasılığı (0–1)")
+    parser.add_argument("--receive-dir", default="", help="Alınan dosyaların dizini (varsayılan: geçici)")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+    )
+    stub = PhoneStub(args.server, args.code, binary=not args.json_only,
+                     delay_ms=args.delay_ms, jitter_ms=args.jitter_ms, drop=args.drop,
+                     receive_dir=args.receive_dir)
+    try:
+        asyncio.run(stub.run())
+    except KeyboardInterrupt:
+        pass
+    print(f"komut={stub.commands} ack={stub.acks} sıra_dışı={stub.out_of_order} "
+          f"probe={stub.probes} kalite={stub.quality_level} taşınma={stub.migrations} "
+          f"alınan={len(stub.received)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
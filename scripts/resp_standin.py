@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+RESP Stand-in (Redis yerine)
+=============================
+Relay'in oturum deposunun (signaling_server/session_store.RespStore)
+kullandığı Redis komut alt kümesini konuşan küçük, bellek içi sunucu.
+Birden fazla relay düğümünü yerelde, Redis kurmadan denemek için:
+
+    python scripts/resp_standin.py --port 6390
+    RELAY_STORE_URL=redis://127.0.0.1:6390 RELAY_NODE_ID=a PORT=8765 python signaling_server/server.py
+    RELAY_STORE_URL=redis://127.0.0.1:6390 RELAY_NODE_ID=b PORT=8766 python signaling_server/server.py
+
+Desteklenen komutlar: PING, AUTH, SET (NX/EX), GET, EXISTS, HSET, HGET, HDEL,
+HGETALL, DEL, EXPIRE, PUBLISH, SUBSCRIBE, QUIT. Kalıcılık ve kümeleme yoktur.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+
+logger = logging.getLogger("resp_standin")
+
+
+def _bulk(value: bytes | None) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _array(items: list) -> bytes:
+    return b"*%d\r\n" % len(items) + b"".join(
+        b":%d\r\n" % i if isinstance(i, int) else _bulk(i) for i in items)
+
+
+async def _read_command(reader: asyncio.StreamReader) -> list[bytes] | None:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        return line.strip().split()  # Satır içi komut (telnet)
+    args = []
+    for _ in range(int(line[1:-2])):
+        n = int((await reader.readline())[1:-2])
+        args.append((await reader.readexactly(n + 2))[:-2])
+    return args
+
+
+class RespStandin:
+    """String'ler, hash'ler, süre aşımı ve pub/sub; tek event loop, kilit gerekmez."""
+
+    def __init__(self):
+        self._strings: dict[bytes, bytes] = {}
+        self._hashes: dict[bytes, dict[bytes, bytes]] = {}
+        self._expiry: dict[bytes, float] = {}
+        self._channels: dict[bytes, set[asyncio.StreamWriter]] = {}
+
+    async def serve(self, host: str, port: int) -> asyncio.Server:
+        return await asyncio.start_server(self._client, host, port)
+
+    def _expire(self, key: bytes):
+        deadline = self._expiry.get(key)
+        if deadline is not None and time.monotonic() >= deadline:
+            self._strings.pop(key, None)
+            self._hashes.pop(key, None)
+            self._expiry.pop(key, None)
+
+    def _exists(self, key: bytes) -> bool:
+        self._expire(key)
+        return key in self._strings or key in self._hashes
+
+    def _hash(self, key: bytes, create: bool = False) -> dict | None:
+        self._expire(key)
+        if create:
+            return self._hashes.setdefault(key, {})
+        return self._hashes.get(key)
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        subscribed: list[bytes] = []
+        try:
+            while (args := await _read_command(reader)) is not None:
+                if not args:
+                    continue
+                reply = self._execute(args, writer, subscribed)
+                if reply is None:
+                    break
+                writer.write(reply)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in subscribed:
+                self._channels.get(channel, set()).discard(writer)
+            writer.close()
+
+    def _execute(self, args: list[bytes], writer, subscribed: list[bytes]) -> bytes | None:
+        cmd, rest = args[0].upper(), args[1:]
+        if cmd == b"PING":
+            return b"+PONG\r\n"
+        if cmd == b"AUTH":
+            return b"+OK\r\n"
+        if cmd == b"QUIT":
+            writer.write(b"+OK\r\n")
+            return None
+        if cmd == b"SET":
+            opts = [o.upper() for o in rest[2:]]
+            if b"NX" in opts and self._exists(rest[0]):
+                return b"$-1\r\n"
+            self._hashes.pop(rest[0], None)
+            self._strings[rest[0]] = rest[1]
+            self._expiry.pop(rest[0], None)
+            if b"EX" in opts:
+                self._expiry[rest[0]] = time.monotonic() + int(rest[2 + opts.index(b"EX") + 1])
+            return b"+OK\r\n"
+        if cmd == b"GET":
+            self._expire(rest[0])
+            return _bulk(self._strings.get(rest[0]))
+        if cmd == b"EXISTS":
+            return b":%d\r\n" % sum(self._exists(k) for k in rest)
+        if cmd == b"HSET":
+            h = self._hash(rest[0], create=True)
+            added = 0
+            for i in range(1, len(rest) - 1, 2):
+                added += rest[i] not in h
+                h[rest[i]] = rest[i + 1]
+            return b":%d\r\n" % added
+        if cmd == b"HGET":
+            return _bulk((self._hash(rest[0]) or {}).get(rest[1]))
+        if cmd == b"HDEL":
+            h = self._hash(rest[0]) or {}
+            removed = sum(h.pop(f, None) is not None for f in rest[1:])
+            if not h:
+                self._hashes.pop(rest[0], None)
+                self._expiry.pop(rest[0], None)
+            return b":%d\r\n" % removed
+        if cmd == b"HGETALL":
+            h = self._hash(rest[0]) or {}
+            return _array([x for kv in h.items() for x in kv])
+        if cmd == b"DEL":
+            removed = sum(self._exists(k) for k in rest)
+            for k in rest:
+                self._strings.pop(k, None)
+                self._hashes.pop(k, None)
+                self._expiry.pop(k, None)
+            return b":%d\r\n" % removed
+        if cmd == b"EXPIRE":
+            if not self._exists(rest[0]):
+                return b":0\r\n"
+            self._expiry[rest[0]] = time.monotonic() + int(rest[1])
+            return b":1\r\n"
+        if cmd == b"PUBLISH":
+            receivers = self._channels.get(rest[0], set())
+            message = _array([b"message", rest[0], rest[1]])
+            for sub in receivers:
+                sub.write(message)
+            return b":%d\r\n" % len(receivers)
+        if cmd == b"SUBSCRIBE":
+            out = []
+            for channel in rest:
+                self._channels.setdefault(channel, set()).add(writer)
+                subscribed.append(channel)
+                out.append(_array([b"subscribe", channel, len(subscribed)]))
+            return b"".join(out)
+        return b"-ERR unknown command '%s'\r\n" % cmd
+
+
+async def _serve(host: str, port: int):
+    server = await RespStandin().serve(host, port)
+    logger.info(f"RESP stand-in listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    try:
+        asyncio.run(_serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
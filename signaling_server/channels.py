@@ -0,0 +1,241 @@
+"""
+Signaling Server — Tek bağlantı üzerinde mantıksal kanallar ve öncelikli gönderim.
+
+Telefon ekran ve kamera frame'lerini aynı WebSocket üzerinden gönderir;
+frame mesajının "ch" alanı kanalı belirtir (yoksa ekran). Frame olmayan
+her mesaj (komut, ack, probe, ikili girdi, stream_info...) kontrol kanalıdır;
+dosya/pano aktarım parçaları (ikili, ilk byte 0x10) kendi BULK kanalındadır.
+
+    {"type": "frame", "ch": 2, "data": "..."}
+
+Her alıcı soketin bir `Outbox`'ı vardır. Gönderim görevi her mesajdan önce
+kuyrukları öncelik sırasıyla tarar: kontrol her zaman önce gider ve en fazla
+o an yazılmakta olan tek frame'in arkasında bekler. Video kanalları bant
+genişliğini WEIGHTS oranında paylaşır (ekran kameranın 3 katı): darboğazda
+ekran önceliklidir ama kamera tamamen durmaz. Aktarım kanalı da paylaşıma
+kamera ağırlığıyla katılır; asıl hız denetimini gönderen yapar (parça
+ack'lerinin gecikmesine bakar), kanal yalnızca frame'lerin arkasında birikmesini
+önler. Video kanallarının kuyrukları kanal başına sınırlıdır ve doluyken en eski
+frame düşer (akış denetimi); yavaş alıcı bayat frame biriktirmez, göndereni
+de bekletmez. Aktarım kanalında düşen parçayı gönderen ack'lerden anlayıp
+yeniden gönderir. Kontrol mesajları düşürülmez; yalnızca alıcı tamamen takılıp
+CONTROL_QUEUE_MESSAGES dolarsa yenileri sayılarak atılır.
+
+Öncelik yalnızca sıra henüz bu kuyruklardayken işe yarar: asyncio soketin
+gönderim tamponu doldukça yazar ve çekirdekte saniyelerce video birikebilir;
+kontrol mesajı onun arkasında kalır. Bu yüzden video frame'i ancak soketteki
+gönderilmemiş veri (asyncio tamponu + çekirdekte henüz yola çıkmamış byte'lar,
+Linux'ta SIOCOUTQNSD) SEND_BACKLOG_BYTES'ın altındaysa yazılır (aktarım
+parçaları daha düşük BULK_BACKLOG_BYTES'ın); üstündeyse frame kuyrukta bekler (ve yenisi gelince düşer), kontrol mesajları beklemez.
+
+Kuyruklardaki byte'lar `queued`'da sayılır; bağlantı başına ve toplam bellek
+bütçesi bunun üzerinden uygulanır (bkz. memory).
+"""
+
+import asyncio
+import re
+import struct
+import sys
+from collections import deque
+
+try:
+    import fcntl
+except ImportError:  # Windows: çekirdek tamponu ölçülemez, yalnızca asyncio tamponu
+    fcntl = None
+
+from websockets.exceptions import ConnectionClosed
+
+from signaling_server import instrumentation, memory
+from signaling_server.config import ServerConfig, MessageTypes
+from signaling_server.metrics import metrics
+
+CONTROL = 0
+SCREEN = 1
+CAMERA = 2
+BULK = 3
+
+# Gönderim sırası: önce kontrol, sonra paylaşılan kanallar ağırlıklarıyla
+PRIORITY = (CONTROL, SCREEN, CAMERA, BULK)
+SHARED = PRIORITY[1:]
+VIDEO = (SCREEN, CAMERA)
+WEIGHTS = {SCREEN: 3, CAMERA: 1, BULK: 1}
+
+# "ch" alanı "type"ın hemen ardından yazılır; ilk 64 karaktere bakılır
+_CH_RE = re.compile(rb'"ch"\s*:\s*(\d)')
+_SNIFF_LEN = 64
+
+
+def channel_of(raw, msg_type: str) -> int:
+    """Mesajın kanalı (parse etmeden); frame ve aktarım parçası dışındaki her şey kontrol."""
+    if msg_type == MessageTypes.CHUNK:
+        return BULK
+    if msg_type != MessageTypes.FRAME:
+        return CONTROL
+    head = raw[:_SNIFF_LEN]
+    if isinstance(head, str):
+        head = head.encode("ascii", "replace")
+    m = _CH_RE.search(head)
+    ch = int(m.group(1)) if m else SCREEN
+    return ch if ch in VIDEO else SCREEN
+
+
+# linux/sockios.h: gönderim kuyruğunda henüz yollanmamış byte (yalnızca Linux)
+_SIOCOUTQNSD = 0x894B if sys.platform.startswith("linux") and fcntl is not None else None
+
+
+def _kernel_unsent(fd: int) -> int:
+    try:
+        return struct.unpack("i", fcntl.ioctl(fd, _SIOCOUTQNSD, b"\0\0\0\0"))[0]
+    except OSError:
+        return 0
+
+
+class Outbox:
+    """Bir alıcı soketin kanal başına gönderim kuyrukları ve gönderim görevi."""
+
+    __slots__ = ("ws", "code", "role", "depth", "dropped", "queued", "sent", "_queues",
+                 "_served", "_vtime", "_wake", "_task", "_fd")
+
+    def __init__(self, ws, code: str, role: str, depth: int = ServerConfig.CHANNEL_QUEUE_FRAMES):
+        self.ws = ws
+        self.code = code
+        self.role = role
+        self.depth = depth
+        self.dropped = 0
+        self.queued = 0     # Kuyruklardaki toplam byte (bkz. memory)
+        self.sent = 0       # Gönderilen toplam byte (bkz. transcode)
+        self._queues: dict[int, deque[tuple[bytes, bool]]] = {ch: deque() for ch in PRIORITY}
+        # Ağırlıklı adil paylaşım: kanalın ağırlığına bölünmüş gönderilen byte
+        self._served = dict.fromkeys(SHARED, 0.0)
+        self._vtime = 0.0
+        self._wake = asyncio.Event()
+        self._fd = -1
+        transport = getattr(ws, "transport", None)
+        sock = transport.get_extra_info("socket") if transport else None
+        if sock is not None and _SIOCOUTQNSD is not None:
+            self._fd = sock.fileno()
+        self._task = asyncio.create_task(self._run())
+
+    @property
+    def closed(self) -> bool:
+        return self._task.done()
+
+    def offer(self, payload: bytes, text: bool = True, ch: int = CONTROL) -> bool:
+        """Mesajı kuyruğa al; alıcı kapandıysa False."""
+        if self._task.done():
+            return False
+        queue = self._queues[ch]
+        size = len(payload)
+        if ch == CONTROL:
+            if len(queue) >= ServerConfig.CONTROL_QUEUE_MESSAGES:
+                metrics.inc("channel_messages_dropped_total", ch=ch, role=self.role)
+                return True
+        elif ch == BULK and memory.shedding:
+            self._drop(ch)  # Bellek bütçesi aşıldı: gönderen ack'lerden anlayıp yeniden gönderir
+            return True
+        else:
+            if not queue:
+                # Boşta kalan kanal geçmiş payını biriktirip sonra ötekini bastırmasın
+                self._served[ch] = max(self._served[ch], self._vtime)
+            if memory.shedding:
+                limit = 1
+            else:
+                limit = ServerConfig.TRANSFER_QUEUE_CHUNKS if ch == BULK else self.depth
+            while queue and (len(queue) >= limit
+                             or self.queued + size > ServerConfig.CONNECTION_QUEUE_BYTES):
+                self.queued -= len(queue.popleft()[0])  # Alıcı en güncel frame'i görsün
+                self._drop(ch)
+        queue.append((payload, text))
+        self.queued += size
+        self._wake.set()
+        return True
+
+    def _drop(self, ch: int):
+        self.dropped += 1
+        metrics.inc("channel_messages_dropped_total", ch=ch, role=self.role)
+
+    def memory(self) -> int:
+        """Bu bağlantı için tutulan byte: kuyruklar + gönderim tamponu."""
+        transport = getattr(self.ws, "transport", None)
+        return self.queued + (transport.get_write_buffer_size() if transport else 0)
+
+    def shed(self):
+        """Bellek bütçesi aşıldı: video kanallarında yalnızca en yeni frame kalır, parçalar atılır."""
+        for ch in SHARED:
+            queue = self._queues[ch]
+            keep = 0 if ch == BULK else 1
+            while len(queue) > keep:
+                self.queued -= len(queue.popleft()[0])
+                self._drop(ch)
+
+    def discard_data(self):
+        """Bekleyen frame ve parçaları at (kaynak gitti; kontrol mesajları kalır)."""
+        for ch in SHARED:
+            queue = self._queues[ch]
+            self.queued -= sum(len(payload) for payload, _ in queue)
+            queue.clear()
+
+    def _backlog(self) -> int:
+        """Sokette henüz yola çıkmamış byte'lar (asyncio tamponu + çekirdek)."""
+        transport = getattr(self.ws, "transport", None)
+        pending = transport.get_write_buffer_size() if transport else 0
+        if self._fd >= 0:
+            pending += _kernel_unsent(self._fd)
+        return pending
+
+    def _next(self) -> tuple[bytes, bool] | None:
+        if self._queues[CONTROL]:
+            item = self._queues[CONTROL].popleft()
+            self.queued -= len(item[0])
+            return item
+        ready = [ch for ch in SHARED if self._queues[ch]]
+        if not ready:
+            return None
+        backlog = self._backlog()
+        if backlog >= ServerConfig.SEND_BACKLOG_BYTES:
+            return None  # Video bekler; kontrol gelirse önce o gider
+        if backlog >= ServerConfig.BULK_BACKLOG_BYTES:
+            # Aktarım parçası ancak soket neredeyse boşken: frame'in önünde yığılmasın
+            ready = [ch for ch in ready if ch != BULK]
+            if not ready:
+                return None
+        ch = min(ready, key=self._served.__getitem__)
+        payload, text = self._queues[ch].popleft()
+        self.queued -= len(payload)
+        self._vtime = self._served[ch]
+        self._served[ch] += len(payload) / WEIGHTS[ch]
+        return payload, text
+
+    async def _run(self):
+        while True:
+            item = self._next()
+            if item is None:
+                self._wake.clear()
+                if any(self._queues[ch] for ch in SHARED):
+                    # Soket tamponu boşalınca haber gelmez: kısa aralıkla yokla
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), ServerConfig.SEND_BACKLOG_POLL_SEC)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    await self._wake.wait()
+                continue
+            payload, text = item
+            try:
+                await instrumentation.timed_send(self.ws, payload, self.code, self.role, text=text)
+            except ConnectionClosed:
+                return
+            self.sent += len(payload)
+
+    def close(self):
+        self._task.cancel()
+
+    def abort(self):
+        """Bellek bütçesi için bağlantıyı beklemeden kes; kuyruk ve tampon hemen boşalır."""
+        self.close()
+        for queue in self._queues.values():
+            queue.clear()
+        self.queued = 0
+        transport = getattr(self.ws, "transport", None)
+        if transport is not None:
+            transport.abort()
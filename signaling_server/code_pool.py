@@ -0,0 +1,139 @@
+"""
+Signaling Server — Eşleşme kodu tahsisi.
+
+Kodlar 10^CODE_DIGITS'lik uzaydan (000000–999999) sunucu tarafından
+rastgele ve çakışmasız verilir. Tüm kodlar tek bir dizide tutulur; dizinin
+ilk `_free` elemanı serbest kodlardır, `_index` her kodun dizideki yerini
+gösterir:
+
+    tahsis     — [0, _free) içinden rastgele bir konum seç, son serbest
+                 elemanla yer değiştir, _free -= 1                    O(1)
+    belirli kod — (eski istemcinin seçtiği kod) konumu _index'ten bul,
+                 aynı yer değiştirmeyle serbest bölgeden çıkar         O(1)
+    iade        — kodu ilk dolu konumla yer değiştir, _free += 1       O(1)
+
+Oturum bitince kod hemen iade edilmez: CODE_HOLD_SEC boyunca aynı
+telefona (token ile) ayrılı kalır; kısa kopma veya drain sonrası yeniden
+bağlanan telefon kodunu korur, başka bir telefon o kodu alamaz. Bekleme
+süresi sabit olduğundan süresi dolanlar FIFO kuyruktan O(1) düşer.
+
+İki dizi 10^6 kod için ~8 MB tutar ve ilk tahsiste oluşturulur.
+"""
+
+import secrets
+import time
+from array import array
+from collections import deque
+
+from signaling_server.config import ServerConfig
+
+
+class CodePool:
+    """Rastgele, çakışmasız ve O(1) kod tahsisi; token ile sahiplik."""
+
+    def __init__(self, digits: int = ServerConfig.CODE_DIGITS,
+                 hold_sec: float = ServerConfig.CODE_HOLD_SEC):
+        self._digits = digits
+        self._size = 10 ** digits
+        self._hold_sec = hold_sec
+        self._codes: array | None = None    # konum -> kod
+        self._index: array | None = None    # kod -> konum
+        self._free = self._size
+        self._tokens: dict[int, str] = {}   # ayrılmış kod -> sahiplik token'ı
+        self._held: dict[int, float] = {}   # bekletilen kod -> bitiş zamanı
+        self._held_queue: deque[tuple[float, int]] = deque()
+
+    def __len__(self) -> int:
+        """Ayrılmış (aktif + bekletilen) kod sayısı."""
+        return self._size - self._free
+
+    @property
+    def held(self) -> int:
+        return len(self._held)
+
+    def _arrays(self) -> tuple[array, array]:
+        if self._codes is None:
+            self._codes = array("i", range(self._size))
+            self._index = array("i", range(self._size))
+        return self._codes, self._index
+
+    def _swap(self, i: int, j: int):
+        codes, index = self._arrays()
+        a, b = codes[i], codes[j]
+        codes[i], codes[j] = b, a
+        index[a], index[b] = j, i
+
+    def _take(self, position: int) -> int:
+        self._free -= 1
+        self._swap(position, self._free)
+        return self._codes[self._free]
+
+    def _put(self, code: int):
+        self._swap(self._index[code], self._free)
+        self._free += 1
+
+    def format(self, code: int) -> str:
+        return f"{code:0{self._digits}d}"
+
+    def parse(self, code: str) -> int | None:
+        # isascii: "١٢٣٤٥٦" de isdigit() ve int() geçer; oturum başka anahtarla tutulurdu
+        if len(code) != self._digits or not (code.isascii() and code.isdigit()):
+            return None
+        return int(code)
+
+    def expire(self, now: float | None = None):
+        """Bekleme süresi dolan kodları havuza iade et."""
+        now = time.monotonic() if now is None else now
+        while self._held_queue and self._held_queue[0][0] <= now:
+            deadline, code = self._held_queue.popleft()
+            if self._held.get(code) == deadline:
+                del self._held[code]
+                del self._tokens[code]
+                self._put(code)
+
+    def allocate(self, now: float | None = None) -> tuple[str, str] | None:
+        """Rastgele serbest bir kod ayır: (kod, token); uzay doluysa None."""
+        self.expire(now)
+        if not self._free:
+            return None
+        self._arrays()
+        code = self._take(secrets.randbelow(self._free))
+        token = secrets.token_urlsafe(12)
+        self._tokens[code] = token
+        return self.format(code), token
+
+    def claim(self, code: str, token: str = "", now: float | None = None) -> str | None:
+        """
+        Belirli bir kodu ayır veya (aynı token ile) geri al; token döndürür.
+        Kod başka bir sahipte ise (aktif veya bekletiliyor) None.
+        """
+        n = self.parse(code)
+        if n is None:
+            return None
+        self.expire(now)
+        self._arrays()
+        owner = self._tokens.get(n)
+        if owner is not None:
+            if not token or not secrets.compare_digest(owner, token):
+                return None
+            self._held.pop(n, None)  # Kuyruktaki eski kayıt expire'da atlanır
+            return owner
+        self._take(self._index[n])
+        token = token or secrets.token_urlsafe(12)
+        self._tokens[n] = token
+        return token
+
+    def owned(self, code: str) -> bool:
+        """Kod şu an ayrılmış mı (aktif veya bekletiliyor)."""
+        n = self.parse(code)
+        return n is not None and n in self._tokens
+
+    def release(self, code: str, now: float | None = None):
+        """Oturum bitti: kodu CODE_HOLD_SEC boyunca sahibine ayrılı tut."""
+        n = self.parse(code)
+        if n is None or n not in self._tokens or n in self._held:
+            return
+        now = time.monotonic() if now is None else now
+        deadline = now + self._hold_sec
+        self._held[n] = deadline
+        self._held_queue.append((deadline, n))
@@ -0,0 +1,128 @@
+"""
+Signaling Server — JSON codec katmanı.
+
+Kurulu olan en hızlı arka uç seçilir: msgspec > orjson > stdlib json.
+`RELAY_JSON_BACKEND` ortam değişkeniyle zorlanabilir. Tüm arka uçlar
+bytes üretir; sunucu bunları `send(..., text=True)` ile metin frame'i
+olarak yollar (str → UTF-8 dönüşümü tekrar yapılmaz).
+
+Sunucu mesajın tamamını değil, sadece yönlendirme için gereken alanları
+(`Envelope`: type / code / role / token) decode eder; relay edilen mesajlar ham
+haliyle iletilir.
+"""
+
+import abc
+import json
+import os
+from typing import NamedTuple
+
+try:
+    import msgspec
+except ImportError:  # opsiyonel bağımlılık
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # opsiyonel bağımlılık
+    orjson = None
+
+
+if msgspec is not None:
+    class Envelope(msgspec.Struct):
+        """Yönlendirme için gereken alanlar; diğer alanlar atlanır."""
+        type: str = ""
+        code: str = ""
+        role: str = ""
+        token: str = ""
+else:
+    class Envelope(NamedTuple):
+        """Yönlendirme için gereken alanlar; diğer alanlar atlanır."""
+        type: str = ""
+        code: str = ""
+        role: str = ""
+        token: str = ""
+
+
+class Codec(abc.ABC):
+    """Bir JSON arka ucu: dumps -> bytes, decode_envelope -> Envelope."""
+
+    name: str = ""
+    errors: tuple = (ValueError,)
+
+    @abc.abstractmethod
+    def dumps(self, obj) -> bytes:
+        """Nesneyi JSON bytes'a çevir."""
+
+    @abc.abstractmethod
+    def loads(self, raw):
+        """JSON metnini / bytes'ı çöz."""
+
+    def decode_envelope(self, raw) -> Envelope:
+        obj = self.loads(raw)
+        if not isinstance(obj, dict):
+            raise ValueError("JSON object expected")
+        fields = (obj.get("type", ""), obj.get("code", ""), obj.get("role", ""),
+                  obj.get("token", ""))
+        if not all(isinstance(v, str) for v in fields):
+            raise ValueError("type/code/role/token must be strings")
+        return Envelope(*fields)
+
+
+class StdlibCodec(Codec):
+    name = "json"
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+    def loads(self, raw):
+        return json.loads(raw)
+
+
+class OrjsonCodec(Codec):
+    name = "orjson"
+
+    def dumps(self, obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, raw):
+        return orjson.loads(raw)
+
+
+class MsgspecCodec(Codec):
+    name = "msgspec"
+
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder()
+        self._envelope = msgspec.json.Decoder(Envelope)
+        self.errors = (ValueError, msgspec.DecodeError)
+
+    def dumps(self, obj) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, raw):
+        return msgspec.json.decode(raw)
+
+    def decode_envelope(self, raw) -> Envelope:
+        # Bilinmeyen alanlar (ör. büyük "data") nesne oluşturulmadan atlanır
+        return self._envelope.decode(raw)
+
+
+def available() -> dict[str, type[Codec]]:
+    """Kurulu arka uçlar, tercih sırasıyla."""
+    backends: dict[str, type[Codec]] = {}
+    if msgspec is not None:
+        backends[MsgspecCodec.name] = MsgspecCodec
+    if orjson is not None:
+        backends[OrjsonCodec.name] = OrjsonCodec
+    backends[StdlibCodec.name] = StdlibCodec
+    return backends
+
+
+def select(name: str = "") -> Codec:
+    backends = available()
+    if name and name in backends:
+        return backends[name]()
+    return next(iter(backends.values()))()
+
+
+codec = select(os.environ.get("RELAY_JSON_BACKEND", ""))
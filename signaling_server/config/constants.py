@@ -3,6 +3,8 @@ Signaling Server — Tüm sabitler ve yapılandırma.
 """
 
 import os
+import socket
+import tempfile
 from dataclasses import dataclass
 from typing import Set
 
@@ -13,6 +15,116 @@ class ServerConfig:
     HOST: str = "0.0.0.0"
     PORT: int = int(os.environ.get("PORT", "8765"))
     LOG_FORMAT: str = "%(asctime)s [%(levelname)s] %(message)s"
+    LOG_LEVEL: str = os.environ.get("RELAY_LOG_LEVEL", "INFO").upper()
+    # Loglar arka plan thread'inde yazılır (bkz. logs); kuyruk dolarsa kayıt düşer
+    LOG_QUEUE_RECORDS: int = 10_000
+    LOG_SUMMARY_INTERVAL_SEC: float = 60.0   # Oturum başına mesaj özeti aralığı
+    LOG_TRACE_SAMPLE_EVERY: int = int(os.environ.get("RELAY_LOG_TRACE_SAMPLE", "100"))  # DEBUG'da 1/N mesaj
+
+    # Mesaj boyutu ve hız sınırları (token bucket, bağlantı başına).
+    # Oturum kovaları aynı sınırların SESSION_RATE_FACTOR katıdır (iki eş).
+    # FRAME_* sınırları video kanalı başınadır (ekran ve kamera ayrı kovalarda).
+    MAX_MESSAGE_BYTES: int = int(os.environ.get("MAX_MESSAGE_BYTES", str(5 * 1024 * 1024)))
+    CONTROL_MAX_BYTES: int = 16 * 1024
+    FRAME_RATE_PER_SEC: float = float(os.environ.get("FRAME_RATE_PER_SEC", "30"))
+    FRAME_BURST: int = 15
+    FRAME_BYTES_PER_SEC: int = int(os.environ.get("FRAME_BYTES_PER_SEC", str(4 * 1024 * 1024)))
+    CONTROL_RATE_PER_SEC: float = float(os.environ.get("CONTROL_RATE_PER_SEC", "120"))
+    CONTROL_BURST: int = 60
+    SIGNALING_RATE_PER_SEC: float = 2.0
+    SIGNALING_BURST: int = 10
+    SESSION_RATE_FACTOR: float = 2.0
+    # Dosya/pano aktarım parçaları ve ack'leri (bkz. channels.BULK); gönderen
+    # hızını kuyruk gecikmesine göre kendisi ayarlar, bu sınırlar yalnızca tavan
+    BULK_RATE_PER_SEC: float = 1000.0
+    BULK_BURST: int = 200
+    BULK_BYTES_PER_SEC: int = int(os.environ.get("BULK_BYTES_PER_SEC", str(32 * 1024 * 1024)))
+    BULK_MAX_BYTES: int = 128 * 1024
+
+    # Enstrümantasyon: event loop gecikmesi, yavaş gönderim, GC duraklamaları
+    LOOP_LAG_INTERVAL_SEC: float = 0.5
+    LOOP_LAG_WARN_MS: float = 100.0
+    SLOW_SEND_MS: float = 250.0
+    SLOW_GC_MS: float = 50.0
+
+    # Yönetim uçları (/debug/...) yalnızca token tanımlıysa açılır
+    ADMIN_TOKEN: str = os.environ.get("RELAY_ADMIN_TOKEN", "")
+    PROFILE_DIR: str = os.environ.get("RELAY_PROFILE_DIR", tempfile.gettempdir())
+    PROFILE_MAX_SEC: int = 60
+    PROFILE_SAMPLE_INTERVAL_MS: float = 5.0
+
+    # WebSocket ping'i: probe göndermeyen istemciler (telefon) için ölü bağlantı tespiti.
+    # Desktop kendi probe'larını (probe / peer_probe) gönderir.
+    PING_INTERVAL_SEC: float = 20
+    PING_TIMEOUT_SEC: float = 20
+
+    # Oturum deposu (bkz. session_store). Boş: tek süreç, bellek içi.
+    # redis://host:port → düğümler paylaşılan depo + pub/sub ile eşleşir.
+    # Düğüm kimliği süreç başınadır (pid eklenir): yeniden başlatmada devralan
+    # süreç eskisiyle karışmaz.
+    SESSION_STORE_URL: str = os.environ.get("RELAY_STORE_URL", "")
+    NODE_ID: str = f"{os.environ.get('RELAY_NODE_ID', socket.gethostname())}-{os.getpid()}"
+    SESSION_TTL_SEC: int = 6 * 3600
+    # Abonelik bağlantısı koparsa yeniden bağlanma beklemesi (her denemede iki katı)
+    STORE_RECONNECT_MIN_SEC: float = 0.5
+    STORE_RECONNECT_MAX_SEC: float = 10.0
+    # Düğümler arası iletim kuyruğu (ayrı bağlantı, toplu PUBLISH); doluysa iletim düşer
+    FORWARD_QUEUE_MESSAGES: int = 1024
+    FORWARD_BATCH_MESSAGES: int = 64
+
+    # Eşleşme kodları sunucu tarafından verilir (bkz. code_pool). Oturum bitince
+    # kod CODE_HOLD_SEC boyunca aynı telefona (token ile) ayrılı kalır.
+    CODE_DIGITS: int = 6
+    CODE_HOLD_SEC: float = float(os.environ.get("RELAY_CODE_HOLD_SEC", "120"))
+    CODE_ALLOCATE_ATTEMPTS: int = 8
+
+    # Drain (SIGTERM) / kesintisiz yeniden başlatma (SIGHUP): yeni kayıt alınmaz,
+    # bağlı eşlere server_draining gönderilir, oturumların taşınması beklenir.
+    # Eşler yeniden bağlanmayı DRAIN_RECONNECT_SPREAD_SEC içine rastgele yayar.
+    DRAIN_DEADLINE_SEC: float = float(os.environ.get("RELAY_DRAIN_SEC", "30"))
+    DRAIN_RECONNECT_SPREAD_SEC: float = 10.0
+    HANDOVER_READY_TIMEOUT_SEC: float = 10.0
+    # Önceki süreçten devralınan dinleme soketi ve hazır bildirimi (SIGHUP ile verilir)
+    LISTEN_FD: int = int(os.environ.get("RELAY_LISTEN_FD", "-1"))
+    READY_FD: int = int(os.environ.get("RELAY_READY_FD", "-1"))
+
+    # Kanal başına gönderim kuyrukları (bkz. channels): alıcı başına video
+    # kanalında bekleyen en fazla frame; kontrol kuyruğu yalnızca takılan
+    # alıcıya karşı sınırlıdır.
+    CHANNEL_QUEUE_FRAMES: int = 4
+    CONTROL_QUEUE_MESSAGES: int = 256
+    # Soketteki gönderilmemiş veri bu sınırı aşarsa video frame'leri bekler
+    SEND_BACKLOG_BYTES: int = 128 * 1024
+    SEND_BACKLOG_POLL_SEC: float = 0.005
+    # Aktarım kanalında bekleyen en fazla parça (gönderenin penceresinden büyük).
+    # Parça ancak soket backlog'u bu sınırın altındaysa yazılır: gelen frame
+    # dolu bir tamponun arkasında beklemez.
+    TRANSFER_QUEUE_CHUNKS: int = 32
+    BULK_BACKLOG_BYTES: int = 16 * 1024
+
+    # Çoklu izleyici (bkz. fanout): izleyici başına bekleyen en fazla frame
+    VIEWER_QUEUE_FRAMES: int = 4
+
+    # Bellek bütçesi (bkz. memory). Bağlantı başına en kötü durum: gelen kuyruk
+    # RECV_QUEUE_FRAMES × MAX_MESSAGE_BYTES (handler takılırsa), kanal kuyrukları
+    # ~CONNECTION_QUEUE_BYTES + kontrol kuyruğu, gönderim tamponunda bir mesaj.
+    # Toplam MEMORY_BUDGET_BYTES aşılırsa önce frame'ler, sonra en çok tutan
+    # bağlantılar atılır.
+    RECV_QUEUE_FRAMES: int = 4
+    CONNECTION_QUEUE_BYTES: int = 4 * 1024 * 1024
+    MEMORY_BUDGET_BYTES: int = int(os.environ.get("RELAY_MEMORY_BUDGET_MB", "512")) * 1024 * 1024
+    MEMORY_CHECK_INTERVAL_SEC: float = 0.5
+    SHED_RESUME_RATIO: float = 0.8            # Kullanım bütçenin bu oranına inince normale dön
+
+    # Yavaş alıcılara küçültülmüş frame (bkz. transcode); Pillow gerekir.
+    # Sınıf 1..n: (ölçek, JPEG kalitesi). Ölçülen hız (KiB/sn) eşiğin altındaysa
+    # o sınıfa inilir; TRANSCODE_UPGRADE_SEC düşmesiz geçerse bir üst sınıf denenir.
+    TRANSCODE_ENABLED: bool = os.environ.get("RELAY_TRANSCODE", "") == "1"
+    TRANSCODE_WORKERS: int = int(os.environ.get("RELAY_TRANSCODE_WORKERS", "2"))
+    TRANSCODE_VARIANTS: tuple = ((0.5, 60), (0.33, 40))
+    TRANSCODE_TIER_KBPS: tuple = (2048, 512)
+    TRANSCODE_EVAL_SEC: float = 2.0
+    TRANSCODE_UPGRADE_SEC: float = 15.0
 
 
 class MessageTypes:
@@ -24,13 +136,32 @@ class MessageTypes:
     WAITING: str = "waiting"
     PAIRED: str = "paired"
     PEER_DISCONNECTED: str = "peer_disconnected"
+    SERVER_DRAINING: str = "server_draining"  # Sunucu kapanıyor; başka düğüme / yeni sürece bağlan
+    ROLE_CHANGED: str = "role_changed"    # Yeni kontrol eden katıldı; eski PC izleyici oldu
     ERROR: str = "error"
     COMMAND: str = "command"
     STREAM_INFO: str = "stream_info"
-    HEARTBEAT: str = "heartbeat"
+    HEARTBEAT: str = "heartbeat"          # Eski istemciler; relay edilmez, yok sayılır
+    PROBE: str = "probe"                  # Sunucuya RTT ölçümü; sunucu yanıtlar
+    PROBE_ACK: str = "probe_ack"
+    PEER_PROBE: str = "peer_probe"        # Karşı eşe RTT ölçümü; relay edilir
+    PEER_PROBE_ACK: str = "peer_probe_ack"
     RELAY: str = "relay"
     FRAME: str = "frame"
+    ACK: str = "ack"
+    # JSON olmayan ikili girdi mesajları (ilk byte < 0x20, bkz. rate_limit.sniff_type)
+    BINARY: str = "binary"
+    # Dosya/pano aktarımı: JSON denetim mesajları ve ikili parça / parça ack'i
+    # (ilk byte 0x10 / 0x11)
+    TRANSFER: str = "transfer"
+    CHUNK: str = "chunk"
+    CHUNK_ACK: str = "chunk_ack"
 
     RELAY_TYPES: Set[str] = frozenset({
-        COMMAND, STREAM_INFO, HEARTBEAT, RELAY, FRAME,
+        COMMAND, STREAM_INFO, RELAY, FRAME, ACK, BINARY, PEER_PROBE, PEER_PROBE_ACK,
+        TRANSFER, CHUNK, CHUNK_ACK,
     })
+    # Parse edilmeden ikili olarak relay edilen tipler
+    BINARY_TYPES: Set[str] = frozenset({BINARY, CHUNK, CHUNK_ACK})
+    # Telefondan izleyicilere de dağıtılan tipler
+    FANOUT_TYPES: Set[str] = frozenset({FRAME, STREAM_INFO})
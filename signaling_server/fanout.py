@@ -0,0 +1,52 @@
+"""
+Signaling Server — Bir telefon oturumunu birden fazla PC'nin izlemesi.
+
+Oturumda komut gönderebilen tek PC "pc" rolündedir (kontrol eden); diğer
+PC'ler "viewer" rolüyle katılır ve telefonun frame'lerini alır. Yeni bir
+"pc" katıldığında önceki kontrol eden izleyiciye düşürülür.
+
+Telefonun frame mesajı her izleyiciye aynı `bytes` nesnesiyle verilir
+(yeniden serialize veya kopya yok). Her izleyicinin kendi kanal kuyrukları
+ve gönderim görevi vardır (bkz. channels.Outbox): yavaş izleyicinin bir
+kanaldaki kuyruğu VIEWER_QUEUE_FRAMES'i aşınca en eski frame'i düşer,
+telefonun relay döngüsü ve diğer izleyiciler beklemez.
+"""
+
+from signaling_server.channels import Outbox, CONTROL
+from signaling_server.metrics import metrics
+
+VIEWER = "viewer"
+
+
+class ViewerGroup:
+    """Bir oturumun bu düğümdeki izleyicileri (gönderim kuyruklarıyla)."""
+
+    def __init__(self, code: str):
+        self.code = code
+        self._viewers: dict[object, Outbox] = {}
+
+    def __len__(self) -> int:
+        return len(self._viewers)
+
+    def __contains__(self, ws) -> bool:
+        return ws in self._viewers
+
+    def sockets(self) -> list:
+        return list(self._viewers)
+
+    def add(self, outbox: Outbox):
+        if outbox.ws not in self._viewers:
+            self._viewers[outbox.ws] = outbox
+            metrics.inc("viewers_joined_total")
+
+    def remove(self, ws) -> bool:
+        """İzleyiciyi çıkar (kuyruğu bağlantıya aittir); grupta kimse kalmadıysa True."""
+        self._viewers.pop(ws, None)
+        return not self._viewers
+
+    def outboxes(self) -> list[Outbox]:
+        return list(self._viewers.values())
+
+    def broadcast(self, payload: bytes, text: bool = True, ch: int = CONTROL):
+        for viewer in self._viewers.values():
+            viewer.offer(payload, text, ch)
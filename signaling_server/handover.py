@@ -0,0 +1,73 @@
+"""
+Signaling Server — Dinleme soketinin yeni sürece devri.
+
+Kesintisiz yeniden başlatma (SIGHUP) sırasında eski süreç dinleme soketini
+kapatmadan yeni bir süreç başlatır; soket dosya tanımlayıcısı (fd) miras
+bırakılır (RELAY_LISTEN_FD). Yeni süreç dinlemeye başlayınca RELAY_READY_FD
+borusuna yazar; eski süreç ancak bundan sonra kabul etmeyi bırakıp drain'e
+geçer. Arada gelen bağlantılar çekirdeğin kuyruğunda bekler, reddedilmez.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import subprocess
+
+from signaling_server.config import ServerConfig
+
+logger = logging.getLogger(__name__)
+
+
+def listen_socket(host: str, port: int) -> socket.socket:
+    """Devralınan soketi (RELAY_LISTEN_FD) veya yeni bağlanmış bir soketi döndür."""
+    if ServerConfig.LISTEN_FD >= 0:
+        sock = socket.socket(fileno=ServerConfig.LISTEN_FD)
+        logger.info(f"Inherited listening socket fd={ServerConfig.LISTEN_FD} {sock.getsockname()}")
+        return sock
+    return socket.create_server((host, port))
+
+
+def notify_ready():
+    """Devralan süreçsek önceki sürece dinlemeye başladığımızı bildir."""
+    if ServerConfig.READY_FD < 0:
+        return
+    try:
+        os.write(ServerConfig.READY_FD, b"1")
+    finally:
+        os.close(ServerConfig.READY_FD)
+
+
+async def spawn_successor(sock: socket.socket, argv: list[str]) -> subprocess.Popen | None:
+    """
+    Soketi miras alan yeni süreci başlat ve hazır olmasını bekle.
+    Yeni süreç HANDOVER_READY_TIMEOUT_SEC içinde hazır olmazsa sonlandırılır
+    ve None döner (eski süreç hizmete devam eder).
+    """
+    read_fd, write_fd = os.pipe()
+    fd = sock.fileno()
+    env = {**os.environ, "RELAY_LISTEN_FD": str(fd), "RELAY_READY_FD": str(write_fd)}
+    try:
+        proc = subprocess.Popen(argv, env=env, pass_fds=(fd, write_fd))
+    except OSError as e:
+        logger.error(f"Successor could not be started: {e}")
+        os.close(read_fd)
+        os.close(write_fd)
+        return None
+    os.close(write_fd)  # Yalnızca yeni süreçte açık kalsın: süreç ölürse read b"" döner
+
+    loop = asyncio.get_running_loop()
+    read = loop.run_in_executor(None, os.read, read_fd, 1)
+    try:
+        ready = await asyncio.wait_for(asyncio.shield(read), ServerConfig.HANDOVER_READY_TIMEOUT_SEC)
+    except asyncio.TimeoutError:
+        ready = b""
+    if ready != b"1":
+        logger.error(f"Successor pid={proc.pid} did not become ready; keeping current process")
+        proc.kill()
+        await read  # Boru kapandı; okuyan thread biter
+        os.close(read_fd)
+        return None
+    os.close(read_fd)
+    logger.info(f"Successor pid={proc.pid} is listening; handing over")
+    return proc
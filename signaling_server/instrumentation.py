@@ -0,0 +1,160 @@
+"""
+Signaling Server — Event loop ve handler enstrümantasyonu.
+
+Relay takıldığında sebebin GC mi, büyük bir `json.loads` mu, yoksa yavaş
+bir alıcı mı olduğunu ayırt etmek için:
+  - Event loop gecikme (lag) ölçer: periyodik uykunun ne kadar geç uyandığı
+  - GC duraklamaları: gc.callbacks ile nesil başına süre
+  - Handler aşamaları (parse / lookup / send) için süre gözlemleri
+  - Yavaş gönderim tespiti (ws.send eşik üstü sürerse uyarı)
+  - İsteğe bağlı örneklemeli profiler: event loop thread'inin yığınını ayrı
+    bir thread'den örnekler, "folded stacks" dosyasına yazar
+    (flamegraph.pl / speedscope ile açılabilir)
+
+Sonuçlar `metrics` sayaçlarına ve key=value biçimli loglara gider.
+"""
+
+import asyncio
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from signaling_server.config import ServerConfig
+from signaling_server.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+# ─── HANDLER AŞAMALARI ───────────────────────────────────────────────────────
+
+def record_stage(stage: str, seconds: float):
+    """Handler aşama süresi (parse / lookup / send)."""
+    metrics.observe("handler_stage_seconds", seconds, stage=stage)
+
+
+async def timed_send(ws, data, code, role, text: bool = True):
+    """ws.send süresini ölç; eşik üstündeyse yavaş alıcı olarak logla."""
+    t0 = time.perf_counter()
+    await ws.send(data, text=text)
+    elapsed = time.perf_counter() - t0
+    record_stage("send", elapsed)
+    if elapsed * 1000 > ServerConfig.SLOW_SEND_MS:
+        metrics.inc("slow_sends_total", role=role)
+        logger.warning(f"slow_send code={code} role={role} ms={elapsed * 1000:.1f} bytes={len(data)}")
+
+
+# ─── EVENT LOOP GECİKMESİ ────────────────────────────────────────────────────
+
+async def monitor_loop_lag():
+    """Periyodik uyku ne kadar geç dönerse event loop o kadar bloklanmıştır."""
+    interval = ServerConfig.LOOP_LAG_INTERVAL_SEC
+    while True:
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag_ms = max(0.0, (time.perf_counter() - t0 - interval) * 1000)
+        metrics.set("loop_lag_ms", lag_ms)
+        metrics.observe("loop_lag_seconds", lag_ms / 1000)
+        if lag_ms > ServerConfig.LOOP_LAG_WARN_MS:
+            logger.warning(f"loop_lag ms={lag_ms:.1f} gc_counts={gc.get_count()}")
+
+
+# ─── GC DURAKLAMALARI ────────────────────────────────────────────────────────
+
+_gc_start: float = 0.0
+_gc_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _gc_callback(phase: str, info: dict):
+    # GC, toplamayı tetikleyen thread'de çalışır (log dinleyicisi, profiler da olabilir)
+    global _gc_start
+    if phase == "start":
+        _gc_start = time.perf_counter()
+        return
+    pause = time.perf_counter() - _gc_start
+    gen = info.get("generation", -1)
+    try:
+        # metrics tek thread'lidir: gözlemi event loop'a devret (loop thread'inde de
+        # doğrudan yazılmaz; toplama bir sayaç güncellemesinin ortasında başlamış olabilir)
+        _gc_loop.call_soon_threadsafe(_record_gc, gen, pause, info.get("collected"))
+    except RuntimeError:
+        pass  # Loop kapandı
+
+
+def _record_gc(gen: int, pause: float, collected):
+    metrics.observe("gc_pause_seconds", pause, gen=gen)
+    if pause * 1000 > ServerConfig.SLOW_GC_MS:
+        logger.warning(f"slow_gc gen={gen} ms={pause * 1000:.1f} collected={collected}")
+
+
+def install_gc_hooks():
+    """GC süre ölçümünü bağla; event loop içinden çağrılır."""
+    global _gc_loop
+    _gc_loop = asyncio.get_running_loop()
+    if _gc_callback not in gc.callbacks:
+        gc.callbacks.append(_gc_callback)
+
+
+# ─── ÖRNEKLEMELİ PROFİLER ────────────────────────────────────────────────────
+
+class SamplingProfiler:
+    """Hedef thread'in yığınını aralıklarla örnekleyip folded stack dosyası yazar."""
+
+    def __init__(self):
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float, target_thread_id: int) -> str | None:
+        """
+        Profil almaya başla; çıktı dosya yolunu döndürür (zaten çalışıyorsa None).
+        Event loop'tan çağrılır. Dizin oluşturulamaz veya dosya açılamazsa OSError
+        burada yükselir; istek kabul edilmeden hata görünür.
+        """
+        if self.running:
+            return None
+        seconds = max(1.0, min(seconds, ServerConfig.PROFILE_MAX_SEC))
+        os.makedirs(ServerConfig.PROFILE_DIR, exist_ok=True)
+        path = os.path.join(ServerConfig.PROFILE_DIR, f"relay-profile-{int(time.time())}.folded")
+        out = open(path, "w", encoding="utf-8")
+        self._thread = threading.Thread(
+            target=self._run, args=(seconds, target_thread_id, out, asyncio.get_running_loop()),
+            daemon=True,
+        )
+        self._thread.start()
+        return path
+
+    @staticmethod
+    def _run(seconds: float, target_thread_id: int, out, loop: asyncio.AbstractEventLoop):
+        interval = ServerConfig.PROFILE_SAMPLE_INTERVAL_MS / 1000
+        stacks: Counter = Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(target_thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if names:
+                stacks[";".join(reversed(names))] += 1
+            time.sleep(interval)
+
+        try:
+            with out:
+                for stack, count in stacks.most_common():
+                    out.write(f"{stack} {count}\n")
+        except OSError as e:
+            logger.error(f"profile_write_failed path={out.name} ({e})")
+            return
+        # metrics tek thread'den (event loop) güncellenir
+        loop.call_soon_threadsafe(metrics.inc, "profiles_written_total")
+        logger.info(f"profile_written path={out.name} samples={sum(stacks.values())} seconds={seconds:g}")
+
+
+profiler = SamplingProfiler()
@@ -0,0 +1,141 @@
+"""
+Signaling Server — Event loop'u bloklamayan loglama.
+
+Log kayıtları event loop thread'inde yalnızca sınırlı bir kuyruğa bırakılır;
+biçimlendirme ve stderr'e yazma QueueListener thread'inde yapılır. Kuyruk
+dolarsa (stderr tıkandı) kayıt düşer ve `log_records_dropped_total` artar;
+relay beklemez.
+
+Mesaj metni de dinleyicide birleştirilir, ama yalnızca argümanlar ayrı
+verilirse (`logger.info("code=%s", code)`); f-string loop'ta, seviye kapalı
+olsa bile hesaplanır. Bağlantı/mesaj yolundaki loglar bu yüzden %s argümanlı
+yazılır; f-string yalnızca başlatma, kapanma ve yönetim uçlarında kalır.
+Argümanlar kayıtla birlikte thread'e geçer: sonradan değişecek nesne değil,
+değer verilmelidir.
+
+Mesaj başına log yoktur:
+  - Oturum özeti: her oturumun tip başına mesaj/byte sayıları biriktirilir,
+    LOG_SUMMARY_INTERVAL_SEC'te bir ve oturum bitince tek satır INFO olur.
+  - Mesaj izi: DEBUG açıkken her LOG_TRACE_SAMPLE_EVERY mesajdan biri loglanır.
+
+Seviye ve örnekleme çalışırken `/debug/loglevel` ile değiştirilebilir
+(bkz. server._admin_request).
+"""
+
+import asyncio
+import atexit
+import logging
+import logging.handlers
+import queue
+
+from signaling_server.config import ServerConfig
+from signaling_server.metrics import metrics
+
+logger = logging.getLogger("signaling_server.sessions")
+
+# code -> mesaj tipi -> [adet, byte]
+_sessions: dict[str, dict[str, list[int]]] = {}
+_listener: logging.handlers.QueueListener | None = None
+_trace_count = 0
+trace_every = ServerConfig.LOG_TRACE_SAMPLE_EVERY
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Kaydı biçimlendirmeden kuyruğa bırakır; kuyruk doluysa düşürür."""
+
+    def prepare(self, record):
+        return record  # Biçimlendirme dinleyici thread'inde (aynı süreç, kopya gerekmez)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.inc("log_records_dropped_total")
+
+
+def setup(level: str = ServerConfig.LOG_LEVEL):
+    """Kök logger'ı kuyruk + arka plan thread'ine bağla (bir kez)."""
+    global _listener
+    if _listener is not None:
+        return
+    output = logging.StreamHandler()
+    output.setFormatter(logging.Formatter(ServerConfig.LOG_FORMAT))
+    records = queue.Queue(ServerConfig.LOG_QUEUE_RECORDS)
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_QueueHandler(records))
+    root.setLevel(level)
+    _listener = logging.handlers.QueueListener(records, output)
+    _listener.start()
+    atexit.register(stop)
+
+
+def stop():
+    """Kuyruktaki kayıtları yaz ve thread'i durdur."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def set_level(level: str, name: str = "") -> bool:
+    """Logger seviyesini değiştir (boş ad: kök); geçersiz seviyede False."""
+    value = logging.getLevelName(level.upper())
+    if not isinstance(value, int):
+        return False
+    logging.getLogger(name).setLevel(value)
+    return True
+
+
+def level(name: str = "") -> str:
+    return logging.getLevelName(logging.getLogger(name).getEffectiveLevel())
+
+
+# ─── OTURUM ÖZETLERİ ─────────────────────────────────────────────────────────
+
+def count(code: str, msg_type: str, size: int):
+    """Oturumun aldığı mesajı özete ekle (mesaj başına; log yazmaz)."""
+    by_type = _sessions.get(code)
+    if by_type is None:
+        by_type = _sessions[code] = {}
+    entry = by_type.get(msg_type)
+    if entry is None:
+        by_type[msg_type] = [1, size]
+    else:
+        entry[0] += 1
+        entry[1] += size
+
+
+def trace(code: str | None, role: str | None, msg_type: str):
+    """Örneklenmiş mesaj izi (DEBUG)."""
+    global _trace_count
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    _trace_count += 1
+    if _trace_count % trace_every == 0:
+        logger.debug(f"[{msg_type}] code={code} role={role} (1/{trace_every})")
+
+
+def _summary(code: str, by_type: dict[str, list[int]]) -> str:
+    parts = " ".join(f"{t}={n}/{size / 1024:.0f}KB"
+                     for t, (n, size) in sorted(by_type.items(), key=lambda i: -i[1][1]))
+    return f"session code={code} {parts}"
+
+
+def flush(code: str):
+    """Biten oturumun birikmiş özetini yaz."""
+    by_type = _sessions.pop(code, None)
+    if by_type:
+        logger.info(_summary(code, by_type))
+
+
+async def summarize():
+    """Aktif oturumların özetlerini periyodik yaz ve sıfırla."""
+    while True:
+        await asyncio.sleep(ServerConfig.LOG_SUMMARY_INTERVAL_SEC)
+        pending = list(_sessions.items())
+        _sessions.clear()
+        if logger.isEnabledFor(logging.INFO):
+            for code, by_type in pending:
+                logger.info(_summary(code, by_type))
@@ -0,0 +1,98 @@
+"""
+Signaling Server — Bağlantı başına ve toplam bellek bütçesi.
+
+Relay'in tuttuğu mesaj byte'ları üç yerde birikir:
+  - Alıcının kanal kuyrukları (channels.Outbox.queued; her ekleme/çıkarmada sayılır)
+  - asyncio gönderim tamponu (transport.get_write_buffer_size; websockets
+    write_limit'i aşınca gönderim beklediği için en fazla bir mesaj kadar)
+  - websockets'in gelen frame kuyruğu: ölçülemez, RECV_QUEUE_FRAMES ×
+    MAX_MESSAGE_BYTES ile sınırlıdır (okuma o noktada durur)
+
+Bağlantı başına: bir kanaldaki frame/parçalar kuyruğa eklenirken bağlantının
+kuyruklarındaki toplam CONNECTION_QUEUE_BYTES'ı aşacaksa o kanalın en eski
+frame'leri düşer (tek frame her zaman sığar).
+
+Toplam: `monitor()` MEMORY_CHECK_INTERVAL_SEC'te bir tüm bağlantıları toplar.
+MEMORY_BUDGET_BYTES aşılırsa yük atılır:
+  1. Önce frame'ler: her video kanalı en yeni tek frame'e iner, bekleyen
+     aktarım parçaları atılır (gönderen ack'lerden anlayıp yeniden gönderir)
+     ve kullanım SHED_RESUME_RATIO'nun altına inene kadar kuyruklar bu
+     derinlikte kalır (`shedding`).
+  2. Bu da yetmezse en çok bellek tutan bağlantılar bütçenin altına inilene
+     kadar kapatılır; soket beklemeden kesilir, tamponu hemen serbest kalır.
+
+Aynı frame birden çok izleyicinin kuyruğunda aynı `bytes` nesnesidir; her
+kuyrukta ayrı sayılır (gerçek kullanımın üst sınırı).
+"""
+
+import asyncio
+import logging
+import os
+
+from signaling_server.config import ServerConfig
+from signaling_server.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Bütçe aşıldı: kanal kuyrukları tek frame derinliğinde (bkz. channels.Outbox.offer)
+shedding = False
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 0
+
+
+def rss_bytes() -> int:
+    """Sürecin yerleşik belleği (yalnızca Linux; ölçülemezse 0)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def usage(outboxes) -> int:
+    return sum(box.memory() for box in outboxes)
+
+
+def enforce(outboxes: dict) -> int:
+    """Bütçeyi bir kez denetle ve gerekirse yük at; son kullanımı döndürür."""
+    global shedding
+    boxes = [box for box in outboxes.values() if not box.closed]
+    used = usage(boxes)
+    budget = ServerConfig.MEMORY_BUDGET_BYTES
+    if used > budget:
+        if not shedding:
+            shedding = True
+            metrics.inc("memory_shed_events_total", stage="frames")
+            logger.warning("memory_over_budget bytes=%d budget=%d connections=%d", used, budget, len(boxes))
+        for box in boxes:
+            box.shed()
+        used = usage(boxes)
+        if used > budget:
+            for box in sorted(boxes, key=lambda b: b.memory(), reverse=True):
+                held = box.memory()
+                used -= held
+                logger.warning("memory_shed_close code=%s role=%s bytes=%d", box.code, box.role, held)
+                metrics.inc("memory_shed_events_total", stage="close")
+                box.abort()
+                if used <= budget:
+                    break
+    elif shedding and used < budget * ServerConfig.SHED_RESUME_RATIO:
+        shedding = False
+        logger.info("memory_recovered bytes=%d budget=%d", used, budget)
+    metrics.set("memory_queued_bytes", used)
+    metrics.set("memory_shedding", int(shedding))
+    return used
+
+
+async def monitor(outboxes: dict):
+    """Bütçeyi periyodik denetle; RSS'i de gösterge olarak yayınla."""
+    metrics.set("memory_budget_bytes", ServerConfig.MEMORY_BUDGET_BYTES)
+    while True:
+        await asyncio.sleep(ServerConfig.MEMORY_CHECK_INTERVAL_SEC)
+        enforce(outboxes)
+        rss = rss_bytes()
+        if rss:
+            metrics.set("process_rss_bytes", rss)
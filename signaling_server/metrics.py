@@ -0,0 +1,56 @@
+"""
+Signaling Server — Basit metrik sayaçları.
+
+Tek süreç içinde tutulan sayaç ve anlık değerler; `GET /metrics` ile
+Prometheus metin formatında dışarı verilir. Event loop tek thread'de
+çalıştığı için kilit gerekmez.
+"""
+
+from collections import defaultdict
+
+_PREFIX = "relay_"
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+class Metrics:
+    """Etiketli sayaçlar (artan) ve göstergeler (anlık değer)."""
+
+    def __init__(self):
+        self._counters: dict[tuple, float] = defaultdict(float)
+        self._gauges: dict[tuple, float] = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        self._counters[_key(name, labels)] += value
+
+    def set(self, name: str, value: float, **labels):
+        self._gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        """Süre/boyut gözlemi: _count, _sum ve _max olarak tutulur."""
+        self._counters[_key(name + "_count", labels)] += 1
+        self._counters[_key(name + "_sum", labels)] += value
+        key = _key(name + "_max", labels)
+        if value > self._gauges.get(key, 0):
+            self._gauges[key] = value
+
+    def get(self, name: str, **labels) -> float:
+        key = _key(name, labels)
+        if key in self._gauges:
+            return self._gauges[key]
+        return self._counters.get(key, 0)
+
+    def render(self) -> str:
+        """Prometheus metin formatı."""
+        lines = []
+        for store in (self._counters, self._gauges):
+            for (name, labels), value in sorted(store.items()):
+                label_str = ",".join(f'{k}="{v}"' for k, v in labels)
+                label_str = f"{{{label_str}}}" if label_str else ""
+                lines.append(f"{_PREFIX}{name}{label_str} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
@@ -0,0 +1,143 @@
+"""
+Signaling Server — Mesaj hız sınırlama ve boyut denetimi.
+
+Her bağlantı ve her oturum için mesaj sınıfı başına iki token bucket
+tutulur: mesaj/sn ve byte/sn. Mesaj sınıfı JSON parse edilmeden, ham
+metnin başındaki "type" alanından bulunur; böylece aşırı büyük veya
+aşırı hızlı mesajlar `json.loads` maliyetine girmeden düşürülür.
+
+Sınıflar:
+  frame      — ekran/kamera frame'leri (büyük, yüksek hızlı); kovalar video
+               kanalı başınadır, ekran ve kamera birbirinin payını yemez
+  control    — command / ack / relay / stream_info / heartbeat / probe'lar / ikili girdi / transfer
+  bulk       — dosya/pano aktarım parçaları ve parça ack'leri
+  signaling  — register / join ve bilinmeyen tipler
+"""
+
+import re
+import time
+
+from signaling_server import channels
+from signaling_server.config import ServerConfig, MessageTypes
+
+FRAME = "frame"
+CONTROL = "control"
+SIGNALING = "signaling"
+BULK = "bulk"
+
+_CONTROL_TYPES = frozenset({
+    MessageTypes.COMMAND, MessageTypes.ACK, MessageTypes.RELAY,
+    MessageTypes.STREAM_INFO, MessageTypes.HEARTBEAT, MessageTypes.BINARY,
+    MessageTypes.PROBE, MessageTypes.PEER_PROBE, MessageTypes.PEER_PROBE_ACK,
+    MessageTypes.TRANSFER,
+})
+_BULK_TYPES = frozenset({MessageTypes.CHUNK, MessageTypes.CHUNK_ACK})
+
+# İkili mesajın ilk byte'ı → tip (diğer ikili opcode'lar girdi protokolüdür)
+_BINARY_OPCODES = {0x10: MessageTypes.CHUNK, 0x11: MessageTypes.CHUNK_ACK}
+
+# İstemciler "type" alanını ilk sıraya yazar; sadece ilk 64 karaktere bakılır
+_TYPE_RE = re.compile(r'"type"\s*:\s*"([a-z_]{1,32})"')
+_SNIFF_LEN = 64
+
+# JSON metni bu byte'larla başlayamaz (boşluklar hariç); ikili opcode aralığı
+_JSON_WHITESPACE = frozenset(b" \t\n\r")
+
+# sınıf -> (mesaj/sn, patlama, byte/sn, tek mesaj üst sınırı)
+_LIMITS = {
+    FRAME: (ServerConfig.FRAME_RATE_PER_SEC, ServerConfig.FRAME_BURST,
+            ServerConfig.FRAME_BYTES_PER_SEC, ServerConfig.MAX_MESSAGE_BYTES),
+    CONTROL: (ServerConfig.CONTROL_RATE_PER_SEC, ServerConfig.CONTROL_BURST,
+              ServerConfig.CONTROL_RATE_PER_SEC * ServerConfig.CONTROL_MAX_BYTES,
+              ServerConfig.CONTROL_MAX_BYTES),
+    SIGNALING: (ServerConfig.SIGNALING_RATE_PER_SEC, ServerConfig.SIGNALING_BURST,
+                ServerConfig.SIGNALING_BURST * ServerConfig.CONTROL_MAX_BYTES,
+                ServerConfig.CONTROL_MAX_BYTES),
+    BULK: (ServerConfig.BULK_RATE_PER_SEC, ServerConfig.BULK_BURST,
+           ServerConfig.BULK_BYTES_PER_SEC, ServerConfig.BULK_MAX_BYTES),
+}
+
+
+def sniff_type(raw) -> str:
+    """
+    Ham mesajın "type" alanı (parse etmeden); bulunamazsa boş string.
+    İlk byte'ı 0x20'nin altındaki mesajlar ikili protokoldür (`BINARY`,
+    aktarım opcode'larında `CHUNK` / `CHUNK_ACK`).
+    """
+    if raw and isinstance(raw, bytes) and raw[0] < 0x20 and raw[0] not in _JSON_WHITESPACE:
+        return _BINARY_OPCODES.get(raw[0], MessageTypes.BINARY)
+    head = raw[:_SNIFF_LEN]
+    if isinstance(head, bytes):
+        head = head.decode("ascii", "replace")
+    m = _TYPE_RE.search(head)
+    return m.group(1) if m else ""
+
+
+def classify(msg_type: str, size: int) -> str:
+    """Mesajın hız sınırlama sınıfı (`sniff_type` sonucu ve ham boyuttan)."""
+    if msg_type == MessageTypes.FRAME:
+        return FRAME
+    if msg_type in _CONTROL_TYPES:
+        return CONTROL
+    if msg_type in _BULK_TYPES:
+        return BULK
+    if not msg_type and size > ServerConfig.CONTROL_MAX_BYTES:
+        # Tipi başta olmayan büyük mesajlar frame sınırlarına tabi
+        return FRAME
+    return SIGNALING
+
+
+class TokenBucket:
+    """Saniyede `rate` token dolan, en fazla `burst` token biriktiren kova."""
+
+    __slots__ = ("rate", "burst", "tokens", "stamp")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = time.monotonic()
+
+    def take(self, cost: float, now: float) -> bool:
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens < cost:
+            return False
+        self.tokens -= cost
+        return True
+
+
+class RateLimiter:
+    """Bir bağlantının ya da oturumun sınıf başına mesaj ve byte kovaları."""
+
+    def __init__(self, factor: float = 1.0):
+        # Frame kovaları (FRAME, kanal) anahtarlı: her video kanalı kendi sınırına tabi
+        keys = [(cls,) for cls in _LIMITS if cls != FRAME]
+        keys += [(FRAME, ch) for ch in channels.VIDEO]
+        self._buckets = {}
+        for key in keys:
+            rate, burst, byte_rate, max_size = _LIMITS[key[0]]
+            self._buckets[key] = (TokenBucket(rate * factor, burst * factor),
+                                  TokenBucket(byte_rate * factor, max(byte_rate, max_size) * factor))
+
+    def check(self, msg_class: str, size: int, now: float,
+              ch: int = channels.SCREEN) -> str | None:
+        """
+        Mesaj geçebiliyorsa None, düşürülmeliyse sebebi ("oversize" / "rate").
+        `ch` yalnızca frame sınıfında kullanılır (video dışı kanal ekran sayılır).
+        """
+        if size > _LIMITS[msg_class][3]:
+            return "oversize"
+        if msg_class == FRAME:
+            key = (FRAME, ch if ch in channels.VIDEO else channels.SCREEN)
+        else:
+            key = (msg_class,)
+        count, volume = self._buckets[key]
+        if not count.take(1, now) or not volume.take(size, now):
+            return "rate"
+        return None
+
+
+def session_limiter() -> RateLimiter:
+    """Oturumdaki tüm eşlerin paylaştığı kovalar."""
+    return RateLimiter(ServerConfig.SESSION_RATE_FACTOR)
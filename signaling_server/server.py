@@ -4,19 +4,47 @@ Remote Phone Control - Signaling Server (websockets >= 12 uyumlu)
 Her iki taraf (PC ve Android) bu sunucuya bağlanır.
 
 Mesaj akışı:
-  Android: {"type": "register", "code": "123456", "role": "phone"}
+  Android: {"type": "register", "role": "phone"}
+           → {"type": "registered", "code": "123456", "token": "..."} (kodu sunucu verir)
+           Yeniden bağlanırken: {"type": "register", "code": "123456", "token": "..."}
   PC:      {"type": "join",     "code": "123456", "role": "pc"}
   Eşleşince: her iki tarafa {"type": "paired"} gönderilir.
   Sonraki mesajlar relay edilir.
+  İzleyici: {"type": "join", "code": "123456", "role": "viewer"}
+           telefonun frame'lerini alır, komut gönderemez (bkz. fanout).
+           Aynı koda ikinci bir "pc" katılırsa önceki PC izleyiciye düşer
+           ({"type": "role_changed", "role": "viewer"}).
+  İkili (binary) girdi mesajları içeriğine bakılmadan iletilir.
+  Frame'ler "ch" alanıyla kanal taşır (ekran / kamera); relay edilen her
+  mesaj alıcının kanal kuyruğundan gider ve kontrol trafiği video
+  frame'lerinin önüne geçer (bkz. channels). RELAY_TRANSCODE=1 ile yetişemeyen
+  alıcılar frame'lerin küçültülmüş sürümünü alır (bkz. transcode).
+
+Birden fazla düğümde çalışırken (RELAY_STORE_URL) eşler farklı düğümlere
+düşebilir; eşleşme paylaşılan oturum deposundan bulunur ve mesajlar karşı
+düğüme pub/sub ile iletilir (bkz. session_store).
+
+Yaşam döngüsü:
+  SIGTERM — drain: yeni bağlantı ve kayıt alınmaz (503 / hata); paylaşılan depo
+            varsa bağlı eşlere server_draining gönderilir (başka düğüme
+            taşınırlar), oturumlar DRAIN_DEADLINE_SEC'e kadar beklenir, kalanlar
+            1001 (going away) ile kapanır
+  SIGHUP  — kesintisiz yeniden başlatma: dinleme soketi yeni sürece devredilir
+            (bkz. handover), ardından drain; eşler yeni sürece taşınır, kalanlar
+            1012 (service restart) ile kapanır
+  SIGINT veya drain sırasında ikinci sinyal — beklemeden kapan
 """
 
 import asyncio
-import json
 import logging
 import sys
 import os
 import http
 import signal
+import time
+import hmac
+import threading
+from urllib.parse import urlsplit, parse_qs
 
 # Proje kökünü path'e ekle (signaling_server.config için)
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -24,11 +52,19 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import websockets
 
 from signaling_server.config import ServerConfig, MessageTypes
-
-logging.basicConfig(
-    level=logging.INFO,
-    format=ServerConfig.LOG_FORMAT,
+from signaling_server import (
+    rate_limit, instrumentation, session_store, handover, fanout, channels, memory, logs, transcode,
+)
+from signaling_server.code_pool import CodePool
+from signaling_server.metrics import metrics
+from signaling_server.codec import codec, Envelope
+from signaling_server.fanout import VIEWER
+from signaling_server.session_store import (
+    FWD_RELAY, FWD_PAIRED, FWD_PEER_GONE, FWD_VIEWER, FWD_VIEWER_GONE, encode_forward,
 )
+
+# Loglar event loop'u bloklamasın: kayıtlar kuyruktan arka plan thread'inde yazılır
+logs.setup()
 logger = logging.getLogger(__name__)
 
 # Render TCP port testleri handshake'i yarıda kestiği için `websockets.server`
@@ -39,115 +75,408 @@ logging.getLogger("websockets.server").setLevel(logging.CRITICAL)
 
 # code -> {"phone": ws, "pc": ws}
 sessions: dict = {}
+# code -> RateLimiter (oturumun iki eşi aynı kovaları paylaşır)
+session_limits: dict = {}
+# (code, role) -> eşin bağlı olduğu uzak düğüm (farklı düğümlere düşen oturumlar)
+remote_peers: dict = {}
+# ws -> alıcının kanal kuyrukları (relay edilen her mesaj buradan gider)
+outboxes: dict = {}
+# code -> bu düğümdeki izleyiciler
+viewers: dict[str, fanout.ViewerGroup] = {}
+# Telefonun düğümünde: code -> izleyicisi olan uzak düğümler
+remote_viewers: dict[str, set[str]] = {}
+# İzleyicinin düğümünde: code -> telefonun bağlı olduğu uzak düğüm
+viewer_sources: dict[str, str] = {}
+# Rol → düğüm eşlemesi; main() yapılandırmaya göre değiştirir
+store: session_store.SessionStore = session_store.MemoryStore(ServerConfig.NODE_ID)
+# Telefonlara verilen eşleşme kodları (bu düğümde; düğümler arası tekillik depoda)
+codes = CodePool()
+# Yavaş alıcılar için frame yeniden kodlama (RELAY_TRANSCODE=1); main() oluşturur
+transcoder: transcode.Transcoder | None = None
+# Drain başladı: yeni kayıt yok, ayrılan eşler karşı tarafa bildirilmez (taşınıyorlar)
+draining = False
+# Dinleme soketi yeni sürece devredildi (SIGHUP); eşler aynı adrese taşınabilir
+handed_over = False
 
 
 async def process_request(connection, request):
     """
     Render'ın health check (HTTP GET/HEAD /) isteklerini yakalar ve 200 OK döndürür.
+    `GET /metrics` sayaçları Prometheus formatında döndürür.
+    `GET /debug/...` yönetim uçları X-Admin-Token başlığı ister:
+      /debug/profile?seconds=N           örneklemeli profil
+      /debug/loglevel?level=DEBUG        seviye (isteğe bağlı &logger=ad, &sample=N iz örneklemesi)
     WebSocket upgrade isteklerini (Upgrade: websocket) normal akışa bırakır.
     """
+    url = urlsplit(request.path)
+    if url.path == "/metrics":
+        metrics.set("sessions_active", len(sessions))
+        metrics.set("viewers_active", sum(len(g) for g in viewers.values()))
+        metrics.set("codes_allocated", len(codes))
+        metrics.set("codes_held", codes.held)
+        return connection.respond(http.HTTPStatus.OK, metrics.render())
+    if url.path.startswith("/debug/"):
+        return _admin_request(connection, request, url.path, parse_qs(url.query))
     if request.path == "/":
         # WebSocket upgrade isteği ise None dön (ws akışına geçir)
         if request.headers.get("Upgrade", "").lower() == "websocket":
+            if draining and not handed_over:
+                # SIGTERM: taşınan eş bu sürece geri dönüp tekrar drain mesajı almasın
+                return connection.respond(http.HTTPStatus.SERVICE_UNAVAILABLE, "draining\n")
             return None
+        if draining:
+            # Load balancer yeni bağlantıları diğer düğümlere yönlendirsin
+            return connection.respond(http.HTTPStatus.SERVICE_UNAVAILABLE, "draining\n")
         return connection.respond(http.HTTPStatus.OK, "OK\n")
     return None
 
 
+def _admin_request(connection, request, path: str, query: dict):
+    """Yönetim uçları; token tanımlı değilse veya eşleşmezse yok sayılır (404)."""
+    token = request.headers.get("X-Admin-Token", "")
+    if not ServerConfig.ADMIN_TOKEN or not hmac.compare_digest(token, ServerConfig.ADMIN_TOKEN):
+        return connection.respond(http.HTTPStatus.NOT_FOUND, "Not Found\n")
+
+    if path == "/debug/profile":
+        # ?seconds=N — event loop thread'ini N saniye örnekle, dosyaya yaz
+        try:
+            seconds = float(query.get("seconds", ["10"])[0])
+        except ValueError:
+            return connection.respond(http.HTTPStatus.BAD_REQUEST, "seconds must be a number\n")
+        try:
+            out = instrumentation.profiler.start(seconds, threading.get_ident())
+        except OSError as e:
+            logger.error(f"profile_start_failed dir={ServerConfig.PROFILE_DIR} ({e})")
+            return connection.respond(http.HTTPStatus.INTERNAL_SERVER_ERROR, f"cannot write profile: {e}\n")
+        if out is None:
+            return connection.respond(http.HTTPStatus.CONFLICT, "profile already running\n")
+        return connection.respond(http.HTTPStatus.ACCEPTED, f"{out}\n")
+
+    if path == "/debug/loglevel":
+        # Parametresiz: mevcut seviye; ?level=DEBUG&logger=ad&sample=N ile değiştir
+        name = query.get("logger", [""])[0]
+        if "sample" in query:
+            try:
+                sample = int(query["sample"][0])
+            except ValueError:
+                sample = 0
+            if sample < 1:
+                return connection.respond(http.HTTPStatus.BAD_REQUEST, "sample must be >= 1\n")
+            logs.trace_every = sample
+        if "level" in query:
+            if not logs.set_level(query["level"][0], name):
+                return connection.respond(http.HTTPStatus.BAD_REQUEST, "unknown level\n")
+            logger.warning(f"log_level logger={name or 'root'} level={logs.level(name)}")
+        return connection.respond(http.HTTPStatus.OK,
+                                  f"{name or 'root'} {logs.level(name)} sample=1/{logs.trace_every}\n")
+
+    return connection.respond(http.HTTPStatus.NOT_FOUND, "Not Found\n")
+
+
+def _error(message: str) -> bytes:
+    return codec.dumps({"type": MessageTypes.ERROR, "message": message})
+
+
+# Sabit mesajlar bir kez encode edilir. Kod/rol içeren mesajlar her seferinde
+# encode edilir: msgspec/orjson ile dict encode, şablon birleştirmeden hızlı
+# (bkz. scripts/bench_codec.py).
+_MSG_INVALID_JSON = _error("Invalid JSON payload")
+_MSG_CODE_MISSING = _error("code missing")
+_MSG_CODE_INVALID = _error("Geçersiz kod")
+_MSG_CODE_IN_USE = _error("Kod kullanımda")
+_MSG_CODES_EXHAUSTED = _error("Boş kod kalmadı")
+_MSG_NOT_REGISTERED = _error("Not registered")
+_MSG_PEER_LOST = _error("Karşı taraf bağlantısı koptu")
+_MSG_VIEW_ONLY = _error("İzleyiciler komut gönderemez")
+_MSG_ROLE_VIEWER = codec.dumps({"type": MessageTypes.ROLE_CHANGED, "role": VIEWER})
+_MSG_NOT_CONNECTED = {role: _error(f"{role} bağlı değil") for role in ("pc", "phone")}
+# Eş yokken sessizce düşürülen tipler (periyodik; hata mesajı üretmesin)
+_SILENT_WITHOUT_PEER = frozenset({MessageTypes.PEER_PROBE, MessageTypes.PEER_PROBE_ACK})
+
+# Eşler yeniden bağlanmayı bu pencereye rastgele yayar (toplu yeniden bağlanma olmasın)
+_MSG_DRAINING = codec.dumps({
+    "type": MessageTypes.SERVER_DRAINING,
+    "reconnect_within_ms": int(min(ServerConfig.DRAIN_RECONNECT_SPREAD_SEC,
+                                   ServerConfig.DRAIN_DEADLINE_SEC) * 1000),
+})
+
+_MSG_SHUTTING_DOWN = _error("Sunucu kapanıyor")
+
+_MSG_WAITING = codec.dumps({
+    "type": MessageTypes.WAITING,
+    "message": "Telefon bağlanmayı bekliyor..."
+})
+
+
+def _other_role(role: str) -> str:
+    return "pc" if role == "phone" else "phone"
+
+
+def _viewer_field() -> str:
+    """Depoda bu düğümün izleyicilerini gösteren alan (düğüm başına bir tane)."""
+    return f"{VIEWER}:{store.node_id}"
+
+
 async def send_json(ws, data: dict):
-    await ws.send(json.dumps(data))
+    await ws.send(codec.dumps(data), text=True)
+
+
+async def send_raw(ws, payload: bytes):
+    """Önceden encode edilmiş JSON'u metin frame'i olarak gönder."""
+    await ws.send(payload, text=True)
+
+
+async def _messages(ws):
+    """
+    Gelen mesajları UTF-8 decode etmeden (bytes) döndürür; relay edilen
+    frame'ler böylece decode + tekrar encode maliyetine girmez.
+    Normal kapanışta biter, hatalı kapanışta ConnectionClosed fırlatır.
+    """
+    try:
+        while True:
+            yield await ws.recv(decode=False)
+    except websockets.exceptions.ConnectionClosedOK:
+        return
+
+
+async def _reserve_code(requested: str, token: str) -> tuple[str, str] | None:
+    """
+    Telefon için kod ayır: kod verilmediyse rastgele yeni bir kod, verildiyse
+    o kod (boşsa veya token eşleşiyorsa). Başka düğümde kullanımda olan
+    yeni kod yerelde bekletmeye alınır ve bir sonraki denenir.
+    """
+    for _ in range(ServerConfig.CODE_ALLOCATE_ATTEMPTS):
+        if requested:
+            code, token = requested, codes.claim(requested, token)
+        else:
+            code, token = codes.allocate() or (None, None)
+        if token is None:
+            return None
+        try:
+            reserved = await store.reserve_code(code, token, fresh=not requested)
+        except session_store.errors as e:
+            logger.warning("store_reserve_failed code=%s (%s)", code, e)
+            reserved = True  # Depo yokken yerel havuz tek başına karar verir
+        if reserved:
+            return code, token
+        codes.release(code)
+        if requested:
+            return None
+    return None
 
 
 async def handler(ws):
     peer_code = None
     peer_role = None
+    peer_token = None
+    conn_limits = rate_limit.RateLimiter()
 
     try:
-        async for raw in ws:
-            try:
-                msg = json.loads(raw)
-            except json.JSONDecodeError:
-                # Olası devasa bozuk frame'leri loglamak yerine ilk 100 karakteri logla
-                preview = str(raw)[:100]
-                logger.warning(f"Invalid JSON received. Preview: {preview}...")
-                await send_json(ws, {"type": MessageTypes.ERROR, "message": "Invalid JSON payload"})
+        async for raw in _messages(ws):
+            # Boyut/hız denetimi parse'tan önce: düşürülen mesaj decode edilmez
+            msg_type = rate_limit.sniff_type(raw)
+            size = len(raw)
+            msg_class = rate_limit.classify(msg_type, size)
+            ch = channels.channel_of(raw, msg_type)
+            now = time.monotonic()
+            drop = conn_limits.check(msg_class, size, now, ch)
+            scope = "conn"
+            if drop is None and peer_code in session_limits:
+                drop = session_limits[peer_code].check(msg_class, size, now, ch)
+                scope = "session"
+            if drop is not None:
+                metrics.inc("messages_dropped_total", cls=msg_class, reason=drop, scope=scope)
                 continue
+            metrics.inc("messages_received_total", cls=msg_class)
+            metrics.inc("bytes_received_total", size, cls=msg_class)
 
-            msg_type = msg.get("type", "")
-            logger.info(f"[{msg_type}] code={msg.get('code')} role={msg.get('role')}")
+            if msg_type == MessageTypes.FRAME or msg_type in MessageTypes.BINARY_TYPES:
+                # Frame'ler, ikili girdi ve aktarım parçaları opak: parse edilmeden ham haliyle relay edilir
+                env = Envelope(type=msg_type)
+            else:
+                try:
+                    t0 = time.perf_counter()
+                    env = codec.decode_envelope(raw)
+                    instrumentation.record_stage("parse", time.perf_counter() - t0)
+                except codec.errors:
+                    # Olası devasa bozuk frame'leri loglamak yerine ilk 100 karakteri logla
+                    preview = raw[:100]
+                    logger.warning("Invalid JSON received. Preview: %s...", preview)
+                    await send_raw(ws, _MSG_INVALID_JSON)
+                    continue
+
+            msg_type = env.type
+            if peer_code:
+                logs.count(peer_code, msg_type, size)
+            logs.trace(peer_code or env.code, peer_role or env.role, msg_type)
 
             # ── REGISTER (telefon) / JOIN (PC) ──────────────────────────────
             if msg_type in (MessageTypes.REGISTER, MessageTypes.JOIN):
-                code = msg.get("code", "").strip()
-                role = msg.get("role", "phone" if msg_type == MessageTypes.REGISTER else "pc")
+                code = env.code.strip()
+                role = env.role or ("phone" if msg_type == MessageTypes.REGISTER else "pc")
+
+                if draining:
+                    if handed_over:
+                        await send_raw(ws, _MSG_DRAINING)  # Yeni süreç devraldı: oraya taşın
+                    else:
+                        await send_raw(ws, _MSG_SHUTTING_DOWN)
+                        await ws.close(websockets.CloseCode.GOING_AWAY)
+                    continue
+                token = None
+                if role == "phone":
+                    # Kodu sunucu verir; eski istemcinin seçtiği kod boşsa kabul edilir
+                    if code and codes.parse(code) is None:
+                        await send_raw(ws, _MSG_CODE_INVALID)
+                        continue
+                    reserved = await _reserve_code(code, env.token)
+                    if reserved is None:
+                        await send_raw(ws, _MSG_CODE_IN_USE if code else _MSG_CODES_EXHAUSTED)
+                        continue
+                    code, token = reserved
+                elif not code:
+                    await send_raw(ws, _MSG_CODE_MISSING)
+                    continue
 
-                if not code:
-                    await send_json(ws, {"type": MessageTypes.ERROR, "message": "code missing"})
+                if role == VIEWER:
+                    peer_code, peer_role = code, role
+                    await _join_viewer(ws, code, _outbox(ws, code, role))
                     continue
 
                 if code not in sessions:
                     sessions[code] = {}
+                    session_limits[code] = rate_limit.session_limiter()
 
+                previous = sessions[code].get(role)
                 sessions[code][role] = ws
+                _outbox(ws, code, role)
+                if role == "pc" and previous is not None and previous is not ws:
+                    await _demote(code, previous)
                 peer_code = code
                 peer_role = role
+                peer_token = token
 
                 ack = MessageTypes.REGISTERED if msg_type == MessageTypes.REGISTER else MessageTypes.JOINED
-                await send_json(ws, {"type": ack, "code": code, "role": role})
-                logger.info(f"{ack}: code={code}, role={role}")
-
-                # İki taraf da bağlandıysa eşleştir
+                reply = {"type": ack, "code": code, "role": role}
+                if token:
+                    reply["token"] = token
+                await send_json(ws, reply)
+                logger.info("%s: code=%s, role=%s", ack, code, role)
+
+                try:
+                    nodes = await store.claim(code, role)
+                except session_store.errors as e:
+                    logger.warning("store_claim_failed code=%s (%s)", code, e)
+                    nodes = {}
+
+                # İki taraf da bağlandıysa eşleştir (aynı düğümde veya farklı düğümlerde)
                 s = sessions.get(code, {})
-                if "phone" in s and "pc" in s:
+                other_role = _other_role(role)
+                remote_node = nodes.get(other_role)
+                if other_role in s:
                     await _notify_paired(code, s)
+                elif remote_node and remote_node != store.node_id:
+                    remote_peers[(code, other_role)] = remote_node
+                    await _notify_paired(code, {role: ws})
+                    await _forward(remote_node, FWD_PAIRED, code, other_role)
                 elif msg_type == MessageTypes.JOIN:
-                    await send_json(ws, {
-                        "type": MessageTypes.WAITING,
-                        "message": "Telefon bağlanmayı bekliyor..."
-                    })
+                    await send_raw(ws, _MSG_WAITING)
+                if role == "phone":
+                    await _pair_viewers(code, nodes)
+
+            # ── CANLILIK ────────────────────────────────────────────────────
+            elif msg_type == MessageTypes.PROBE:
+                # ts aynen döner; istemci sunucuya RTT'yi hesaplar
+                try:
+                    ts = codec.loads(raw).get("ts")
+                except codec.errors:
+                    continue
+                await send_json(ws, {"type": MessageTypes.PROBE_ACK, "ts": ts})
+
+            elif msg_type == MessageTypes.HEARTBEAT:
+                # Eski istemcilerin keep-alive'ı: relay edilmez (eş yokken hata üretmesin)
+                continue
 
             # ── RELAY ───────────────────────────────────────────────────────
             elif msg_type in MessageTypes.RELAY_TYPES:
                 if not peer_code or not peer_role:
-                    await send_json(ws, {"type": MessageTypes.ERROR, "message": "Not registered"})
+                    await send_raw(ws, _MSG_NOT_REGISTERED)
+                    continue
+                if peer_role == "pc" and sessions.get(peer_code, {}).get("pc") is not ws:
+                    peer_role = VIEWER  # Yeni bir PC kontrolü devraldı
+                if peer_role == VIEWER:
+                    if msg_type not in _SILENT_WITHOUT_PEER:
+                        await send_raw(ws, _MSG_VIEW_ONLY)
                     continue
 
+                text = msg_type not in MessageTypes.BINARY_TYPES
+                ch = channels.channel_of(raw, msg_type)
+                fanned_out = (peer_role == "phone" and msg_type in MessageTypes.FANOUT_TYPES
+                              and await _fan_out(peer_code, raw, text, ch))
+                t0 = time.perf_counter()
                 s = sessions.get(peer_code, {})
-                other_role = "pc" if peer_role == "phone" else "phone"
+                other_role = _other_role(peer_role)
                 other_ws = s.get(other_role)
+                remote_node = None if other_ws else remote_peers.get((peer_code, other_role))
+                instrumentation.record_stage("lookup", time.perf_counter() - t0)
 
                 if other_ws:
-                    try:
-                        await other_ws.send(json.dumps(msg))
-                    except Exception:
-                        await send_json(ws, {
-                            "type": MessageTypes.ERROR,
-                            "message": "Karşı taraf bağlantısı koptu"
-                        })
-                else:
-                    await send_json(ws, {
-                        "type": MessageTypes.ERROR,
-                        "message": f"{other_role} bağlı değil"
-                    })
+                    # Mesaj yeniden serialize edilmez; ham byte'lar alıcının
+                    # kanal kuyruğuna girer (kontrol video'nun önüne geçer)
+                    box = outboxes.get(other_ws)
+                    if box is None or not _deliver(box, peer_code, raw, text, ch):
+                        await send_raw(ws, _MSG_PEER_LOST)
+                elif remote_node:
+                    if not await _forward(remote_node, FWD_RELAY, peer_code, other_role, raw,
+                                          text=text):
+                        await send_raw(ws, _MSG_PEER_LOST)
+                    else:
+                        metrics.inc("messages_forwarded_total", cls=msg_class)
+                elif msg_type not in _SILENT_WITHOUT_PEER and not fanned_out:
+                    await send_raw(ws, _MSG_NOT_CONNECTED[other_role])
 
             else:
                 await send_json(ws, {"type": MessageTypes.ERROR, "message": f"Unknown: {msg_type}"})
 
     except websockets.exceptions.ConnectionClosed as e:
-        logger.info(f"Connection closed: code={peer_code}, role={peer_role} ({e})")
+        logger.info("Connection closed: code=%s, role=%s (%s)", peer_code, peer_role, e)
     except Exception as e:
-        logger.warning(f"Handler error: {e}")
+        logger.warning("Handler error: %s", e)
     finally:
         # Temizlik
-        if peer_code and peer_role:
+        box = outboxes.pop(ws, None)
+        if box is not None:
+            box.close()
+        if peer_code:
+            await _leave_viewers(peer_code, ws)
+        if peer_code and peer_role and peer_role != VIEWER:
             s = sessions.get(peer_code, {})
             if s.get(peer_role) is ws:
                 del s[peer_role]
-                logger.info(f"Removed: code={peer_code}, role={peer_role}")
-
-                other_role = "pc" if peer_role == "phone" else "phone"
+                logger.info("Removed: code=%s, role=%s", peer_code, peer_role)
+                logs.flush(peer_code)
+                if peer_token:
+                    codes.release(peer_code)
+                try:
+                    await store.release(peer_code, peer_role)
+                    if peer_token and not draining:
+                        # Drain'de atlanır: taşınan telefon kodunu yeni süreçte yeniledi
+                        await store.release_code(peer_code, peer_token)
+                except session_store.errors as e:
+                    logger.warning("store_release_failed code=%s (%s)", peer_code, e)
+
+                if peer_role == "phone":
+                    await _viewers_peer_gone(peer_code)
+                    if transcoder is not None:
+                        transcoder.forget(peer_code)
+
+                other_role = _other_role(peer_role)
+                remote_node = remote_peers.pop((peer_code, other_role), None)
+                if remote_node and not draining:
+                    await _forward(remote_node, FWD_PEER_GONE, peer_code, other_role)
                 other_ws = s.get(other_role)
-                if other_ws:
+                if other_ws and not draining:
+                    if other_ws in outboxes:
+                        outboxes[other_ws].discard_data()  # Giden eşin bayat frame'leri
                     try:
                         await send_json(other_ws, {
                             "type": MessageTypes.PEER_DISCONNECTED,
@@ -158,10 +487,11 @@ async def handler(ws):
 
             if not s:
                 sessions.pop(peer_code, None)
+                session_limits.pop(peer_code, None)
 
 
 async def _notify_paired(code: str, s: dict):
-    logger.info(f"✅ Paired! code={code}")
+    logger.info("✅ Paired! code=%s", code)
     for role, ws in s.items():
         try:
             await send_json(ws, {"type": MessageTypes.PAIRED, "code": code, "your_role": role})
@@ -169,45 +499,303 @@ async def _notify_paired(code: str, s: dict):
             pass
 
 
+def _outbox(ws, code: str, role: str) -> channels.Outbox:
+    """Bağlantının gönderim kuyrukları (ilk katılımda oluşturulur)."""
+    box = outboxes.get(ws)
+    if box is None:
+        depth = ServerConfig.VIEWER_QUEUE_FRAMES if role == VIEWER else ServerConfig.CHANNEL_QUEUE_FRAMES
+        box = outboxes[ws] = channels.Outbox(ws, code, role, depth)
+    return box
+
+
+async def _join_viewer(ws, code: str, box: channels.Outbox):
+    """İzleyiciyi gruba ekle; telefon bu düğümde değilse onun düğümüne bildir."""
+    group = viewers.get(code)
+    first = group is None
+    if first:
+        group = viewers[code] = fanout.ViewerGroup(code)
+    group.add(box)
+    await send_json(ws, {"type": MessageTypes.JOINED, "code": code, "role": VIEWER})
+    logger.info("viewer joined: code=%s viewers=%d", code, len(group))
+
+    nodes = {}
+    if first:
+        try:
+            nodes = await store.claim(code, _viewer_field())
+        except session_store.errors as e:
+            logger.warning("store_claim_failed code=%s (%s)", code, e)
+    phone_node = nodes.get("phone")
+    if "phone" in sessions.get(code, {}) or code in viewer_sources:
+        await _notify_paired(code, {VIEWER: ws})
+    elif phone_node and phone_node != store.node_id:
+        viewer_sources[code] = phone_node
+        await _forward(phone_node, FWD_VIEWER, code, "phone")
+        await _notify_paired(code, {VIEWER: ws})
+    else:
+        await send_raw(ws, _MSG_WAITING)
+
+
+async def _leave_viewers(code: str, ws):
+    """Bağlantı izleyiciyse gruptan çıkar; düğümde izleyici kalmadıysa bildir."""
+    group = viewers.get(code)
+    if group is None or ws not in group or not group.remove(ws):
+        return
+    del viewers[code]
+    try:
+        await store.release(code, _viewer_field())
+    except session_store.errors as e:
+        logger.warning("store_release_failed code=%s (%s)", code, e)
+    source = viewer_sources.pop(code, None)
+    if source:
+        await _forward(source, FWD_VIEWER_GONE, code, "phone")
+
+
+async def _demote(code: str, ws):
+    """Kontrolü yeni PC devraldı: önceki PC izleyici olarak devam eder."""
+    viewers.setdefault(code, fanout.ViewerGroup(code)).add(_outbox(ws, code, "pc"))
+    metrics.inc("controller_takeovers_total")
+    try:
+        await send_raw(ws, _MSG_ROLE_VIEWER)
+    except websockets.exceptions.ConnectionClosed:
+        pass
+
+
+async def _pair_viewers(code: str, nodes: dict[str, str]):
+    """Telefon bu düğüme kaydoldu: yerel ve uzak izleyicilere eşleşmeyi bildir."""
+    group = viewers.get(code)
+    if group:
+        for ws in group.sockets():
+            await _notify_paired(code, {VIEWER: ws})
+    for field, node in nodes.items():
+        if field.startswith(f"{VIEWER}:") and node != store.node_id:
+            remote_viewers.setdefault(code, set()).add(node)
+            await _forward(node, FWD_PAIRED, code, VIEWER)
+
+
+async def _fan_out(code: str, raw: bytes, text: bool, ch: int) -> bool:
+    """Telefon mesajını izleyicilere dağıt (uzak düğüme bir kez); izleyici var mıydı."""
+    group = viewers.get(code)
+    if group:
+        _broadcast(group, raw, text, ch)
+    nodes = remote_viewers.get(code)
+    for node in tuple(nodes or ()):
+        await _forward(node, FWD_RELAY, code, VIEWER, raw, text)
+    return bool(group or nodes)
+
+
+async def _viewers_peer_gone(code: str):
+    """Telefon ayrıldı; drain'de izleyicilere bildirilmez (telefon taşınıyor)."""
+    nodes = remote_viewers.pop(code, ())
+    if draining:
+        return
+    for node in nodes:
+        await _forward(node, FWD_PEER_GONE, code, VIEWER)
+    group = viewers.get(code)
+    for ws in group.sockets() if group else ():
+        try:
+            await send_json(ws, {"type": MessageTypes.PEER_DISCONNECTED, "role": "phone"})
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+
+def _deliver(box: channels.Outbox, code: str, payload: bytes, text: bool, ch: int) -> bool:
+    """Alıcının kuyruğuna ver; yeniden kodlama açıksa video frame'i alıcının sınıfına göre."""
+    if transcoder is not None and ch in channels.VIDEO:
+        return transcoder.offer(box, code, payload, ch)
+    return box.offer(payload, text, ch)
+
+
+def _broadcast(group: fanout.ViewerGroup, payload: bytes, text: bool, ch: int):
+    if transcoder is not None and ch in channels.VIDEO:
+        for box in group.outboxes():
+            transcoder.offer(box, group.code, payload, ch)
+    else:
+        group.broadcast(payload, text, ch)
+
+
+def _channel(payload: bytes, text: bool) -> int:
+    """Başka düğümden iletilen mesajın kanalı (iletim zarfı tipi taşımaz)."""
+    return channels.channel_of(payload, rate_limit.sniff_type(payload))
+
+
+async def _forward(node: str, kind: int, code: str, role: str,
+                   payload: bytes = b"", text: bool = True) -> bool:
+    """Başka düğümdeki (code, role) bağlantısına ilet (beklemeden kuyruğa); kuyruk doluysa False."""
+    try:
+        await store.publish(node, encode_forward(kind, code, role, store.node_id, payload, text))
+        return True
+    except session_store.errors as e:
+        logger.warning("forward_failed node=%s code=%s (%s)", node, code, e)
+        return False
+
+
+async def _on_forward(kind: int, code: str, role: str, node: str, payload: bytes, text: bool):
+    """Başka düğümden bu düğümdeki bir bağlantıya gelen iletim."""
+    if role == VIEWER:
+        await _on_viewer_forward(kind, code, node, payload, text)
+        return
+    if kind == FWD_VIEWER:
+        if "phone" in sessions.get(code, {}):
+            remote_viewers.setdefault(code, set()).add(node)
+        return
+    if kind == FWD_VIEWER_GONE:
+        nodes = remote_viewers.get(code)
+        if nodes is not None:
+            nodes.discard(node)
+            if not nodes:
+                del remote_viewers[code]
+        return
+    ws = sessions.get(code, {}).get(role)
+    if ws is None:
+        return
+    other_role = _other_role(role)
+    if kind == FWD_RELAY:
+        box = outboxes.get(ws)
+        if box is not None:
+            _deliver(box, code, payload, text, _channel(payload, text))
+    elif kind == FWD_PAIRED:
+        remote_peers[(code, other_role)] = node
+        await _notify_paired(code, {role: ws})
+    elif kind == FWD_PEER_GONE:
+        if remote_peers.pop((code, other_role), None) is None:
+            return
+        try:
+            await send_json(ws, {"type": MessageTypes.PEER_DISCONNECTED, "role": other_role})
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+
+async def _on_viewer_forward(kind: int, code: str, node: str, payload: bytes, text: bool):
+    """Telefonun düğümünden bu düğümdeki izleyicilere gelen iletim."""
+    group = viewers.get(code)
+    if group is None:
+        return
+    if kind == FWD_RELAY:
+        _broadcast(group, payload, text, _channel(payload, text))
+    elif kind == FWD_PAIRED:
+        viewer_sources[code] = node
+        for ws in group.sockets():
+            await _notify_paired(code, {VIEWER: ws})
+    elif kind == FWD_PEER_GONE:
+        viewer_sources.pop(code, None)
+        for ws in group.sockets():
+            try:
+                await send_json(ws, {"type": MessageTypes.PEER_DISCONNECTED, "role": "phone"})
+            except websockets.exceptions.ConnectionClosed:
+                pass
+
+
+async def _drain(server, stop_event: asyncio.Event, stop_listening: bool):
+    """
+    Yeni kayıtları durdur, bağlı herkese server_draining gönder ve oturumlar
+    taşınana (veya DRAIN_DEADLINE_SEC dolana / ikinci sinyal gelene) kadar bekle.
+    """
+    global draining, handed_over
+    draining = True
+    handed_over = stop_listening
+    metrics.set("draining", 1)
+    if stop_listening:
+        # Soket artık devralan süreçte; bu süreç yeni bağlantı kabul etmez
+        server.server.close()
+    if handed_over or not isinstance(store, session_store.MemoryStore):
+        # Taşınacak yer var: yeni süreç veya paylaşılan depodaki diğer düğümler
+        websockets.broadcast(server.connections, _MSG_DRAINING.decode())
+    logger.info(f"Draining: {len(sessions)} sessions, deadline {ServerConfig.DRAIN_DEADLINE_SEC}s")
+
+    deadline = time.monotonic() + ServerConfig.DRAIN_DEADLINE_SEC
+    while (sessions or viewers) and time.monotonic() < deadline and not stop_event.is_set():
+        await asyncio.sleep(0.25)
+    logger.info(f"Drain finished: {len(sessions)} sessions left")
+
+
 async def main():
+    global store, transcoder
     host = ServerConfig.HOST
     port = ServerConfig.PORT
     logger.info(f"Signaling server starting on ws://{host}:{port}")
 
-    # Graceful shutdown event
+    # Graceful shutdown event; drain istekleri (restart: soket devri yapılsın mı)
     stop_event = asyncio.Event()
+    drain_requests: asyncio.Queue[bool] = asyncio.Queue()
+    loop = asyncio.get_running_loop()
 
     def signal_handler():
         logger.info("Shutdown signal received. Closing server...")
         stop_event.set()
 
+    def drain_handler(restart: bool):
+        if draining:
+            signal_handler()  # Drain sırasında ikinci sinyal: beklemeden kapan
+            return
+        logger.info(f"{'Restart' if restart else 'Drain'} signal received.")
+        drain_requests.put_nowait(restart)
+
     # Windows'da SIGTERM/SIGINT desteği sınırlı olabilir, try-except ile koruyalım
     try:
-        for sig in (signal.SIGINT, signal.SIGTERM):
-            asyncio.get_running_loop().add_signal_handler(sig, signal_handler)
+        loop.add_signal_handler(signal.SIGINT, signal_handler)
+        loop.add_signal_handler(signal.SIGTERM, drain_handler, False)
+        loop.add_signal_handler(signal.SIGHUP, drain_handler, True)
     except NotImplementedError:
-        # Windows environments that don't support add_signal_handler
-        signal.signal(signal.SIGINT, lambda s, f: signal_handler())
-        signal.signal(signal.SIGTERM, lambda s, f: signal_handler())
+        # Windows environments that don't support add_signal_handler (SIGHUP da yok)
+        signal.signal(signal.SIGINT, lambda s, f: loop.call_soon_threadsafe(signal_handler))
+        signal.signal(signal.SIGTERM, lambda s, f: loop.call_soon_threadsafe(drain_handler, False))
+
+    instrumentation.install_gc_hooks()
+    lag_monitor = asyncio.create_task(instrumentation.monitor_loop_lag())
+    memory_monitor = asyncio.create_task(memory.monitor(outboxes))
+    log_summaries = asyncio.create_task(logs.summarize())
 
+    store = session_store.create(ServerConfig.SESSION_STORE_URL, ServerConfig.NODE_ID)
+    await store.start(_on_forward)
+    logger.info(f"Session store: {type(store).__name__} node={store.node_id}")
+    transcoder = transcode.create()
+
+    # Soket kendimiz açıyoruz (veya önceki süreçten devralıyoruz) ki SIGHUP'ta devredilebilsin
+    sock = handover.listen_socket(host, port)
 
     # Ping/Pong ve Payload limitlerini ekleyerek cloud ortamında bağlantı kopmalarını
     # ve OOM tehlikesini engelliyoruz. Render gibi platformlar 100 sn idle bağlantıyı koparır.
+    # Gelen kuyruk açıkça sınırlı: handler takılırsa okuma RECV_QUEUE_FRAMES'te durur (bkz. memory).
     async with websockets.serve(
-        handler, 
-        host, 
-        port, 
+        handler,
+        sock=sock,
         process_request=process_request,
-        ping_interval=20,     # Her 20 saniyede bir ping gönder
-        ping_timeout=20,      # 20 saniye içinde pong gelmezse bağlantıyı kapat
-        max_size=5 * 1024 * 1024 # 5MB maksimum payload limiti (MJPEG/Frame transferleri için yeterli)
+        ping_interval=ServerConfig.PING_INTERVAL_SEC,   # Her 20 saniyede bir ping gönder
+        ping_timeout=ServerConfig.PING_TIMEOUT_SEC,     # 20 saniye içinde pong gelmezse bağlantıyı kapat
+        max_size=ServerConfig.MAX_MESSAGE_BYTES,  # Varsayılan 5MB (MJPEG/Frame transferleri için yeterli)
+        max_queue=ServerConfig.RECV_QUEUE_FRAMES,
     ) as server:
         logger.info(f"✅ Server listening on ws://{host}:{port}")
-        
-        # event set edilene kadar bekle
-        await stop_event.wait()
-        
+        handover.notify_ready()
+
+        # Kapanma sinyali veya başarılı bir drain isteği gelene kadar bekle
+        stop_wait = asyncio.create_task(stop_event.wait())
+        while not stop_event.is_set():
+            next_request = asyncio.create_task(drain_requests.get())
+            await asyncio.wait({stop_wait, next_request}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_request.done():
+                next_request.cancel()
+                break
+            restart = next_request.result()
+            if restart and await handover.spawn_successor(
+                    sock, [sys.executable, os.path.abspath(__file__)]) is None:
+                continue  # Yeni süreç hazır olmadı; hizmete devam
+            await _drain(server, stop_event, stop_listening=restart)
+            break
+        stop_wait.cancel()
+        lag_monitor.cancel()
+        memory_monitor.cancel()
+        log_summaries.cancel()
+        # Kalan bağlantılar: yeni süreç devraldıysa 1012 (service restart), aksi halde 1001
+        server.close(code=(websockets.CloseCode.SERVICE_RESTART if handed_over
+                           else websockets.CloseCode.GOING_AWAY))
+
+    await store.close()
+    if transcoder is not None:
+        transcoder.close()
+
     logger.info("Server completely shut down.")
+    logs.stop()
 
 
 if __name__ == "__main__":
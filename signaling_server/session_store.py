@@ -0,0 +1,415 @@
+"""
+Signaling Server — Oturum deposu ve düğümler arası iletim.
+
+Birden fazla relay örneği (düğüm) bir load balancer arkasında çalışırken
+telefon ile PC farklı düğümlere düşebilir. Her düğüm kendi WebSocket
+bağlantılarını yerelde tutar; "hangi oturumun hangi rolü hangi düğümde"
+bilgisi paylaşılan depoda durur:
+
+    relay:session:<code>   hash   role -> node_id   (SESSION_TTL_SEC ile süreli;
+                                  izleyiciler "viewer:<node_id>" alanında)
+    relay:code:<code>      string telefonun sahiplik token'ı (kod tahsisi, bkz. code_pool)
+    relay:node:<node_id>   kanal  o düğüme iletilecek mesajlar (pub/sub)
+
+Arka uçlar:
+  MemoryStore — tek süreç (varsayılan); aynı nesneyi paylaşan düğümler
+                arasında iletim de süreç içinde yapılır
+  RespStore   — Redis protokolü (RESP2) konuşan bir sunucu; harici kütüphane
+                gerektirmez. Testlerde scripts/resp_standin.py kullanılabilir.
+                İletimler (PUBLISH) handler'ı bekletmez: sınırlı bir kuyruğa
+                bırakılır, ayrı bir bağlantıda toplu gönderilir (pipelining).
+
+İletilen mesaj biçimi (`encode_forward`):
+    kind:u8 flags:u8 code_len:u8 role_len:u8 node_len:u8 code role node payload
+    kind  — FWD_RELAY (payload hedef role aynen gönderilir) / FWD_PAIRED / FWD_PEER_GONE /
+            FWD_VIEWER, FWD_VIEWER_GONE (gönderen düğümde izleyici var / kalmadı)
+    flags — bit0: payload metin frame'i mi
+"""
+
+import abc
+import asyncio
+import logging
+import struct
+import time
+from typing import Awaitable, Callable
+from urllib.parse import urlsplit
+
+from signaling_server.config import ServerConfig
+from signaling_server.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+FWD_RELAY = 1
+FWD_PAIRED = 2
+FWD_PEER_GONE = 3
+FWD_VIEWER = 4
+FWD_VIEWER_GONE = 5
+
+_FWD_HEADER = struct.Struct(">BBBBB")
+_FLAG_TEXT = 0x01
+
+ForwardHandler = Callable[[int, str, str, str, bytes, bool], Awaitable[None]]
+
+
+def session_key(code: str) -> str:
+    return f"relay:session:{code}"
+
+
+def code_key(code: str) -> str:
+    return f"relay:code:{code}"
+
+
+def node_channel(node_id: str) -> str:
+    return f"relay:node:{node_id}"
+
+
+def encode_forward(kind: int, code: str, role: str, node: str,
+                   payload: bytes = b"", text: bool = True) -> bytes:
+    """Düğümler arası mesaj: hedef oturum/rol, gönderen düğüm ve ham payload."""
+    c, r, n = code.encode(), role.encode(), node.encode()
+    flags = _FLAG_TEXT if text else 0
+    return _FWD_HEADER.pack(kind, flags, len(c), len(r), len(n)) + c + r + n + payload
+
+
+def decode_forward(data: bytes) -> tuple[int, str, str, str, bytes, bool]:
+    """(kind, code, role, node, payload, text); hatalı mesajda ValueError."""
+    if len(data) < _FWD_HEADER.size:
+        raise ValueError("forward message too short")
+    kind, flags, lc, lr, ln = _FWD_HEADER.unpack_from(data)
+    i = _FWD_HEADER.size
+    if len(data) < i + lc + lr + ln:
+        raise ValueError("forward message truncated")
+    code = data[i:i + lc].decode()
+    role = data[i + lc:i + lc + lr].decode()
+    node = data[i + lc + lr:i + lc + lr + ln].decode()
+    return kind, code, role, node, data[i + lc + lr + ln:], bool(flags & _FLAG_TEXT)
+
+
+class SessionStore(abc.ABC):
+    """Oturum rol → düğüm eşlemesi ve düğümlere iletim için ortak arayüz."""
+
+    def __init__(self, node_id: str):
+        self.node_id = node_id
+
+    @abc.abstractmethod
+    async def start(self, on_forward: ForwardHandler):
+        """Bu düğüme gelen iletimleri dinlemeye başla."""
+
+    @abc.abstractmethod
+    async def close(self):
+        """Aboneliği ve bağlantıları kapat."""
+
+    @abc.abstractmethod
+    async def claim(self, code: str, role: str) -> dict[str, str]:
+        """Rolü bu düğüme yaz; oturumun güncel rol → düğüm eşlemesini döndür."""
+
+    @abc.abstractmethod
+    async def release(self, code: str, role: str):
+        """Rol hâlâ bu düğümdeyse sil."""
+
+    @abc.abstractmethod
+    async def publish(self, node_id: str, message: bytes):
+        """
+        `encode_forward` çıktısını hedef düğüme ilet. Depo turunu beklemez;
+        iletilemeyecekse (kuyruk dolu) `errors`'tan biri yükselir.
+        """
+
+    @abc.abstractmethod
+    async def reserve_code(self, code: str, token: str, fresh: bool) -> bool:
+        """
+        Kodu token'a SESSION_TTL_SEC süreyle ayır; aynı token ile yenilenebilir.
+        `fresh` (yeni tahsis): kodda bekleyen bir oturum varsa da reddet.
+        """
+
+    @abc.abstractmethod
+    async def release_code(self, code: str, token: str):
+        """Sahibi hâlâ token ise ayrımı CODE_HOLD_SEC sonra düşecek şekilde kısalt."""
+
+
+# ─── BELLEK İÇİ ───────────────────────────────────────────────────────────────
+
+class MemoryStore(SessionStore):
+    """
+    Tek süreçlik depo. Aynı `shared` sözlüğünü alan birden fazla örnek
+    süreç içi "düğümler" gibi davranır (deneme ve ölçüm için).
+    """
+
+    def __init__(self, node_id: str, shared: dict | None = None):
+        super().__init__(node_id)
+        self._shared = shared if shared is not None else {}
+        self._sessions: dict[str, dict[str, str]] = self._shared.setdefault("sessions", {})
+        self._handlers: dict[str, ForwardHandler] = self._shared.setdefault("handlers", {})
+        # code -> (token, bitiş zamanı)
+        self._codes: dict[str, tuple[str, float]] = self._shared.setdefault("codes", {})
+
+    async def start(self, on_forward: ForwardHandler):
+        self._handlers[self.node_id] = on_forward
+
+    async def close(self):
+        self._handlers.pop(self.node_id, None)
+
+    async def claim(self, code: str, role: str) -> dict[str, str]:
+        roles = self._sessions.setdefault(code, {})
+        roles[role] = self.node_id
+        return dict(roles)
+
+    async def release(self, code: str, role: str):
+        roles = self._sessions.get(code)
+        if roles and roles.get(role) == self.node_id:
+            del roles[role]
+            if not roles:
+                del self._sessions[code]
+
+    async def publish(self, node_id: str, message: bytes):
+        handler = self._handlers.get(node_id)
+        if handler is not None:
+            await handler(*decode_forward(message))
+
+    async def reserve_code(self, code: str, token: str, fresh: bool) -> bool:
+        now = time.monotonic()
+        owner = self._codes.get(code)
+        if owner is not None and owner[1] > now and owner[0] != token:
+            return False
+        if fresh and code in self._sessions:
+            return False
+        self._codes[code] = (token, now + ServerConfig.SESSION_TTL_SEC)
+        return True
+
+    async def release_code(self, code: str, token: str):
+        owner = self._codes.get(code)
+        if owner is not None and owner[0] == token:
+            self._codes[code] = (token, time.monotonic() + ServerConfig.CODE_HOLD_SEC)
+
+
+# ─── RESP (Redis protokolü) ───────────────────────────────────────────────────
+
+class RespError(Exception):
+    """Sunucunun döndürdüğü RESP hata yanıtı."""
+
+
+# Depo erişim hataları (çağıran loglar ve yerel davranışa döner)
+errors = (OSError, asyncio.IncompleteReadError, RespError)
+
+
+def _encode_command(*args) -> bytes:
+    out = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode()
+        elif isinstance(arg, int):
+            arg = str(arg).encode()
+        out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(out)
+
+
+async def _read_reply(reader: asyncio.StreamReader):
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("RESP connection closed")
+    prefix, body = line[:1], line[1:-2]
+    if prefix == b"+":
+        return body.decode()
+    if prefix == b"-":
+        raise RespError(body.decode())
+    if prefix == b":":
+        return int(body)
+    if prefix == b"$":
+        n = int(body)
+        if n < 0:
+            return None
+        data = await reader.readexactly(n + 2)
+        return data[:-2]
+    if prefix == b"*":
+        n = int(body)
+        if n < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(n)]
+    raise RespError(f"unexpected RESP prefix {prefix!r}")
+
+
+class RespStore(SessionStore):
+    """
+    Redis protokolü üzerinden paylaşılan depo üç bağlantı kullanır:
+      - komutlar (claim / lookup; sırayla, kilitli)
+      - iletimler: publish() mesajı FORWARD_QUEUE_MESSAGES'lık kuyruğa bırakır;
+        `_publisher` birikenleri FORWARD_BATCH_MESSAGES'lık gruplar halinde
+        yanıt beklemeden yazar, yanıtları sonra sırayla okur (tur başına bir RTT)
+      - bu düğümün kanalına abonelik
+    Abonelik veya iletim bağlantısı koparsa artan beklemeyle yeniden kurulur.
+    """
+
+    def __init__(self, node_id: str, url: str):
+        super().__init__(node_id)
+        u = urlsplit(url)
+        self._host = u.hostname or "127.0.0.1"
+        self._port = u.port or 6379
+        self._password = u.password
+        self._lock = asyncio.Lock()
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._sub_writer: asyncio.StreamWriter | None = None
+        self._sub_task: asyncio.Task | None = None
+        self._outbound: asyncio.Queue[tuple[str, bytes]] = asyncio.Queue(ServerConfig.FORWARD_QUEUE_MESSAGES)
+        self._pub_writer: asyncio.StreamWriter | None = None
+        self._pub_task: asyncio.Task | None = None
+
+    async def _open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self._host, self._port)
+        if self._password:
+            writer.write(_encode_command("AUTH", self._password))
+            await writer.drain()
+            await _read_reply(reader)
+        return reader, writer
+
+    async def _command(self, *args):
+        async with self._lock:
+            if self._writer is None:
+                self._reader, self._writer = await self._open()
+            try:
+                self._writer.write(_encode_command(*args))
+                await self._writer.drain()
+                return await _read_reply(self._reader)
+            except BaseException:
+                # Yarım kalan yanıt (kopma, iptal) sonraki komutun yanıtını kaydırmasın:
+                # bağlantıyı bırak, bir sonraki komutta yeniden bağlan
+                writer, self._writer, self._reader = self._writer, None, None
+                writer.close()
+                raise
+
+    async def _subscribe(self) -> asyncio.StreamReader:
+        reader, writer = await self._open()
+        self._sub_writer = writer
+        writer.write(_encode_command("SUBSCRIBE", node_channel(self.node_id)))
+        await writer.drain()
+        await _read_reply(reader)  # ["subscribe", kanal, 1]
+        return reader
+
+    async def start(self, on_forward: ForwardHandler):
+        # İlk abonelik hatası açılışta görünsün; sonraki kopmalarda _listen yeniden bağlanır
+        reader = await self._subscribe()
+        self._sub_task = asyncio.create_task(self._listen(reader, on_forward))
+        self._pub_task = asyncio.create_task(self._publisher())
+
+    async def _listen(self, reader: asyncio.StreamReader, on_forward: ForwardHandler):
+        delay = ServerConfig.STORE_RECONNECT_MIN_SEC
+        while True:
+            try:
+                reply = await _read_reply(reader)
+            except errors as e:
+                logger.error(f"store_subscription_lost node={self.node_id} ({e})")
+                metrics.inc("store_subscription_lost_total")
+                self._sub_writer.close()
+                reader = await self._resubscribe(delay)
+                delay = ServerConfig.STORE_RECONNECT_MIN_SEC
+                continue
+            if not isinstance(reply, list) or len(reply) != 3 or reply[0] != b"message":
+                continue
+            try:
+                await on_forward(*decode_forward(reply[2]))
+            except Exception as e:
+                logger.warning("forward_handler_error %s", e)
+
+    async def _resubscribe(self, delay: float) -> asyncio.StreamReader:
+        """Aboneliği artan beklemeyle (STORE_RECONNECT_MAX_SEC'e kadar) yeniden kur."""
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                reader = await self._subscribe()
+            except errors as e:
+                logger.warning(f"store_resubscribe_failed node={self.node_id} ({e})")
+                if self._sub_writer is not None:
+                    self._sub_writer.close()
+                delay = min(delay * 2, ServerConfig.STORE_RECONNECT_MAX_SEC)
+                continue
+            logger.info(f"store_subscription_restored node={self.node_id}")
+            return reader
+
+    async def close(self):
+        for task in (self._sub_task, self._pub_task):
+            if task:
+                task.cancel()
+        for writer in (self._sub_writer, self._pub_writer, self._writer):
+            if writer is not None:
+                writer.close()
+        self._sub_writer = self._pub_writer = self._writer = None
+
+    async def claim(self, code: str, role: str) -> dict[str, str]:
+        key = session_key(code)
+        await self._command("HSET", key, role, self.node_id)
+        await self._command("EXPIRE", key, ServerConfig.SESSION_TTL_SEC)
+        flat = await self._command("HGETALL", key) or []
+        return {flat[i].decode(): flat[i + 1].decode() for i in range(0, len(flat), 2)}
+
+    async def release(self, code: str, role: str):
+        key = session_key(code)
+        owner = await self._command("HGET", key, role)
+        if owner is not None and owner.decode() == self.node_id:
+            await self._command("HDEL", key, role)
+
+    async def reserve_code(self, code: str, token: str, fresh: bool) -> bool:
+        key = code_key(code)
+        if fresh and await self._command("EXISTS", session_key(code)):
+            return False
+        if await self._command("SET", key, token, "NX", "EX", ServerConfig.SESSION_TTL_SEC):
+            return True
+        owner = await self._command("GET", key)
+        if owner is None or owner.decode() != token:
+            return False
+        await self._command("EXPIRE", key, ServerConfig.SESSION_TTL_SEC)
+        return True
+
+    async def release_code(self, code: str, token: str):
+        key = code_key(code)
+        owner = await self._command("GET", key)
+        if owner is not None and owner.decode() == token:
+            await self._command("EXPIRE", key, int(ServerConfig.CODE_HOLD_SEC))
+
+    async def publish(self, node_id: str, message: bytes):
+        try:
+            self._outbound.put_nowait((node_id, message))
+        except asyncio.QueueFull:
+            metrics.inc("forward_dropped_total", reason="queue_full")
+            raise RespError("forward queue full") from None
+
+    async def _publisher(self):
+        """Kuyruktaki iletimleri ayrı bağlantıda toplu (pipelined) PUBLISH et."""
+        queue = self._outbound
+        reader: asyncio.StreamReader | None = None
+        delay = ServerConfig.STORE_RECONNECT_MIN_SEC
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < ServerConfig.FORWARD_BATCH_MESSAGES and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                if self._pub_writer is not None and reader.at_eof():
+                    self._pub_writer.close()  # Sunucu boştayken kapatmış; yazmadan önce yenile
+                    self._pub_writer = None
+                if self._pub_writer is None:
+                    reader, self._pub_writer = await self._open()
+                t0 = time.perf_counter()
+                self._pub_writer.write(b"".join(_encode_command("PUBLISH", node_channel(node), message)
+                                                for node, message in batch))
+                await self._pub_writer.drain()
+                for node, _ in batch:
+                    if not await _read_reply(reader):
+                        logger.warning("forward_no_receiver node=%s", node)
+                metrics.observe("forward_publish_seconds", time.perf_counter() - t0)
+                delay = ServerConfig.STORE_RECONNECT_MIN_SEC
+            except errors as e:
+                logger.error("forward_publish_failed node=%s messages=%d (%s)", self.node_id, len(batch), e)
+                metrics.inc("forward_dropped_total", len(batch), reason="store")
+                if self._pub_writer is not None:
+                    self._pub_writer.close()
+                    self._pub_writer = None
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, ServerConfig.STORE_RECONNECT_MAX_SEC)
+
+
+def create(url: str, node_id: str) -> SessionStore:
+    """URL'ye göre depo: boş → MemoryStore, redis://host:port → RespStore."""
+    if not url:
+        return MemoryStore(node_id)
+    scheme = urlsplit(url).scheme
+    if scheme in ("redis", "resp", "tcp"):
+        return RespStore(node_id, url)
+    raise ValueError(f"Unsupported session store URL: {url}")
@@ -0,0 +1,218 @@
+"""
+Signaling Server — Yavaş bağlantıdaki alıcılar için frame'i yeniden kodlama.
+
+Telefon herkese tek kalitede frame gönderir. RELAY_TRANSCODE=1 ile relay,
+yetişemeyen alıcılara (kontrol eden PC veya izleyici) frame'in daha küçük /
+düşük kaliteli bir sürümünü gönderir. Sınıf 0 telefonun frame'idir; sınıf
+1..n TRANSCODE_VARIANTS'taki (ölçek, JPEG kalitesi) çiftleridir.
+
+Sınıf seçimi (alıcı başına, TRANSCODE_EVAL_SEC'te bir):
+  - Alıcının kuyruğunda frame düştüyse bağlantı doymuştur; o aralıkta
+    gönderilen byte/sn bağlantının ölçülen hızıdır. Sınıf, hızın
+    TRANSCODE_TIER_KBPS eşiklerine göre karşılığına, en az bir alt sınıfa iner.
+  - TRANSCODE_UPGRADE_SEC boyunca hiç düşme olmazsa bir üst sınıf denenir.
+
+Çözme / ölçekleme / kodlama Pillow ile süreç havuzunda yapılır; event loop
+yalnızca byte'ları havuza verir ve sonucu kuyruğa koyar. Her (oturum, kanal,
+sınıf) için aynı anda tek iş çalışır: iş sürerken gelen frame'ler yalnızca en
+yenisi kalacak şekilde bekler (aradakiler atlanır). Aynı frame'i isteyen tüm
+alıcılar aynı işin sonucunu alır; bir sürüm frame başına bir kez üretilir.
+
+Yalnızca ekran/kamera frame'lerinin "data" alanı yeniden kodlanır; yakınlaştırma
+karosu ("tile", "roi") küçük sürümlerden çıkarılır. Pillow kurulu değilse
+özellik kapalı kalır.
+"""
+
+import asyncio
+import base64
+import io
+import json
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:  # Opsiyonel: yoksa yeniden kodlama kapalı
+    Image = None
+
+from signaling_server.config import ServerConfig
+from signaling_server.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def tier_for(kbps: float) -> int:
+    """Ölçülen hıza (KiB/sn) uygun sınıf."""
+    return sum(kbps < limit for limit in ServerConfig.TRANSCODE_TIER_KBPS)
+
+
+def encode_variant(raw: bytes, scale: float, quality: int) -> bytes | None:
+    """Frame mesajının küçültülmüş sürümü (havuz sürecinde); JPEG yoksa None."""
+    msg = json.loads(raw)
+    data = msg.get("data")
+    if not data:
+        return None
+    img = Image.open(io.BytesIO(base64.b64decode(data)))
+    size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+    img.draft("RGB", size)  # JPEG'i doğrudan küçük ölçekte çöz (DCT ölçekleme)
+    img = img.convert("RGB")
+    if img.size != size:
+        img = img.resize(size, Image.Resampling.BILINEAR)
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=quality)
+    # "type" ve "ch" başta kalmalı: relay kanalı mesajın başından okur
+    variant = {"type": msg["type"], "ch": msg.get("ch", 1),
+               "data": base64.b64encode(out.getvalue()).decode("ascii")}
+    for key, value in msg.items():
+        if key not in variant and key not in ("tile", "roi"):
+            variant[key] = value
+    return json.dumps(variant, separators=(",", ":")).encode()
+
+
+class _Meter:
+    """Alıcının sınıfı ve son değerlendirmedeki sayaçları."""
+
+    __slots__ = ("tier", "at", "sent", "dropped", "calm_since")
+
+    def __init__(self, box, now: float):
+        self.tier = 0
+        self.at = self.calm_since = now
+        self.sent = box.sent
+        self.dropped = box.dropped
+
+
+class _Stream:
+    """Bir (oturum, kanal, sınıf) için bekleyen / kodlanan / son üretilen frame."""
+
+    __slots__ = ("pending", "pending_boxes", "encoding", "encoding_boxes", "done", "variant", "task")
+
+    def __init__(self):
+        self.pending = self.encoding = self.done = None
+        self.pending_boxes: list = []
+        self.encoding_boxes: list = []
+        self.variant: bytes | None = None
+        self.task: asyncio.Task | None = None
+
+
+class Transcoder:
+    """Frame'leri alıcının sınıfına göre olduğu gibi veya küçültülmüş iletir."""
+
+    def __init__(self, workers: int = ServerConfig.TRANSCODE_WORKERS):
+        # spawn: event loop ve log thread'i olan süreç fork edilmesin
+        self._pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        self._meters: dict = {}
+        self._streams: dict[tuple[str, int, int], _Stream] = {}
+
+    def close(self):
+        for stream in self._streams.values():
+            if stream.task:
+                stream.task.cancel()
+        self._streams.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def offer(self, box, code: str, raw: bytes, ch: int) -> bool:
+        """Video frame'ini alıcıya ilet (gerekirse küçültülmüş sürüm); alıcı kapandıysa False."""
+        if box.closed:
+            self._meters.pop(box, None)
+            return False
+        tier = self._tier(box)
+        if tier == 0:
+            return box.offer(raw, True, ch)
+        key = (code, ch, tier)
+        stream = self._streams.get(key)
+        if stream is None:
+            stream = self._streams[key] = _Stream()
+        if stream.done is raw:
+            metrics.inc("transcode_cache_hits_total")
+            return box.offer(stream.variant, True, ch)
+        if stream.encoding is raw:
+            metrics.inc("transcode_cache_hits_total")
+            stream.encoding_boxes.append(box)
+            return True
+        if stream.pending is raw:
+            metrics.inc("transcode_cache_hits_total")
+        else:
+            if stream.pending is not None:
+                metrics.inc("transcode_superseded_total")  # Kodlanmadan yenisi geldi
+            stream.pending = raw
+        if box not in stream.pending_boxes:
+            stream.pending_boxes.append(box)
+        if stream.task is None:
+            stream.task = asyncio.create_task(self._encode(key, stream))
+        return True
+
+    def forget(self, code: str):
+        """Oturum bitti: bekleyen işleri ve ölçümleri bırak."""
+        for key in [k for k in self._streams if k[0] == code]:
+            stream = self._streams.pop(key)
+            if stream.task:
+                stream.task.cancel()
+        for box in [b for b in self._meters if b.code == code]:
+            del self._meters[box]
+
+    def _tier(self, box) -> int:
+        now = time.monotonic()
+        meter = self._meters.get(box)
+        if meter is None:
+            meter = self._meters[box] = _Meter(box, now)
+        elapsed = now - meter.at
+        if elapsed < ServerConfig.TRANSCODE_EVAL_SEC:
+            return meter.tier
+        kbps = (box.sent - meter.sent) / 1024 / elapsed
+        tier = meter.tier
+        if box.dropped > meter.dropped:
+            # Alıcı yetişemiyor: gönderilebilen hız bağlantının kapasitesi
+            tier = min(len(ServerConfig.TRANSCODE_VARIANTS), max(tier_for(kbps), tier + 1))
+            meter.calm_since = now
+        elif tier and now - meter.calm_since >= ServerConfig.TRANSCODE_UPGRADE_SEC:
+            tier -= 1
+            meter.calm_since = now
+        if tier != meter.tier:
+            logger.info("transcode_tier code=%s role=%s tier=%d->%d kbps=%.0f",
+                        box.code, box.role, meter.tier, tier, kbps)
+            metrics.inc("transcode_tier_changes_total", direction="down" if tier > meter.tier else "up")
+            meter.tier = tier
+        meter.at, meter.sent, meter.dropped = now, box.sent, box.dropped
+        return tier
+
+    async def _encode(self, key: tuple[str, int, int], stream: _Stream):
+        _, ch, tier = key
+        scale, quality = ServerConfig.TRANSCODE_VARIANTS[tier - 1]
+        loop = asyncio.get_running_loop()
+        try:
+            while stream.pending is not None:
+                raw, boxes = stream.pending, stream.pending_boxes
+                stream.pending, stream.pending_boxes = None, []
+                stream.encoding, stream.encoding_boxes = raw, boxes
+                t0 = time.perf_counter()
+                try:
+                    variant = await loop.run_in_executor(self._pool, encode_variant, raw, scale, quality)
+                except Exception as e:
+                    logger.warning("transcode_failed code=%s tier=%d (%r)", key[0], tier, e)
+                    variant = None
+                metrics.observe("transcode_seconds", time.perf_counter() - t0, tier=tier)
+                metrics.inc("transcode_jobs_total", tier=tier)
+                if variant is None:
+                    variant = raw  # Çözülemeyen veya JPEG'siz frame olduğu gibi gider
+                else:
+                    metrics.inc("transcode_bytes_saved_total", len(raw) - len(variant), tier=tier)
+                stream.done, stream.variant = raw, variant
+                stream.encoding, stream.encoding_boxes = None, []
+                for box in boxes:
+                    box.offer(variant, True, ch)
+        finally:
+            stream.task = None
+
+
+def create() -> Transcoder | None:
+    """Yapılandırmaya göre Transcoder; kapalıysa veya Pillow yoksa None."""
+    if not ServerConfig.TRANSCODE_ENABLED:
+        return None
+    if Image is None:
+        logger.warning("RELAY_TRANSCODE=1 ama Pillow kurulu değil; yeniden kodlama kapalı")
+        return None
+    logger.info(f"Transcoding: {ServerConfig.TRANSCODE_WORKERS} süreç, "
+                f"sınıflar {ServerConfig.TRANSCODE_VARIANTS}")
+    return Transcoder()
@@ -0,0 +1,55 @@
+"""rate_limit — frame kovalarının video kanalı başına ayrılması."""
+
+import time
+
+from signaling_server import channels, rate_limit
+from signaling_server.config import ServerConfig
+
+FRAME_SIZE = 20 * 1024
+
+
+def _frame(ch: int) -> bytes:
+    return b'{"type":"frame","ch":%d,"data":"' % ch + b"A" * FRAME_SIZE + b'"}'
+
+
+def _run(limiter: rate_limit.RateLimiter, chs: tuple[int, ...], seconds: float, fps: float):
+    """`chs` kanallarının her birinden `fps` hızla frame gönder; kanal başına geçen sayı."""
+    passed = dict.fromkeys(chs, 0)
+    now = time.monotonic()
+    for _ in range(int(seconds * fps)):
+        now += 1 / fps
+        for ch in chs:
+            raw = _frame(ch)
+            msg_type = rate_limit.sniff_type(raw)
+            msg_class = rate_limit.classify(msg_type, len(raw))
+            assert msg_class == rate_limit.FRAME
+            if limiter.check(msg_class, len(raw), now, channels.channel_of(raw, msg_type)) is None:
+                passed[ch] += 1
+    return passed
+
+
+def test_screen_and_camera_at_full_rate_are_not_dropped():
+    fps = ServerConfig.FRAME_RATE_PER_SEC
+    passed = _run(rate_limit.RateLimiter(), (channels.SCREEN, channels.CAMERA), 5, fps)
+    assert passed == {channels.SCREEN: int(5 * fps), channels.CAMERA: int(5 * fps)}
+
+
+def test_each_channel_is_limited_on_its_own():
+    fps = ServerConfig.FRAME_RATE_PER_SEC
+    passed = _run(rate_limit.RateLimiter(), (channels.SCREEN, channels.CAMERA), 5, 2 * fps)
+    for ch in (channels.SCREEN, channels.CAMERA):
+        # Patlama + 5 sn'lik dolum; ötekinin payını almaz
+        assert passed[ch] <= ServerConfig.FRAME_BURST + 5 * fps + 1
+
+
+def test_session_limiter_keeps_channels_apart():
+    fps = ServerConfig.FRAME_RATE_PER_SEC
+    passed = _run(rate_limit.session_limiter(), (channels.SCREEN, channels.CAMERA), 5, fps)
+    assert min(passed.values()) == int(5 * fps)
+
+
+def test_untyped_large_message_uses_screen_bucket():
+    limiter = rate_limit.RateLimiter()
+    size = ServerConfig.CONTROL_MAX_BYTES + 1
+    assert rate_limit.classify("", size) == rate_limit.FRAME
+    assert limiter.check(rate_limit.FRAME, size, time.monotonic(), channels.CONTROL) is None